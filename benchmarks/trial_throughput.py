@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks the trial throughput of the public data point-source analyses
+``time_integrated_ps``, ``time_dependent_ps``, and ``mcbkg_ps`` on synthetic
+data. For each analysis, number of data events, and number of CPUs the
+analysis is created and trials are generated in a fresh process, and the
+following quantities are measured:
+
+    construction_time
+        The wall time in seconds to create the analysis instance, including
+        the data loading.
+    data_load_time
+        The wall time in seconds to load and prepare the data of the dataset.
+    evaluate_time_mean, evaluate_time_median
+        The wall time in seconds of one call of the ``evaluate`` method of the
+        log-likelihood ratio function for a pseudo data trial.
+    trials_per_sec
+        The number of trials per second generated by the ``do_trials`` method
+        of the analysis.
+    peak_rss, peak_rss_workers
+        The peak resident set size in bytes of the benchmark process and of
+        its largest worker process.
+
+The results are stored as JSON file together with the version information of
+the benchmarked code. A previous result file can be passed via the
+``--baseline`` option to print the relative changes.
+
+This script must be executed from the skyllh main directory, e.g.::
+
+    python -m benchmarks.trial_throughput --output bench.json
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing as mp
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+import numpy as np
+
+import skyllh
+from skyllh.analyses.i3.publicdata_ps import (
+    mcbkg_ps,
+    time_dependent_ps,
+    time_integrated_ps,
+)
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+from skyllh.core.timing import (
+    TimeLord,
+    instrument_methods,
+    uninstrument_methods,
+)
+
+from tests.i3.testdata.synthetic_data import (
+    MJD_START,
+    create_synthetic_data_files,
+    create_synthetic_dataset,
+)
+
+# The quantities, which are compared to a baseline, and if larger values are
+# better.
+COMPARED_QUANTITIES = {
+    'trials_per_sec': True,
+    'evaluate_time_median': False,
+    'construction_time': False,
+    'data_load_time': False,
+    'peak_rss': False,
+}
+
+
+def create_time_integrated_ps_analysis(cfg, ds, source):
+    return time_integrated_ps.create_analysis(
+        cfg=cfg,
+        datasets=[ds],
+        source=source)
+
+
+def create_time_dependent_ps_analysis(cfg, ds, source):
+    return time_dependent_ps.create_analysis(
+        cfg=cfg,
+        datasets=[ds],
+        source=source,
+        box={'start': MJD_START + 10, 'stop': MJD_START + 40})
+
+
+def create_mcbkg_ps_analysis(cfg, ds, source):
+    return mcbkg_ps.create_analysis(
+        cfg=cfg,
+        datasets=[ds],
+        source=source)
+
+
+ANALYSIS_FACTORIES = {
+    'time_integrated_ps': create_time_integrated_ps_analysis,
+    'time_dependent_ps': create_time_dependent_ps_analysis,
+    'mcbkg_ps': create_mcbkg_ps_analysis,
+}
+
+
+def get_peak_rss():
+    """Returns the peak resident set size in bytes of this process and of its
+    largest terminated child process.
+    """
+    # On Linux the maximum resident set size is given in kilobytes.
+    return (
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024,
+    )
+
+
+def run_case(
+        analysis,
+        base_path,
+        ncpu,
+        n_trials,
+        n_evaluate,
+        mean_n_sig,
+        seed):
+    """Runs the benchmark for a single analysis and number of CPUs. This
+    function is supposed to be called in a fresh process, so that the peak
+    memory usage is not influenced by other benchmark cases.
+
+    Returns
+    -------
+    result : dict
+        The dictionary with the benchmark settings and measured quantities.
+    """
+    cfg = Config()
+    cfg.set_ncpu(ncpu)
+
+    ds = create_synthetic_dataset(cfg=cfg, base_path=base_path)
+    source = PointLikeSource(ra=np.deg2rad(77.35), dec=np.deg2rad(5.7))
+
+    # Record the data loading, which is done during the analysis creation.
+    tl = TimeLord()
+    instrument_methods(
+        ds, method_names=['load_and_prepare_data'], max_depth=0)
+    try:
+        t0 = time.perf_counter()
+        with tl:
+            ana = ANALYSIS_FACTORIES[analysis](
+                cfg=cfg, ds=ds, source=source)
+        construction_time = time.perf_counter() - t0
+    finally:
+        uninstrument_methods()
+    data_load_time = tl.get_task_record(
+        f'{type(ds).__name__}.load_and_prepare_data').duration
+
+    # Measure the evaluation time of the log-likelihood ratio function for a
+    # single pseudo data trial.
+    rss = RandomStateService(seed=seed)
+    (n_sig, n_events_list, events_list) = ana.generate_pseudo_data(
+        rss=rss,
+        mean_n_sig=mean_n_sig)
+    ana.initialize_trial(events_list, n_events_list)
+    fitparam_values = ana.pmm.global_paramset.floating_param_initials
+    evaluate_times = np.empty((n_evaluate,), dtype=np.float64)
+    for i in range(n_evaluate):
+        t0 = time.perf_counter()
+        ana.llhratio.evaluate(fitparam_values)
+        evaluate_times[i] = time.perf_counter() - t0
+
+    # Measure the trial throughput.
+    t0 = time.perf_counter()
+    ana.do_trials(
+        rss=rss,
+        n=n_trials,
+        ncpu=ncpu,
+        mean_n_sig=mean_n_sig)
+    trials_time = time.perf_counter() - t0
+
+    (peak_rss, peak_rss_workers) = get_peak_rss()
+
+    result = dict(
+        n_trials=n_trials,
+        n_evaluate=n_evaluate,
+        mean_n_sig=mean_n_sig,
+        construction_time=construction_time,
+        data_load_time=data_load_time,
+        evaluate_time_mean=float(np.mean(evaluate_times)),
+        evaluate_time_median=float(np.median(evaluate_times)),
+        trials_time=trials_time,
+        trials_per_sec=n_trials / trials_time,
+        peak_rss=peak_rss,
+        peak_rss_workers=peak_rss_workers,
+    )
+
+    return result
+
+
+def _run_case_in_process(conn, kwargs):
+    """Target function of the benchmark process. It sends the result of the
+    ``run_case`` function, or the formatted exception, through the given
+    connection.
+    """
+    # The spawned process inherits the start method of its parent, but the
+    # parallelization of skyllh relies on forking the worker processes.
+    mp.set_start_method('fork', force=True)
+    try:
+        conn.send((True, run_case(**kwargs)))
+    except Exception:
+        conn.send((False, traceback.format_exc()))
+    finally:
+        conn.close()
+
+
+def run_case_in_new_process(ctx, **kwargs):
+    """Runs the ``run_case`` function with the given keyword arguments in a
+    new process of the given multiprocessing context. The process is not
+    daemonic, so that it can start its own worker processes.
+    """
+    (parent_conn, child_conn) = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_run_case_in_process,
+        args=(child_conn, kwargs))
+    proc.start()
+    child_conn.close()
+    try:
+        (success, result) = parent_conn.recv()
+    finally:
+        proc.join()
+    if not success:
+        raise RuntimeError(
+            f'The benchmark case {kwargs} failed:\n{result}')
+
+    return result
+
+
+def get_git_commit():
+    """Returns the git commit hash of the skyllh source tree, or ``None`` if
+    it cannot be determined.
+    """
+    try:
+        proc = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(skyllh.__file__)),
+            capture_output=True,
+            text=True,
+            check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return proc.stdout.strip()
+
+
+def create_metadata(args):
+    """Creates the dictionary with information about the benchmarked code and
+    the machine.
+    """
+    metadata = dict(
+        date=datetime.datetime.now().isoformat(timespec='seconds'),
+        skyllh_version=skyllh.__version__,
+        git_commit=get_git_commit(),
+        python_version=platform.python_version(),
+        numpy_version=np.__version__,
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+        args=vars(args),
+    )
+
+    return metadata
+
+
+def get_case_key(result):
+    return (result['analysis'], result['n_events'], result['ncpu'])
+
+
+def compare_results(baseline, results):
+    """Creates the lines of a table comparing the given results with the
+    results of a baseline.
+
+    Parameters
+    ----------
+    baseline : list of dict
+        The results of the baseline benchmark.
+    results : list of dict
+        The results of the current benchmark.
+
+    Returns
+    -------
+    lines : list of str
+        The lines of the comparison table. The relative change is positive
+        for improvements.
+    """
+    baseline_dict = dict((get_case_key(r), r) for r in baseline)
+
+    lines = [
+        f'{"analysis":<20} {"n_events":>9} {"ncpu":>4} {"quantity":<22} '
+        f'{"baseline":>12} {"current":>12} {"change":>8}'
+    ]
+    for result in results:
+        key = get_case_key(result)
+        if key not in baseline_dict:
+            continue
+        base = baseline_dict[key]
+        for (quantity, larger_is_better) in COMPARED_QUANTITIES.items():
+            (old, new) = (base[quantity], result[quantity])
+            change = (new - old) / old
+            if not larger_is_better:
+                change = -change
+            lines.append(
+                f'{key[0]:<20} {key[1]:>9} {key[2]:>4} {quantity:<22} '
+                f'{old:>12.4g} {new:>12.4g} {change:>+8.1%}')
+
+    return lines
+
+
+def run_benchmarks(args, data_path):
+    """Runs all benchmark cases specified by the given command line arguments.
+    The synthetic data files are created in ``data_path`` if they do not exist
+    yet.
+
+    Returns
+    -------
+    results : list of dict
+        The list of the results of the benchmark cases.
+    """
+    # Each benchmark case runs in a new interpreter process, so that the
+    # measurements are not influenced by previous cases.
+    ctx = mp.get_context('spawn')
+
+    results = []
+    for n_events in args.n_events:
+        base_path = os.path.join(data_path, f'n_events_{n_events}')
+        if not os.path.exists(os.path.join(base_path, 'testdata', 'exp.npy')):
+            create_synthetic_data_files(
+                path=os.path.join(base_path, 'testdata'),
+                rss=RandomStateService(seed=args.seed),
+                n_events=n_events)
+
+        for analysis in args.analyses:
+            for ncpu in args.ncpu:
+                result = dict(
+                    analysis=analysis,
+                    n_events=n_events,
+                    ncpu=ncpu)
+                result.update(run_case_in_new_process(
+                    ctx,
+                    analysis=analysis,
+                    base_path=base_path,
+                    ncpu=ncpu,
+                    n_trials=args.n_trials,
+                    n_evaluate=args.n_evaluate,
+                    mean_n_sig=args.mean_n_sig,
+                    seed=args.seed))
+                print(
+                    f'{analysis}: n_events={n_events}, ncpu={ncpu}: '
+                    f'{result["trials_per_sec"]:.3g} trials/s, '
+                    f'{result["evaluate_time_median"]*1e3:.3g} ms/evaluate, '
+                    f'construction {result["construction_time"]:.3g} s, '
+                    f'data loading {result["data_load_time"]:.3g} s, '
+                    f'peak RSS {result["peak_rss"]/2**20:.0f} MiB',
+                    flush=True)
+                results.append(result)
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the trial throughput of the public data '
+                    'point-source analyses on synthetic data.')
+    parser.add_argument(
+        '--output',
+        default='trial_throughput.json',
+        help='The JSON file the results are written to.')
+    parser.add_argument(
+        '--baseline',
+        default=None,
+        help='The JSON file of a previous benchmark run to compare with.')
+    parser.add_argument(
+        '--analyses',
+        nargs='+',
+        default=list(ANALYSIS_FACTORIES.keys()),
+        choices=list(ANALYSIS_FACTORIES.keys()),
+        help='The analyses to benchmark.')
+    parser.add_argument(
+        '--n-events',
+        nargs='+',
+        type=int,
+        default=[10000, 100000],
+        help='The numbers of events of the synthetic data samples.')
+    parser.add_argument(
+        '--ncpu',
+        nargs='+',
+        type=int,
+        default=[1, 2],
+        help='The numbers of CPUs to benchmark.')
+    parser.add_argument(
+        '--n-trials',
+        type=int,
+        default=20,
+        help='The number of trials for measuring the trial throughput.')
+    parser.add_argument(
+        '--n-evaluate',
+        type=int,
+        default=100,
+        help='The number of log-likelihood ratio function evaluations.')
+    parser.add_argument(
+        '--mean-n-sig',
+        type=float,
+        default=0,
+        help='The mean number of signal events injected into the trials.')
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=1,
+        help='The seed of the random number generator.')
+    parser.add_argument(
+        '--data-dir',
+        default=None,
+        help='The directory for the synthetic data files. They are reused '
+             'in later runs. If not given, a temporary directory is used.')
+    args = parser.parse_args(argv)
+
+    metadata = create_metadata(args)
+
+    if args.data_dir is None:
+        with tempfile.TemporaryDirectory() as data_path:
+            results = run_benchmarks(args, data_path)
+    else:
+        results = run_benchmarks(args, args.data_dir)
+
+    with open(args.output, 'w') as fp:
+        json.dump(dict(metadata=metadata, results=results), fp, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as fp:
+            baseline = json.load(fp)
+        print(f'Comparison with baseline {args.baseline} '
+              f'(commit {baseline["metadata"]["git_commit"]}):')
+        for line in compare_results(baseline['results'], results):
+            print(line)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,7 +19,7 @@ from skyllh.core.storage import (
 )
 
 
-def load_effective_area_array(pathfilenames):
+def load_effective_area_array(pathfilenames, cache=None):
     """Loads the (nbins_decnu, nbins_log10enu)-shaped 2D effective
     area array from the given data file.
 
@@ -27,6 +27,8 @@ def load_effective_area_array(pathfilenames):
     ----------
     pathfilename : str | list of str
         The file name of the data file.
+    cache : instance of DiskCache | None
+        The optional on-disk cache for the parsed content of the data file.
 
     Returns
     -------
@@ -42,7 +44,7 @@ def load_effective_area_array(pathfilenames):
     log10_enu_binedges_upper : (nbins_log10enu,)-shaped ndarray
         The ndarray holding the upper bin edges of the log10(E_nu/GeV) axis.
     """
-    loader = create_FileLoader(pathfilenames=pathfilenames)
+    loader = create_FileLoader(pathfilenames=pathfilenames, cache=cache)
     data = loader.load_data()
     renaming_dict = {
         'log10(E_nu/GeV)_min': 'log10_enu_min',
@@ -107,7 +109,7 @@ class PDAeff(object):
     """
     def __init__(
             self, pathfilenames, src_dec=None,
-            min_log10enu=None, max_log10enu=None,
+            min_log10enu=None, max_log10enu=None, cache=None,
             **kwargs):
         """Creates an effective area instance by loading the effective area
         data from the given file.
@@ -131,6 +133,8 @@ class PDAeff(object):
             calculating the detection probability.
             If None, the highest available neutrino energy bin edge of the
             effective area is used.
+        cache : instance of DiskCache | None
+            The optional on-disk cache for the parsed content of the data file.
         """
         super().__init__(**kwargs)
 
@@ -140,7 +144,7 @@ class PDAeff(object):
             self._decnu_binedges_upper,
             self._log10_enu_binedges_lower,
             self._log10_enu_binedges_upper
-        ) = load_effective_area_array(pathfilenames)
+        ) = load_effective_area_array(pathfilenames, cache=cache)
 
         # Note: self._aeff_decnu_log10enu is numpy 2D ndarray of shape
         # (nbins_decnu, nbins_log10enu).
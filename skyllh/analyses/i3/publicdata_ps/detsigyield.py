@@ -14,6 +14,11 @@ from skyllh.core import (
 from skyllh.core.binning import (
     BinningDefinition,
 )
+from skyllh.core.cache import (
+    create_DiskCache_from_config,
+    get_model_fingerprint,
+    make_cache_key,
+)
 from skyllh.core.flux_model import (
     FactorizedFluxModel,
 )
@@ -163,7 +168,9 @@ class PDSingleParamFluxPointLikeSourceI3DetSigYieldBuilder(
             sin_true_dec_binedges_upper,
             log_true_e_binedges_lower,
             log_true_e_binedges_upper
-        ) = load_effective_area_array(aeff_fnames)
+        ) = load_effective_area_array(
+            aeff_fnames,
+            cache=dataset.get_text_file_cache())
 
         # Calculate the detector signal yield in sin_dec vs gamma.
         def _create_hist(
@@ -212,36 +219,59 @@ class PDSingleParamFluxPointLikeSourceI3DetSigYieldBuilder(
         param_grid = self.param_grid.copy()
         param_grid.add_extra_lower_and_upper_bin()
 
-        # Construct the arguments for the hist function to be used in the
-        # multiproc.parallelize function.
-        args_list = [
-            (
+        def _create_log_spl():
+            """Creates the 2D spline of the logarithmic detector signal yield
+            in sin(dec) and the parameter.
+            """
+            # Construct the arguments for the hist function to be used in the
+            # multiproc.parallelize function.
+            args_list = [
                 (
-                    energy_bin_edges_lower,
-                    energy_bin_edges_upper,
-                    aeff_arr,
-                    shg.fluxmodel.copy({param_grid.name: param_val}),
-                    to_internal_flux_unit_factor,
-                ),
-                {}
-            )
-            for param_val in param_grid.grid
-        ]
-        h = np.vstack(
-            multiproc.parallelize(
-                _create_hist, args_list, self.ncpu, ppbar=ppbar)).T
-        h *= livetime_days*to_internal_time_unit_factor
+                    (
+                        energy_bin_edges_lower,
+                        energy_bin_edges_upper,
+                        aeff_arr,
+                        shg.fluxmodel.copy({param_grid.name: param_val}),
+                        to_internal_flux_unit_factor,
+                    ),
+                    {}
+                )
+                for param_val in param_grid.grid
+            ]
+            h = np.vstack(
+                multiproc.parallelize(
+                    _create_hist, args_list, self.ncpu, ppbar=ppbar)).T
+            h *= livetime_days*to_internal_time_unit_factor
 
-        # Create a 2d spline in log of the detector signal yield.
-        sin_dec_bincenters = 0.5*(
-            sin_true_dec_binedges_lower + sin_true_dec_binedges_upper)
-        log_spl_sinDec_param = scipy.interpolate.RectBivariateSpline(
-            sin_dec_bincenters,
-            param_grid.grid,
-            np.log(h),
-            kx=self.spline_order_sinDec,
-            ky=self.spline_order_param,
-            s=0)
+            # Create a 2d spline in log of the detector signal yield.
+            sin_dec_bincenters = 0.5*(
+                sin_true_dec_binedges_lower + sin_true_dec_binedges_upper)
+            return scipy.interpolate.RectBivariateSpline(
+                sin_dec_bincenters,
+                param_grid.grid,
+                np.log(h),
+                kx=self.spline_order_sinDec,
+                ky=self.spline_order_param,
+                s=0)
+
+        cache = create_DiskCache_from_config(self._cfg, 'detsigyields')
+        if cache is None:
+            log_spl_sinDec_param = _create_log_spl()
+        else:
+            key = make_cache_key(
+                classname(self),
+                [
+                    cache.get_file_checksum(pathfilename)
+                    for pathfilename in aeff_fnames
+                ],
+                get_model_fingerprint(shg.fluxmodel),
+                to_internal_flux_unit_factor,
+                livetime_days*to_internal_time_unit_factor,
+                param_grid.name,
+                param_grid.grid,
+                self.spline_order_sinDec,
+                self.spline_order_param)
+            log_spl_sinDec_param = cache.get_object(key, _create_log_spl)
 
         # Construct the detector signal yield instance with the created spline.
         sin_dec_binedges = np.concatenate(
@@ -7,6 +7,7 @@ pdfs, which are generated by running `scripts/mceq_atm_bkg.py` script.
 """
 
 import argparse
+import functools
 import logging
 import numpy as np
 import pickle
@@ -24,7 +25,7 @@ from skyllh.analyses.i3.publicdata_ps.signal_generator import (
     PDDatasetSignalGenerator,
 )
 from skyllh.analyses.i3.publicdata_ps.signalpdf import (
-    PDSignalEnergyPDFSet,
+    PDSignalEnergyPDFSetRegistry,
 )
 from skyllh.analyses.i3.publicdata_ps.utils import (
     create_energy_cut_spline,
@@ -32,6 +33,9 @@ from skyllh.analyses.i3.publicdata_ps.utils import (
 from skyllh.core.analysis import (
     SingleSourceMultiDatasetLLHRatioAnalysis as Analysis,
 )
+from skyllh.core.background_generator import (
+    DatasetBackgroundGenerator,
+)
 from skyllh.core.config import (
     Config,
 )
@@ -112,6 +116,9 @@ from skyllh.i3.background_generation import (
 from skyllh.i3.backgroundpdf import (
     DataBackgroundI3SpatialPDF,
 )
+from skyllh.i3.config import (
+    add_icecube_specific_analysis_required_data_fields,
+)
 
 
 def TXS_location():
@@ -121,6 +128,7 @@ def TXS_location():
 
 
 def create_analysis(
+    cfg,
     datasets,
     source,
     refplflux_Phi0=1,
@@ -140,6 +148,7 @@ def create_analysis(
     keep_data_fields=None,
     evt_sel_delta_angle_deg=10,
     efficiency_mode=None,
+    energy_pdf_set_registry=None,
     tl=None,
     ppbar=None,
     logger_name=None,
@@ -148,6 +157,8 @@ def create_analysis(
 
     Parameters
     ----------
+    cfg : instance of Config
+        The instance of Config holding the local configuration.
     datasets : list of Dataset instances
         The list of Dataset instances, which should be used in the
         analysis.
@@ -202,9 +213,19 @@ def create_analysis(
             The data will be loaded in a time efficient way. This will
             require more memory, because each data file gets loaded in
             memory at once.
+        ``'mmap'``:
+            The data will be memory mapped in copy-on-write mode. This
+            allows several processes to share the memory of the same
+            data files. Only modified memory pages get copied.
 
         The default value is ``'time'``. If set to ``None``, the default
         value will be used.
+    energy_pdf_set_registry : instance of PDSignalEnergyPDFSetRegistry | None
+        The optional registry of signal energy PDF sets. Passing the same
+        registry to several calls of this function, e.g. for the sources of a
+        catalog or the positions of a sky scan, shares the signal energy PDF
+        sets between sources within the same declination bins. If set to
+        ``None``, a new registry is created.
     tl : TimeLord instance | None
         The TimeLord instance to use to time the creation of the analysis.
     ppbar : ProgressBar instance | None
@@ -218,26 +239,41 @@ def create_analysis(
     ana : instance of SingleSourceMultiDatasetLLHRatioAnalysis
         The Analysis instance for this analysis.
     """
+    add_icecube_specific_analysis_required_data_fields(cfg)
+
+    # Remove run number from the dataset data field requirements.
+    cfg['datafields'].pop('run', None)
+
     if logger_name is None:
         logger_name = __name__
     logger = get_logger(logger_name)
 
     # Create the minimizer instance.
     if minimizer_impl == 'LBFGS':
-        minimizer = Minimizer(LBFGSMinimizerImpl())
+        minimizer = Minimizer(LBFGSMinimizerImpl(cfg=cfg))
     elif minimizer_impl == 'minuit':
-        minimizer = Minimizer(IMinuitMinimizerImpl(ftol=1e-8))
+        minimizer = Minimizer(IMinuitMinimizerImpl(cfg=cfg, ftol=1e-8))
     else:
         raise NameError(
             f"Minimizer implementation `{minimizer_impl}` is not supported "
             "Please use `LBFGS` or `minuit`.")
 
+    dtc_dict = None
+    dtc_except_fields = None
+    if compress_data is True:
+        dtc_dict = {np.dtype(np.float64): np.dtype(np.float32)}
+        dtc_except_fields = ['mcweight']
+
     # Define the flux model.
     fluxmodel = SteadyPointlikeFFM(
         Phi0=refplflux_Phi0,
         energy_profile=PowerLawEnergyFluxProfile(
             E0=refplflux_E0,
-            gamma=refplflux_gamma))
+            gamma=refplflux_gamma,
+            cfg=cfg,
+        ),
+        cfg=cfg,
+    )
 
     # Define the fit parameter ns.
     param_ns = Parameter(
@@ -260,6 +296,7 @@ def create_analysis(
     gamma_grid = param_gamma.as_linear_grid(delta=0.1)
     detsigyield_builder =\
         PDSingleParamFluxPointLikeSourceI3DetSigYieldBuilder(
+            cfg=cfg,
             param_grid=gamma_grid)
 
     # Create a source hypothesis group manager.
@@ -285,25 +322,24 @@ def create_analysis(
     # Define the test statistic.
     test_statistic = WilksTestStatistic()
 
-    # Define the data scrambler with its data scrambling method, which is used
-    # for background generation.
-    data_scrambler = DataScrambler(UniformRAScramblingMethod())
-
-    # Create background generation method.
-    bkg_gen_method = FixedScrambledExpDataI3BkgGenMethod(data_scrambler)
-
-    # Create the minimizer instance.
-    minimizer = Minimizer(LBFGSMinimizerImpl())
-
     # Create the Analysis instance.
     ana = Analysis(
+        cfg=cfg,
         shg_mgr=shg_mgr,
         pmm=pmm,
         test_statistic=test_statistic,
-        bkg_gen_method=bkg_gen_method,
         sig_generator_cls=MultiDatasetSignalGenerator,
     )
 
+    # Define the data scrambler with its data scrambling method, which is used
+    # for background generation.
+    data_scrambler = DataScrambler(UniformRAScramblingMethod())
+
+    # Create background generation method, which will be used for all datasets.
+    bkg_gen_method = FixedScrambledExpDataI3BkgGenMethod(
+        cfg=cfg,
+        data_scrambler=data_scrambler)
+
     # Define the event selection method for pure optimization purposes.
     # We will use the same method for all datasets.
     event_selection_method = SpatialBoxEventSelectionMethod(
@@ -320,13 +356,17 @@ def create_analysis(
             'The length of the spl_smooth and of the cut_sindec must be equal '
             f'to the length of datasets: {len(datasets)}.')
 
+    if energy_pdf_set_registry is None:
+        energy_pdf_set_registry = PDSignalEnergyPDFSetRegistry()
+
     # Add the data sets to the analysis.
     pbar = ProgressBar(len(datasets), parent=ppbar).start()
     for (ds_idx, ds) in enumerate(datasets):
         # Load the data of the data set.
         data = ds.load_and_prepare_data(
             keep_fields=keep_data_fields,
-            compress=compress_data,
+            dtc_dict=dtc_dict,
+            dtc_except_fields=dtc_except_fields,
             efficiency_mode=efficiency_mode,
             tl=tl)
 
@@ -334,37 +374,48 @@ def create_analysis(
 
         # Create the spatial PDF ratio instance for this dataset.
         spatial_sigpdf = RayleighPSFPointSourceSignalSpatialPDF(
+            cfg=cfg,
             dec_range=np.arcsin(sin_dec_binning.range))
         spatial_bkgpdf = DataBackgroundI3SpatialPDF(
+            cfg=cfg,
             data_exp=data.exp,
             sin_dec_binning=sin_dec_binning)
         spatial_pdfratio = SigOverBkgPDFRatio(
+            cfg=cfg,
             sig_pdf=spatial_sigpdf,
             bkg_pdf=spatial_bkgpdf)
 
         # Create the energy PDF ratio instance for this dataset.
-        energy_sigpdfset = PDSignalEnergyPDFSet(
+        # The signal energy PDF set depends on the source declination. Hence,
+        # the energy PDF ratio needs to retrieve a new set from the registry
+        # when the source changes.
+        energy_sigpdfset_factory = functools.partial(
+            energy_pdf_set_registry.get_pdf_set,
+            cfg=cfg,
             ds=ds,
-            src_dec=source.dec,
             fluxmodel=fluxmodel,
-            param_grid_set=gamma_grid,
-            ppbar=ppbar
-        )
+            param_grid_set=gamma_grid)
+        energy_sigpdfset = energy_sigpdfset_factory(
+            src_dec=source.dec,
+            ppbar=ppbar)
 
         bkg_pdf_pathfilename = ds.get_abs_pathfilename_list(
             ds.get_aux_data_definition('pdf_bkg_datafile'))[0]
         with open(bkg_pdf_pathfilename, 'rb') as f:
             bkg_pdf_data = pickle.load(f)
         energy_bkgpdf = PDMCBackgroundI3EnergyPDF(
+            cfg=cfg,
             pdf_log10emu_sindecmu=bkg_pdf_data['pdf'],
             log10emu_binning=bkg_pdf_data['log10emu_binning'],
             sindecmu_binning=bkg_pdf_data['sindecmu_binning'],
         )
 
         energy_pdfratio = PDSigSetOverBkgPDFRatio(
+            cfg=cfg,
             sig_pdf_set=energy_sigpdfset,
             bkg_pdf=energy_bkgpdf,
-            cap_ratio=cap_ratio)
+            cap_ratio=cap_ratio,
+            sig_pdf_set_factory=energy_sigpdfset_factory)
 
         pdfratio = spatial_pdfratio * energy_pdfratio
 
@@ -384,7 +435,15 @@ def create_analysis(
             data.exp,
             spl_smooth[ds_idx])
 
+        bkg_generator = DatasetBackgroundGenerator(
+            cfg=cfg,
+            dataset=ds,
+            data=data,
+            bkg_gen_method=bkg_gen_method,
+        )
+
         sig_generator = PDDatasetSignalGenerator(
+            cfg=cfg,
             shg_mgr=shg_mgr,
             ds=ds,
             ds_idx=ds_idx,
@@ -398,6 +457,7 @@ def create_analysis(
             pdfratio=pdfratio,
             tdm=tdm,
             event_selection_method=event_selection_method,
+            bkg_generator=bkg_generator,
             sig_generator=sig_generator)
 
         pbar.increment()
@@ -495,7 +555,8 @@ if __name__ == '__main__':
     for (sample, season) in sample_seasons:
         # Get the dataset from the correct dataset collection.
         dsc = data_samples[sample].create_dataset_collection(
-            args.data_base_path)
+            cfg=cfg,
+            base_path=args.data_base_path)
         datasets.append(dsc.get_dataset(season))
 
     # Define a random state service.
@@ -508,6 +569,7 @@ if __name__ == '__main__':
 
     with tl.task_timer('Creating analysis.'):
         ana = create_analysis(
+            cfg=cfg,
             datasets=datasets,
             source=source,
             cap_ratio=args.cap_ratio,
@@ -7,6 +7,9 @@ import numpy as np
 from skyllh.core.debugging import (
     get_logger,
 )
+from skyllh.core.interpolate import (
+    group_values_by_grid_point,
+)
 from skyllh.core.parameters import (
     ParameterModelMapper,
 )
@@ -14,6 +17,7 @@ from skyllh.core.pdfratio import (
     SigSetOverBkgPDFRatio,
 )
 from skyllh.core.py import (
+    classname,
     module_class_method_name,
 )
 
@@ -25,6 +29,7 @@ class PDSigSetOverBkgPDFRatio(
             sig_pdf_set,
             bkg_pdf,
             cap_ratio=False,
+            sig_pdf_set_factory=None,
             **kwargs):
         """Creates a PDFRatio instance for the public data.
         It takes a signal PDF set for different discrete gamma values.
@@ -40,6 +45,16 @@ class PDSigSetOverBkgPDFRatio(
         cap_ratio : bool
             Switch whether the S/B PDF ratio should get capped where no
             background is available. Default is False.
+        sig_pdf_set_factory : callable | None
+            The optional callable returning the PDSignalEnergyPDFSet instance
+            for a given source declination. Its call signature must be
+
+                __call__(src_dec)
+
+            If set, the signal PDF set is replaced by the one of the new source
+            declination, when the source of the analysis is changed via the
+            ``change_shg_mgr`` method. If set to ``None``, the signal PDF set
+            is kept.
         """
         self._logger = get_logger(module_class_method_name(self, '__init__'))
 
@@ -48,39 +63,13 @@ class PDSigSetOverBkgPDFRatio(
             bkg_pdf=bkg_pdf,
             **kwargs)
 
-        # Construct the instance for the fit parameter interpolation method.
-        self._interpolmethod = self.interpolmethod_cls(
-            func=self._get_ratio_values,
-            param_grid_set=sig_pdf_set.param_grid_set)
+        self.sig_pdf_set_factory = sig_pdf_set_factory
 
         self.cap_ratio = cap_ratio
         if self.cap_ratio:
             self._logger.info('The energy PDF ratio will be capped!')
 
-            # Calculate the ratio value for the phase space where no background
-            # is available. We will take the p_sig percentile of the signal
-            # like phase space.
-            ratio_perc = 99
-
-            # Get the log10 reco energy values where the background pdf has
-            # non-zero values.
-            n_logE = bkg_pdf.get_binning('log_energy').nbins
-            n_sinDec = bkg_pdf.get_binning('sin_dec').nbins
-            bd = bkg_pdf._hist_logE_sinDec > 0
-            log10_e_bc = bkg_pdf.get_binning('log_energy').bincenters
-            self.ratio_fill_value_dict = dict()
-            for sig_pdf_key in sig_pdf_set.pdf_keys:
-                sigpdf = sig_pdf_set[sig_pdf_key]
-                sigvals = sigpdf.get_pd_by_log10_reco_e(log10_e_bc)
-                sigvals = np.broadcast_to(sigvals, (n_sinDec, n_logE)).T
-                r = sigvals[bd] / bkg_pdf._hist_logE_sinDec[bd]
-                # Remove possible inf values.
-                r = r[np.invert(np.isinf(r))]
-                val = np.percentile(r[r > 1.], ratio_perc)
-                self.ratio_fill_value_dict[sig_pdf_key] = val
-                self._logger.info(
-                    f'The cap value for the energy PDF ratio key {sig_pdf_key} '
-                    f'is {val}.')
+        self._initialize_for_sig_pdf_set()
 
         # Create cache variables for the last ratio value and gradients in
         # order to avoid the recalculation of the ratio value when the
@@ -91,6 +80,22 @@ class PDSigSetOverBkgPDFRatio(
         self._cache_ratio = None
         self._cache_grads = None
 
+    @property
+    def sig_pdf_set_factory(self):
+        """The callable returning the PDSignalEnergyPDFSet instance for a given
+        source declination. Can be ``None``.
+        """
+        return self._sig_pdf_set_factory
+
+    @sig_pdf_set_factory.setter
+    def sig_pdf_set_factory(self, factory):
+        if (factory is not None) and (not callable(factory)):
+            raise TypeError(
+                'The sig_pdf_set_factory property must be None, or a callable '
+                'object! '
+                f'Its current type is {classname(factory)}!')
+        self._sig_pdf_set_factory = factory
+
     @property
     def cap_ratio(self):
         """Boolean switch whether to cap the ratio where no background
@@ -131,6 +136,87 @@ class PDSigSetOverBkgPDFRatio(
 
         return False
 
+    def _initialize_for_sig_pdf_set(self):
+        """Creates the parameter interpolation method instance and, if the
+        ratio should be capped, calculates the cap values for the current
+        signal PDF set.
+        """
+        sig_pdf_set = self._sig_pdf_set
+        bkg_pdf = self._bkg_pdf
+
+        # Construct the instance for the fit parameter interpolation method.
+        self._interpolmethod = self.interpolmethod_cls(
+            func=self._get_ratio_values,
+            param_grid_set=sig_pdf_set.param_grid_set)
+
+        if self._cap_ratio:
+            # Calculate the ratio value for the phase space where no background
+            # is available. We will take the p_sig percentile of the signal
+            # like phase space.
+            ratio_perc = 99
+
+            # Get the log10 reco energy values where the background pdf has
+            # non-zero values.
+            n_logE = bkg_pdf.get_binning('log_energy').nbins
+            n_sinDec = bkg_pdf.get_binning('sin_dec').nbins
+            bd = bkg_pdf._hist_logE_sinDec > 0
+            log10_e_bc = bkg_pdf.get_binning('log_energy').bincenters
+            self.ratio_fill_value_dict = dict()
+            for sig_pdf_key in sig_pdf_set.pdf_keys:
+                sigpdf = sig_pdf_set[sig_pdf_key]
+                sigvals = sigpdf.get_pd_by_log10_reco_e(log10_e_bc)
+                sigvals = np.broadcast_to(sigvals, (n_sinDec, n_logE)).T
+                r = sigvals[bd] / bkg_pdf._hist_logE_sinDec[bd]
+                # Remove possible inf values.
+                r = r[np.invert(np.isinf(r))]
+                val = np.percentile(r[r > 1.], ratio_perc)
+                self.ratio_fill_value_dict[sig_pdf_key] = val
+                self._logger.info(
+                    f'The cap value for the energy PDF ratio key {sig_pdf_key} '
+                    f'is {val}.')
+
+    def change_shg_mgr(
+            self,
+            shg_mgr):
+        """Replaces the signal PDF set by the one for the declination of the
+        new source, if a signal PDF set factory has been set. The signal PDF
+        set is valid for a single source only.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The new instance of SourceHypoGroupManager.
+
+        Raises
+        ------
+        ValueError
+            If a signal PDF set factory is set and the
+            SourceHypoGroupManager instance defines more than one source.
+        """
+        if self._sig_pdf_set_factory is None:
+            return
+
+        if shg_mgr.n_sources != 1:
+            raise ValueError(
+                f'The {classname(self)} instance supports only a single '
+                'source, when the signal PDF set should be changed with the '
+                f'source! The SourceHypoGroupManager has {shg_mgr.n_sources} '
+                'sources!')
+
+        src_dec = shg_mgr.shg_list[0].source_list[0].dec
+        sig_pdf_set = self._sig_pdf_set_factory(src_dec=src_dec)
+        if sig_pdf_set is self._sig_pdf_set:
+            return
+
+        self.sig_pdf_set = sig_pdf_set
+        self._initialize_for_sig_pdf_set()
+
+        # Invalidate the cached ratio and gradient values.
+        self._cache_tdm_trial_data_state_id = None
+        self._cache_fitparams_hash = None
+        self._cache_ratio = None
+        self._cache_grads = None
+
     def _get_hash_of_local_sig_fit_param_values(
             self,
             src_params_recarray):
@@ -168,46 +254,39 @@ class PDSigSetOverBkgPDFRatio(
         """Select the signal PDF for the given fit parameter grid point and
         evaluates the S/B ratio for all the trial data events and sources.
         """
-        n_sources = len(gridparams_recarray)
+        ratio = self._get_grid_table_values(
+            tdm=tdm,
+            gridparams_recarray=gridparams_recarray)
+        if ratio is not None:
+            return ratio
 
-        ratio = np.empty((n_values,), dtype=np.double)
+        # Group the sources by their grid point, so that each signal PDF is
+        # evaluated only once for all the sources sharing it.
+        groups = group_values_by_grid_point(
+            tdm=tdm,
+            gridparams_recarray=gridparams_recarray)
 
-        same_pdf_for_all_sources = True
-        if len(gridparams_recarray) > 1:
-            for pname in gridparams_recarray.dtype.fields.keys():
-                if not np.all(np.isclose(np.diff(gridparams_recarray[pname]), 0)):
-                    same_pdf_for_all_sources = False
-                    break
-        if same_pdf_for_all_sources:
+        if len(groups) == 1:
             # Special case where the grid parameter values are the same for all
             # sources for all grid parameters
-            gridparams = dict(
-                zip(gridparams_recarray.dtype.fields.keys(),
-                    gridparams_recarray[0])
-            )
+            (gridparams, _) = groups[0]
             sig_pdf_key = self.sig_pdf_set.make_key(gridparams)
             sig_pdf = self.sig_pdf_set.get_pdf(sig_pdf_key)
             (ratio, sig_grads) = sig_pdf.get_pd(
                 tdm=tdm,
                 params_recarray=None)
         else:
-            # General case, we need to loop over the sources.
-            for (sidx, interpol_param_values) in enumerate(gridparams_recarray):
-                m_src = np.zeros((n_sources), dtype=np.bool_)
-                m_src[sidx] = True
-                m_values = tdm.get_values_mask_for_source_mask(m_src)
-
-                gridparams = dict(
-                    zip(gridparams_recarray.dtype.fields.keys(),
-                        interpol_param_values)
-                )
+            # General case, we need to loop over the groups of sources.
+            ratio = np.empty((n_values,), dtype=np.double)
+
+            evt_idxs = tdm.src_evt_idxs[1]
+            log10_reco_e = np.take(tdm['log_energy'], evt_idxs)
+
+            for (gridparams, m_values) in groups:
                 sig_pdf_key = self.sig_pdf_set.make_key(gridparams)
                 sig_pdf = self.sig_pdf_set.get_pdf(sig_pdf_key)
-                (sig_pd, sig_grads) = sig_pdf.get_pd(
-                    tdm=tdm,
-                    params_recarray=None)
-
-                ratio[m_values] = sig_pd[m_values]
+                ratio[m_values] = sig_pdf.get_pd_by_log10_reco_e(
+                    log10_reco_e=log10_reco_e[m_values])
 
         (bkg_pd, bkg_grads) = self.bkg_pdf.get_pd(tdm=tdm)
         (bkg_pd,) = tdm.broadcast_selected_events_arrays_to_values_arrays(
@@ -228,7 +307,10 @@ class PDSigSetOverBkgPDFRatio(
             out=ratio)
 
         if self._cap_ratio:
-            ratio[m_zero_bkg] = self.ratio_fill_value_dict[sig_pdf_key]
+            for (gridparams, m_values) in groups:
+                sig_pdf_key = self.sig_pdf_set.make_key(gridparams)
+                m = m_zero_bkg if m_values is None else m_zero_bkg & m_values
+                ratio[m] = self.ratio_fill_value_dict[sig_pdf_key]
         else:
             np.divide(
                 ratio,
@@ -244,6 +326,34 @@ class PDSigSetOverBkgPDFRatio(
 
         return ratio
 
+    def initialize_for_new_trial(
+            self,
+            tdm,
+            tl=None,
+            **kwargs):
+        """Initializes the PDF ratio instance for a new trial. If the
+        ``precompute_grid_table`` property is set to ``True``, the S/B ratio
+        values of all gamma grid points are calculated once for all trial
+        events.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The instance of TrialDataManager holding the trial data.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord for measuring timing information.
+        """
+        super().initialize_for_new_trial(
+            tdm=tdm,
+            tl=tl,
+            **kwargs)
+
+        self._create_grid_table(
+            tdm=tdm,
+            func=self._get_ratio_values,
+            eventdata=None,
+            tl=tl)
+
     def _calculate_ratio_and_grads(
             self,
             tdm,
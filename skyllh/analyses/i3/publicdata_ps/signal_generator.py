@@ -89,7 +89,8 @@ class PDDatasetSignalGenerator(
 
         self.sm = PDSmearingMatrix(
             pathfilenames=ds.get_abs_pathfilename_list(
-                    ds.get_aux_data_definition('smearing_datafile')))
+                    ds.get_aux_data_definition('smearing_datafile')),
+            cache=ds.get_text_file_cache())
 
         self._create_source_dependent_data_structures()
 
@@ -132,7 +133,8 @@ class PDDatasetSignalGenerator(
                     self.ds.get_aux_data_definition('eff_area_datafile')),
                 src_dec=src.dec,
                 min_log10enu=min_log_true_e,
-                max_log10enu=max_log_true_e)
+                max_log10enu=max_log_true_e,
+                cache=self.ds.get_text_file_cache())
 
             # Build the spline for the inverse CDF of the source flux's true
             # energy probability distribution.
@@ -16,6 +16,11 @@ from skyllh.analyses.i3.publicdata_ps.smearing_matrix import (
 from skyllh.core.binning import (
     get_bincenters_from_binedges,
 )
+from skyllh.core.cache import (
+    create_DiskCache_from_config,
+    get_model_fingerprint,
+    make_cache_key,
+)
 from skyllh.core.debugging import (
     get_logger,
 )
@@ -265,9 +270,11 @@ class PDSignalEnergyPDFSet(
             **kwargs)
 
         # Load the smearing matrix.
+        sm_pathfilenames = ds.get_abs_pathfilename_list(
+            ds.get_aux_data_definition('smearing_datafile'))
         sm = PDSmearingMatrix(
-            pathfilenames=ds.get_abs_pathfilename_list(
-                ds.get_aux_data_definition('smearing_datafile')))
+            pathfilenames=sm_pathfilenames,
+            cache=ds.get_text_file_cache())
 
         # Select the slice of the smearing matrix corresponding to the
         # source declination band.
@@ -303,9 +310,11 @@ class PDSignalEnergyPDFSet(
         )
 
         # Load the effective area.
+        aeff_pathfilenames = ds.get_abs_pathfilename_list(
+            ds.get_aux_data_definition('eff_area_datafile'))
         aeff = PDAeff(
-            pathfilenames=ds.get_abs_pathfilename_list(
-                ds.get_aux_data_definition('eff_area_datafile')))
+            pathfilenames=aeff_pathfilenames,
+            cache=ds.get_text_file_cache())
 
         # Calculate the probability to detect a neutrino of energy
         # E_nu given a neutrino declination: p(E_nu|dec).
@@ -330,7 +339,7 @@ class PDSignalEnergyPDFSet(
 
         # Create the energy pdf for different gamma values.
         def create_energy_pdf(sm_pdf, fluxmodel, gridparams):
-            """Creates an energy pdf for a specific gamma value.
+            """Creates the spline of the energy pdf for a specific gamma value.
             """
             # Create a copy of the FluxModel with the given flux parameters.
             # The copy is needed to not interfer with other CPU processes.
@@ -403,24 +412,181 @@ class PDSignalEnergyPDFSet(
 
             spline = FctSpline1D(sum_pdf, xvals_binedges, norm=True)
 
+            return spline
+
+        def create_energy_pdf_splines():
+            """Creates the energy pdf splines for all grid points.
+            """
+            args_list = [
+                ((sm_pdf, fluxmodel, gridparams), {})
+                for gridparams in self.gridparams_list
+            ]
+
+            return parallelize(
+                create_energy_pdf,
+                args_list,
+                ncpu=self.ncpu,
+                ppbar=ppbar)
+
+        cache = create_DiskCache_from_config(self._cfg, 'pdf_sets')
+        if cache is None:
+            spline_list = create_energy_pdf_splines()
+        else:
+            # The energy PDFs depend on the source declination only through
+            # the declination bins of the smearing matrix and the effective
+            # area. Hence, sources within the same bins share a cache entry.
+            key = make_cache_key(
+                classname(self),
+                ds.name,
+                ds.version,
+                ds.verqualifiers,
+                [
+                    cache.get_file_checksum(pathfilename)
+                    for pathfilename in sm_pathfilenames + aeff_pathfilenames
+                ],
+                int(true_dec_idx),
+                int(np.digitize(src_dec, aeff.decnu_binedges) - 1),
+                get_model_fingerprint(fluxmodel),
+                self.gridparams_list,
+                xvals_binedges,
+                self._cfg['units'])
+            spline_list = cache.get_object(key, create_energy_pdf_splines)
+
+        # Save all the energy PDF objects in the PDFSet PDF registry with
+        # the hash of the individual parameters as key.
+        for (gridparams, spline) in zip(self.gridparams_list, spline_list):
             pdf = PDSignalEnergyPDF(spline, cfg=self._cfg)
+            self.add_pdf(pdf, gridparams)
 
-            return pdf
 
-        args_list = [
-            ((sm_pdf, fluxmodel, gridparams), {})
-            for gridparams in self.gridparams_list
-        ]
+class PDSignalEnergyPDFSetRegistry(
+        object,
+):
+    """This class provides a registry of PDSignalEnergyPDFSet instances. The
+    signal energy PDFs depend on the source declination only through the
+    declination bins of the smearing matrix and of the effective area. Hence,
+    sources within the same declination bins, e.g. of a source catalog or of a
+    sky scan, can share the same PDSignalEnergyPDFSet instance, if the dataset,
+    the flux model, and the parameter grids are the same as well.
+    """
+    def __init__(
+            self,
+            **kwargs,
+    ):
+        """Creates a new empty registry of PDSignalEnergyPDFSet instances.
+        """
+        super().__init__(**kwargs)
 
-        pdf_list = parallelize(
-            create_energy_pdf,
-            args_list,
-            ncpu=self.ncpu,
-            ppbar=ppbar)
+        self._pdf_set_dict = dict()
+        self._dec_binedges_dict = dict()
 
-        del sm_pdf
+    @property
+    def n_pdf_sets(self):
+        """(read-only) The number of PDSignalEnergyPDFSet instances in this
+        registry.
+        """
+        return len(self._pdf_set_dict)
 
-        # Save all the energy PDF objects in the PDFSet PDF registry with
-        # the hash of the individual parameters as key.
-        for (gridparams, pdf) in zip(self.gridparams_list, pdf_list):
-            self.add_pdf(pdf, gridparams)
+    def clear(self):
+        """Removes all PDSignalEnergyPDFSet instances from this registry.
+        """
+        self._pdf_set_dict = dict()
+        self._dec_binedges_dict = dict()
+
+    def _get_dec_binedges(
+            self,
+            ds,
+            files_key,
+    ):
+        """Retrieves the declination bin edges of the smearing matrix and the
+        effective area of the given dataset. They are loaded only once per
+        dataset.
+        """
+        if files_key not in self._dec_binedges_dict:
+            (sm_pathfilenames, aeff_pathfilenames) = files_key
+            sm = PDSmearingMatrix(
+                pathfilenames=list(sm_pathfilenames),
+                cache=ds.get_text_file_cache())
+            aeff = PDAeff(
+                pathfilenames=list(aeff_pathfilenames),
+                cache=ds.get_text_file_cache())
+            self._dec_binedges_dict[files_key] = (
+                np.copy(sm.true_dec_bin_edges),
+                np.copy(aeff.decnu_binedges))
+
+        return self._dec_binedges_dict[files_key]
+
+    def get_pdf_set(
+            self,
+            cfg,
+            ds,
+            src_dec,
+            fluxmodel,
+            param_grid_set,
+            ncpu=None,
+            ppbar=None,
+    ):
+        """Retrieves the PDSignalEnergyPDFSet instance for the given dataset,
+        source declination, flux model, and parameter grids. If no such instance
+        exists in the registry yet, it is created.
+
+        Parameters
+        ----------
+        cfg : instance of Config
+            The instance of Config holding the local configuration.
+        ds : instance of Dataset
+            The instance of Dataset that defines the dataset of the public data.
+        src_dec : float
+            The declination of the source in radians.
+        fluxmodel : instance of FactorizedFluxModel
+            The instance of FactorizedFluxModel that defines the source's flux
+            model.
+        param_grid_set : instance of ParameterGrid | instance of ParameterGridSet
+            The parameter grid set defining the grids of the parameters this
+            energy PDF set depends on.
+        ncpu : int | None
+            The number of CPUs to utilize for the creation of a new instance.
+        ppbar : instance of ProgressBar | None
+            The instance of ProgressBar for the optional parent progress bar.
+
+        Returns
+        -------
+        pdf_set : instance of PDSignalEnergyPDFSet
+            The instance of PDSignalEnergyPDFSet.
+        """
+        files_key = (
+            tuple(ds.get_abs_pathfilename_list(
+                ds.get_aux_data_definition('smearing_datafile'))),
+            tuple(ds.get_abs_pathfilename_list(
+                ds.get_aux_data_definition('eff_area_datafile'))),
+        )
+        (sm_dec_binedges, aeff_dec_binedges) = self._get_dec_binedges(
+            ds, files_key)
+
+        param_grids = param_grid_set
+        if isinstance(param_grids, ParameterGrid):
+            param_grids = [param_grids]
+
+        key = make_cache_key(
+            files_key,
+            ds.get_binning_definition('log_energy').binedges,
+            int(np.digitize(src_dec, sm_dec_binedges) - 1),
+            int(np.digitize(src_dec, aeff_dec_binedges) - 1),
+            get_model_fingerprint(fluxmodel),
+            [
+                (param_grid.name, param_grid.grid)
+                for param_grid in param_grids
+            ],
+            cfg['units'])
+
+        if key not in self._pdf_set_dict:
+            self._pdf_set_dict[key] = PDSignalEnergyPDFSet(
+                cfg=cfg,
+                ds=ds,
+                src_dec=src_dec,
+                fluxmodel=fluxmodel,
+                param_grid_set=param_grid_set,
+                ncpu=ncpu,
+                ppbar=ppbar)
+
+        return self._pdf_set_dict[key]
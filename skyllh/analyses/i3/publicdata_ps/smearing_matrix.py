@@ -6,13 +6,16 @@ from skyllh.core.storage import create_FileLoader
 
 
 def load_smearing_histogram(
-        pathfilenames):
+        pathfilenames,
+        cache=None):
     """Loads the 5D smearing histogram from the given data file.
 
     Parameters
     ----------
     pathfilenames : str | list of str
         The file name of the data file.
+    cache : instance of DiskCache | None
+        The optional on-disk cache for the parsed content of the data file.
 
     Returns
     -------
@@ -51,7 +54,7 @@ def load_smearing_histogram(
         The shape is (n_true_e, n_true_dec, n_reco_e, n_psi, n_ang_err).
     """
     # Load the smearing data from the public dataset.
-    loader = create_FileLoader(pathfilenames=pathfilenames)
+    loader = create_FileLoader(pathfilenames=pathfilenames, cache=cache)
     data = loader.load_data()
     # Rename the data fields.
     renaming_dict = {
@@ -174,6 +177,357 @@ def load_smearing_histogram(
     )
 
 
+def _create_cdf_table(
+        p):
+    """Creates a flattened table of cumulative distribution functions (CDF)
+    for the given rows of probability values. The CDF of row ``i`` is shifted by
+    ``i``, hence the complete table is monotonically increasing and a value for
+    each row can be sampled with a single call of ``np.searchsorted``.
+
+    Parameters
+    ----------
+    p : (n_rows, n_cols)-shaped numpy ndarray
+        The non-normalized probability values of each row.
+
+    Returns
+    -------
+    cdf : (n_rows*n_cols,)-shaped numpy ndarray
+        The flattened table of the shifted CDFs.
+    valid : (n_rows,)-shaped numpy ndarray of bool
+        The flag if a row has a non-zero total probability.
+    """
+    (n_rows, n_cols) = p.shape
+
+    cdf = np.cumsum(p, axis=1)
+    total = cdf[:, -1]
+    valid = total > 0
+
+    cdf[valid] /= total[valid, np.newaxis]
+    # Rows without any probability must not break the monotonicity.
+    cdf[~valid] = 1
+    cdf += np.arange(n_rows, dtype=np.float64)[:, np.newaxis]
+
+    return (cdf.ravel(), valid)
+
+
+def _sample_from_cdf_table(
+        rss,
+        cdf,
+        valid,
+        n_cols,
+        row_idxs):
+    """Samples a column index for each of the given rows from the given CDF
+    table created by the ``_create_cdf_table`` function.
+
+    Parameters
+    ----------
+    rss : instance of RandomStateService
+        The RandomStateService which should be used for drawing random
+        numbers from.
+    cdf : (n_rows*n_cols,)-shaped numpy ndarray
+        The flattened table of the shifted CDFs.
+    valid : (n_rows,)-shaped numpy ndarray of bool
+        The flag if a row has a non-zero total probability.
+    n_cols : int
+        The number of columns of the CDF table.
+    row_idxs : (n,)-shaped numpy ndarray of int
+        The row indices for which a column index should be sampled. Negative
+        row indices denote invalid rows.
+
+    Returns
+    -------
+    col_idxs : (n,)-shaped numpy ndarray of int
+        The sampled column indices. It is ``-1`` for invalid rows.
+    """
+    col_idxs = np.full((len(row_idxs),), -1, dtype=np.int64)
+
+    m = row_idxs >= 0
+    m[m] = valid[row_idxs[m]]
+    rows = row_idxs[m]
+
+    u = rss.random.uniform(size=len(rows))
+    col_idxs[m] = np.searchsorted(cdf, rows + u, side='right') - rows*n_cols
+
+    # Guard against rounding at the upper end of a CDF.
+    np.minimum(col_idxs, n_cols-1, out=col_idxs)
+
+    return col_idxs
+
+
+def _sample_uniform_in_bins(
+        rss,
+        lower_edges,
+        upper_edges,
+        idxs):
+    """Samples values uniformly within the given bins of the given flattened
+    bin edges. The value is NaN for negative bin indices.
+    """
+    values = np.full((len(idxs),), np.nan, dtype=np.double)
+
+    m = idxs >= 0
+    values[m] = rss.random.uniform(
+        lower_edges[idxs[m]],
+        upper_edges[idxs[m]])
+
+    return values
+
+
+class PDSmearingMatrixSampler(
+        object):
+    """This class provides a vectorized sampler of the conditional chain
+    log_e | true_e, psi | (true_e, log_e), and ang_err | (true_e, log_e, psi)
+    of a smearing matrix for a single true declination bin. The normalized
+    cumulative distribution functions of all bins are pre-calculated as
+    flattened tables, so a whole batch of events is sampled with a few
+    vectorized calls.
+    """
+    def __init__(
+            self,
+            sm,
+            dec_idx,
+            **kwargs):
+        """Creates a new sampler for the given declination bin of the given
+        smearing matrix.
+
+        Parameters
+        ----------
+        sm : instance of PDSmearingMatrix
+            The smearing matrix.
+        dec_idx : int
+            The index of the true declination bin.
+        """
+        super().__init__(**kwargs)
+
+        self._dec_idx = dec_idx
+
+        # The histogram has the axes (true_e, reco_e, psi, ang_err).
+        h = sm.histogram[:, dec_idx]
+        (n_true_e, n_reco_e, n_psi, n_ang_err) = h.shape
+        self._shape = h.shape
+
+        # Create the log_e CDFs for each true_e bin.
+        (self._log_e_cdf, self._log_e_valid) = _create_cdf_table(
+            np.sum(h, axis=(-2, -1)))
+        self._log_e_lower_edges = sm.reco_e_lower_edges[:, dec_idx].ravel()
+        self._log_e_upper_edges = sm.reco_e_upper_edges[:, dec_idx].ravel()
+
+        # Create the psi CDFs for each (true_e, reco_e) bin.
+        (self._psi_cdf, self._psi_valid) = _create_cdf_table(
+            np.sum(h, axis=-1).reshape((n_true_e*n_reco_e, n_psi)))
+        self._psi_lower_edges = sm.psi_lower_edges[:, dec_idx].ravel()
+        self._psi_upper_edges = sm.psi_upper_edges[:, dec_idx].ravel()
+
+        # Create the ang_err CDFs for each (true_e, reco_e, psi) bin.
+        # Some ang_err bins might not be defined, i.e. have zero bin widths.
+        lower_edges = sm.ang_err_lower_edges[:, dec_idx]
+        upper_edges = sm.ang_err_upper_edges[:, dec_idx]
+        ang_err_bin_valid = (upper_edges - lower_edges) > 0
+        h = h.reshape((n_true_e*n_reco_e*n_psi, n_ang_err))
+        (self._ang_err_cdf, self._ang_err_valid) = _create_cdf_table(
+            np.where(
+                ang_err_bin_valid.reshape(h.shape),
+                h,
+                0))
+        self._ang_err_valid &= np.sum(h, axis=-1) > 0
+        self._ang_err_lower_edges = lower_edges.ravel()
+        self._ang_err_upper_edges = upper_edges.ravel()
+        # The ang_err bin indices are counted over the valid bins only.
+        self._ang_err_valid_bin_idxs = (
+            np.cumsum(ang_err_bin_valid, axis=-1) - 1).ravel()
+
+    @property
+    def dec_idx(self):
+        """(read-only) The index of the true declination bin.
+        """
+        return self._dec_idx
+
+    def sample_log_e(
+            self,
+            rss,
+            log_true_e_idxs):
+        """Samples log energy values for the given true energy bins.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The RandomStateService which should be used for drawing random
+            numbers from.
+        log_true_e_idxs : 1d ndarray of int
+            The bin indices of the true energy bins.
+
+        Returns
+        -------
+        log_e_idx : 1d ndarray of int
+            The bin indices of the log_e pdf corresponding to the sampled
+            log_e values. It is ``-1`` where no pdf is available.
+        log_e : 1d ndarray of float
+            The sampled log_e values. It is NaN where no pdf is available.
+        """
+        n_reco_e = self._shape[1]
+
+        log_true_e_idxs = np.asarray(log_true_e_idxs, dtype=np.int64)
+
+        log_e_idx = _sample_from_cdf_table(
+            rss=rss,
+            cdf=self._log_e_cdf,
+            valid=self._log_e_valid,
+            n_cols=n_reco_e,
+            row_idxs=log_true_e_idxs)
+
+        log_e = _sample_uniform_in_bins(
+            rss=rss,
+            lower_edges=self._log_e_lower_edges,
+            upper_edges=self._log_e_upper_edges,
+            idxs=np.where(
+                log_e_idx >= 0, log_true_e_idxs*n_reco_e + log_e_idx, -1))
+
+        return (log_e_idx, log_e)
+
+    def sample_psi(
+            self,
+            rss,
+            log_true_e_idxs,
+            log_e_idxs):
+        """Samples psi values for the given true energy bins, and log_e bins.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The RandomStateService which should be used for drawing random
+            numbers from.
+        log_true_e_idxs : 1d ndarray of int
+            The bin indices of the true energy bins.
+        log_e_idxs : 1d ndarray of int
+            The bin indices of the log_e bins.
+
+        Returns
+        -------
+        psi_idx : 1d ndarray of int
+            The bin indices of the psi pdf corresponding to the sampled psi
+            values. It is ``-1`` where no pdf is available.
+        psi : 1d ndarray of float
+            The sampled psi values in radians. It is NaN where no pdf is
+            available.
+        """
+        (n_true_e, n_reco_e, n_psi, n_ang_err) = self._shape
+
+        log_true_e_idxs = np.asarray(log_true_e_idxs, dtype=np.int64)
+        log_e_idxs = np.asarray(log_e_idxs, dtype=np.int64)
+
+        rows = np.where(
+            (log_true_e_idxs >= 0) & (log_e_idxs >= 0),
+            log_true_e_idxs*n_reco_e + log_e_idxs,
+            -1)
+
+        psi_idx = _sample_from_cdf_table(
+            rss=rss,
+            cdf=self._psi_cdf,
+            valid=self._psi_valid,
+            n_cols=n_psi,
+            row_idxs=rows)
+
+        psi = _sample_uniform_in_bins(
+            rss=rss,
+            lower_edges=self._psi_lower_edges,
+            upper_edges=self._psi_upper_edges,
+            idxs=np.where(psi_idx >= 0, rows*n_psi + psi_idx, -1))
+
+        return (psi_idx, psi)
+
+    def sample_ang_err(
+            self,
+            rss,
+            log_true_e_idxs,
+            log_e_idxs,
+            psi_idxs):
+        """Samples ang_err values for the given true energy bins, log_e bins,
+        and psi bins.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The RandomStateService which should be used for drawing random
+            numbers from.
+        log_true_e_idxs : 1d ndarray of int
+            The bin indices of the true energy bins.
+        log_e_idxs : 1d ndarray of int
+            The bin indices of the log_e bins.
+        psi_idxs : 1d ndarray of int
+            The bin indices of the psi bins.
+
+        Returns
+        -------
+        ang_err_idx : 1d ndarray of int
+            The bin indices of the angular error pdf corresponding to the
+            sampled angular error values. The bin indices count only the
+            defined angular error bins. It is ``-1`` where no pdf is available.
+        ang_err : 1d ndarray of float
+            The sampled angular error values in radians. It is NaN where no pdf
+            is available.
+        """
+        (n_true_e, n_reco_e, n_psi, n_ang_err) = self._shape
+
+        log_true_e_idxs = np.asarray(log_true_e_idxs, dtype=np.int64)
+        log_e_idxs = np.asarray(log_e_idxs, dtype=np.int64)
+        psi_idxs = np.asarray(psi_idxs, dtype=np.int64)
+
+        rows = np.where(
+            (log_true_e_idxs >= 0) & (log_e_idxs >= 0) & (psi_idxs >= 0),
+            (log_true_e_idxs*n_reco_e + log_e_idxs)*n_psi + psi_idxs,
+            -1)
+
+        idx = _sample_from_cdf_table(
+            rss=rss,
+            cdf=self._ang_err_cdf,
+            valid=self._ang_err_valid,
+            n_cols=n_ang_err,
+            row_idxs=rows)
+        flat_idxs = np.where(idx >= 0, rows*n_ang_err + idx, -1)
+
+        ang_err = _sample_uniform_in_bins(
+            rss=rss,
+            lower_edges=self._ang_err_lower_edges,
+            upper_edges=self._ang_err_upper_edges,
+            idxs=flat_idxs)
+
+        ang_err_idx = np.full_like(idx, -1)
+        m = flat_idxs >= 0
+        ang_err_idx[m] = self._ang_err_valid_bin_idxs[flat_idxs[m]]
+
+        return (ang_err_idx, ang_err)
+
+    def sample(
+            self,
+            rss,
+            log_true_e_idxs):
+        """Samples the log_e, psi, and ang_err values for the given true
+        energy bins.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The RandomStateService which should be used for drawing random
+            numbers from.
+        log_true_e_idxs : 1d ndarray of int
+            The bin indices of the true energy bins.
+
+        Returns
+        -------
+        log_e : 1d ndarray of float
+            The sampled log_e values.
+        psi : 1d ndarray of float
+            The sampled psi values in radians.
+        ang_err : 1d ndarray of float
+            The sampled angular error values in radians.
+        """
+        (log_e_idxs, log_e) = self.sample_log_e(rss, log_true_e_idxs)
+        (psi_idxs, psi) = self.sample_psi(rss, log_true_e_idxs, log_e_idxs)
+        (_, ang_err) = self.sample_ang_err(
+            rss, log_true_e_idxs, log_e_idxs, psi_idxs)
+
+        return (log_e, psi, ang_err)
+
+
 class PDSmearingMatrix(
         object):
     """This class is a helper class for dealing with the smearing matrix
@@ -182,9 +536,17 @@ class PDSmearingMatrix(
     def __init__(
             self,
             pathfilenames,
+            cache=None,
             **kwargs):
         """Creates a smearing matrix instance by loading the smearing matrix
         from the given file.
+
+        Parameters
+        ----------
+        pathfilenames : str | list of str
+            The file name of the smearing matrix data file.
+        cache : instance of DiskCache | None
+            The optional on-disk cache for the parsed content of the data file.
         """
         super().__init__(**kwargs)
 
@@ -198,7 +560,7 @@ class PDSmearingMatrix(
             self.psi_upper_edges,
             self.ang_err_lower_edges,
             self.ang_err_upper_edges
-        ) = load_smearing_histogram(pathfilenames)
+        ) = load_smearing_histogram(pathfilenames, cache=cache)
 
         self.n_psi_bins = self.histogram.shape[3]
         self.n_ang_err_bins = self.histogram.shape[4]
@@ -224,6 +586,9 @@ class PDSmearingMatrix(
         self.ang_err_binedges[..., :-1] = self.ang_err_lower_edges
         self.ang_err_binedges[..., -1] = self.ang_err_upper_edges[..., -1]
 
+        # The samplers are created on demand for each declination bin.
+        self._samplers = dict()
+
     @property
     def n_log10_true_e_bins(self):
         """(read-only) The number of log10 true energy bins.
@@ -714,6 +1079,31 @@ class PDSmearingMatrix(
 
         return (pdf, lower_bin_edges, upper_bin_edges, bin_widths)
 
+    def get_sampler(
+            self,
+            dec_idx):
+        """Retrieves the vectorized sampler for the given declination bin. The
+        sampler is created once and then reused.
+
+        Parameters
+        ----------
+        dec_idx : int
+            The index of the source declination bin.
+
+        Returns
+        -------
+        sampler : instance of PDSmearingMatrixSampler
+            The sampler for the given declination bin.
+        """
+        dec_idx = int(dec_idx)
+
+        sampler = self._samplers.get(dec_idx, None)
+        if sampler is None:
+            sampler = PDSmearingMatrixSampler(self, dec_idx)
+            self._samplers[dec_idx] = sampler
+
+        return sampler
+
     def sample_log_e(
             self,
             rss,
@@ -740,41 +1130,9 @@ class PDSmearingMatrix(
         log_e : 1d ndarray of float
             The sampled log_e values.
         """
-        n_evt = len(log_true_e_idxs)
-        log_e_idx = np.empty((n_evt,), dtype=np.int64)
-        log_e = np.empty((n_evt,), dtype=np.double)
-
-        unique_log_true_e_idxs = np.unique(log_true_e_idxs)
-        for b_log_true_e_idx in unique_log_true_e_idxs:
-            m = log_true_e_idxs == b_log_true_e_idx
-            b_size = np.count_nonzero(m)
-            (
-                pdf,
-                low_bin_edges,
-                up_bin_edges,
-                bin_widths
-            ) = self.get_log_e_pdf(
-                b_log_true_e_idx,
-                dec_idx)
-
-            if pdf is None:
-                log_e_idx[m] = -1
-                log_e[m] = np.nan
-                continue
-
-            b_log_e_idx = rss.random.choice(
-                np.arange(len(pdf)),
-                p=(pdf * bin_widths),
-                size=b_size)
-            b_log_e = rss.random.uniform(
-                low_bin_edges[b_log_e_idx],
-                up_bin_edges[b_log_e_idx],
-                size=b_size)
-
-            log_e_idx[m] = b_log_e_idx
-            log_e[m] = b_log_e
-
-        return (log_e_idx, log_e)
+        return self.get_sampler(dec_idx).sample_log_e(
+            rss=rss,
+            log_true_e_idxs=log_true_e_idxs)
 
     def sample_psi(
             self,
@@ -809,45 +1167,10 @@ class PDSmearingMatrix(
             raise ValueError(
                 'The lengths of log_true_e_idxs and log_e_idxs must be equal!')
 
-        n_evt = len(log_true_e_idxs)
-        psi_idx = np.empty((n_evt,), dtype=np.int64)
-        psi = np.empty((n_evt,), dtype=np.double)
-
-        unique_log_true_e_idxs = np.unique(log_true_e_idxs)
-        for b_log_true_e_idx in unique_log_true_e_idxs:
-            m = log_true_e_idxs == b_log_true_e_idx
-            bb_unique_log_e_idxs = np.unique(log_e_idxs[m])
-            for bb_log_e_idx in bb_unique_log_e_idxs:
-                mm = m & (log_e_idxs == bb_log_e_idx)
-                bb_size = np.count_nonzero(mm)
-                (
-                    pdf,
-                    low_bin_edges,
-                    up_bin_edges,
-                    bin_widths
-                ) = self.get_psi_pdf(
-                    b_log_true_e_idx,
-                    dec_idx,
-                    bb_log_e_idx)
-
-                if pdf is None:
-                    psi_idx[mm] = -1
-                    psi[mm] = np.nan
-                    continue
-
-                bb_psi_idx = rss.random.choice(
-                    np.arange(len(pdf)),
-                    p=(pdf * bin_widths),
-                    size=bb_size)
-                bb_psi = rss.random.uniform(
-                    low_bin_edges[bb_psi_idx],
-                    up_bin_edges[bb_psi_idx],
-                    size=bb_size)
-
-                psi_idx[mm] = bb_psi_idx
-                psi[mm] = bb_psi
-
-        return (psi_idx, psi)
+        return self.get_sampler(dec_idx).sample_psi(
+            rss=rss,
+            log_true_e_idxs=log_true_e_idxs,
+            log_e_idxs=log_e_idxs)
 
     def sample_ang_err(
             self,
@@ -881,52 +1204,14 @@ class PDSmearingMatrix(
         ang_err : 1d ndarray of float
             The sampled angular error values in radians.
         """
-        if (len(log_true_e_idxs) != len(log_e_idxs)) and\
+        if (len(log_true_e_idxs) != len(log_e_idxs)) or\
            (len(log_e_idxs) != len(psi_idxs)):
             raise ValueError(
                 'The lengths of log_true_e_idxs, log_e_idxs, and psi_idxs must '
                 'be equal!')
 
-        n_evt = len(log_true_e_idxs)
-        ang_err_idx = np.empty((n_evt,), dtype=np.int64)
-        ang_err = np.empty((n_evt,), dtype=np.double)
-
-        unique_log_true_e_idxs = np.unique(log_true_e_idxs)
-        for b_log_true_e_idx in unique_log_true_e_idxs:
-            m = log_true_e_idxs == b_log_true_e_idx
-            bb_unique_log_e_idxs = np.unique(log_e_idxs[m])
-            for bb_log_e_idx in bb_unique_log_e_idxs:
-                mm = m & (log_e_idxs == bb_log_e_idx)
-                bbb_unique_psi_idxs = np.unique(psi_idxs[mm])
-                for bbb_psi_idx in bbb_unique_psi_idxs:
-                    mmm = mm & (psi_idxs == bbb_psi_idx)
-                    bbb_size = np.count_nonzero(mmm)
-                    (
-                        pdf,
-                        low_bin_edges,
-                        up_bin_edges,
-                        bin_widths
-                    ) = self.get_ang_err_pdf(
-                        b_log_true_e_idx,
-                        dec_idx,
-                        bb_log_e_idx,
-                        bbb_psi_idx)
-
-                    if pdf is None:
-                        ang_err_idx[mmm] = -1
-                        ang_err[mmm] = np.nan
-                        continue
-
-                    bbb_ang_err_idx = rss.random.choice(
-                        np.arange(len(pdf)),
-                        p=(pdf * bin_widths),
-                        size=bbb_size)
-                    bbb_ang_err = rss.random.uniform(
-                        low_bin_edges[bbb_ang_err_idx],
-                        up_bin_edges[bbb_ang_err_idx],
-                        size=bbb_size)
-
-                    ang_err_idx[mmm] = bbb_ang_err_idx
-                    ang_err[mmm] = bbb_ang_err
-
-        return (ang_err_idx, ang_err)
+        return self.get_sampler(dec_idx).sample_ang_err(
+            rss=rss,
+            log_true_e_idxs=log_true_e_idxs,
+            log_e_idxs=log_e_idxs,
+            psi_idxs=psi_idxs)
@@ -4,6 +4,8 @@
 dataset.
 """
 
+import functools
+
 import numpy as np
 
 from skyllh.analyses.i3.publicdata_ps.backgroundpdf import (
@@ -19,7 +21,7 @@ from skyllh.analyses.i3.publicdata_ps.signal_generator import (
     TimeDependentPDDatasetSignalGenerator,
 )
 from skyllh.analyses.i3.publicdata_ps.signalpdf import (
-    PDSignalEnergyPDFSet,
+    PDSignalEnergyPDFSetRegistry,
 )
 from skyllh.analyses.i3.publicdata_ps.utils import (
     clip_grl_start_times,
@@ -45,7 +47,10 @@ from skyllh.core.event_selection import (
     SpatialBoxEventSelectionMethod,
 )
 from skyllh.core.expectation_maximization import (
-    em_fit,
+    em_fit_batch,
+)
+from skyllh.core.flare_scan import (
+    box_flare_scan,
 )
 from skyllh.core.flux_model import (
     BoxTimeFluxProfile,
@@ -378,7 +383,9 @@ def run_gamma_scan_for_single_flare(
         n_gamma=51,
         ppbar=None,
 ):
-    """Runs ``em_fit`` for different gamma values in the signal energy PDF.
+    """Runs the expectation maximization for different gamma values in the
+    signal energy PDF. The fits for all gamma values are performed as one
+    batch using ``em_fit_batch``.
 
     Parameters
     ----------
@@ -421,28 +428,33 @@ def run_gamma_scan_for_single_flare(
 
     gamma_values = np.linspace(gamma_min, gamma_max, n_gamma)
 
+    # Calculate the signal-over-background ratios for all gamma values and
+    # run the expectation maximization for all of them at once.
+    ratios = np.empty((n_gamma, len(time)), dtype=np.float64)
+
     pbar = ProgressBar(len(gamma_values), parent=ppbar).start()
     for (i, gamma) in enumerate(gamma_values):
         fitparam_values = np.array([0, gamma], dtype=np.float64)
-        ratio = get_energy_spatial_signal_over_background(ana, fitparam_values)
-        (mu, sigma, ns) = em_fit(
-            time,
-            ratio,
-            n=1,
-            tol=1.e-200,
-            iter_max=500,
-            weight_thresh=0,
-            initial_width=5000,
-            remove_x=remove_time)
-        em_results[i] = (
-            gamma,
-            mu[0],
-            sigma[0],
-            ns[0],
-        )
+        ratios[i] = get_energy_spatial_signal_over_background(
+            ana, fitparam_values)
         pbar.increment()
     pbar.finish()
 
+    (mu, sigma, ns) = em_fit_batch(
+        time,
+        ratios,
+        n=1,
+        tol=1.e-200,
+        iter_max=500,
+        weight_thresh=0,
+        initial_width=5000,
+        remove_x=remove_time)
+
+    em_results['gamma'] = gamma_values
+    em_results['mu'] = mu[:, 0]
+    em_results['sigma'] = sigma[:, 0]
+    em_results['ns_em'] = ns[:, 0]
+
     return em_results
 
 
@@ -489,6 +501,159 @@ def unblind_single_flare(
     return (max_ts, best_em_result, best_fitparam_values)
 
 
+def run_box_scan_for_single_flare(
+        ana,
+        gamma_min=1,
+        gamma_max=5,
+        n_gamma=51,
+        min_livetime=1,
+        max_n_edges=500,
+        ppbar=None,
+):
+    """Scans box-shaped time windows for different gamma values in the signal
+    energy PDF. For each gamma value the box, whose start and stop times
+    coincide with event times, that maximizes the log-likelihood ratio
+    function is determined using ``box_flare_scan``.
+
+    Parameters
+    ----------
+    ana : instance of SingleSourceMultiDatasetLLHRatioAnalysis
+        The analysis that should be used.
+    gamma_min : float
+        Lower bound for gamma scan.
+    gamma_max : float
+        Upper bound for gamma scan.
+    n_gamma : int
+        Number of steps for gamma scan.
+    min_livetime : float
+        The minimal livetime of a box in days.
+    max_n_edges : int
+        The maximal number of events considered as start or stop events of the
+        boxes.
+    ppbar : instance of ProgressBar | None
+        The optional parent instance of ProgressBar.
+
+    Returns
+    -------
+    box_results : instance of numpy structured ndarray
+        The numpy structured ndarray with fields
+
+        gamma : float
+            The spectral index value.
+        start : float
+            The start time of the best box.
+        stop : float
+            The stop time of the best box.
+        ns : float
+            The best fit number of signal events of the best box.
+        ts : float
+            The test-statistic value of the best box.
+    """
+    box_results_dt = [
+        ('gamma', np.float64),
+        ('start', np.float64),
+        ('stop', np.float64),
+        ('ns', np.float64),
+        ('ts', np.float64),
+    ]
+    box_results = np.empty(n_gamma, dtype=box_results_dt)
+
+    tdm = ana.tdm_list[0]
+    time = tdm.get_data('time')
+
+    livetime = I3Livetime.from_grl_data(
+        grl_data=ana.data_list[0].grl)
+
+    gamma_values = np.linspace(gamma_min, gamma_max, n_gamma)
+
+    pbar = ProgressBar(len(gamma_values), parent=ppbar).start()
+    for (i, gamma) in enumerate(gamma_values):
+        fitparam_values = np.array([0, gamma], dtype=np.float64)
+        ratio = get_energy_spatial_signal_over_background(
+            ana, fitparam_values)
+
+        (ts, ns, start, stop) = box_flare_scan(
+            t=time,
+            sob=ratio,
+            livetime=livetime,
+            n_events=tdm.n_events,
+            min_livetime=min_livetime,
+            max_n_edges=max_n_edges)
+
+        box_results[i] = (gamma, start, stop, ns, ts)
+        pbar.increment()
+    pbar.finish()
+
+    return box_results
+
+
+def unblind_single_box_flare(
+        ana,
+        min_livetime=1,
+        max_n_edges=500,
+):
+    """Runs the box flare scan for a single flare on unblinded data and
+    maximizes the log-likelihood ratio function for the best box.
+
+    Parameters
+    ----------
+    ana : instance of SingleSourceMultiDatasetLLHRatioAnalysis
+        The analysis that should be used.
+    min_livetime : float
+        The minimal livetime of a box in days.
+    max_n_edges : int
+        The maximal number of events considered as start or stop events of the
+        boxes.
+
+    Returns
+    -------
+    max_TS : float
+        The TS value of the maximized best box hypothesis.
+    best_box_result : instance of numpy structured ndarray
+        The box scan result from the gamma scan corresponding to the best box.
+    best_fitparam_values : instance of numpy ndarray
+        The instance of numpy ndarray holding the fit parameter values of the
+        overall best fit result.
+    """
+    rss = RandomStateService(seed=1)
+
+    ana.unblind(
+        minimizer_rss=rss)
+
+    box_results = run_box_scan_for_single_flare(
+        ana=ana,
+        min_livetime=min_livetime,
+        max_n_edges=max_n_edges)
+
+    best_box_result = box_results[np.argmax(box_results['ts'])]
+    if np.isnan(best_box_result['start']):
+        # No box with a positive log-likelihood ratio value was found.
+        return (0., best_box_result, np.array([0., best_box_result['gamma']]))
+
+    change_signal_time_pdf_of_llhratio_function(
+        ana=ana,
+        box={
+            'start': best_box_result['start'],
+            'stop': best_box_result['stop']})
+
+    (log_lambda_max, best_fitparam_values, status) = ana.llhratio.maximize(
+        rss=rss)
+
+    max_TS = ana.calculate_test_statistic(
+        log_lambda=log_lambda_max,
+        fitparam_values=best_fitparam_values)
+
+    # The scan result is itself a maximum of the log-likelihood ratio function
+    # for a fixed gamma value. Use it, if the minimizer got stuck at a lower
+    # value, e.g. at the ns=0 boundary.
+    if best_box_result['ts'] > max_TS:
+        max_TS = best_box_result['ts']
+        best_fitparam_values = np.array(
+            [best_box_result['ns'], best_box_result['gamma']])
+
+    return (max_TS, best_box_result, best_fitparam_values)
+
+
 def do_trial_with_em(
         ana,
         rss,
@@ -784,6 +949,7 @@ def create_analysis(  # noqa: C901
         evt_sel_delta_angle_deg=10,
         construct_bkg_generator=True,
         construct_sig_generator=True,
+        energy_pdf_set_registry=None,
         tl=None,
         ppbar=None,
         logger_name=None,
@@ -858,6 +1024,12 @@ def create_analysis(  # noqa: C901
     construct_sig_generator : bool
         Flag if the signal generator should be constructed (``True``) or not
         (``False``).
+    energy_pdf_set_registry : instance of PDSignalEnergyPDFSetRegistry | None
+        The optional registry of signal energy PDF sets. Passing the same
+        registry to several calls of this function, e.g. for the sources of a
+        catalog or the positions of a sky scan, shares the signal energy PDF
+        sets between sources within the same declination bins. If set to
+        ``None``, a new registry is created.
     tl : TimeLord instance | None
         The TimeLord instance to use to time the creation of the analysis.
     ppbar : ProgressBar instance | None
@@ -1006,6 +1178,9 @@ def create_analysis(  # noqa: C901
             'The length of the spl_smooth and of the cut_sindec must be equal '
             f'to the length of datasets: {len(datasets)}.')
 
+    if energy_pdf_set_registry is None:
+        energy_pdf_set_registry = PDSignalEnergyPDFSetRegistry()
+
     # Add the data sets to the analysis.
     pbar = ProgressBar(len(datasets), parent=ppbar).start()
     for (ds_idx, ds) in enumerate(datasets):
@@ -1038,14 +1213,18 @@ def create_analysis(  # noqa: C901
             bkg_pdf=spatial_bkgpdf)
 
         # Create the energy PDF ratio instance for this dataset.
-        energy_sigpdfset = PDSignalEnergyPDFSet(
+        # The signal energy PDF set depends on the source declination. Hence,
+        # the energy PDF ratio needs to retrieve a new set from the registry
+        # when the source changes.
+        energy_sigpdfset_factory = functools.partial(
+            energy_pdf_set_registry.get_pdf_set,
             cfg=cfg,
             ds=ds,
-            src_dec=source.dec,
             fluxmodel=fluxmodel,
-            param_grid_set=gamma_grid,
-            ppbar=ppbar
-        )
+            param_grid_set=gamma_grid)
+        energy_sigpdfset = energy_sigpdfset_factory(
+            src_dec=source.dec,
+            ppbar=ppbar)
         smoothing_filter = BlockSmoothingFilter(nbins=1)
         energy_bkgpdf = PDDataBackgroundI3EnergyPDF(
             cfg=cfg,
@@ -1059,7 +1238,8 @@ def create_analysis(  # noqa: C901
             cfg=cfg,
             sig_pdf_set=energy_sigpdfset,
             bkg_pdf=energy_bkgpdf,
-            cap_ratio=cap_ratio)
+            cap_ratio=cap_ratio,
+            sig_pdf_set_factory=energy_sigpdfset_factory)
 
         pdfratio = spatial_pdfratio * energy_pdfratio
 
@@ -5,6 +5,8 @@ source analysis with a two-component likelihood function using a spacial and an
 energy event PDF.
 """
 
+import functools
+
 import numpy as np
 
 from scipy.interpolate import splrep, BSpline
@@ -22,7 +24,7 @@ from skyllh.analyses.i3.publicdata_ps.signal_generator import (
     PDDatasetSignalGenerator,
 )
 from skyllh.analyses.i3.publicdata_ps.signalpdf import (
-    PDSignalEnergyPDFSet,
+    PDSignalEnergyPDFSetRegistry,
 )
 from skyllh.analyses.i3.publicdata_ps.utils import (
     create_energy_cut_spline,
@@ -230,6 +232,7 @@ def create_analysis(
     keep_data_fields=None,
     evt_sel_delta_angle_deg=10,
     construct_sig_generator=True,
+    energy_pdf_set_registry=None,
     tl=None,
     ppbar=None,
     logger_name=None,
@@ -296,6 +299,12 @@ def create_analysis(
     construct_sig_generator : bool
         Flag if the signal generator should be constructed (``True``) or not
         (``False``).
+    energy_pdf_set_registry : instance of PDSignalEnergyPDFSetRegistry | None
+        The optional registry of signal energy PDF sets. Passing the same
+        registry to several calls of this function, e.g. for the sources of a
+        catalog or the positions of a sky scan, shares the signal energy PDF
+        sets between sources within the same declination bins. If set to
+        ``None``, a new registry is created.
     tl : TimeLord instance | None
         The TimeLord instance to use to time the creation of the analysis.
     ppbar : ProgressBar instance | None
@@ -442,6 +451,9 @@ def create_analysis(
             'The length of the spl_smooth and of the cut_sindec must be equal '
             f'to the length of datasets: {len(datasets)}.')
 
+    if energy_pdf_set_registry is None:
+        energy_pdf_set_registry = PDSignalEnergyPDFSetRegistry()
+
     # Add the data sets to the analysis.
     pbar = ProgressBar(len(datasets), parent=ppbar).start()
     for (ds_idx, ds) in enumerate(datasets):
@@ -469,14 +481,18 @@ def create_analysis(
             bkg_pdf=spatial_bkgpdf)
 
         # Create the energy PDF ratio instance for this dataset.
-        energy_sigpdfset = PDSignalEnergyPDFSet(
+        # The signal energy PDF set depends on the source declination. Hence,
+        # the energy PDF ratio needs to retrieve a new set from the registry
+        # when the source changes.
+        energy_sigpdfset_factory = functools.partial(
+            energy_pdf_set_registry.get_pdf_set,
             cfg=cfg,
             ds=ds,
-            src_dec=source.dec,
             fluxmodel=fluxmodel,
-            param_grid_set=e_peak_grid,
-            ppbar=ppbar
-        )
+            param_grid_set=e_peak_grid)
+        energy_sigpdfset = energy_sigpdfset_factory(
+            src_dec=source.dec,
+            ppbar=ppbar)
         smoothing_filter = BlockSmoothingFilter(nbins=1)
         energy_bkgpdf = PDDataBackgroundI3EnergyPDF(
             cfg=cfg,
@@ -490,7 +506,8 @@ def create_analysis(
             cfg=cfg,
             sig_pdf_set=energy_sigpdfset,
             bkg_pdf=energy_bkgpdf,
-            cap_ratio=cap_ratio)
+            cap_ratio=cap_ratio,
+            sig_pdf_set_factory=energy_sigpdfset_factory)
 
         pdfratio = spatial_pdfratio * energy_pdfratio
 
@@ -100,6 +100,126 @@ class RegisterCN(Command):
         self._cn_live_time = t
 
 
+class SetupAnalysis(Command):
+    _cmd = 'SETUPANA'
+
+    def __init__(self, factory, args=None, kwargs=None):
+        """Creates a setup analysis command, which tells the compute node to
+        create the analysis instance for subsequent trial tasks.
+
+        Parameters
+        ----------
+        factory : callable
+            The picklable callable with call signature
+            ``__call__(*args, **kwargs)`` that creates and returns the analysis
+            instance. The analysis instance must provide the ``do_trial``
+            method, see :meth:`skyllh.core.analysis.Analysis.do_trial`.
+        args : sequence | None
+            The optional positional arguments for ``factory``.
+        kwargs : dict | None
+            The optional keyword arguments for ``factory``.
+        """
+        super(SetupAnalysis, self).__init__()
+
+        if not callable(factory):
+            raise TypeError(
+                'The factory argument must be callable!')
+
+        self.factory = factory
+        self.args = () if args is None else tuple(args)
+        self.kwargs = dict() if kwargs is None else dict(kwargs)
+
+
+class TrialTask(Command):
+    _cmd = 'TRIALTASK'
+
+    def __init__(self, start_idx, seeds, kwargs=None):
+        """Creates a trial task command, which tells the compute node to
+        execute one trial for each of the given seeds.
+
+        Parameters
+        ----------
+        start_idx : int
+            The index of the first trial of this task within all trials. It
+            identifies the task.
+        seeds : instance of numpy ndarray
+            The (n_trials,)-shaped numpy ndarray holding the seed of the
+            random state of each trial.
+        kwargs : dict | None
+            The optional keyword arguments for the ``do_trial`` method of the
+            analysis.
+        """
+        super(TrialTask, self).__init__()
+
+        self.start_idx = start_idx
+        self.seeds = seeds
+        self.kwargs = dict() if kwargs is None else dict(kwargs)
+
+    @property
+    def start_idx(self):
+        """The index of the first trial of this task within all trials.
+        """
+        return self._start_idx
+
+    @start_idx.setter
+    def start_idx(self, idx):
+        idx = int_cast(
+            idx,
+            'The start_idx property must be castable to type int!')
+        self._start_idx = idx
+
+
+class TrialResult(Command):
+    _cmd = 'TRIALRESULT'
+
+    def __init__(self, start_idx, recarray):
+        """Creates a trial result command, which sends the results of a trial
+        task back to the master node.
+
+        Parameters
+        ----------
+        start_idx : int
+            The index of the first trial of the trial task.
+        recarray : numpy record ndarray
+            The numpy record ndarray holding the results of the trials of the
+            trial task.
+        """
+        super(TrialResult, self).__init__()
+
+        self.start_idx = start_idx
+        self.recarray = recarray
+
+    @property
+    def start_idx(self):
+        """The index of the first trial of the trial task.
+        """
+        return self._start_idx
+
+    @start_idx.setter
+    def start_idx(self, idx):
+        idx = int_cast(
+            idx,
+            'The start_idx property must be castable to type int!')
+        self._start_idx = idx
+
+
+class Error(Command):
+    _cmd = 'ERROR'
+
+    def __init__(self, msg):
+        """Creates an error command, which tells the master node that a
+        command could not be executed on the compute node.
+
+        Parameters
+        ----------
+        msg : str
+            The error message, e.g. the formatted traceback of the exception.
+        """
+        super(Error, self).__init__()
+
+        self.msg = msg
+
+
 def receive_command_from_socket(sock, blocksize=2048):
     """Receives a command from the given socket.
     """
@@ -3,24 +3,52 @@
 import argparse
 import socket
 import time
+import traceback
+
+import numpy as np
 
 from skyllh.cluster.commands import (
     ACK,
+    Error,
     MSG,
     RegisterCN,
+    SetupAnalysis,
     ShutdownCN,
+    TrialResult,
+    TrialTask,
     receive_command_from_socket,
 )
 from skyllh.core.py import (
     int_cast,
 )
+from skyllh.core.random import (
+    RandomStateService,
+)
 
 
 class ComputeNode(object):
     """The ComputeNode class provides an entity for stand-alone program running
     on a dedicated compute node host.
     """
-    def __init__(self, live_time, master_addr, master_port):
+    def __init__(
+            self, live_time, master_addr, master_port, connect_timeout=None):
+        """Creates a new ComputeNode instance and registers it to the master
+        node.
+
+        Parameters
+        ----------
+        live_time : int
+            The time in seconds this compute node should be listening for
+            requests.
+        master_addr : str
+            The address of the SkyLLH master program.
+        master_port : int
+            The port number of the SkyLLH master program.
+        connect_timeout : float | None
+            The time in seconds during which the connection to the master node
+            is retried, e.g. when the master node is not listening yet. If set
+            to ``None``, the connection is tried only once.
+        """
         super(ComputeNode, self).__init__()
 
         self.live_time = live_time
@@ -29,9 +57,11 @@ class ComputeNode(object):
 
         self._start_time = time.time()
 
+        # The analysis instance created through the SetupAnalysis command.
+        self._ana = None
+
         # Register the compute node to the master node.
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.sock.connect((self.master_addr, self.master_port))
+        self.sock = self._connect_to_master(connect_timeout)
 
         # Send the register command to the master and tell .
         RegisterCN(self._start_time, self._live_time).send(self.sock)
@@ -44,7 +74,24 @@ class ComputeNode(object):
         print(f'Runtime set to {self._live_time} seconds')
 
     def __del__(self):
-        self.sock.close()
+        if hasattr(self, 'sock'):
+            self.sock.close()
+
+    def _connect_to_master(self, connect_timeout):
+        """Connects to the master node. The connection is retried until the
+        given timeout is exceeded.
+        """
+        while True:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.connect((self.master_addr, self.master_port))
+                return sock
+            except OSError:
+                sock.close()
+                if (connect_timeout is None) or\
+                   (time.time() > self._start_time + connect_timeout):
+                    raise
+            time.sleep(0.1)
 
     @property
     def live_time(self):
@@ -86,15 +133,59 @@ class ComputeNode(object):
             'The master_port property must be castable to type int!')
         self._master_port = p
 
+    def setup_analysis(self, cmd):
+        """Creates the analysis instance through the factory of the given
+        SetupAnalysis command and replies with an ACK command, or with an Error
+        command if the analysis could not be created.
+        """
+        try:
+            self._ana = cmd.factory(*cmd.args, **cmd.kwargs)
+        except Exception:
+            self._ana = None
+            Error(traceback.format_exc()).send(self.sock)
+            return
+        ACK().send(self.sock)
+
+    def do_trials(self, task):
+        """Executes the trials of the given TrialTask command and replies with
+        a TrialResult command holding the results, or with an Error command if
+        the trials could not be executed.
+        """
+        try:
+            if self._ana is None:
+                raise RuntimeError(
+                    'No analysis has been set up on this compute node!')
+            result_list = [
+                self._ana.do_trial(
+                    rss=RandomStateService(seed=seed),
+                    **task.kwargs)
+                for seed in task.seeds
+            ]
+            recarray = np.empty(len(result_list), dtype=result_list[0].dtype)
+            recarray[:] = np.array(result_list)[:, 0]
+        except Exception:
+            Error(traceback.format_exc()).send(self.sock)
+            return
+        TrialResult(task.start_idx, recarray).send(self.sock)
+
     def handle_requests(self):
         if time.time() > self._start_time + self._live_time:
             raise RuntimeError('Live-time already exceeded!')
 
         while True:
             # Receive a command.
-            cmd = receive_command_from_socket(self.sock)
+            try:
+                cmd = receive_command_from_socket(self.sock)
+            except RuntimeError:
+                print('Connection to master lost. Shutting down.')
+                self.sock.close()
+                return
             if cmd.is_same_as(MSG):
                 print(f'Received general message: {cmd.msg}')
+            elif cmd.is_same_as(SetupAnalysis):
+                self.setup_analysis(cmd)
+            elif cmd.is_same_as(TrialTask):
+                self.do_trials(cmd)
             elif cmd.is_same_as(ShutdownCN):
                 print('Received shutdown command. Shutting down.')
                 self.sock.close()
@@ -119,12 +210,17 @@ if __name__ == '__main__':
     parser.add_argument(
         '--live-time', type=int, default=2*60*60,
         help='The time in seconds to run this compute node instance.')
+    parser.add_argument(
+        '--connect-timeout', type=float, default=None,
+        help='The time in seconds during which the connection to the master '
+             'program is retried.')
 
     args = parser.parse_args()
 
     cn = ComputeNode(
         live_time=args.live_time,
         master_addr=args.master_addr,
-        master_port=args.master_port)
+        master_port=args.master_port,
+        connect_timeout=args.connect_timeout)
 
     cn.handle_requests()
@@ -1,16 +1,35 @@
 # -*- coding: utf-8 -*-
 
+import collections
 import logging
+import pickle
+import select
 import socket
+import time
+
+import numpy as np
 
 from skyllh.cluster.commands import (
     ACK,
     Command,
+    Error,
     MSG,
+    SetupAnalysis,
     ShutdownCN,
     RegisterCN,
+    TrialResult,
+    TrialTask,
     receive_command_from_socket,
 )
+from skyllh.core.multiproc import (
+    create_seed_chunks,
+)
+from skyllh.core.progressbar import (
+    ProgressBar,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
 
 
 class CNRegistryEntry(object):
@@ -26,6 +45,9 @@ class CNRegistryEntry(object):
         self.cn_start_time = cn_start_time
         self.cn_live_time = cn_live_time
 
+        # The flag if the analysis has been set up on the CN.
+        self.has_analysis = False
+
     def __del__(self):
         self.sock.close()
 
@@ -73,7 +95,32 @@ class MasterNode(object):
 
         self.cn_registry = dict()
 
-    def register_compute_nodes(self, n_cn=10, master_port=9999, blocksize=2048):
+    def remove_compute_node(self, cn_key):
+        """Removes the compute node of the given key from the registry and
+        closes its socket. This is used for compute nodes, which are considered
+        dead.
+        """
+        cn = self._cn_registry.pop(cn_key)
+        cn.sock.close()
+
+    def register_compute_nodes(
+            self, n_cn=10, master_port=9999, blocksize=2048,
+            master_addr=None):
+        """Waits for ``n_cn`` compute nodes to register to this master node.
+
+        Parameters
+        ----------
+        n_cn : int
+            The number of compute nodes to wait for.
+        master_port : int
+            The port number the master node is listening on.
+        blocksize : int
+            The size in bytes of the blocks that are read from the sockets at
+            once.
+        master_addr : str | None
+            The address the master node is listening on. If set to ``None``,
+            the fully qualified domain name of the host is used.
+        """
         logger = logging.getLogger(__name__)
 
         logger.debug(
@@ -83,9 +130,12 @@ class MasterNode(object):
         logger.debug(
             'Creating server TCP/IP socket')
         serversock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        serversock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
 
         # bind the socket to a public host, and a well-known port
-        master_hostname = socket.getfqdn(socket.gethostname())
+        master_hostname = master_addr
+        if master_hostname is None:
+            master_hostname = socket.getfqdn(socket.gethostname())
         logger.debug(
             'Listening on %s:%d with %d simulanious allowed connections',
             master_hostname, master_port, n_cn)
@@ -118,6 +168,326 @@ class MasterNode(object):
         for (cn_key, cn) in self.cn_registry.items():
             cn.send_command(MSG(msg))
 
+    def _receive_command(self, cn_key, blocksize=2048):
+        """Receives a command from the compute node of the given key. If the
+        connection to the compute node is broken, the compute node is removed
+        from the registry and ``None`` is returned.
+        """
+        logger = logging.getLogger(__name__)
+
+        cn = self._cn_registry[cn_key]
+        try:
+            return receive_command_from_socket(cn.sock, blocksize=blocksize)
+        except (RuntimeError, OSError, EOFError, pickle.UnpicklingError):
+            logger.warning(
+                'Lost connection to compute node %s. Removing it.', cn_key)
+            self.remove_compute_node(cn_key)
+            return None
+
+    def setup_analysis(
+            self, factory, args=None, kwargs=None, timeout=None,
+            blocksize=2048):
+        """Ships the given analysis factory to all registered compute nodes,
+        which create their analysis instance through it. Compute nodes, which
+        do not respond within the given timeout, are removed from the registry.
+
+        Parameters
+        ----------
+        factory : callable
+            The picklable callable with call signature
+            ``__call__(*args, **kwargs)`` that creates and returns the analysis
+            instance on the compute node. The factory must be importable on
+            the compute nodes, e.g. a module-level function.
+        args : sequence | None
+            The optional positional arguments for ``factory``.
+        kwargs : dict | None
+            The optional keyword arguments for ``factory``.
+        timeout : float | None
+            The time in seconds to wait for the compute nodes to create the
+            analysis. If set to ``None``, there is no time limit.
+        blocksize : int
+            The size in bytes of the blocks that are read from the sockets at
+            once.
+
+        Raises
+        ------
+        RuntimeError
+            If the analysis could not be created on a compute node.
+        """
+        logger = logging.getLogger(__name__)
+
+        cmd = SetupAnalysis(factory, args=args, kwargs=kwargs)
+
+        pending = set()
+        for cn_key in list(self._cn_registry.keys()):
+            cn = self._cn_registry[cn_key]
+            cn.has_analysis = False
+            try:
+                cn.send_command(cmd)
+            except (RuntimeError, OSError):
+                logger.warning(
+                    'Lost connection to compute node %s. Removing it.', cn_key)
+                self.remove_compute_node(cn_key)
+                continue
+            pending.add(cn_key)
+
+        deadline = None if timeout is None else time.time() + timeout
+        while len(pending) > 0:
+            wait = None if deadline is None else max(deadline - time.time(), 0)
+            sock_cn_key_map = dict(
+                (self._cn_registry[cn_key].sock, cn_key)
+                for cn_key in pending)
+            (readable, _, _) = select.select(
+                list(sock_cn_key_map.keys()), [], [], wait)
+            if len(readable) == 0:
+                for cn_key in pending:
+                    logger.warning(
+                        'Compute node %s did not set up the analysis within '
+                        '%g seconds. Removing it.', cn_key, timeout)
+                    self.remove_compute_node(cn_key)
+                break
+            for sock in readable:
+                cn_key = sock_cn_key_map[sock]
+                pending.remove(cn_key)
+                reply = self._receive_command(cn_key, blocksize=blocksize)
+                if reply is None:
+                    continue
+                if reply.is_same_as(Error):
+                    raise RuntimeError(
+                        f'The compute node {cn_key} could not set up the '
+                        f'analysis:\n{reply.msg}')
+                if not reply.is_same_as(ACK):
+                    raise RuntimeError(
+                        f'The compute node {cn_key} did not reply with an ACK '
+                        'command!')
+                self._cn_registry[cn_key].has_analysis = True
+
+    def _drain_trial_tasks(self, cn_keys, timeout=None, blocksize=2048):
+        """Waits for the replies of the compute nodes of the given keys, which
+        are still working on a trial task, and discards them. Otherwise these
+        replies would be received as replies to later tasks. Compute nodes,
+        which do not reply within ``timeout`` seconds, lost their connection,
+        or reply with an unexpected command, are removed from the registry.
+        """
+        logger = logging.getLogger(__name__)
+
+        pending = set(cn_keys)
+        deadline = None if timeout is None else time.time() + timeout
+        while len(pending) > 0:
+            wait = None if deadline is None else max(deadline - time.time(), 0)
+            sock_cn_key_map = dict(
+                (self._cn_registry[cn_key].sock, cn_key)
+                for cn_key in pending)
+            (readable, _, _) = select.select(
+                list(sock_cn_key_map.keys()), [], [], wait)
+            if len(readable) == 0:
+                for cn_key in pending:
+                    logger.warning(
+                        'Compute node %s did not finish its trial task within '
+                        '%g seconds. Removing it.', cn_key, timeout)
+                    self.remove_compute_node(cn_key)
+                break
+            for sock in readable:
+                cn_key = sock_cn_key_map[sock]
+                pending.remove(cn_key)
+                reply = self._receive_command(cn_key, blocksize=blocksize)
+                if reply is None:
+                    continue
+                if (not reply.is_same_as(TrialResult)) and\
+                   (not reply.is_same_as(Error)):
+                    logger.warning(
+                        'Compute node %s replied with an unexpected command. '
+                        'Removing it.', cn_key)
+                    self.remove_compute_node(cn_key)
+
+    def iter_trials(  # noqa: C901
+            self, rss, n, chunksize=1, task_timeout=None, ppbar=None,
+            blocksize=2048, **kwargs):
+        """Distributes ``n`` trials of the analysis, which has been set up via
+        the :meth:`setup_analysis` method, to the registered compute nodes and
+        yields the results as they arrive.
+
+        The trials are split into tasks of ``chunksize`` trials. Each trial
+        gets its own seed drawn from ``rss`` based on the trial's index, in the
+        same way as done by the :meth:`skyllh.core.analysis.Analysis.do_trials`
+        method with a ``chunksize``. Hence, the results are identical to a
+        local run with the same random state. Each compute node executes one
+        task at a time. Tasks held by compute nodes, which lost their
+        connection or did not reply within ``task_timeout`` seconds, are
+        re-queued and the compute node is removed from the registry.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The RandomStateService instance from which the seeds of the trials
+            are drawn.
+        n : int
+            The number of trials.
+        chunksize : int
+            The number of trials per task.
+        task_timeout : float | None
+            The time in seconds after which a compute node is considered dead,
+            if it did not return the results of its task. If set to ``None``,
+            there is no time limit.
+        ppbar : instance of ProgressBar | None
+            The possible parent ProgressBar instance.
+        blocksize : int
+            The size in bytes of the blocks that are read from the sockets at
+            once.
+        **kwargs
+            Additional keyword arguments are passed to the ``do_trial`` method
+            of the analysis.
+
+        Yields
+        ------
+        start_idx : int
+            The index of the first trial of the task.
+        recarray : numpy record ndarray
+            The numpy record ndarray holding the results of the trials of the
+            task.
+
+        Raises
+        ------
+        RuntimeError
+            If a trial failed on a compute node, or if no compute node with the
+            analysis set up is left while there are unfinished tasks. Before
+            the error is raised, the replies of the other compute nodes to
+            their tasks in progress are awaited and discarded, so the compute
+            nodes can be used for further trials.
+        """
+        logger = logging.getLogger(__name__)
+
+        if not isinstance(rss, RandomStateService):
+            raise TypeError(
+                'The rss argument must be an instance of RandomStateService!')
+
+        task_queue = collections.deque(
+            TrialTask(start_idx, seeds, kwargs)
+            for (start_idx, seeds) in create_seed_chunks(
+                n, chunksize, rss=rss)
+        )
+
+        # The dictionary of the tasks in progress and their deadlines, keyed
+        # by the key of the compute node.
+        active = dict()
+
+        def requeue(cn_key):
+            (task, _) = active.pop(cn_key)
+            logger.warning(
+                'Re-queuing trial task %d of compute node %s.',
+                task.start_idx, cn_key)
+            task_queue.appendleft(task)
+
+        pbar = ProgressBar(maxval=n, parent=ppbar).start()
+
+        try:
+            while (len(task_queue) > 0) or (len(active) > 0):
+                # Hand out tasks to idle compute nodes.
+                for (cn_key, cn) in list(self._cn_registry.items()):
+                    if len(task_queue) == 0:
+                        break
+                    if (not cn.has_analysis) or (cn_key in active):
+                        continue
+                    task = task_queue.popleft()
+                    deadline = (
+                        None if task_timeout is None
+                        else time.time() + task_timeout)
+                    active[cn_key] = (task, deadline)
+                    try:
+                        cn.send_command(task)
+                    except (RuntimeError, OSError):
+                        logger.warning(
+                            'Lost connection to compute node %s. Removing it.',
+                            cn_key)
+                        requeue(cn_key)
+                        self.remove_compute_node(cn_key)
+
+                if len(active) == 0:
+                    raise RuntimeError(
+                        'No compute node with the analysis set up is available '
+                        f'for the remaining {len(task_queue)} trial tasks!')
+
+                # Wait for results until the earliest deadline.
+                deadlines = [d for (_, d) in active.values() if d is not None]
+                wait = (
+                    None if len(deadlines) == 0
+                    else max(min(deadlines) - time.time(), 0))
+                sock_cn_key_map = dict(
+                    (self._cn_registry[cn_key].sock, cn_key)
+                    for cn_key in active.keys())
+                (readable, _, _) = select.select(
+                    list(sock_cn_key_map.keys()), [], [], wait)
+
+                for sock in readable:
+                    cn_key = sock_cn_key_map[sock]
+                    reply = self._receive_command(cn_key, blocksize=blocksize)
+                    if reply is None:
+                        requeue(cn_key)
+                        continue
+                    if reply.is_same_as(Error):
+                        active.pop(cn_key)
+                        raise RuntimeError(
+                            f'The trials failed on compute node {cn_key}:\n'
+                            f'{reply.msg}')
+                    if not reply.is_same_as(TrialResult):
+                        active.pop(cn_key)
+                        self.remove_compute_node(cn_key)
+                        raise RuntimeError(
+                            f'The compute node {cn_key} replied with an '
+                            'unexpected command!')
+                    active.pop(cn_key)
+                    pbar.increment(len(reply.recarray))
+                    yield (reply.start_idx, reply.recarray)
+
+                # Re-queue the tasks of compute nodes, which exceeded the task
+                # timeout.
+                now = time.time()
+                for (cn_key, (task, deadline)) in list(active.items()):
+                    if (deadline is not None) and (now > deadline):
+                        logger.warning(
+                            'Compute node %s did not finish trial task %d '
+                            'within %g seconds. Removing it.',
+                            cn_key, task.start_idx, task_timeout)
+                        requeue(cn_key)
+                        self.remove_compute_node(cn_key)
+        finally:
+            # Wait for the compute nodes, which are still working on a task,
+            # when the trials are aborted, e.g. due to a failed trial.
+            self._drain_trial_tasks(
+                list(active.keys()), timeout=task_timeout, blocksize=blocksize)
+
+        pbar.finish()
+
+    def do_trials(
+            self, rss, n, chunksize=1, task_timeout=None, ppbar=None,
+            blocksize=2048, **kwargs):
+        """Executes ``n`` trials of the analysis, which has been set up via the
+        :meth:`setup_analysis` method, on the registered compute nodes. See the
+        :meth:`iter_trials` method for the description of the arguments.
+
+        Returns
+        -------
+        recarray : numpy record ndarray
+            The numpy record ndarray holding the result of all trials, which is
+            identical to the result of the
+            :meth:`skyllh.core.analysis.Analysis.do_trials` method with the
+            same random state and ``chunksize``.
+        """
+        recarray = None
+        for (start_idx, task_recarray) in self.iter_trials(
+                rss=rss,
+                n=n,
+                chunksize=chunksize,
+                task_timeout=task_timeout,
+                ppbar=ppbar,
+                blocksize=blocksize,
+                **kwargs):
+            if recarray is None:
+                recarray = np.empty(n, dtype=task_recarray.dtype)
+            recarray[start_idx:start_idx+len(task_recarray)] = task_recarray
+
+        return recarray
+
     def shutdown_compute_nodes(self):
         """Sends a stop command to all compute nodes.
         """
@@ -7,6 +7,12 @@ from skyllh.core.py import (
 )
 
 
+# The number of bytes of the message header holding the length of the message.
+# Pickled analysis factories and trial results can be large, hence the length is
+# not limited to a few kilobytes.
+MSGLEN_NBYTES = 8
+
+
 class Message(object):
     @staticmethod
     def receive(sock, blocksize=2048, as_bytes=False):
@@ -26,9 +32,10 @@ class Message(object):
         m : Message
             The Message instance created with the message read from the socket.
         """
-        # Get the first 2 bytes to determine the length of the message.
+        # Get the first bytes to determine the length of the message.
         msglen = int.from_bytes(
-            read_from_socket(sock, 2, blocksize=blocksize), 'little')
+            read_from_socket(sock, MSGLEN_NBYTES, blocksize=blocksize),
+            'little')
 
         # Read the message of length msglen bytes from the socket. Here, msg is
         # a bytes object.
@@ -69,13 +76,16 @@ class Message(object):
     def length(self):
         """The length of the message in bytes.
         """
-        return len(self.msg)
+        if isinstance(self.msg, bytes):
+            return len(self.msg)
+        return len(bytes(self.msg, 'utf-8'))
 
     def as_socket_msg(self):
         """Converts this message to a bytes instance that can be send through a
-        socket. The first two bytes hold the length of the message.
+        socket. The first ``MSGLEN_NBYTES`` bytes hold the length of the
+        message.
         """
-        smsg = len(self.msg).to_bytes(2, 'little')
+        smsg = self.length.to_bytes(MSGLEN_NBYTES, 'little')
         if isinstance(self.msg, bytes):
             smsg += self.msg
         else:
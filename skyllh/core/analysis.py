@@ -30,7 +30,11 @@ from skyllh.core.llhratio import (
     MultiDatasetTCLLHRatio,
     ZeroSigH0SingleDatasetTCLLHRatio,
 )
+from skyllh.core.minimizer import (
+    MultiStartMinimizer,
+)
 from skyllh.core.multiproc import (
+    WorkerPool,
     get_ncpu,
     parallelize,
 )
@@ -1172,6 +1176,46 @@ class Analysis(
 
         return recarray
 
+    def create_trial_worker_pool(
+            self,
+            ncpu=None):
+        """Creates a long-lived pool of worker processes for the
+        :meth:`do_trial` method of this analysis instance. The pool can be
+        passed to the :meth:`do_trials` method via its ``pool`` argument in
+        order to avoid spawning new worker processes and transferring this
+        analysis instance to them for each call of :meth:`do_trials`.
+
+        The worker processes hold a snapshot of this analysis instance taken
+        when the pool is created, whereas the master process participates with
+        the current instance. Hence, the pool must not be used anymore once
+        the analysis has been changed, e.g. via the :meth:`change_source` or
+        :meth:`change_shg_mgr` methods, or by changing parameter or minimizer
+        settings. A new pool has to be created instead.
+
+        Parameters
+        ----------
+        ncpu : int | None
+            The number of CPUs to use, i.e. the number of processes including
+            the master process. If set to None, the global setting will be
+            used.
+
+        Returns
+        -------
+        pool : instance of WorkerPool
+            The instance of WorkerPool evaluating the :meth:`do_trial` method.
+            It should be used as context manager or closed via its ``close``
+            method when it is not needed anymore.
+        """
+        ncpu = get_ncpu(
+            cfg=self._cfg,
+            local_ncpu=ncpu)
+
+        pool = WorkerPool(
+            func=self.do_trial,
+            ncpu=ncpu)
+
+        return pool
+
     def do_trials(
             self,
             rss,
@@ -1179,6 +1223,8 @@ class Analysis(
             ncpu=None,
             tl=None,
             ppbar=None,
+            pool=None,
+            chunksize=None,
             **kwargs):
         """Executes the :meth:`do_trial` method ``n`` times with possible
         multi-processing.
@@ -1198,6 +1244,20 @@ class Analysis(
             individual tasks.
         ppbar : instance of ProgressBar | None
             The possible parent ProgressBar instance.
+        pool : instance of WorkerPool | None
+            The optional instance of WorkerPool, created via the
+            :meth:`create_trial_worker_pool` method, whose worker processes
+            should be used to execute the trials. If set, the ``ncpu``
+            argument is ignored. The pool's worker processes use the state of
+            the analysis at the time the pool was created, see the
+            :meth:`create_trial_worker_pool` method.
+        chunksize : int | None
+            If set to an integer, the trials are distributed dynamically in
+            chunks of ``chunksize`` trials to the processes, and the random
+            numbers of each trial are seeded based on the trial's index. See
+            the :func:`~skyllh.core.multiproc.parallelize` function for
+            details. If set to None, each process gets one contiguous block of
+            trials.
         **kwargs
             Additional keyword arguments are passed to the :meth:`do_trial`
             method. See the documentation of that method for allowed keyword
@@ -1211,18 +1271,38 @@ class Analysis(
             :py:meth:`~skyllh.core.analysis.Analysis.do_trial` method for the
             list of data fields.
         """
-        ncpu = get_ncpu(
-            cfg=self._cfg,
-            local_ncpu=ncpu)
-
         args_list = [((), kwargs) for i in range(n)]
-        result_list = parallelize(
-            func=self.do_trial,
-            args_list=args_list,
-            ncpu=ncpu,
-            rss=rss,
-            tl=tl,
-            ppbar=ppbar)
+
+        if pool is not None:
+            if not isinstance(pool, WorkerPool):
+                raise TypeError(
+                    'The pool argument must be None or an instance of '
+                    'WorkerPool! '
+                    f'Its current type is {classname(pool)}!')
+            if pool.func != self.do_trial:
+                raise ValueError(
+                    'The worker pool given by the pool argument must have '
+                    'been created for the do_trial method of this analysis '
+                    'instance!')
+            result_list = pool.map(
+                args_list=args_list,
+                rss=rss,
+                tl=tl,
+                ppbar=ppbar,
+                chunksize=chunksize)
+        else:
+            ncpu = get_ncpu(
+                cfg=self._cfg,
+                local_ncpu=ncpu)
+
+            result_list = parallelize(
+                func=self.do_trial,
+                args_list=args_list,
+                ncpu=ncpu,
+                rss=rss,
+                tl=tl,
+                ppbar=ppbar,
+                chunksize=chunksize)
 
         recarray_dtype = result_list[0].dtype
         recarray = np.empty(n, dtype=recarray_dtype)
@@ -1470,6 +1550,50 @@ class LLHRatioAnalysis(
         self._llhratio.initialize_for_new_trial(
             tl=tl)
 
+    def initialize_trials(
+            self,
+            trial_events_list,
+            trial_n_events_list,
+            tl=None):
+        """This method initializes the log-likelihood ratio function with a
+        batch of trials at once via the
+        :meth:`~skyllh.core.trialdata.TrialDataManager.initialize_trials`
+        method of the trial data managers. This is a low-level method. For a
+        convenient method see the :meth:`do_trials_batched` method.
+
+        Parameters
+        ----------
+        trial_events_list : list of list of DataFieldRecordArray instances
+            The list of the ``events_list`` of each trial. See the
+            documentation of the :meth:`initialize_trial` method.
+        trial_n_events_list : list of list of int
+            The list of the ``n_events_list`` of each trial. See the
+            documentation of the :meth:`initialize_trial` method.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used for timing
+            measurements.
+        """
+        for (ds_idx, (tdm, evt_sel_method)) in enumerate(zip(
+                self._tdm_list,
+                self._event_selection_method_list)):
+
+            tdm.initialize_trials(
+                shg_mgr=self._shg_mgr,
+                pmm=self._pmm,
+                events_list=[
+                    events_list[ds_idx]
+                    for events_list in trial_events_list
+                ],
+                n_events_list=[
+                    n_events_list[ds_idx]
+                    for n_events_list in trial_n_events_list
+                ],
+                evt_sel_method=evt_sel_method,
+                tl=tl)
+
+        self._llhratio.initialize_for_new_trial(
+            tl=tl)
+
     def unblind(
             self,
             minimizer_rss,
@@ -1586,10 +1710,20 @@ class LLHRatioAnalysis(
         with TaskTimer(tl, 'Initializing trial.'):
             self.initialize_trial(events_list, n_events_list)
 
-        with TaskTimer(tl, 'Maximizing LLH ratio function.'):
-            (log_lambda, fitparam_values, status) = self._llhratio.maximize(
-                rss=minimizer_rss,
-                tl=tl)
+        # A multi-start minimizer can warm-start from the best fit of the
+        # previous trial with the same mean number of signal events.
+        minimizer = self._llhratio.minimizer
+        if isinstance(minimizer, MultiStartMinimizer):
+            minimizer.warm_start_key = (mean_n_sig, mean_n_sig_0)
+        try:
+            with TaskTimer(tl, 'Maximizing LLH ratio function.'):
+                (log_lambda, fitparam_values, status) =\
+                    self._llhratio.maximize(
+                        rss=minimizer_rss,
+                        tl=tl)
+        finally:
+            if isinstance(minimizer, MultiStartMinimizer):
+                minimizer.warm_start_key = None
         if isinstance(minimizer_status_dict, dict):
             minimizer_status_dict.update(status)
 
@@ -1625,6 +1759,139 @@ class LLHRatioAnalysis(
 
         return recarray
 
+    def do_trials_batched(
+            self,
+            rss,
+            n,
+            mean_n_bkg_list=None,
+            mean_n_sig=0,
+            bkg_kwargs=None,
+            sig_kwargs=None,
+            tl=None):
+        """Performs ``n`` analysis trials as one batch, which requires that ns
+        is the only global floating parameter. The pseudo data of all trials is
+        generated via the :meth:`generate_pseudo_data` method and the trials
+        are initialized at once via the :meth:`initialize_trials` method.
+        Hence, the data fields and the PDF ratio values are calculated for the
+        events of all trials together. ns is fitted for all trials
+        simultaneously via the
+        :meth:`~skyllh.core.llhratio.TCLLHRatio.maximize_ns_for_trials` method
+        of the log-likelihood ratio function.
+
+        .. note::
+
+            This requires that the event selection method and the data field
+            functions treat each event independently of the other events.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The instance of RandomStateService to use for generating
+            random numbers.
+        n : int
+            The number of trials.
+        mean_n_bkg_list : list of float | None
+            The mean number of background events that should be generated for
+            each dataset. If set to None (the default), the background
+            generation method needs to obtain this number itself.
+        mean_n_sig : float
+            The mean number of signal events that should be generated for each
+            trial.
+        bkg_kwargs : dict | None
+            Additional keyword arguments for the `generate_events` method of the
+            background generation method class. An usual keyword argument is
+            `poisson`.
+        sig_kwargs : dict | None
+            Additional keyword arguments for the `generate_signal_events` method
+            of the `SignalGenerator` class. An usual keyword argument is
+            `poisson`.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used to time
+            individual tasks.
+
+        Returns
+        -------
+        recarray : instance of numpy record ndarray
+            The numpy record ndarray holding the result of all trials.
+            See the documentation of the
+            :py:meth:`~skyllh.core.analysis.LLHRatioAnalysis.do_trial_with_given_pseudo_data`
+            method for the list of data fields.
+
+        Raises
+        ------
+        ValueError
+            If ns is not the only global floating parameter.
+        """
+        if self._pmm.global_paramset.floating_params_name_list != ['ns']:
+            raise ValueError(
+                'The trials can only be performed as one batch if ns is the '
+                'only global floating parameter! The global floating '
+                'parameters are '
+                f'{self._pmm.global_paramset.floating_params_name_list}.')
+
+        n_sig_arr = np.empty((n,), dtype=np.int64)
+        trial_n_events_list = []
+        trial_events_list = []
+        with TaskTimer(tl, 'Generating pseudo data.'):
+            for k in range(n):
+                (n_sig, n_events_list, events_list) =\
+                    self.generate_pseudo_data(
+                        rss=rss,
+                        mean_n_bkg_list=mean_n_bkg_list,
+                        mean_n_sig=mean_n_sig,
+                        bkg_kwargs=bkg_kwargs,
+                        sig_kwargs=sig_kwargs,
+                        tl=tl)
+                n_sig_arr[k] = n_sig
+                trial_n_events_list.append(n_events_list)
+                trial_events_list.append(events_list)
+
+        self._llhratio.mean_n_sig_0 = 0
+
+        with TaskTimer(tl, 'Initializing trials.'):
+            self.initialize_trials(
+                trial_events_list=trial_events_list,
+                trial_n_events_list=trial_n_events_list,
+                tl=tl)
+
+        with TaskTimer(tl, 'Maximizing LLH ratio function for trials.'):
+            (log_lambda, fitparam_values) =\
+                self._llhratio.maximize_ns_for_trials(
+                    n_trials=n,
+                    fitparam_values=(
+                        self._pmm.global_paramset.floating_param_initials),
+                    tl=tl)
+
+        global_param_names = list(self._pmm.create_global_params_dict(
+            gflp_values=fitparam_values[0]).keys())
+
+        recarray_dtype = [
+            ('seed', np.int64),
+            ('mean_n_sig', np.float64),
+            ('n_sig', np.int64),
+            ('mean_n_sig_0', np.float64),
+            ('ts', np.float64)
+        ] + [
+            (param_name, np.float64)
+            for param_name in global_param_names
+        ]
+        recarray = np.empty((n,), dtype=recarray_dtype)
+        recarray['seed'] = rss.seed
+        recarray['mean_n_sig'] = mean_n_sig
+        recarray['n_sig'] = n_sig_arr
+        recarray['mean_n_sig_0'] = 0
+        with TaskTimer(tl, 'Calculating test statistic.'):
+            for k in range(n):
+                recarray['ts'][k] = self.calculate_test_statistic(
+                    log_lambda=log_lambda[k],
+                    fitparam_values=fitparam_values[k])
+                global_params_dict = self._pmm.create_global_params_dict(
+                    gflp_values=fitparam_values[k])
+                for (param_name, param_value) in global_params_dict.items():
+                    recarray[param_name][k] = param_value
+
+        return recarray
+
 
 class SingleSourceMultiDatasetLLHRatioAnalysis(
         LLHRatioAnalysis):
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import abc
+import weakref
 
 import numpy as np
 
@@ -22,6 +23,7 @@ from skyllh.core.py import (
     classname,
     float_cast,
     func_has_n_args,
+    int_cast,
     issequenceof,
 )
 from skyllh.core.random import (
@@ -129,6 +131,8 @@ class MCDataSamplingBkgGenMethod(
             data_scrambler=None,
             keep_mc_data_fields=None,
             pre_event_selection_method=None,
+            random_choice_method='cdf',
+            draw_batch_size=None,
             **kwargs,
     ):
         """Creates a new instance of the MCDataSamplingBkgGenMethod class.
@@ -175,6 +179,20 @@ class MCDataSamplingBkgGenMethod(
             pre-select the MC events that will be used for later background
             event generation. Using this pre-selection a large portion of the
             MC data can be reduced prior to background event generation.
+        random_choice_method : str
+            The method of the RandomChoice instance to draw the MC events.
+            Possible values are ``'cdf'`` and ``'alias'``. The alias method
+            draws each event in constant time, independent of the number of MC
+            events.
+        draw_batch_size : int | None
+            If not ``None``, the MC event indices are drawn in batches of at
+            least this size, and are consumed by consecutive calls of the
+            ``generate_events`` method with the same instance of
+            RandomStateService. This avoids the overhead of drawing the indices
+            for each trial separately. The pre-drawn indices are discarded when
+            a different instance of RandomStateService is used or its seed has
+            been changed. Hence, reseeding an instance with its current seed
+            does not discard them.
         """
         super().__init__(
             **kwargs)
@@ -184,6 +202,8 @@ class MCDataSamplingBkgGenMethod(
         self.data_scrambler = data_scrambler
         self.keep_mc_data_field_names = keep_mc_data_fields
         self.pre_event_selection_method = pre_event_selection_method
+        self.random_choice_method = random_choice_method
+        self.draw_batch_size = draw_batch_size
 
         if (pre_event_selection_method is not None) and (get_mean_func is None):
             raise ValueError(
@@ -199,6 +219,14 @@ class MCDataSamplingBkgGenMethod(
         self._cache_mean_pre_selected = None
         self._cache_random_choice = None
 
+        # Define the pool of pre-drawn MC event indices, which is valid only
+        # for the RandomStateService instance and seed it was drawn with. The
+        # instance is referenced weakly, because the id of a deleted instance
+        # can be reused by a new instance.
+        self._idx_pool = np.empty((0,), dtype=np.int64)
+        self._idx_pool_rss_ref = None
+        self._idx_pool_rss_seed = None
+
     @property
     def get_event_prob_func(self):
         """The function to obtain the background probability for each
@@ -312,6 +340,91 @@ class MCDataSamplingBkgGenMethod(
 
         self._pre_event_selection_method = method
 
+    @property
+    def random_choice_method(self):
+        """The method of the RandomChoice instance to draw the MC events,
+        i.e. ``'cdf'`` or ``'alias'``.
+        """
+        return self._random_choice_method
+
+    @random_choice_method.setter
+    def random_choice_method(self, method):
+        if method not in ('cdf', 'alias'):
+            raise ValueError(
+                'The random_choice_method property must be either "cdf" or '
+                f'"alias"! Its current value is "{method}".')
+        self._random_choice_method = method
+        # Invalidate the data cache.
+        self._cache_data_id = None
+
+    @property
+    def draw_batch_size(self):
+        """The minimal number of MC event indices drawn at once. ``None``
+        means the indices are drawn for each call of ``generate_events``
+        separately.
+        """
+        return self._draw_batch_size
+
+    @draw_batch_size.setter
+    def draw_batch_size(self, n):
+        if n is not None:
+            n = int_cast(
+                n,
+                'The draw_batch_size property must be None, or cast-able to '
+                'type int!')
+            if n <= 0:
+                raise ValueError(
+                    'The draw_batch_size property must be greater than zero!')
+        self._draw_batch_size = n
+
+    def _draw_mc_event_indices(
+            self,
+            rss,
+            random_choice,
+            size,
+    ):
+        """Draws the given number of MC event indices. If a draw batch size is
+        set, the indices are taken from a pool of pre-drawn indices, which is
+        refilled when required.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The instance of RandomStateService that should be used to generate
+            random numbers from.
+        random_choice : instance of RandomChoice
+            The instance of RandomChoice for the MC events.
+        size : int
+            The number of MC event indices to draw.
+
+        Returns
+        -------
+        idxs : instance of numpy.ndarray
+            The (size,)-shaped numpy.ndarray holding the MC event indices.
+        """
+        if self._draw_batch_size is None:
+            return random_choice(rss=rss, size=size)
+
+        if (self._idx_pool_rss_ref is None) or\
+           (self._idx_pool_rss_ref() is not rss) or\
+           (self._idx_pool_rss_seed != rss.seed):
+            self._idx_pool = self._idx_pool[0:0]
+            self._idx_pool_rss_ref = weakref.ref(rss)
+            self._idx_pool_rss_seed = rss.seed
+
+        if len(self._idx_pool) < size:
+            self._idx_pool = np.concatenate((
+                self._idx_pool,
+                random_choice(
+                    rss=rss,
+                    size=max(self._draw_batch_size, size-len(self._idx_pool)))
+            ))
+
+        idxs = self._idx_pool[:size]
+        self._idx_pool = self._idx_pool[size:]
+
+        return idxs
+
     def change_shg_mgr(self, shg_mgr):
         """Changes the instance of SourceHypoGroupManager of the
         pre-event-selection method. Also it invalidates the data cache of this
@@ -405,6 +518,10 @@ class MCDataSamplingBkgGenMethod(
             # Cache the current id of the data.
             self._cache_data_id = data_id
 
+            # Discard the pre-drawn MC event indices.
+            self._idx_pool = self._idx_pool[0:0]
+            self._idx_pool_rss_ref = None
+
             # Create a copy of the MC data with all MC data fields removed,
             # except the specified MC data fields to keep for the
             # ``get_mean_func`` and ``get_event_prob_func`` functions.
@@ -458,7 +575,8 @@ class MCDataSamplingBkgGenMethod(
                     'Create RandomChoice for MC background events.'):
                 self._cache_random_choice = RandomChoice(
                     items=self._cache_mc.indices,
-                    probabilities=self._cache_mc_event_bkg_prob)
+                    probabilities=self._cache_mc_event_bkg_prob,
+                    method=self._random_choice_method)
 
         if mean is None:
             if self._cache_mean is None:
@@ -494,8 +612,9 @@ class MCDataSamplingBkgGenMethod(
         # Draw the actual background events from the selected events of the
         # monte-carlo data set.
         with TaskTimer(tl, 'Draw MC background indices.'):
-            bkg_event_indices = self._cache_random_choice(
+            bkg_event_indices = self._draw_mc_event_indices(
                 rss=rss,
+                random_choice=self._cache_random_choice,
                 size=n_bkg_selected)
 
         with TaskTimer(tl, 'Select MC background events from indices.'):
@@ -616,6 +735,24 @@ class CompositeMCDataSamplingBkgGenMethod(
 
         self.bkg_component_rate_calc_func_dict = bkg_component_rate_calc_func_dict
 
+    @property
+    def draw_batch_size(self):
+        """The minimal number of MC event indices drawn at once. It is always
+        ``None`` for this background generation method, because the drawing
+        probabilities of the MC events change for each call of the
+        ``generate_events`` method.
+        """
+        return self._draw_batch_size
+
+    @draw_batch_size.setter
+    def draw_batch_size(self, n):
+        if n is not None:
+            raise ValueError(
+                f'The {classname(self)} background generation method does not '
+                'support drawing MC event indices in batches! The '
+                'draw_batch_size property must be None!')
+        self._draw_batch_size = n
+
     @property
     def bkg_component_rate_calc_func_dict(self):
         """The dictionary holding the background components (as key) and their
@@ -778,7 +915,8 @@ class CompositeMCDataSamplingBkgGenMethod(
                 'Create RandomChoice for MC background events.'):
             random_choice = RandomChoice(
                 items=data_mc.indices,
-                probabilities=mc_event_bkg_prob)
+                probabilities=mc_event_bkg_prob,
+                method=self._random_choice_method)
 
         # Select the correct mean value.
         if mean is None:
@@ -815,8 +953,9 @@ class CompositeMCDataSamplingBkgGenMethod(
         # Draw the actual background events from the selected events of the
         # monte-carlo data set.
         with TaskTimer(tl, 'Draw MC background indices.'):
-            bkg_event_indices = random_choice(
+            bkg_event_indices = self._draw_mc_event_indices(
                 rss=rss,
+                random_choice=random_choice,
                 size=n_bkg_selected)
 
         with TaskTimer(tl, 'Select MC background events from indices.'):
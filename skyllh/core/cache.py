@@ -0,0 +1,565 @@
+# -*- coding: utf-8 -*-
+
+"""The cache module provides a content-addressed on-disk cache, which can be
+used to store the results of expensive calculations, e.g. prepared data, across
+the lifetime of a process. A cache entry is a directory identified by a key,
+which is a hash created from all the inputs of the calculation. The total size
+of the cache can be bounded, in which case the least recently used entries are
+evicted.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import os.path
+import pickle
+import re
+import shutil
+import tempfile
+
+import numpy as np
+
+import skyllh
+from skyllh.core.debugging import (
+    get_logger,
+)
+from skyllh.core.py import (
+    classname,
+    int_cast,
+)
+
+
+logger = get_logger(__name__)
+
+# The pattern of memory addresses within the default representation of
+# objects, e.g. ``<Foo object at 0x7f...>``.
+_MEMORY_ADDRESS_PATTERN = re.compile(r' at 0x[0-9a-fA-F]+')
+
+# The exceptions raised when unpickling a corrupt file, or a stale file, whose
+# classes do not exist anymore in the current code.
+_UNPICKLING_ERRORS = (
+    OSError,
+    EOFError,
+    pickle.UnpicklingError,
+    AttributeError,
+    ImportError,
+)
+
+
+def get_file_checksum(
+        pathfilename,
+        blocksize=2**20):
+    """Calculates the SHA-256 checksum of the content of the given file.
+
+    Parameters
+    ----------
+    pathfilename : str
+        The fully qualified file name of the file.
+    blocksize : int
+        The size in bytes of the blocks in which the file is read.
+
+    Returns
+    -------
+    checksum : str
+        The hexadecimal SHA-256 checksum of the file content.
+    """
+    h = hashlib.sha256()
+    with open(pathfilename, 'rb') as f:
+        for block in iter(lambda: f.read(blocksize), b''):
+            h.update(block)
+
+    return h.hexdigest()
+
+
+def _get_object_fingerprint(obj, depth, ignore_attrs=()):
+    """Creates a string representation of the given object, which is stable
+    across Python processes. See :func:`get_callable_fingerprint`. The
+    attributes of callable class instances, whose names are given by
+    ``ignore_attrs``, are not included. Objects without a stable
+    representation are represented by their class name only, and a warning is
+    logged.
+    """
+    if depth > 8:
+        return classname(obj)
+
+    if isinstance(obj, functools.partial):
+        return 'partial({},{},{})'.format(
+            _get_object_fingerprint(obj.func, depth+1, ignore_attrs),
+            _get_object_fingerprint(obj.args, depth+1, ignore_attrs),
+            _get_object_fingerprint(
+                sorted(obj.keywords.items()), depth+1, ignore_attrs))
+
+    if inspect.ismethod(obj):
+        return 'method({},{})'.format(
+            _get_object_fingerprint(obj.__func__, depth+1, ignore_attrs),
+            _get_object_fingerprint(obj.__self__, depth+1, ignore_attrs))
+
+    if inspect.isfunction(obj):
+        try:
+            code = inspect.getsource(obj)
+        except (OSError, TypeError):
+            code = repr(obj.__code__.co_code) + repr(obj.__code__.co_consts)
+        s = f'function({obj.__module__}.{obj.__qualname__},{code}'
+        if obj.__defaults__ is not None:
+            s += ',' + _get_object_fingerprint(
+                obj.__defaults__, depth+1, ignore_attrs)
+        if obj.__closure__ is not None:
+            s += ',' + _get_object_fingerprint(
+                [cell.cell_contents for cell in obj.__closure__],
+                depth+1,
+                ignore_attrs)
+        return s + ')'
+
+    if isinstance(obj, (list, tuple)):
+        return '({})'.format(','.join(
+            _get_object_fingerprint(o, depth+1, ignore_attrs) for o in obj))
+
+    if isinstance(obj, dict):
+        return '{{{}}}'.format(','.join(
+            f'{_get_object_fingerprint(k, depth+1, ignore_attrs)}:'
+            f'{_get_object_fingerprint(v, depth+1, ignore_attrs)}'
+            for (k, v) in sorted(obj.items(), key=lambda kv: repr(kv[0]))))
+
+    if isinstance(obj, np.ndarray):
+        return 'ndarray({},{},{})'.format(
+            obj.dtype.str,
+            obj.shape,
+            hashlib.sha256(np.ascontiguousarray(obj).tobytes()).hexdigest())
+
+    if isinstance(obj, (type(None), bool, int, float, complex, str, bytes)):
+        return repr(obj)
+
+    if callable(obj) and hasattr(obj, '__dict__'):
+        # A callable class instance. Its behavior is defined by the source code
+        # of its class and its state.
+        cls = type(obj)
+        try:
+            code = inspect.getsource(cls)
+        except (OSError, TypeError):
+            code = ''
+        return 'instance({}.{},{},{})'.format(
+            cls.__module__,
+            cls.__qualname__,
+            code,
+            _get_object_fingerprint(
+                dict(
+                    (k, v)
+                    for (k, v) in vars(obj).items()
+                    if k not in ignore_attrs),
+                depth+1,
+                ignore_attrs))
+
+    # The representation of an object, whose class does not define its own,
+    # contains the object's memory address, which changes between processes.
+    s = repr(obj)
+    if _MEMORY_ADDRESS_PATTERN.search(s) is not None:
+        logger.warning(
+            'The object of type %s has no representation, which is stable '
+            'across Python processes. Only its type enters the fingerprint!',
+            classname(obj))
+        return classname(obj)
+
+    return s
+
+
+def get_callable_fingerprint(func):
+    """Creates a fingerprint of the given callable object, which is stable
+    across Python processes. It is built from the qualified name and the source
+    code of the callable, and from the values it depends on, i.e. default
+    argument values, closure variables, arguments of functools.partial objects
+    and the state of callable class instances.
+
+    Parameters
+    ----------
+    func : callable
+        The callable object.
+
+    Returns
+    -------
+    fingerprint : str
+        The hexadecimal SHA-256 hash of the callable.
+    """
+    if not callable(func):
+        raise TypeError(
+            'The func argument must be a callable object! '
+            f'Its current type is {classname(func)}.')
+
+    s = _get_object_fingerprint(func, depth=0)
+
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+def get_model_fingerprint(model):
+    """Creates a fingerprint of the given model instance, e.g. a flux model,
+    which is stable across Python processes. In contrast to
+    :func:`get_callable_fingerprint`, the names and the configuration of the
+    model and its sub-models are not included, because the name of a model
+    defaults to its memory address and the configuration holds settings, which
+    do not change the behavior of the model, e.g. directories. Settings of the
+    configuration, which the cached values depend on, e.g. the internal units,
+    need to be added to the cache key explicitly.
+
+    Parameters
+    ----------
+    model : instance of Model
+        The model instance.
+
+    Returns
+    -------
+    fingerprint : str
+        The hexadecimal SHA-256 hash of the model.
+    """
+    s = _get_object_fingerprint(
+        model, depth=0, ignore_attrs=('_name', '_cfg'))
+
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+def create_DiskCache_from_config(
+        cfg,
+        name):
+    """Creates a DiskCache instance for the cache of the given name as
+    configured via ``cfg['caching'][name]``, which must be a dictionary with the
+    keys ``'directory'`` and ``'max_size'``.
+
+    Parameters
+    ----------
+    cfg : instance of Config
+        The instance of Config holding the local configuration.
+    name : str
+        The name of the cache.
+
+    Returns
+    -------
+    cache : instance of DiskCache | None
+        The instance of DiskCache, or ``None`` if no directory is configured
+        for the cache.
+    """
+    cache_cfg = cfg['caching'].get(name, dict())
+    directory = cache_cfg.get('directory', None)
+    if directory is None:
+        return None
+
+    return DiskCache(
+        directory=directory,
+        max_size=cache_cfg.get('max_size', None))
+
+
+def make_cache_key(*components):
+    """Creates a cache key from the given components. Each component must have
+    a representation that is stable across Python processes, e.g. str, numbers,
+    or lists, tuples and dictionaries thereof. The version of SkyLLH is always
+    part of the key, so cache entries created by a different version of the
+    code are not used.
+
+    Parameters
+    ----------
+    *components : objects
+        The components that define the cache entry.
+
+    Returns
+    -------
+    key : str
+        The hexadecimal SHA-256 hash of the components.
+    """
+    s = _get_object_fingerprint(
+        (skyllh.__version__,) + components, depth=0)
+
+    return hashlib.sha256(s.encode('utf-8')).hexdigest()
+
+
+class DiskCache(
+        object,
+):
+    """This class provides a content-addressed on-disk cache. Each cache entry
+    is a sub-directory of the cache directory named by the cache key. Entries
+    are written into a temporary directory first and are then renamed
+    atomically, so several processes can use the same cache directory
+    concurrently.
+
+    If a maximum size is specified, the least recently used entries are evicted
+    after a new entry was added, until the total size of the cache is below the
+    maximum size. The usage time of an entry is tracked through the
+    modification time of its directory.
+    """
+
+    _CHECKSUMS_FILENAME = 'file_checksums.pkl'
+    _OBJECT_FILENAME = 'object.pkl'
+
+    def __init__(
+            self,
+            directory,
+            max_size=None,
+            **kwargs,
+    ):
+        """Creates a new DiskCache instance.
+
+        Parameters
+        ----------
+        directory : str
+            The path of the cache directory. It will be created if it does not
+            exist.
+        max_size : int | None
+            The maximum size in bytes of the cache. If set to ``None``, the size
+            of the cache is not limited.
+        """
+        super().__init__(**kwargs)
+
+        if not isinstance(directory, str):
+            raise TypeError(
+                'The directory argument must be an instance of str! '
+                f'Its current type is {classname(directory)}.')
+
+        self._directory = os.path.abspath(directory)
+        self._max_size = int_cast(
+            max_size,
+            'The max_size argument must be None, or castable to type int!',
+            allow_None=True)
+
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        """(read-only) The path of the cache directory.
+        """
+        return self._directory
+
+    @property
+    def max_size(self):
+        """(read-only) The maximum size in bytes of the cache. ``None`` means
+        the size is not limited.
+        """
+        return self._max_size
+
+    def get_entry_path(self, key):
+        """Returns the path of the entry directory of the given cache key.
+        """
+        return os.path.join(self._directory, key)
+
+    def get_entry_keys(self):
+        """Returns the list of keys of all cache entries.
+        """
+        return [
+            name
+            for name in os.listdir(self._directory)
+            if (not name.startswith('.')) and
+            os.path.isdir(os.path.join(self._directory, name))
+        ]
+
+    def has_entry(self, key):
+        """Checks if an entry exists for the given key.
+        """
+        return os.path.isdir(self.get_entry_path(key))
+
+    def get(self, key):
+        """Retrieves the path of the entry directory for the given key and marks
+        the entry as recently used.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        path : str | None
+            The path of the entry directory, or ``None`` if no entry exists for
+            the given key.
+        """
+        path = self.get_entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        return path
+
+    def put(self, key, write_func):
+        """Creates a new cache entry for the given key. If an entry already
+        exists for the key, it is kept as is.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        write_func : callable
+            The function with call signature ``__call__(path)`` that writes the
+            content of the entry into the given directory ``path``.
+
+        Returns
+        -------
+        path : str
+            The path of the entry directory.
+        """
+        path = self.get_entry_path(key)
+
+        tmp_path = tempfile.mkdtemp(prefix=f'.{key}.', dir=self._directory)
+        try:
+            write_func(tmp_path)
+            try:
+                os.rename(tmp_path, path)
+            except OSError:
+                # Another process created the entry in the meantime.
+                if not os.path.isdir(path):
+                    raise
+        finally:
+            if os.path.isdir(tmp_path):
+                shutil.rmtree(tmp_path, ignore_errors=True)
+
+        self.evict(keep_keys=[key])
+
+        return path
+
+    def remove(self, key):
+        """Removes the entry of the given key from the cache.
+        """
+        path = self.get_entry_path(key)
+        # Rename the entry first, so that other processes do not see a partly
+        # removed entry.
+        tmp_path = tempfile.mkdtemp(prefix=f'.{key}.', dir=self._directory)
+        try:
+            os.rename(path, os.path.join(tmp_path, key))
+        except OSError:
+            pass
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    @staticmethod
+    def _get_dir_size(path):
+        """Calculates the total size in bytes of the files in the given
+        directory.
+        """
+        size = 0
+        for (dirpath, dirnames, filenames) in os.walk(path):
+            for filename in filenames:
+                try:
+                    size += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return size
+
+    def get_size(self):
+        """Calculates the total size in bytes of all cache entries.
+        """
+        return sum(
+            self._get_dir_size(self.get_entry_path(key))
+            for key in self.get_entry_keys())
+
+    def evict(self, keep_keys=None):
+        """Removes the least recently used entries until the total size of the
+        cache is not larger than the maximum size.
+
+        Parameters
+        ----------
+        keep_keys : sequence of str | None
+            The keys of the entries that must not be evicted.
+        """
+        if self._max_size is None:
+            return
+
+        if keep_keys is None:
+            keep_keys = []
+
+        entries = []
+        for key in self.get_entry_keys():
+            path = self.get_entry_path(key)
+            try:
+                atime = os.path.getmtime(path)
+            except OSError:
+                continue
+            entries.append((atime, key, self._get_dir_size(path)))
+
+        total_size = sum(e[2] for e in entries)
+        for (atime, key, size) in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            if key in keep_keys:
+                continue
+            logger.debug(
+                f'Evicting cache entry "{key}" of size {size} bytes.')
+            self.remove(key)
+            total_size -= size
+
+    def get_object(self, key, create_func):
+        """Retrieves the pickled object stored in the entry of the given key.
+        If no such entry exists, the object is created by calling
+        ``create_func`` and is stored in a new entry.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        create_func : callable
+            The function with call signature ``__call__()`` that creates the
+            object in case it is not cached yet. The object must be picklable.
+
+        Returns
+        -------
+        obj : object
+            The cached or newly created object.
+        """
+        path = self.get(key)
+        if path is not None:
+            try:
+                with open(os.path.join(path, self._OBJECT_FILENAME), 'rb') as f:
+                    return pickle.load(f)
+            except _UNPICKLING_ERRORS:
+                logger.warning(
+                    f'The cache entry "{key}" is corrupt or stale. Recreating '
+                    'it.')
+                self.remove(key)
+
+        obj = create_func()
+
+        def write_func(path):
+            with open(os.path.join(path, self._OBJECT_FILENAME), 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.put(key, write_func)
+
+        return obj
+
+    def get_file_checksum(self, pathfilename):
+        """Calculates the SHA-256 checksum of the content of the given file.
+        The checksums are memorized in the cache directory, keyed by the file
+        name, size and modification time, so large files need to be read only
+        once.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The fully qualified file name of the file.
+
+        Returns
+        -------
+        checksum : str
+            The hexadecimal SHA-256 checksum of the file content.
+        """
+        pathfilename = os.path.abspath(pathfilename)
+        st = os.stat(pathfilename)
+        file_id = (pathfilename, st.st_size, st.st_mtime_ns)
+
+        checksums_pathfilename = os.path.join(
+            self._directory, self._CHECKSUMS_FILENAME)
+        checksums = dict()
+        try:
+            with open(checksums_pathfilename, 'rb') as f:
+                checksums = pickle.load(f)
+        except _UNPICKLING_ERRORS:
+            pass
+
+        if file_id in checksums:
+            return checksums[file_id]
+
+        checksum = get_file_checksum(pathfilename)
+        checksums[file_id] = checksum
+
+        # Write the checksums file atomically. Concurrent updates may lose
+        # memorized checksums, which only causes their recalculation.
+        (fd, tmp_pathfilename) = tempfile.mkstemp(
+            prefix=f'.{self._CHECKSUMS_FILENAME}.', dir=self._directory)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(checksums, f)
+        os.replace(tmp_pathfilename, checksums_pathfilename)
+
+        return checksum
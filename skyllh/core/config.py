@@ -35,6 +35,13 @@ _BASECONFIG = {
         # setting will be used if a function's local ncpu setting is not
         # specified.
         'ncpu': None,
+        # The number of threads to use for evaluating the log-likelihood ratio
+        # functions of the individual datasets of a multi-dataset
+        # log-likelihood ratio function concurrently. If set to None or 1, the
+        # datasets are evaluated sequentially. This setting is used if the
+        # n_threads setting of the log-likelihood ratio function is not
+        # specified.
+        'llhratio_n_threads': None,
     },
     'debugging': {
         # The default log format.
@@ -89,7 +96,34 @@ _BASECONFIG = {
     'caching': {
         'pdf': {
             'MultiDimGridPDF': False,
-        }
+        },
+        # The on-disk cache of prepared dataset data, which is used by the
+        # Dataset.load_and_prepare_data method. If the directory is set to
+        # None, no caching is performed. The maximal size is given in bytes.
+        # If set to None, the size of the cache is not limited.
+        'dataset_data': {
+            'directory': None,
+            'max_size': None,
+        },
+        # The on-disk cache of parsed text data files in binary format, which
+        # is used by the TextFileLoader class for the data files of datasets.
+        'text_files': {
+            'directory': None,
+            'max_size': None,
+        },
+        # The on-disk cache of PDF sets, which are constructed on a grid of
+        # parameter values, e.g. the signal energy PDF set of the public data
+        # point-source analysis.
+        'pdf_sets': {
+            'directory': None,
+            'max_size': None,
+        },
+        # The on-disk cache of the splines of detector signal yields, which are
+        # constructed on a grid of parameter values.
+        'detsigyields': {
+            'directory': None,
+            'max_size': None,
+        },
     }
 }
 
@@ -3,6 +3,7 @@
 import abc
 import os
 import os.path
+import pickle
 import shutil
 import stat
 
@@ -18,6 +19,11 @@ from skyllh.core import (
 from skyllh.core.binning import (
     BinningDefinition,
 )
+from skyllh.core.cache import (
+    create_DiskCache_from_config,
+    get_callable_fingerprint,
+    make_cache_key,
+)
 from skyllh.core.config import (
     HasConfig,
 )
@@ -34,6 +40,10 @@ from skyllh.core.display import (
 from skyllh.core.livetime import (
     Livetime,
 )
+from skyllh.core.multiproc import (
+    limit_ncpu_by_memory,
+    parallelize,
+)
 from skyllh.core.progressbar import (
     ProgressBar,
 )
@@ -49,6 +59,7 @@ from skyllh.core.py import (
 )
 from skyllh.core.storage import (
     DataFieldRecordArray,
+    TextFileLoader,
     create_FileLoader,
 )
 from skyllh.core.timing import (
@@ -1571,6 +1582,8 @@ class Dataset(
             dtc_except_fields=None,
             efficiency_mode=None,
             tl=None,
+            ncpu=None,
+            max_memory=None,
     ):
         """Loads the data, which is described by the dataset.
 
@@ -1608,11 +1621,23 @@ class Dataset(
                     The data will be loaded in a time efficient way. This will
                     require more memory, because each data file gets loaded in
                     memory at once.
+                ``'mmap'``
+                    The data will be memory mapped in copy-on-write mode. This
+                    allows several processes to share the memory of the same
+                    data files. Only modified memory pages get copied.
 
             The default value is ``'time'``. If set to ``None``, the default
             value will be used.
         tl : instance of TimeLord | None
             The TimeLord instance to use to time the data loading procedure.
+        ncpu : int | None
+            The number of processes to use for loading several data files in
+            parallel. If set to ``None``, the data files are loaded
+            sequentially.
+        max_memory : int | None
+            The maximum memory in bytes of the data files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
 
         Returns
         -------
@@ -1648,12 +1673,15 @@ class Dataset(
         if keep_fields is None:
             keep_fields = []
 
+        if ncpu is None:
+            ncpu = 1
+
         datafields = {**self._cfg['datafields'], **self._datafields}
 
         # Load the experimental data if there is any.
         if len(self._exp_pathfilename_list) > 0:
             with TaskTimer(tl, 'Loading exp data from disk.'):
-                fileloader_exp = create_FileLoader(
+                fileloader_exp = self.create_file_loader(
                     self.exp_abs_pathfilename_list)
                 # Create the list of field names that should get kept.
                 keep_fields_exp = list(set(
@@ -1676,7 +1704,9 @@ class Dataset(
                     dtype_conversion_except_fields=_conv_new2orig_field_names(
                         dtc_except_fields,
                         self._exp_field_name_renaming_dict),
-                    efficiency_mode=efficiency_mode)
+                    efficiency_mode=efficiency_mode,
+                    ncpu=ncpu,
+                    max_memory=max_memory)
                 data_exp.rename_fields(self._exp_field_name_renaming_dict)
         else:
             data_exp = None
@@ -1684,7 +1714,7 @@ class Dataset(
         # Load the monte-carlo data if there is any.
         if len(self._mc_pathfilename_list) > 0:
             with TaskTimer(tl, 'Loading mc data from disk.'):
-                fileloader_mc = create_FileLoader(
+                fileloader_mc = self.create_file_loader(
                     self.mc_abs_pathfilename_list)
                 # Determine `keep_fields_mc` for the generic case, where MC
                 # field names are an union of exp and mc field names.
@@ -1721,7 +1751,9 @@ class Dataset(
                     dtype_conversion_except_fields=_conv_new2orig_field_names(
                         dtc_except_fields,
                         self._mc_field_name_renaming_dict),
-                    efficiency_mode=efficiency_mode)
+                    efficiency_mode=efficiency_mode,
+                    ncpu=ncpu,
+                    max_memory=max_memory)
                 data_mc.rename_fields(self._mc_field_name_renaming_dict)
         else:
             data_mc = None
@@ -1771,8 +1803,8 @@ class Dataset(
 
         aux_pathfilename_list = self._aux_data_definitions[name]
         with TaskTimer(tl, f'Loaded aux data "{name}" from disk.'):
-            fileloader_aux = create_FileLoader(self.get_abs_pathfilename_list(
-                aux_pathfilename_list))
+            fileloader_aux = self.create_file_loader(
+                self.get_abs_pathfilename_list(aux_pathfilename_list))
             data = fileloader_aux.load_data()
 
         return data
@@ -1870,6 +1902,8 @@ class Dataset(
             dtc_except_fields=None,
             efficiency_mode=None,
             tl=None,
+            ncpu=None,
+            max_memory=None,
     ):
         """Loads and prepares the experimental and monte-carlo data of this
         dataset by calling its ``load_data`` and ``prepare_data`` methods.
@@ -1907,12 +1941,24 @@ class Dataset(
                     The data will be loaded in a time efficient way. This will
                     require more memory, because each data file gets loaded in
                     memory at once.
+                ``'mmap'``
+                    The data will be memory mapped in copy-on-write mode. This
+                    allows several processes to share the memory of the same
+                    data files. Only modified memory pages get copied.
 
             The default value is ``'time'``. If set to ``None``, the default
             value will be used.
         tl : instance of TimeLord | None
             The instance of TimeLord that should be used to time the data
             loading and preparation.
+        ncpu : int | None
+            The number of processes to use for loading several data files in
+            parallel. If set to ``None``, the data files are loaded
+            sequentially.
+        max_memory : int | None
+            The maximum memory in bytes of the data files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
 
         Returns
         -------
@@ -1927,13 +1973,38 @@ class Dataset(
                 'The keep_fields argument must be None, or a sequence of str!')
         keep_fields = list(keep_fields)
 
+        # Try to load the prepared data from the data cache, if configured.
+        cache = self._get_data_cache()
+        if cache is not None:
+            with TaskTimer(tl, 'Creating data cache key.'):
+                cache_key = self.create_data_cache_key(
+                    cache=cache,
+                    livetime=livetime,
+                    keep_fields=keep_fields,
+                    dtc_dict=dtc_dict,
+                    dtc_except_fields=dtc_except_fields)
+            path = cache.get(cache_key)
+            if path is not None:
+                with TaskTimer(tl, 'Loading prepared data from cache.'):
+                    data = self._read_data_from_cache(
+                        path=path,
+                        efficiency_mode=efficiency_mode)
+                logger = get_logger(module_class_method_name(
+                    self, 'load_and_prepare_data'))
+                logger.debug(
+                    f'Loaded prepared data of dataset "{self.name}" from '
+                    f'cache entry "{path}".')
+                return data
+
         data = self.load_data(
             keep_fields=keep_fields,
             livetime=livetime,
             dtc_dict=dtc_dict,
             dtc_except_fields=dtc_except_fields,
             efficiency_mode=efficiency_mode,
-            tl=tl)
+            tl=tl,
+            ncpu=ncpu,
+            max_memory=max_memory)
 
         self.prepare_data(data, tl=tl)
 
@@ -1968,6 +2039,297 @@ class Dataset(
         with TaskTimer(tl, 'Asserting data format.'):
             assert_data_format(self, data)
 
+        if cache is not None:
+            with TaskTimer(tl, 'Writing prepared data to cache.'):
+                cache.put(
+                    cache_key,
+                    lambda path: self._write_data_to_cache(path, data))
+
+        return data
+
+    def _get_data_cache(self):
+        """Creates the DiskCache instance for the prepared data as configured
+        via ``Config['caching']['dataset_data']``.
+
+        Returns
+        -------
+        cache : instance of DiskCache | None
+            The instance of DiskCache, or ``None`` if no data cache directory
+            is configured.
+        """
+        return create_DiskCache_from_config(self._cfg, 'dataset_data')
+
+    def get_text_file_cache(self):
+        """Creates the DiskCache instance for the parsed text data files as
+        configured via ``Config['caching']['text_files']``.
+
+        Returns
+        -------
+        cache : instance of DiskCache | None
+            The instance of DiskCache, or ``None`` if no text file cache
+            directory is configured.
+        """
+        return create_DiskCache_from_config(self._cfg, 'text_files')
+
+    def create_file_loader(
+            self,
+            pathfilenames,
+    ):
+        """Creates the appropriate FileLoader instance for the given data
+        files of this dataset, using the configured text file cache.
+
+        Parameters
+        ----------
+        pathfilenames : str | sequence of str
+            The sequence of fully qualified file names of the data files.
+
+        Returns
+        -------
+        fileloader : instance of FileLoader
+            The appropriate FileLoader instance for the given type of data
+            files.
+        """
+        return create_FileLoader(
+            pathfilenames,
+            cache=self.get_text_file_cache())
+
+    def build_text_file_cache(
+            self,
+            tl=None,
+    ):
+        """Parses all the text data files of this dataset, i.e. the
+        experimental, monte-carlo and auxiliary data files, and stores them in
+        the text file cache in a binary format, unless they are cached already.
+
+        Parameters
+        ----------
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord to time the cache creation.
+
+        Returns
+        -------
+        keys : list of str
+            The list of cache keys of all the text data files of this dataset.
+
+        Raises
+        ------
+        ValueError
+            If no text file cache directory is configured.
+        """
+        cache = self.get_text_file_cache()
+        if cache is None:
+            raise ValueError(
+                'No text file cache directory is configured via '
+                'cfg[\'caching\'][\'text_files\'][\'directory\']!')
+
+        if self._cfg['repository']['download_from_origin'] is True:
+            self.make_data_available()
+
+        pathfilenames = self.get_data_cache_pathfilenames()
+        for aux_pathfilename_list in self._aux_data_definitions.values():
+            pathfilenames += self.get_abs_pathfilename_list(
+                aux_pathfilename_list)
+
+        keys = []
+        with TaskTimer(tl, f'Building text file cache of "{self.name}".'):
+            for pathfilename in pathfilenames:
+                fileloader = create_FileLoader(pathfilename, cache=cache)
+                if not isinstance(fileloader, TextFileLoader):
+                    continue
+                keys += fileloader.build_cache()
+
+        return keys
+
+    def get_data_cache_pathfilenames(self):
+        """Returns the list of the fully qualified file names of all data
+        files, whose content defines the prepared data of this dataset.
+
+        Returns
+        -------
+        pathfilenames : list of str
+            The list of fully qualified file names.
+        """
+        return (
+            self.exp_abs_pathfilename_list +
+            self.mc_abs_pathfilename_list
+        )
+
+    def create_data_cache_key(
+            self,
+            cache,
+            livetime,
+            keep_fields,
+            dtc_dict,
+            dtc_except_fields,
+    ):
+        """Creates the key of the data cache entry for the prepared data of
+        this dataset. The key is built from the checksums of the data files,
+        the arguments of the :meth:`load_and_prepare_data` method, the data
+        field definitions and renaming, and the fingerprints of the data
+        preparation functions. As every cache key created by the
+        :func:`~skyllh.core.cache.make_cache_key` function, it includes the
+        version of SkyLLH, so data prepared by a different version of the
+        data loading code is not used.
+
+        .. note::
+
+            Data preparation functions must depend only on their own source
+            code and state, and on the data. Otherwise a stale cache entry might
+            be used.
+
+        Parameters
+        ----------
+        cache : instance of DiskCache
+            The instance of DiskCache, which is used to memorize the file
+            checksums.
+        livetime : float | instance of Livetime | None
+            The user-defined livetime.
+        keep_fields : list of str
+            The list of additional data fields that should get kept.
+        dtc_dict : dict | None
+            The data type conversion dictionary.
+        dtc_except_fields : str | sequence of str | None
+            The field names whose data type should not get converted.
+
+        Returns
+        -------
+        key : str
+            The cache key.
+        """
+        if isinstance(livetime, Livetime):
+            livetime = livetime.livetime
+        elif livetime is not None:
+            livetime = float_cast(
+                livetime,
+                'The livetime argument must be None, an instance of Livetime, '
+                'or castable to type float!')
+
+        if dtc_dict is not None:
+            dtc_dict = sorted(
+                (np.dtype(k).str, np.dtype(v).str)
+                for (k, v) in dtc_dict.items())
+        if isinstance(dtc_except_fields, str):
+            dtc_except_fields = [dtc_except_fields]
+        if dtc_except_fields is not None:
+            dtc_except_fields = sorted(dtc_except_fields)
+
+        file_checksums = [
+            cache.get_file_checksum(pathfilename)
+            for pathfilename in self.get_data_cache_pathfilenames()
+        ]
+
+        data_prep_fingerprints = [
+            get_callable_fingerprint(func)
+            for func in self._data_preparation_functions
+        ]
+
+        key = make_cache_key(
+            classname(self),
+            file_checksums,
+            livetime,
+            sorted(set(keep_fields)),
+            dtc_dict,
+            dtc_except_fields,
+            {**self._cfg['datafields'], **self._datafields},
+            self._exp_field_name_renaming_dict,
+            self._mc_field_name_renaming_dict,
+            data_prep_fingerprints)
+
+        return key
+
+    def get_data_cache_arrays(self, data):
+        """Returns the data arrays of the given prepared data, which need to be
+        stored in the data cache. Derived classes can extend this method to
+        store additional data arrays.
+
+        Parameters
+        ----------
+        data : instance of DatasetData
+            The instance of DatasetData holding the prepared data.
+
+        Returns
+        -------
+        arrays : dict of str -> instance of DataFieldRecordArray | None
+            The dictionary holding the data arrays by their name.
+        """
+        return {
+            'exp': data.exp,
+            'mc': data.mc,
+        }
+
+    def create_data_from_cache_arrays(self, arrays, livetime):
+        """Creates the DatasetData instance from the data arrays loaded from
+        the data cache. This is the counterpart of the
+        :meth:`get_data_cache_arrays` method.
+
+        Parameters
+        ----------
+        arrays : dict of str -> instance of DataFieldRecordArray | None
+            The dictionary holding the data arrays by their name.
+        livetime : float | None
+            The livetime of the data.
+
+        Returns
+        -------
+        data : instance of DatasetData
+            The instance of DatasetData holding the prepared data.
+        """
+        return DatasetData(
+            data_exp=arrays['exp'],
+            data_mc=arrays['mc'],
+            livetime=livetime)
+
+    def _write_data_to_cache(self, path, data):
+        """Writes the given prepared data into the given cache entry
+        directory. Each data field is stored as an individual .npy file, so it
+        can be loaded column-wise or memory mapped.
+        """
+        meta = {
+            'livetime': data.livetime,
+            'fields': dict(),
+        }
+        for (name, arr) in self.get_data_cache_arrays(data).items():
+            if arr is None:
+                meta['fields'][name] = None
+                continue
+            meta['fields'][name] = arr.field_name_list
+            os.mkdir(os.path.join(path, name))
+            for (fidx, fname) in enumerate(arr.field_name_list):
+                np.save(
+                    os.path.join(path, name, f'{fidx}.npy'),
+                    np.ascontiguousarray(arr[fname]))
+
+        with open(os.path.join(path, 'meta.pkl'), 'wb') as f:
+            pickle.dump(meta, f)
+
+    def _read_data_from_cache(self, path, efficiency_mode):
+        """Reads the prepared data from the given cache entry directory.
+        If ``efficiency_mode`` is ``'mmap'``, the data fields are memory
+        mapped in copy-on-write mode.
+        """
+        mmap_mode = 'c' if efficiency_mode == 'mmap' else None
+
+        with open(os.path.join(path, 'meta.pkl'), 'rb') as f:
+            meta = pickle.load(f)
+
+        arrays = dict()
+        for (name, field_names) in meta['fields'].items():
+            if field_names is None:
+                arrays[name] = None
+                continue
+            arrays[name] = DataFieldRecordArray(
+                dict([
+                    (fname, np.load(
+                        os.path.join(path, name, f'{fidx}.npy'),
+                        mmap_mode=mmap_mode))
+                    for (fidx, fname) in enumerate(field_names)
+                ]),
+                copy=False)
+
+        data = self.create_data_from_cache_arrays(
+            arrays=arrays,
+            livetime=meta['livetime'])
+
         return data
 
     def add_binning_definition(
@@ -2732,15 +3094,54 @@ class DatasetCollection(
         for dataset in self._datasets.values():
             dataset.update_version_qualifiers(verqualifiers)
 
+    def build_text_file_cache(
+            self,
+            tl=None,
+            ppbar=None,
+    ):
+        """Builds the text file cache for all datasets of this dataset
+        collection. See the :meth:`Dataset.build_text_file_cache` method.
+
+        Parameters
+        ----------
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord to time the cache creation.
+        ppbar : instance of ProgressBar | None
+            The optional parent progress bar.
+
+        Returns
+        -------
+        keys_dict : dict of str => list of str
+            The dictionary with the dataset names as keys and the lists of
+            cache keys of the text data files of the datasets as values.
+        """
+        pbar = ProgressBar(len(self._datasets), parent=ppbar).start()
+        keys_dict = dict()
+        for (dsname, dataset) in self._datasets.items():
+            keys_dict[dsname] = dataset.build_text_file_cache(tl=tl)
+            pbar.increment()
+        pbar.finish()
+
+        return keys_dict
+
     def load_data(
             self,
             livetime=None,
             tl=None,
             ppbar=None,
+            ncpu=None,
+            max_memory=None,
             **kwargs,
     ):
         """Loads the data of all data sets of this data set collection.
 
+        If more than one CPU is used and the collection contains several
+        datasets, the datasets are loaded in parallel by several processes,
+        each loading the files of its dataset sequentially. Otherwise the
+        datasets are loaded one after another, and the files of each dataset
+        are loaded in parallel. The order of the returned data does not depend
+        on the number of CPUs.
+
         Parameters
         ----------
         livetime : float | dict of str => float | None
@@ -2753,6 +3154,13 @@ class DatasetCollection(
             operation.
         ppbar : instance of ProgressBar | None
             The optional parent progress bar.
+        ncpu : int | None
+            The number of processes to use for loading the data. If set to
+            ``None``, the data is loaded sequentially.
+        max_memory : int | None
+            The maximum memory in bytes of the data files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
         **kwargs
             Additional keyword arguments are passed to the
             :meth:`~skyllh.core.dataset.Dataset.load_data` method of the
@@ -2776,12 +3184,61 @@ class DatasetCollection(
                 f'dictionary with {len(self._datasets)} str:float entries! '
                 f'Currently the dictionary has {len(livetime)} entries.')
 
+        if len(self._datasets) == 0:
+            return dict()
+
+        datasets = list(self._datasets.values())
+        if ncpu is None:
+            ncpu = 1
+
+        if (ncpu > 1) and (len(datasets) > 1):
+            # Limit the number of processes such that the files of the largest
+            # datasets fit into the memory.
+            ncpu = limit_ncpu_by_memory(
+                ncpu=ncpu,
+                task_sizes=[
+                    sum(
+                        os.path.getsize(pathfilename)
+                        for pathfilename in (
+                            dataset.exp_abs_pathfilename_list +
+                            dataset.mc_abs_pathfilename_list)
+                        if os.path.isfile(pathfilename)
+                    )
+                    for dataset in datasets
+                ],
+                max_memory=max_memory)
+
+        if (ncpu > 1) and (len(datasets) > 1):
+            # Load the datasets in parallel. The files of an individual dataset
+            # are loaded sequentially to avoid nested sub-processes.
+            data_list = parallelize(
+                func=_load_dataset_data,
+                args_list=[
+                    ((dataset,), dict(
+                        livetime=livetime[dataset.name],
+                        ncpu=1,
+                        **kwargs))
+                    for dataset in datasets
+                ],
+                ncpu=ncpu,
+                tl=tl,
+                ppbar=ppbar,
+                chunksize=1)
+            data_dict = dict([
+                (dataset.name, data)
+                for (dataset, data) in zip(datasets, data_list)
+            ])
+
+            return data_dict
+
         pbar = ProgressBar(len(self._datasets), parent=ppbar).start()
         data_dict = dict()
         for (dsname, dataset) in self._datasets.items():
             data_dict[dsname] = dataset.load_data(
                 livetime=livetime[dsname],
                 tl=tl,
+                ncpu=ncpu,
+                max_memory=max_memory,
                 **kwargs)
             pbar.increment()
         pbar.finish()
@@ -2789,6 +3246,29 @@ class DatasetCollection(
         return data_dict
 
 
+def _load_dataset_data(
+        dataset,
+        **kwargs,
+):
+    """Loads the data of the given dataset. This function is used by the
+    :meth:`DatasetCollection.load_data` method to load datasets in parallel.
+
+    Parameters
+    ----------
+    dataset : instance of Dataset
+        The instance of Dataset whose data should get loaded.
+    **kwargs
+        Additional keyword arguments are passed to the
+        :meth:`~skyllh.core.dataset.Dataset.load_data` method.
+
+    Returns
+    -------
+    data : instance of DatasetData
+        The instance of DatasetData holding the data of the dataset.
+    """
+    return dataset.load_data(**kwargs)
+
+
 class DatasetData(
         object):
     """This class provides the container for the actual experimental and
@@ -907,6 +907,299 @@ class SpatialBoxEventSelectionMethod(
         return (selected_events, (src_idxs, evt_idxs))
 
 
+class IndexedSpatialBoxEventSelectionMethod(
+        SpatialBoxEventSelectionMethod):
+    """This event selection method selects the same events as the
+    SpatialBoxEventSelectionMethod, but uses a spatial index of the events
+    instead of dense (N_sources, N_events)-shaped masks. The events are
+    grouped into declination bins and sorted by right-ascension within each
+    bin. The events of each source box are then found via binary searches,
+    which makes the selection time roughly proportional to the number of
+    selected source-event pairs. This is advantageous for stacking analyses
+    with many sources.
+    """
+    def __init__(
+            self,
+            shg_mgr,
+            delta_angle,
+            dec_bin_width=None):
+        """Creates and configures an indexed spatial box event selection method
+        object.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The instance of SourceHypoGroupManager that defines the list of
+            sources, i.e. the list of SourceModel instances.
+        delta_angle : float
+            The half-opening angle around the source for which events should
+            get selected.
+        dec_bin_width : float | None
+            The width in radian of the declination bins of the spatial index.
+            If set to ``None``, the value of ``delta_angle`` is used.
+        """
+        super().__init__(
+            shg_mgr=shg_mgr,
+            delta_angle=delta_angle)
+
+        self.dec_bin_width = dec_bin_width
+
+    @property
+    def dec_bin_width(self):
+        """The width in radian of the declination bins of the spatial index.
+        If set to ``None``, the value of the ``delta_angle`` property is used.
+        """
+        return self._dec_bin_width
+
+    @dec_bin_width.setter
+    def dec_bin_width(self, w):
+        if w is not None:
+            w = float_cast(
+                w,
+                'The dec_bin_width property must be None, or castable to type '
+                'float!')
+            if w <= 0:
+                raise ValueError(
+                    'The dec_bin_width property must be positive! '
+                    f'Its current value is {w}.')
+        self._dec_bin_width = w
+
+    def _get_n_dec_bins(self):
+        """Returns the number of declination bins of the spatial index.
+        """
+        w = self._dec_bin_width
+        if w is None:
+            w = self._delta_angle
+        if w <= 0:
+            return 1
+
+        return max(int(np.ceil(np.pi / w)), 1)
+
+    @staticmethod
+    def _get_dec_bin_idxs(dec, n_dec_bins):
+        """Calculates the declination bin indices for the given declination
+        values.
+        """
+        bin_idxs = np.floor((dec + np.pi/2) / np.pi * n_dec_bins).astype(
+            np.int64)
+        return np.clip(bin_idxs, 0, n_dec_bins-1)
+
+    def build_index(
+            self,
+            events,
+            tl=None):
+        """Builds the spatial index of the given events. The events are sorted
+        by declination bin and right-ascension.
+
+        Parameters
+        ----------
+        events : instance of DataFieldRecordArray
+            The instance of DataFieldRecordArray that holds the event data.
+            The data fields ``'ra'`` and ``'dec'`` must exist.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used to collect
+            timing information about this method.
+
+        Returns
+        -------
+        sorted_evt_idxs : 1d ndarray of ints
+            The (N_events,)-shaped numpy ndarray holding the event indices
+            sorted by the index key.
+        sorted_keys : 1d ndarray of floats
+            The (N_events,)-shaped numpy ndarray holding the sorted index keys
+            of the events. The key of an event is its right-ascension, wrapped
+            into the range [0, 2pi), plus 4pi times its declination bin index.
+        """
+        with TaskTimer(tl, 'ESM-Indexed: Build index.'):
+            n_dec_bins = self._get_n_dec_bins()
+
+            evts_ra = np.mod(events['ra'], 2*np.pi)
+            dec_bin_idxs = self._get_dec_bin_idxs(events['dec'], n_dec_bins)
+
+            keys = evts_ra + 4*np.pi*dec_bin_idxs
+            sorted_evt_idxs = np.argsort(keys, kind='stable')
+            sorted_keys = keys[sorted_evt_idxs]
+
+        return (sorted_evt_idxs, sorted_keys)
+
+    def _get_key_ranges(
+            self,
+            srcs_ra,
+            dRA_half,
+            src_dec_minus,
+            src_dec_plus):
+        """Calculates the key ranges of the spatial index, which have to be
+        searched for the events of the individual sources. Each source box
+        is covered by up to two right-ascension intervals, because of the
+        wrap-around at 2pi, for each declination bin it touches.
+
+        Returns
+        -------
+        src_idxs : 1d ndarray of ints
+            The source index of each key range.
+        key_lo : 1d ndarray of floats
+            The lower key bound of each key range.
+        key_hi : 1d ndarray of floats
+            The upper key bound of each key range.
+        """
+        n_sources = len(srcs_ra)
+        n_dec_bins = self._get_n_dec_bins()
+
+        # Determine the right-ascension intervals of the sources. A second
+        # interval is needed for boxes that wrap around 0 or 2pi.
+        ra_lo = srcs_ra - dRA_half
+        ra_hi = srcs_ra + dRA_half
+        full_ra = dRA_half >= np.pi
+
+        ra_lo1 = np.where(full_ra, 0, np.maximum(ra_lo, 0))
+        ra_hi1 = np.where(full_ra, 2*np.pi, np.minimum(ra_hi, 2*np.pi))
+        ra_lo2 = np.where(ra_lo < 0, ra_lo + 2*np.pi, 0)
+        ra_hi2 = np.where(
+            ra_lo < 0, 2*np.pi, np.where(ra_hi > 2*np.pi, ra_hi - 2*np.pi, -1))
+        ra_hi2[full_ra] = -1
+
+        # Create the (source, dec bin) combinations.
+        dec_bin_lo = self._get_dec_bin_idxs(src_dec_minus, n_dec_bins)
+        dec_bin_hi = self._get_dec_bin_idxs(src_dec_plus, n_dec_bins)
+        n_bins = dec_bin_hi - dec_bin_lo + 1
+
+        src_idxs = np.repeat(np.arange(n_sources), n_bins)
+        bin_offsets = np.repeat(np.cumsum(n_bins) - n_bins, n_bins)
+        dec_bin_idxs = (
+            np.repeat(dec_bin_lo, n_bins) +
+            np.arange(len(src_idxs)) - bin_offsets
+        )
+
+        bin_key = 4*np.pi*dec_bin_idxs
+        src_idxs = np.concatenate((src_idxs, src_idxs))
+        key_lo = np.concatenate((
+            bin_key + ra_lo1[src_idxs[:len(bin_key)]],
+            bin_key + ra_lo2[src_idxs[:len(bin_key)]]))
+        key_hi = np.concatenate((
+            bin_key + ra_hi1[src_idxs[:len(bin_key)]],
+            bin_key + ra_hi2[src_idxs[:len(bin_key)]]))
+
+        # Remove empty key ranges.
+        m = key_hi >= key_lo
+
+        return (src_idxs[m], key_lo[m], key_hi[m])
+
+    def select_events(
+            self,
+            events,
+            src_evt_idxs=None,
+            ret_original_evt_idxs=False,
+            tl=None):
+        """Selects the events within the spatial box in right-ascention and
+        declination using a spatial index of the events.
+
+        Parameters
+        ----------
+        events : instance of DataFieldRecordArray
+            The instance of DataFieldRecordArray that holds the event data.
+            The following data fields must exist:
+
+            ``'ra'`` : float
+                The right-ascention of the event.
+            ``'dec'`` : float
+                The declination of the event.
+
+        src_evt_idxs : 2-tuple of 1d ndarrays of ints | None
+            The 2-element tuple holding the two 1d ndarrays of int of length
+            N_values, specifying to which sources the given events belong to.
+        ret_original_evt_idxs : bool
+            Flag if the original indices of the selected events should get
+            returned as well.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used to collect
+            timing information about this method.
+
+        Returns
+        -------
+        selected_events : instance of DataFieldRecordArray
+            The instance of DataFieldRecordArray holding only the selected
+            events.
+        (src_idxs, evt_idxs) : 1d ndarrays of ints
+            The indices of sources and the selected events.
+        original_evt_idxs : 1d ndarray of ints
+            The (N_selected_events,)-shaped numpy ndarray holding the original
+            indices of the selected events, if ``ret_original_evt_idxs`` is set
+            to ``True``.
+        """
+        delta_angle = self._delta_angle
+        src_arr = self._src_arr
+        n_sources = len(src_arr)
+
+        srcs_ra = np.mod(src_arr['ra'], 2*np.pi)
+        srcs_dec = src_arr['dec']
+
+        # Get the minus and plus declination around the sources.
+        src_dec_minus = np.maximum(-np.pi/2, srcs_dec - delta_angle)
+        src_dec_plus = np.minimum(srcs_dec + delta_angle, np.pi/2)
+
+        # Calculate the cosine factor for the largest declination distance from
+        # the source and the resulting half-width in right-ascension.
+        cosfact = np.amin(np.cos([src_dec_minus, src_dec_plus]), axis=0)
+        dRA_half = np.amin(
+            [np.repeat(2*np.pi, n_sources),
+             np.fabs(delta_angle / cosfact)], axis=0)
+
+        (sorted_evt_idxs, sorted_keys) = self.build_index(
+            events=events,
+            tl=tl)
+
+        # Find the candidate source-event pairs via binary searches in the
+        # spatial index.
+        with TaskTimer(tl, 'ESM-Indexed: Query index.'):
+            (range_src_idxs, key_lo, key_hi) = self._get_key_ranges(
+                srcs_ra=srcs_ra,
+                dRA_half=dRA_half,
+                src_dec_minus=src_dec_minus,
+                src_dec_plus=src_dec_plus)
+
+            start = np.searchsorted(sorted_keys, key_lo, side='left')
+            end = np.searchsorted(sorted_keys, key_hi, side='right')
+            n = end - start
+
+            # Expand the index ranges into individual pairs.
+            n_total = np.sum(n)
+            offsets = np.repeat(start - (np.cumsum(n) - n), n)
+            cand_src_idxs = np.repeat(range_src_idxs, n)
+            cand_evt_idxs = sorted_evt_idxs[offsets + np.arange(n_total)]
+
+        # Apply the exact box conditions, which are identical to the ones of
+        # the SpatialBoxEventSelectionMethod class.
+        with TaskTimer(tl, 'ESM-Indexed: Calculate mask_sky.'):
+            ra_diff = np.fabs(
+                events['ra'][cand_evt_idxs] - src_arr['ra'][cand_src_idxs])
+            ra_mod = np.where(ra_diff >= np.pi, 2*np.pi - ra_diff, ra_diff)
+            cand_dec = events['dec'][cand_evt_idxs]
+            mask_sky = (
+                (ra_mod < dRA_half[cand_src_idxs]) &
+                (cand_dec > src_dec_minus[cand_src_idxs]) &
+                (cand_dec < src_dec_plus[cand_src_idxs])
+            )
+            src_idxs = cand_src_idxs[mask_sky]
+            evt_idxs = cand_evt_idxs[mask_sky]
+
+        # Reduce the events to the selected events.
+        with TaskTimer(tl, 'ESM-Indexed: Create selected_events.'):
+            selected_events_idxs = np.unique(evt_idxs)
+            selected_events = events[selected_events_idxs]
+
+        # Map the event indices to the selected events and sort the pairs by
+        # source and event.
+        evt_idxs = np.searchsorted(selected_events_idxs, evt_idxs)
+        sort_idxs = np.lexsort((evt_idxs, src_idxs))
+        src_idxs = src_idxs[sort_idxs]
+        evt_idxs = evt_idxs[sort_idxs]
+
+        if ret_original_evt_idxs:
+            return (selected_events, (src_idxs, evt_idxs), selected_events_idxs)
+
+        return (selected_events, (src_idxs, evt_idxs))
+
+
 class PsiFuncEventSelectionMethod(
         EventSelectionMethod):
     """This event selection method selects events whose psi value, i.e. the
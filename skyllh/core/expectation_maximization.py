@@ -1,5 +1,118 @@
 import numpy as np
-from scipy.stats import norm
+
+
+def em_expectation_step_batch(
+        ns,
+        mu,
+        sigma,
+        t,
+        sob,
+        mask=None,
+):
+    """Expectation step of expectation maximization algorithm for a batch of
+    independent fits, e.g. for the different spectral indices of a gamma scan.
+
+    Parameters
+    ----------
+    ns : instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the number of
+        signal neutrinos, as weight for each gaussian flare.
+    mu : instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the mean for each
+        gaussian flare.
+    sigma: instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the sigma for each
+        gaussian flare.
+    t : instance of ndarray
+        The (n_batch, n_events)- or (n_events,)-shaped numpy ndarray holding
+        the time of each event.
+    sob : instance of ndarray
+        The (n_batch, n_events)-shaped numpy ndarray holding the
+        signal-over-background values of each event.
+    mask : instance of ndarray | None
+        The optional (n_batch, n_events)-shaped boolean numpy ndarray selecting
+        the events that take part in the fit. If set to ``None``, all events
+        are used.
+
+    Returns
+    -------
+    expectations : instance of ndarray
+        The (n_batch, n_flares, n_events)-shaped numpy ndarray holding the
+        expectation of each flare and event. It is zero for masked events.
+    llh : instance of ndarray
+        The (n_batch,)-shaped numpy ndarray holding the log-likelihood value,
+        which is the sum of log of the signal and background expectations.
+    """
+    t = np.broadcast_to(t, sob.shape)
+    if mask is None:
+        mask = np.ones(sob.shape, dtype=np.bool_)
+
+    b_term = (1 - np.cos(10 / 180 * np.pi)) / 2
+    N = np.count_nonzero(mask, axis=1)
+    t_min = np.min(t, axis=1, initial=np.inf, where=mask)
+    t_max = np.max(t, axis=1, initial=-np.inf, where=mask)
+
+    # Calculate the weighted gaussian densities of all flares for all events.
+    ns = ns[:, :, np.newaxis]
+    mu = mu[:, :, np.newaxis]
+    sigma = sigma[:, :, np.newaxis]
+    e_sig = t[:, np.newaxis, :] - mu
+    e_sig /= sigma
+    np.square(e_sig, out=e_sig)
+    e_sig *= -0.5
+    np.exp(e_sig, out=e_sig)
+    e_sig /= np.sqrt(2*np.pi)
+    e_sig /= sigma
+    e_sig *= np.where(mask, sob, 0)[:, np.newaxis, :]
+    e_sig *= ns
+
+    e_bkg = (N - np.sum(ns, axis=(1, 2))) / (t_max - t_min) / b_term
+    denom = np.sum(e_sig, axis=1) + e_bkg[:, np.newaxis]
+
+    expectations = e_sig
+    expectations /= denom[:, np.newaxis, :]
+    llh = np.sum(np.log(denom), axis=1, where=mask)
+
+    return (expectations, llh)
+
+
+def em_maximization_step_batch(
+        e,
+        t,
+):
+    """The maximization step of the expectation maximization algorithm for a
+    batch of independent fits.
+
+    Parameters
+    ----------
+    e : instance of ndarray
+        The (n_batch, n_flares, n_events)-shaped numpy ndarray holding the
+        expectation for each event and flare.
+    t : instance of ndarray
+        The (n_batch, n_events)- or (n_events,)-shaped numpy ndarray holding
+        the time of each event.
+
+    Returns
+    -------
+    mu : instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the best fit mean
+        time of the gaussian flares.
+    sigma : instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the best fit sigma
+        of the gaussian flares.
+    ns : instance of ndarray
+        The (n_batch, n_flares)-shaped numpy ndarray holding the best fit number
+        of signal neutrinos, as weight for the gaussian flares.
+    """
+    t = np.broadcast_to(t, (e.shape[0], e.shape[2]))[:, np.newaxis, :]
+
+    ns = np.sum(e, axis=2)
+    mu = np.sum(e * t, axis=2) / ns
+    sigma = np.sqrt(
+        np.sum(e * np.square(t - mu[:, :, np.newaxis]), axis=2) / ns)
+    sigma = np.maximum(sigma, 1)
+
+    return (mu, sigma, ns)
 
 
 def em_expectation_step(
@@ -37,22 +150,14 @@ def em_expectation_step(
         The log-likelihood value, which is the sum of log of the signal and
         background expectations.
     """
-    n_flares = len(ns)
+    (expectations, llh) = em_expectation_step_batch(
+        ns=np.atleast_2d(np.asarray(ns, dtype=np.float64)),
+        mu=np.atleast_2d(np.asarray(mu, dtype=np.float64)),
+        sigma=np.atleast_2d(np.asarray(sigma, dtype=np.float64)),
+        t=t,
+        sob=np.atleast_2d(sob))
 
-    b_term = (1 - np.cos(10 / 180 * np.pi)) / 2
-    N = len(t)
-    e_sig = np.empty((n_flares, N), dtype=np.float64)
-    for i in range(n_flares):
-        e_sig[i] = norm(loc=mu[i], scale=sigma[i]).pdf(t)
-        e_sig[i] *= sob
-        e_sig[i] *= ns[i]
-    e_bkg = (N - np.sum(ns)) / (np.max(t) - np.min(t)) / b_term
-    denom = np.sum(e_sig, axis=0) + e_bkg
-
-    expectations = e_sig / denom
-    llh = np.sum(np.log(denom))
-
-    return (expectations, llh)
+    return (expectations[0], llh[0])
 
 
 def em_maximization_step(
@@ -71,26 +176,21 @@ def em_maximization_step(
 
     Returns
     -------
-    mu : list of float
+    mu : instance of ndarray
         Best fit mean time of the gaussian flare.
-    sigma : list of float
+    sigma : instance of ndarray
         Best fit sigma of the gaussian flare.
-    ns : list of float
+    ns : instance of ndarray
         Best fit number of signal neutrinos, as weight for the gaussian flare.
     """
-    mu = []
-    sigma = []
-    ns = []
-    for i in range(e.shape[0]):
-        mu.append(np.average(t, weights=e[i]))
-        sigma.append(np.sqrt(np.average(np.square(t - mu[i]), weights=e[i])))
-        ns.append(np.sum(e[i]))
-    sigma = [max(1, s) for s in sigma]
+    (mu, sigma, ns) = em_maximization_step_batch(
+        e=e[np.newaxis],
+        t=t)
 
-    return (mu, sigma, ns)
+    return (mu[0], sigma[0], ns[0])
 
 
-def em_fit(
+def em_fit_batch(
         x,
         weights,
         n=1,
@@ -100,14 +200,21 @@ def em_fit(
         initial_width=5000,
         remove_x=None,
 ):
-    """Perform the expectation maximization fit.
+    """Perform the expectation maximization fit for a batch of independent
+    data sets at once, e.g. for the different spectral indices of a gamma scan
+    or for several trials. Each fit of the batch stops individually when its
+    stopping criteria is reached.
 
     Parameters
     ----------
-    x : array of float
-        The quantity to run EM on (e.g. the time if EM should find time flares).
-    weights : array of float
-        The weights for each x value (e.g. the signal over background ratio).
+    x : instance of ndarray
+        The (n_events,)- or (n_batch, n_events)-shaped numpy ndarray holding
+        the quantity to run EM on (e.g. the time if EM should find time
+        flares). Data sets with fewer events can be padded with NaN values.
+        The valid values of each data set must be sorted.
+    weights : instance of ndarray
+        The (n_batch, n_events)-shaped numpy ndarray holding the weights for
+        each x value (e.g. the signal over background ratio).
     n : int
         How many Gaussians flares we are looking for.
     tol : float
@@ -126,56 +233,139 @@ def em_fit(
 
     Returns
     -------
-    mu : list of float
-        The list of size ``n`` with the determined mean values.
-    sigma : list of float
-        The list of size ``n`` with the standard deviation values.
-    ns : list of float
-        The list of size ``n`` with the normalization factor values.
+    mu : instance of ndarray
+        The (n_batch, n)-shaped numpy ndarray with the determined mean values.
+    sigma : instance of ndarray
+        The (n_batch, n)-shaped numpy ndarray with the standard deviation
+        values.
+    ns : instance of ndarray
+        The (n_batch, n)-shaped numpy ndarray with the normalization factor
+        values.
     """
+    weights = np.atleast_2d(weights)
+    x = np.asarray(x)
+
+    if (remove_x is not None) and (x.ndim == 1):
+        # The data point is the same for all data sets of the batch, hence it
+        # can be removed from the arrays directly.
+        m = x != remove_x
+        x = x[m]
+        weights = weights[:, m]
+        remove_x = None
+
+    x = np.broadcast_to(x, weights.shape)
+
+    (n_batch, n_events) = weights.shape
+
+    # Determine the events taking part in the fit and set the values of all
+    # other events to zero, so they do not contribute to any sum.
+    mask = np.invert(np.isnan(x))
     if weight_thresh > 0:
         # Remove events below threshold.
-        for i in range(len(weights)):
-            mask = weights > weight_thresh
-            weights[i] = weights[i][mask]
-            x[i] = x[i][mask]
-
+        mask &= weights > weight_thresh
     if remove_x is not None:
         # Remove data point.
-        mask = x == remove_x
-        weights = weights[~mask]
-        x = x[~mask]
+        mask &= x != remove_x
+    t = np.where(mask, x, 0)
+    sob = np.where(mask, weights, 0)
 
-    # Do the expectation maximization.
-    mu = np.linspace(x[0], x[-1], n+2)[1:-1]
-    sigma = np.full((n,), initial_width)
-    ns = np.full((n,), 10)
+    # Do the expectation maximization. The flares are initially distributed
+    # equidistantly between the first and last event.
+    batch_idxs = np.arange(n_batch)
+    x_first = t[batch_idxs, np.argmax(mask, axis=1)]
+    x_last = t[batch_idxs, n_events - 1 - np.argmax(mask[:, ::-1], axis=1)]
+    mu = (
+        x_first[:, np.newaxis] +
+        np.arange(1, n+1) * ((x_last - x_first) / (n+1))[:, np.newaxis]
+    )
+    sigma = np.full((n_batch, n), initial_width, dtype=np.float64)
+    ns = np.full((n_batch, n), 10, dtype=np.float64)
 
-    llh_diff = 100
-    llh_old = 0
-    llh_diff_list = [100] * 20
+    llh_old = np.zeros((n_batch,), dtype=np.float64)
+    llh_diff_hist = np.full((n_batch, 20), 100, dtype=np.float64)
 
-    # Run until convergence or maximum number of iterations is reached.
+    # Run until convergence or maximum number of iterations is reached for
+    # each fit of the batch.
+    active = np.ones((n_batch,), dtype=np.bool_)
     iteration = 0
-    while (iteration < iter_max) and (llh_diff > tol):
+    while (iteration < iter_max) and np.any(active):
         iteration += 1
 
-        (e, llh_new) = em_expectation_step(
-            ns=ns,
-            mu=mu,
-            sigma=sigma,
-            t=x,
-            sob=weights)
+        idxs = np.flatnonzero(active)
+
+        (e, llh_new) = em_expectation_step_batch(
+            ns=ns[idxs],
+            mu=mu[idxs],
+            sigma=sigma[idxs],
+            t=t[idxs],
+            sob=sob[idxs],
+            mask=mask[idxs])
 
-        tmp_diff = np.abs(llh_old - llh_new) / llh_new
-        llh_diff_list = llh_diff_list[:-1]
-        llh_diff_list.insert(0, tmp_diff)
-        llh_diff = np.max(llh_diff_list)
+        llh_diff_hist[idxs, 1:] = llh_diff_hist[idxs, :-1]
+        llh_diff_hist[idxs, 0] = np.abs(llh_old[idxs] - llh_new) / llh_new
 
-        llh_old = llh_new
+        llh_old[idxs] = llh_new
 
-        (mu, sigma, ns) = em_maximization_step(
+        (mu[idxs], sigma[idxs], ns[idxs]) = em_maximization_step_batch(
             e=e,
-            t=x)
+            t=t[idxs])
+
+        active[idxs] = np.max(llh_diff_hist[idxs], axis=1) > tol
 
     return (mu, sigma, ns)
+
+
+def em_fit(
+        x,
+        weights,
+        n=1,
+        tol=1.e-200,
+        iter_max=500,
+        weight_thresh=0,
+        initial_width=5000,
+        remove_x=None,
+):
+    """Perform the expectation maximization fit.
+
+    Parameters
+    ----------
+    x : array of float
+        The quantity to run EM on (e.g. the time if EM should find time flares).
+    weights : array of float
+        The weights for each x value (e.g. the signal over background ratio).
+    n : int
+        How many Gaussians flares we are looking for.
+    tol : float
+        The stopping criteria for the expectation maximization. This is the
+        difference in the normalized likelihood over the last 20 iterations.
+    iter_max : int
+        The maximum number of iterations, even if stopping criteria tolerance
+        (``tol``) is not yet reached.
+    weight_thresh : float
+        Set a minimum threshold for event weights. Events with smaller weights
+        will be removed.
+    initial_width : float
+        The starting width for the gaussian flare in days.
+    remove_x : float | None
+        Specific x of event that should be removed.
+
+    Returns
+    -------
+    mu : instance of ndarray
+        The (n,)-shaped numpy ndarray with the determined mean values.
+    sigma : instance of ndarray
+        The (n,)-shaped numpy ndarray with the standard deviation values.
+    ns : instance of ndarray
+        The (n,)-shaped numpy ndarray with the normalization factor values.
+    """
+    (mu, sigma, ns) = em_fit_batch(
+        x=x,
+        weights=np.asarray(weights)[np.newaxis],
+        n=n,
+        tol=tol,
+        iter_max=iter_max,
+        weight_thresh=weight_thresh,
+        initial_width=initial_width,
+        remove_x=remove_x)
+
+    return (mu[0], sigma[0], ns[0])
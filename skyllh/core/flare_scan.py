@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+"""The flare_scan module provides functionality to search for the box-shaped
+time flare, i.e. the time window, that maximizes the log-likelihood ratio of a
+time-dependent point source analysis.
+
+For a box-shaped signal time PDF with a livetime :math:`L_w` inside the box and
+a background time PDF that is uniform over the total livetime :math:`L`, the
+signal-over-background ratio of an event is :math:`c X_i` with
+:math:`c = L/L_w` for events inside the box and zero for all other events,
+where :math:`X_i` is the signal-over-background ratio of all the other PDFs.
+Using the substitution :math:`s = c q / (1 - q)` with :math:`q = n_s/N`, the
+log-likelihood ratio function of the :math:`N` events becomes
+
+.. math::
+
+    \\log\\Lambda(s) = \\sum_{i \\in w} \\log(1 + s X_i) - N \\log(1 + s/c),
+
+where the sum runs only over the events inside the box. For a fixed value of
+:math:`s` the sum is the difference of two prefix sums over the time-sorted
+events, which allows to evaluate all candidate boxes at once.
+"""
+
+import numpy as np
+import scipy.optimize
+
+from skyllh.core.py import (
+    float_cast,
+    int_cast,
+)
+
+
+def _box_log_lambda(
+        s,
+        X,
+        N,
+        c,
+):
+    """Calculates the log-likelihood ratio value of a single box for the given
+    value of the substitution variable ``s``.
+
+    Parameters
+    ----------
+    s : float
+        The value of the substitution variable :math:`s`.
+    X : instance of numpy ndarray
+        The (n_box_events,)-shaped numpy ndarray holding the
+        signal-over-background ratio of the events inside the box.
+    N : int
+        The total number of events.
+    c : float
+        The ratio of the total livetime and the livetime inside the box.
+
+    Returns
+    -------
+    log_lambda : float
+        The log-likelihood ratio value.
+    """
+    return np.sum(np.log1p(s * X)) - N * np.log1p(s / c)
+
+
+def box_flare_scan(
+        t,
+        sob,
+        livetime,
+        n_events,
+        min_livetime=1.,
+        edge_sob_thresh=1.,
+        max_n_edges=500,
+        n_s=64,
+        n_refine=16,
+        chunk_size=2**16,
+):
+    """Scans all box-shaped time windows, whose start and stop times coincide
+    with the times of signal-like events, for the box that maximizes the
+    log-likelihood ratio function.
+
+    Parameters
+    ----------
+    t : instance of numpy ndarray
+        The (n_selected_events,)-shaped numpy ndarray holding the time of each
+        selected event.
+    sob : instance of numpy ndarray
+        The (n_selected_events,)-shaped numpy ndarray holding the
+        signal-over-background ratio of each selected event without the time
+        PDF ratio, e.g. the product of the spatial and energy PDF ratios.
+    livetime : instance of Livetime
+        The instance of Livetime providing the detector on-time intervals.
+    n_events : int
+        The total number of events of the trial, i.e. including the events that
+        have not been selected.
+    min_livetime : float
+        The minimal livetime of a box in days. Shorter boxes are not
+        considered.
+    edge_sob_thresh : float
+        The minimal signal-over-background ratio of an event to be considered
+        as start or stop event of a box.
+    max_n_edges : int
+        The maximal number of events considered as start or stop events of the
+        boxes. If there are more events above ``edge_sob_thresh``, only the
+        ``max_n_edges`` most signal-like events are used. The number of
+        scanned boxes is ``max_n_edges * (max_n_edges + 1) / 2`` at most.
+    n_s : int
+        The number of grid points of the substitution variable :math:`s`, for
+        which the log-likelihood ratio values of all boxes are calculated.
+    n_refine : int
+        The number of best boxes on the :math:`s` grid, for which the
+        log-likelihood ratio function gets maximized exactly.
+    chunk_size : int
+        The number of boxes that are evaluated at once. This limits the memory
+        usage to ``n_s * chunk_size`` float values.
+
+    Returns
+    -------
+    ts : float
+        The test-statistic value, i.e. twice the maximal log-likelihood ratio
+        value, of the best box.
+    ns : float
+        The best fit number of signal events of the best box.
+    start : float
+        The start time of the best box. It is NaN, if no box was found.
+    stop : float
+        The stop time of the best box. It is NaN, if no box was found.
+    """
+    N = int_cast(
+        n_events,
+        'The n_events argument must be castable to type int!')
+    min_livetime = float_cast(
+        min_livetime,
+        'The min_livetime argument must be castable to type float!')
+    if min_livetime <= 0:
+        raise ValueError(
+            'The min_livetime argument must be greater than zero! '
+            f'Its current value is {min_livetime}.')
+
+    # Sort the events by time. Events during detector down-time have no
+    # signal contribution.
+    sorted_idxs = np.argsort(t, kind='stable')
+    t = np.asarray(t)[sorted_idxs]
+    X = np.where(livetime.is_on(t), np.asarray(sob)[sorted_idxs], 0)
+
+    # Select the events that can be start or stop events of a box.
+    edge_idxs = np.flatnonzero(X > edge_sob_thresh)
+    if len(edge_idxs) > max_n_edges:
+        edge_idxs = np.sort(
+            edge_idxs[np.argsort(X[edge_idxs])[-max_n_edges:]])
+
+    # Create all boxes with start event index a and stop event index b.
+    (a_edge_idxs, b_edge_idxs) = np.triu_indices(len(edge_idxs))
+    a = edge_idxs[a_edge_idxs]
+    b = edge_idxs[b_edge_idxs]
+
+    cum_livetime = livetime.get_livetime_upto(t)
+    box_livetime = cum_livetime[b] - cum_livetime[a]
+    m = box_livetime >= min_livetime
+    if not np.any(m):
+        return (0., 0., np.nan, np.nan)
+    a = a[m]
+    b = b[m]
+    c = livetime.livetime / box_livetime[m]
+
+    # Create the grid of the substitution variable s, which spans the range
+    # where s*X is of order one for the signal-like events.
+    X_edges = X[edge_idxs]
+    s_grid = np.logspace(
+        np.log10(1e-3 / np.max(X_edges)),
+        np.log10(1e3 / np.min(X_edges)),
+        n_s)
+
+    # Calculate the prefix sums of log(1 + s*X) for each s grid point.
+    P = np.zeros((n_s, len(X)+1), dtype=np.float64)
+    np.cumsum(np.log1p(np.outer(s_grid, X)), axis=1, out=P[:, 1:])
+
+    # Evaluate the log-likelihood ratio function for all boxes on the s grid.
+    n_boxes = len(a)
+    grid_log_lambda = np.empty((n_boxes,), dtype=np.float64)
+    grid_s_idxs = np.empty((n_boxes,), dtype=np.int64)
+    for chunk_start in range(0, n_boxes, chunk_size):
+        sl = slice(chunk_start, chunk_start + chunk_size)
+        log_lambda = (
+            P[:, b[sl]+1] - P[:, a[sl]] -
+            N * np.log1p(s_grid[:, np.newaxis] / c[np.newaxis, sl])
+        )
+        grid_s_idxs[sl] = np.argmax(log_lambda, axis=0)
+        grid_log_lambda[sl] = log_lambda[
+            grid_s_idxs[sl], np.arange(log_lambda.shape[1])]
+
+    # Maximize the log-likelihood ratio function exactly for the best boxes,
+    # starting from the neighbouring s grid points.
+    log_s_grid = np.log(s_grid)
+    best_log_lambda = 0
+    best = (0., np.nan, np.nan)
+    for box_idx in np.argsort(grid_log_lambda)[::-1][:n_refine]:
+        X_box = X[a[box_idx]:b[box_idx]+1]
+        c_box = c[box_idx]
+        s_idx = grid_s_idxs[box_idx]
+        res = scipy.optimize.minimize_scalar(
+            lambda log_s: -_box_log_lambda(np.exp(log_s), X_box, N, c_box),
+            bounds=(
+                log_s_grid[max(s_idx-1, 0)],
+                log_s_grid[min(s_idx+1, n_s-1)]),
+            method='bounded')
+        log_lambda = -res.fun
+        if log_lambda > best_log_lambda:
+            best_log_lambda = log_lambda
+            s = np.exp(res.x)
+            best = (N * s / (c_box + s), t[a[box_idx]], t[b[box_idx]])
+
+    (ns, start, stop) = best
+    ts = 2 * best_log_lambda
+
+    return (ts, ns, start, stop)
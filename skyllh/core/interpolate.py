@@ -15,6 +15,60 @@ from skyllh.core.py import (
 )
 
 
+def group_values_by_grid_point(
+        tdm,
+        gridparams_recarray,
+):
+    """Groups the sources by their grid point, i.e. by their set of grid
+    parameter values, and determines the values that belong to each group of
+    sources. This allows a grid manifold function to evaluate each distinct
+    grid point only once for all the sources sharing it.
+
+    Parameters
+    ----------
+    tdm : instance of TrialDataManager
+        The TrialDataManager instance holding the trial event data and the
+        event mapping to the sources via the ``src_evt_idxs`` property.
+    gridparams_recarray : instance of numpy structured ndarray
+        The numpy structured ndarray of length N_sources with the grid
+        parameter names and values for all sources. If the length of this
+        structured array is 1, the set of parameters is used for all sources.
+
+    Returns
+    -------
+    groups : list of (dict, instance of numpy ndarray | None) tuples
+        The list of 2-element tuples, one for each distinct grid point, holding
+        the dictionary with the grid parameter names and values and the
+        (N_values,)-shaped boolean numpy ndarray selecting the values of the
+        sources having this grid point. If all sources share the same grid
+        point, the list contains a single group and its values mask is
+        ``None``.
+    """
+    pnames = gridparams_recarray.dtype.names
+
+    if len(gridparams_recarray) == 1:
+        return [(dict(zip(pnames, gridparams_recarray[0].item())), None)]
+
+    (unique_gridparams_recarray, src_group_idxs) = np.unique(
+        gridparams_recarray,
+        return_inverse=True)
+
+    if len(unique_gridparams_recarray) == 1:
+        return [
+            (dict(zip(pnames, unique_gridparams_recarray[0].item())), None)
+        ]
+
+    (src_idxs, evt_idxs) = tdm.src_evt_idxs
+    value_group_idxs = src_group_idxs.ravel()[src_idxs]
+
+    groups = [
+        (dict(zip(pnames, gridparams.item())), value_group_idxs == group_idx)
+        for (group_idx, gridparams) in enumerate(unique_gridparams_recarray)
+    ]
+
+    return groups
+
+
 class GridManifoldInterpolationMethod(
         object,
         metaclass=abc.ABCMeta,
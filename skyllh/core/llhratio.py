@@ -7,6 +7,11 @@ implement the pure math of the log-likelihood ratio function.
 
 import abc
 import numpy as np
+import os
+
+from concurrent.futures import (
+    ThreadPoolExecutor,
+)
 
 from skyllh.core.config import (
     HasConfig,
@@ -29,6 +34,7 @@ from skyllh.core.py import (
     classname,
     issequenceof,
     float_cast,
+    int_cast,
 )
 from skyllh.core.services import (
     DatasetSignalWeightFactorsService,
@@ -39,6 +45,7 @@ from skyllh.core.source_hypo_grouping import (
 )
 from skyllh.core.timing import (
     TaskTimer,
+    activate_time_lord,
 )
 from skyllh.core.trialdata import (
     TrialDataManager,
@@ -423,6 +430,134 @@ class TCLLHRatio(
             rss=rss,
             tl=tl)
 
+    def evaluate_trials(
+            self,
+            fitparam_values,
+            src_params_recarray=None,
+            tl=None):
+        """This method is supposed to evaluate the log-likelihood ratio
+        function for a batch of K trials, which has been initialized via the
+        :meth:`~skyllh.core.trialdata.TrialDataManager.initialize_trials`
+        method of the TrialDataManager instance(s). Only the value of the
+        global fit parameter ns can differ between the trials.
+
+        Parameters
+        ----------
+        fitparam_values : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D ndarray holding the current values
+            of the global fit parameters for each of the K trials.
+        src_params_recarray : instance of numpy record ndarray | None
+            The numpy record ndarray of length N_sources holding the parameter
+            names and values of all sources.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used for timing
+            measurements.
+
+        Returns
+        -------
+        log_lambda : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the log-lambda value of each
+            trial.
+        grads : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D numpy ndarray holding the gradient
+            value for each trial and global fit parameter.
+        """
+        raise NotImplementedError(
+            f'The LLH ratio function {classname(self)} does not support the '
+            'evaluation of a batch of trials!')
+
+    def maximize_ns_for_trials(
+            self,
+            n_trials,
+            fitparam_values,
+            ns_tol=1e-6,
+            tl=None):
+        """Maximizes this log-likelihood ratio function w.r.t. the global fit
+        parameter ns for a batch of trials at once, keeping the values of all
+        other global fit parameters fixed. The batch of trials must have been
+        initialized via the
+        :meth:`~skyllh.core.trialdata.TrialDataManager.initialize_trials`
+        method of the TrialDataManager instance(s).
+
+        Since the log-likelihood ratio function is concave in ns, its maximum
+        within the bounds of ns is found via a bisection of the derivative
+        w.r.t. ns, which is performed for all trials simultaneously using the
+        :meth:`evaluate_trials` method.
+
+        Parameters
+        ----------
+        n_trials : int
+            The number of trials of the batch.
+        fitparam_values : instance of numpy ndarray
+            The (N_fitparams,)-shaped 1D ndarray holding the values of the
+            global fit parameters, which are used for all trials. The value of
+            ns is ignored.
+        ns_tol : float
+            The absolute tolerance of the best fit value of ns.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used to time the
+            maximization of the LLH ratio function.
+
+        Returns
+        -------
+        log_lambda_max : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the maximum value of the
+            log-likelihood ratio function of each trial.
+        fitparam_values : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D numpy ndarray holding the global
+            fit parameter values of each trial.
+        """
+        ns_pidx = self._pmm.get_gflp_idx(name='ns')
+        (ns_min, ns_max) =\
+            self._pmm.global_paramset.floating_param_bounds[ns_pidx]
+
+        fitparam_values = np.tile(
+            np.asarray(fitparam_values, dtype=np.float64), (n_trials, 1))
+
+        src_params_recarray = self._pmm.create_src_params_recarray(
+            gflp_values=fitparam_values[0])
+
+        def calc_ns_grad(ns):
+            fitparam_values[:, ns_pidx] = ns
+            with np.errstate(divide='ignore', invalid='ignore'):
+                (log_lambda, grads) = self.evaluate_trials(
+                    fitparam_values=fitparam_values,
+                    src_params_recarray=src_params_recarray,
+                    tl=tl)
+            # The log-likelihood ratio function is not defined for ns values
+            # not smaller than the number of events. The maximum lies below
+            # such ns values, hence the derivative is set to -inf.
+            return np.where(
+                np.isfinite(log_lambda), grads[:, ns_pidx], -np.inf)
+
+        ns_lo = np.full((n_trials,), ns_min, dtype=np.float64)
+        ns_hi = np.full((n_trials,), ns_max, dtype=np.float64)
+
+        # Determine the trials whose maximum lies at one of the ns bounds.
+        at_ns_min = ~(calc_ns_grad(ns_lo) > 0)
+        at_ns_max = calc_ns_grad(ns_hi) > 0
+        m_active = ~(at_ns_min | at_ns_max)
+
+        with TaskTimer(tl, 'Bisect ns for trials.'):
+            while np.any(m_active):
+                ns_mid = 0.5*(ns_lo + ns_hi)
+                m_inc = calc_ns_grad(ns_mid) > 0
+                ns_lo = np.where(m_active & m_inc, ns_mid, ns_lo)
+                ns_hi = np.where(m_active & ~m_inc, ns_mid, ns_hi)
+                m_active &= (ns_hi - ns_lo) > ns_tol
+
+        ns = 0.5*(ns_lo + ns_hi)
+        ns[at_ns_min] = ns_min
+        ns[at_ns_max] = ns_max
+
+        fitparam_values[:, ns_pidx] = ns
+        (log_lambda_max, grads) = self.evaluate_trials(
+            fitparam_values=fitparam_values,
+            src_params_recarray=src_params_recarray,
+            tl=tl)
+
+        return (log_lambda_max, fitparam_values)
+
 
 class SingleDatasetTCLLHRatio(
         TCLLHRatio,
@@ -598,6 +733,21 @@ class ZeroSigH0SingleDatasetTCLLHRatio(
                 f'Its current type is {classname(r)}.')
         self._pdfratio = r
 
+    def change_shg_mgr(self, shg_mgr):
+        """Changes the source hypothesis group manager of this two-component LLH
+        ratio function and of its PDF ratio instance.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The new instance of SourceHypoGroupManager.
+        """
+        super().change_shg_mgr(
+            shg_mgr=shg_mgr)
+
+        self._pdfratio.change_shg_mgr(
+            shg_mgr=shg_mgr)
+
     def initialize_for_new_trial(
             self,
             tl=None,
@@ -741,6 +891,115 @@ class ZeroSigH0SingleDatasetTCLLHRatio(
 
         return (log_lambda, grads)
 
+    def calculate_log_lambda_and_grads_for_trials(
+            self,
+            N,
+            ns,
+            ns_pidx,
+            p_mask,
+            Xi,
+            dXi_dp,
+            trial_evt_offsets):
+        """Calculates the log(Lambda) value and its gradient for each global fit
+        parameter for a batch of K trials at once. The selected events of all
+        trials are given as concatenated arrays, where the events of trial
+        ``k`` are the events ``trial_evt_offsets[k]:trial_evt_offsets[k+1]``.
+        The sums over the events of each trial are computed via segmented
+        reductions. The result is identical to calling the
+        :meth:`calculate_log_lambda_and_grads` method for each trial.
+
+        Parameters
+        ----------
+        N : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the total number of events of
+            each trial.
+        ns : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the value of the global fit
+            parameter ns for each trial.
+        ns_pidx : int
+            The index of the global fit parameter ns.
+        p_mask : instance of numpy ndarray
+            The (N_fitparam,)-shaped numpy ndarray of bool selecting all global
+            fit parameters, except ns.
+        Xi : instance of numpy ndarray
+            The (n_selected_events,)-shaped 1D numpy ndarray holding the X value
+            of each selected event of all trials.
+        dXi_dp : instance of numpy ndarray
+            The (n_selected_events, N_fitparams-1,)-shaped 2D ndarray holding
+            the derivative value for each fit parameter p (i.e. except ns) of
+            each event's X value.
+        trial_evt_offsets : instance of numpy ndarray
+            The (K+1,)-shaped numpy ndarray holding the offsets of the selected
+            events of each trial.
+
+        Returns
+        -------
+        log_lambda : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the value of the
+            log-likelihood ratio function for each trial.
+        grads : instance of numpy ndarray
+            The (K, N_fitparams)-shaped numpy ndarray holding the gradient
+            value of log_lambda for each trial and fit parameter.
+        """
+        n_trials = len(N)
+
+        # Get the number of selected events of each trial and the trial index
+        # of each selected event.
+        Nprime = np.diff(trial_evt_offsets)
+        trial_idxs = np.repeat(np.arange(n_trials), Nprime)
+
+        one_plus_alpha = ZeroSigH0SingleDatasetTCLLHRatio._one_plus_alpha
+
+        alpha = one_plus_alpha - 1
+        ns_i = ns[trial_idxs]
+        alpha_i = ns_i*Xi
+
+        # Create a mask for events which have a stable non-diverging
+        # log-function argument, and an inverted mask thereof.
+        m_stable = alpha_i > alpha
+        m_unstable = ~m_stable
+        any_unstable_events = np.any(m_unstable)
+
+        # Calculate the log_lambda_i value for all events. For the numerical
+        # unstable events a Taylor expansion is used.
+        log_lambda_i = np.empty_like(alpha_i, dtype=np.float64)
+        np.log1p(alpha_i, where=m_stable, out=log_lambda_i)
+
+        # Calculate the factor of the gradient for each event, i.e. the
+        # derivative of log_lambda_i w.r.t. alpha_i.
+        dlog_lambda_i_dalpha_i = np.empty_like(alpha_i, dtype=np.float64)
+        dlog_lambda_i_dalpha_i[m_stable] = 1 / (1 + alpha_i[m_stable])
+
+        if any_unstable_events:
+            tildealpha_i = (alpha_i[m_unstable] - alpha) / one_plus_alpha
+            log_lambda_i[m_unstable] =\
+                np.log1p(alpha) + tildealpha_i - 0.5 * tildealpha_i**2
+            dlog_lambda_i_dalpha_i[m_unstable] =\
+                (1 - tildealpha_i) / one_plus_alpha
+
+        # Calculate the log_lambda value for each trial and account for pure
+        # background events.
+        log_lambda = (
+            np.bincount(trial_idxs, weights=log_lambda_i, minlength=n_trials) +
+            (N - Nprime)*np.log1p(-ns/N)
+        )
+
+        # Calculate the gradient for each trial and fit parameter.
+        grads = np.empty((n_trials, len(p_mask)), dtype=np.float64)
+
+        grads[:, ns_pidx] = np.bincount(
+            trial_idxs,
+            weights=dlog_lambda_i_dalpha_i * Xi,
+            minlength=n_trials) - (N - Nprime) / (N - ns)
+
+        for (idx, pidx) in enumerate(np.flatnonzero(p_mask)):
+            grads[:, pidx] = np.bincount(
+                trial_idxs,
+                weights=ns_i * dlog_lambda_i_dalpha_i * dXi_dp[:, idx],
+                minlength=n_trials)
+
+        return (log_lambda, grads)
+
     def calculate_ns_grad2(
             self,
             ns,
@@ -905,6 +1164,134 @@ class ZeroSigH0SingleDatasetTCLLHRatio(
 
         return (log_lambda, grads)
 
+    def evaluate_trials(
+            self,
+            fitparam_values,
+            src_params_recarray=None,
+            tl=None):
+        """Evaluates the log-likelihood ratio function for a batch of trials,
+        which has been initialized via the
+        :meth:`~skyllh.core.trialdata.TrialDataManager.initialize_trials`
+        method of the TrialDataManager instance. The PDF ratio values are
+        calculated once for the selected events of all trials.
+
+        Since the PDF ratio values are calculated for all trials at once, only
+        the value of the global fit parameter ns can differ between the
+        trials. The values of all other global fit parameters must be the same
+        for all trials. Hence, this method is a primitive for fitting ns with
+        all other global fit parameters fixed, as done by the
+        :meth:`~TCLLHRatio.maximize_ns_for_trials` method.
+
+        Parameters
+        ----------
+        fitparam_values : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D ndarray holding the current values
+            of the global fit parameters for each of the K trials.
+        src_params_recarray : instance of numpy structured ndarray | None
+            The numpy record ndarray of length N_sources holding the local
+            parameter names and values of all sources.
+            If it is ``None``, it will be generated automatically from the
+            ``fitparam_values`` argument using the
+            :class:`~skyllh.core.parameters.ParameterModelMapper` instance.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord to measure the timing of
+            evaluating the LLH ratio function.
+
+        Returns
+        -------
+        log_lambda : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the log-lambda value of each
+            trial.
+        grads : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D numpy ndarray holding the gradient
+            value for each trial and global fit parameter.
+        """
+        tdm = self._tdm
+
+        if tdm.n_trials is None:
+            raise RuntimeError(
+                'The trial data manager must be initialized with a batch of '
+                'trials via its initialize_trials method!')
+
+        fitparam_values = np.atleast_2d(fitparam_values)
+        (n_trials, n_fitparams) = fitparam_values.shape
+        if n_trials != tdm.n_trials:
+            raise ValueError(
+                f'The number of fit parameter value sets ({n_trials}) must '
+                f'match the number of trials ({tdm.n_trials})!')
+
+        ns_pidx = self._pmm.get_gflp_idx('ns')
+
+        # Create a mask that selects all fit parameters except ns.
+        p_mask = np.ones((n_fitparams,), dtype=np.bool_)
+        p_mask[ns_pidx] = False
+
+        if np.any(fitparam_values[:, p_mask] != fitparam_values[0, p_mask]):
+            raise ValueError(
+                'The values of all global fit parameters except ns must be '
+                'the same for all trials!')
+
+        if src_params_recarray is None:
+            src_params_recarray = self._pmm.create_src_params_recarray(
+                gflp_values=fitparam_values[0])
+
+        ns = fitparam_values[:, ns_pidx]
+
+        N = tdm.n_events_per_trial
+        trial_evt_offsets = tdm.trial_evt_offsets
+        N_i = np.repeat(N, np.diff(trial_evt_offsets))
+
+        # Calculate the data fields that depend on global fit parameters.
+        if tdm.has_global_fitparam_data_fields:
+            with TaskTimer(
+                    tl,
+                    'Calculate global fit parameter dependent data fields.'):
+                global_fitparams = self._pmm.get_global_floating_params_dict(
+                    gflp_values=fitparam_values[0])
+                tdm.calculate_global_fitparam_data_fields(
+                    shg_mgr=self._shg_mgr,
+                    pmm=self._pmm,
+                    global_fitparams=global_fitparams)
+
+        # Calculate the PDF ratio values for each selected event of all
+        # trials.
+        with TaskTimer(tl, 'Calc pdfratio value Ri'):
+            Ri = self._pdfratio.get_ratio(
+                tdm=tdm,
+                src_params_recarray=src_params_recarray,
+                tl=tl)
+
+        # Calculate Xi for each selected event.
+        Xi = (Ri - 1.) / N_i
+
+        # Calculate the gradients of Xi for each fit parameter (without ns).
+        dXi_dp = np.empty(
+            (Xi.shape[0], n_fitparams-1),
+            dtype=np.float64)
+
+        fitparam_ids = np.arange(n_fitparams)
+        for (idx, fitparam_id) in enumerate(fitparam_ids[p_mask]):
+            dRi = self._pdfratio.get_gradient(
+                tdm=tdm,
+                src_params_recarray=src_params_recarray,
+                fitparam_id=fitparam_id,
+                tl=tl)
+
+            dXi_dp[:, idx] = dRi / N_i
+
+        with TaskTimer(tl, 'Calc logLambda and grads for trials'):
+            (log_lambda, grads) =\
+                self.calculate_log_lambda_and_grads_for_trials(
+                    N=N,
+                    ns=ns,
+                    ns_pidx=ns_pidx,
+                    p_mask=p_mask,
+                    Xi=Xi,
+                    dXi_dp=dXi_dp,
+                    trial_evt_offsets=trial_evt_offsets)
+
+        return (log_lambda, grads)
+
 
 class MultiDatasetTCLLHRatio(
         TCLLHRatio):
@@ -927,6 +1314,7 @@ class MultiDatasetTCLLHRatio(
             src_detsigyield_weights_service,
             ds_sig_weight_factors_service,
             llhratio_list,
+            n_threads=None,
             **kwargs):
         """Creates a new composite two-component log-likelihood ratio function.
 
@@ -947,6 +1335,14 @@ class MultiDatasetTCLLHRatio(
         llhratio_list : list of instance of SingleDatasetTCLLHRatio
             The list of the two-component log-likelihood ratio functions,
             one for each dataset.
+        n_threads : int | None
+            The number of threads to use for evaluating the log-likelihood
+            ratio functions of the individual datasets concurrently. If set to
+            ``None``, the ``'llhratio_n_threads'`` setting of the
+            ``'multiproc'`` configuration section is used. A value of ``None``
+            or 1 means sequential evaluation. The results are independent of
+            the number of threads, because the individual results are combined
+            in the order of the datasets.
         """
         if not issequenceof(llhratio_list, SingleDatasetTCLLHRatio):
             raise TypeError(
@@ -973,6 +1369,46 @@ class MultiDatasetTCLLHRatio(
                 'instance is made for must be equal to the number of '
                 'log-likelihood ratio functions!')
 
+        self.n_threads = n_threads
+
+        self._thread_pool = None
+        self._thread_pool_pid = None
+        self._thread_pool_n_threads = None
+
+    def __getstate__(self):
+        """Removes the thread pool from the state of this instance, because it
+        cannot be pickled. It will be re-created when needed.
+        """
+        state = self.__dict__.copy()
+        state['_thread_pool'] = None
+        state['_thread_pool_pid'] = None
+        state['_thread_pool_n_threads'] = None
+        return state
+
+    def __del__(self):
+        self._shutdown_thread_pool(wait=False)
+
+    def _shutdown_thread_pool(self, wait):
+        """Shuts down the thread pool of this instance, if it was created by
+        the current process. A thread pool inherited through a fork of the
+        process has no threads within the child process.
+        """
+        thread_pool = getattr(self, '_thread_pool', None)
+        if (thread_pool is not None) and\
+           (self._thread_pool_pid == os.getpid()):
+            thread_pool.shutdown(wait=wait)
+
+        self._thread_pool = None
+        self._thread_pool_pid = None
+        self._thread_pool_n_threads = None
+
+    def close(self):
+        """Shuts down the pool of threads, which is used to evaluate the
+        log-likelihood ratio functions of the individual datasets
+        concurrently. The pool is re-created when needed.
+        """
+        self._shutdown_thread_pool(wait=True)
+
     @property
     def src_detsigyield_weights_service(self):
         """The instance of SrcDetSigYieldWeightsService, which provides the
@@ -1021,6 +1457,110 @@ class MultiDatasetTCLLHRatio(
                 f'Its current type is {classname(llhratios)}.')
         self._llhratio_list = list(llhratios)
 
+    @property
+    def n_threads(self):
+        """The number of threads to use for evaluating the log-likelihood ratio
+        functions of the individual datasets concurrently. ``None`` means that
+        the ``'llhratio_n_threads'`` setting of the ``'multiproc'``
+        configuration section is used.
+        """
+        return self._n_threads
+
+    @n_threads.setter
+    def n_threads(self, n):
+        n = int_cast(
+            n,
+            'The n_threads property must be None, or castable to type int!',
+            allow_None=True)
+        if (n is not None) and (n < 1):
+            raise ValueError(
+                'The n_threads property must be None, or greater than 0! '
+                f'Its current value is {n}.')
+        self._n_threads = n
+
+    def _get_n_threads(self):
+        """Determines the number of threads to use from the local and global
+        settings.
+        """
+        n_threads = self._n_threads
+        if n_threads is None:
+            n_threads = self._cfg['multiproc'].get('llhratio_n_threads', None)
+        if n_threads is None:
+            n_threads = 1
+
+        return min(n_threads, len(self._llhratio_list))
+
+    def _map_llhratio_list(
+            self,
+            func,
+            tl=None):
+        """Calls the given function for each individual log-likelihood ratio
+        function, possibly concurrently using a pool of threads.
+
+        Parameters
+        ----------
+        func : callable
+            The function with call signature
+
+                ``__call__(j, llhratio, tl)``
+
+            where ``j`` is the index of the dataset, ``llhratio`` the
+            log-likelihood ratio function of the dataset, and ``tl`` the
+            optional instance of TimeLord.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used for timing
+            measurements.
+
+        Returns
+        -------
+        results : list
+            The list of the return values of ``func``, in the order of the
+            datasets.
+        """
+        n_threads = self._get_n_threads()
+        if n_threads == 1:
+            return [
+                func(j, llhratio, tl)
+                for (j, llhratio) in enumerate(self._llhratio_list)
+            ]
+
+        # A thread pool does not survive a fork of the process, so a new one
+        # needs to be created within a child process.
+        pid = os.getpid()
+        if (
+            (self._thread_pool is None) or
+            (self._thread_pool_pid != pid) or
+            (self._thread_pool_n_threads != n_threads)
+        ):
+            self._shutdown_thread_pool(wait=False)
+            self._thread_pool = ThreadPoolExecutor(max_workers=n_threads)
+            self._thread_pool_pid = pid
+            self._thread_pool_n_threads = n_threads
+
+        # Each task records its timing information into its own TimeLord
+        # instance, because the TimeLord class is not thread-safe. The
+        # instance is activated within the thread for instrumented methods.
+        tl_list = [
+            None if tl is None else tl.empty_copy()
+            for _ in range(len(self._llhratio_list))
+        ]
+
+        def task(j, llhratio, tl_j):
+            with activate_time_lord(tl_j):
+                return func(j, llhratio, tl_j)
+
+        futures = [
+            self._thread_pool.submit(task, j, llhratio, tl_list[j])
+            for (j, llhratio) in enumerate(self._llhratio_list)
+        ]
+        results = [future.result() for future in futures]
+
+        if tl is not None:
+            for tl_j in tl_list:
+                tl.join(tl_j)
+
+        return results
+
     @property
     def n_selected_events(self):
         """(read-only) The sum of selected events of each individual
@@ -1070,11 +1610,13 @@ class MultiDatasetTCLLHRatio(
         tl : instance of TimeLord
             The optional instance of TimeLord to measure timing information.
         """
-        for llhratio in self._llhratio_list:
+        def func(j, llhratio, tl):
             llhratio.initialize_for_new_trial(
                 tl=tl,
                 **kwargs)
 
+        self._map_llhratio_list(func, tl=tl)
+
     def evaluate(
             self,
             fitparam_values,
@@ -1156,27 +1698,29 @@ class MultiDatasetTCLLHRatio(
         # for ns.
         grads = np.zeros((n_fitparams,), dtype=np.float64)
 
-        # Create an array holding the fit parameter values for a particular
-        # llh ratio function. Since we need to adjust ns with nsj it's more
-        # efficient to create this array once and use it within the for loop
-        # over the llh ratio functions.
-        llhratio_fitparam_values = fitparam_values.copy()
-
         pmask = np.ones((n_fitparams,), dtype=np.bool_)
         pmask[ns_pidx] = False
 
-        # Loop over the llh ratio functions.
-        for (j, llhratio) in enumerate(self._llhratio_list):
+        def func(j, llhratio, tl):
             if tracing:
                 logger.debug(
                     f'nsf[j={j}] = {nsf[j]:.3f}')
 
+            # Create an array holding the fit parameter values for the
+            # particular llh ratio function, which has ns replaced by nsj.
+            llhratio_fitparam_values = fitparam_values.copy()
             llhratio_fitparam_values[ns_pidx] = nsf[j]
 
-            (log_lambda_j, grads_j) = llhratio.evaluate(
+            return llhratio.evaluate(
                 fitparam_values=llhratio_fitparam_values,
                 src_params_recarray=src_params_recarray,
                 tl=tl)
+
+        results = self._map_llhratio_list(func, tl=tl)
+
+        # Combine the results of the llh ratio functions in the order of the
+        # datasets.
+        for (j, (log_lambda_j, grads_j)) in enumerate(results):
             log_lambda += log_lambda_j
 
             # Gradient for ns.
@@ -1189,6 +1733,101 @@ class MultiDatasetTCLLHRatio(
 
         return (log_lambda, grads)
 
+    def evaluate_trials(
+            self,
+            fitparam_values,
+            src_params_recarray=None,
+            tl=None):
+        """Evaluates the composite log-likelihood-ratio function for a batch of
+        K trials, which has been initialized for each dataset via the
+        :meth:`~skyllh.core.trialdata.TrialDataManager.initialize_trials`
+        method. Only the value of the global fit parameter ns can differ
+        between the trials, see the documentation of the
+        :meth:`ZeroSigH0SingleDatasetTCLLHRatio.evaluate_trials` method.
+
+        Parameters
+        ----------
+        fitparam_values : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D ndarray holding the current values
+            of the global fit parameters for each trial.
+        src_params_recarray : instance of numpy record ndarray | None
+            The numpy record ndarray of length N_sources holding the parameter
+            names and values of all sources.
+            It case it is ``None``, it will be created automatically from the
+            ``fitparam_values`` argument using the
+            :class:`~skyllh.core.parameters.ParameterModelMapper` instance.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord that should be used for timing
+            measurements.
+
+        Returns
+        -------
+        log_lambda : instance of numpy ndarray
+            The (K,)-shaped numpy ndarray holding the log-lambda value of the
+            composite log-likelihood-ratio function for each trial.
+        grads : instance of numpy ndarray
+            The (K, N_fitparams)-shaped 2D ndarray holding the gradient value of
+            the composite log-likelihood-ratio function for each trial and
+            global fit parameter.
+        """
+        fitparam_values = np.atleast_2d(fitparam_values)
+        (n_trials, n_fitparams) = fitparam_values.shape
+
+        if src_params_recarray is None:
+            src_params_recarray = self._pmm.create_src_params_recarray(
+                gflp_values=fitparam_values[0])
+
+        ns_pidx = self._pmm.get_gflp_idx('ns')
+
+        ns = fitparam_values[:, ns_pidx]
+
+        # We need to calculate the source detsigyield weights and the dataset
+        # signal weight factors.
+        self._src_detsigyield_weights_service.calculate(
+            src_params_recarray=src_params_recarray)
+        self._ds_sig_weight_factors_service.calculate()
+
+        (f, f_grads_dict) = self._ds_sig_weight_factors_service.get_weights()
+
+        f_grads = np.zeros((len(f), n_fitparams), dtype=np.float64)
+        for pidx in f_grads_dict.keys():
+            f_grads[:, pidx] = f_grads_dict[pidx]
+
+        log_lambda = np.zeros((n_trials,), dtype=np.float64)
+        grads = np.zeros((n_trials, n_fitparams), dtype=np.float64)
+
+        pmask = np.ones((n_fitparams,), dtype=np.bool_)
+        pmask[ns_pidx] = False
+
+        def func(j, llhratio, tl):
+            llhratio_fitparam_values = fitparam_values.copy()
+            llhratio_fitparam_values[:, ns_pidx] = ns * f[j]
+
+            return llhratio.evaluate_trials(
+                fitparam_values=llhratio_fitparam_values,
+                src_params_recarray=src_params_recarray,
+                tl=tl)
+
+        results = self._map_llhratio_list(func, tl=tl)
+
+        # Combine the results of the llh ratio functions in the order of the
+        # datasets.
+        for (j, (log_lambda_j, grads_j)) in enumerate(results):
+            log_lambda += log_lambda_j
+
+            # Gradient for ns.
+            grads[:, ns_pidx] += grads_j[:, ns_pidx] * f[j]
+
+            # Gradient for each global fit parameter, if there are any.
+            if n_fitparams > 1:
+                ns_summand = (
+                    (grads_j[:, ns_pidx] * ns)[:, np.newaxis] *
+                    f_grads[j][pmask]
+                )
+                grads[:, pmask] += ns_summand + grads_j[:, pmask]
+
+        return (log_lambda, grads)
+
     def calculate_ns_grad2(
             self,
             ns,
@@ -16,6 +16,7 @@ from skyllh.core.parameters import (
 )
 from skyllh.core.py import (
     classname,
+    int_cast,
 )
 
 
@@ -1037,6 +1038,61 @@ class Minimizer(
 
             reps += 1
 
+        return self._finalize_minimization(
+            xmin=xmin,
+            fmin=fmin,
+            status=status,
+            reps=reps,
+            bounds=bounds,
+            func=func,
+            args=args)
+
+    def _finalize_minimization(
+            self,
+            xmin,
+            fmin,
+            status,
+            reps,
+            bounds,
+            func,
+            args,
+    ):
+        """Checks that the minimization converged and moves fit values, which
+        are outside their bounds due to rounding errors, onto the bounds.
+
+        Parameters
+        ----------
+        xmin : 1d numpy ndarray
+            The parameter values of the minimum.
+        fmin : float
+            The function value at the minimum.
+        status : dict
+            The status dictionary of the minimization process.
+        reps : int
+            The number of repetitions of the minimization process.
+        bounds : (N_fitparams,2)-shaped numpy ndarray
+            The bounds of the fit parameters.
+        func : callable ``f(x, *args)``
+            The function that has been minimized.
+        args : sequence of arguments for ``func`` | None
+            The optional sequence of arguments for ``func``.
+
+        Returns
+        -------
+        xmin : 1d numpy ndarray
+            The array holding the parameter values for which the function has
+            a minimum.
+        fmin : float
+            The function value at its minimum.
+        status : dict
+            The status dictionary with information about the minimization
+            process.
+
+        Raises
+        ------
+        ValueError
+            If the minimization process did not converge.
+        """
         # Store the number of repetitions in the status dictionary.
         status['skyllh_minimizer_n_reps'] = reps
 
@@ -1066,3 +1122,340 @@ class Minimizer(
                 self._minimizer_impl.get_niter(status), reps, str(xmin)))
 
         return (xmin, fmin, status)
+
+
+class MultiStartMinimizer(
+        Minimizer,
+):
+    """The MultiStartMinimizer class implements a multi-start strategy for
+    the minimization of a function. Before the actual minimization, the
+    function is evaluated for a set of candidate initials, which are
+    distributed as a Latin hypercube or on a regular grid within the parameter
+    bounds. The minimizer implementation is then started from the
+    ``n_starts`` candidates with the smallest function values, and the best
+    converged result is returned. If none of these minimizations converged,
+    the minimization is repeated from the remaining candidates in the order
+    of their function values, and finally from random initials, until the
+    maximal number of repetitions is reached.
+
+    Optionally, the best fit of the previous minimization with the same
+    warm-start key, e.g. the previous trial with the same mean number of
+    signal events, is added to the candidates. The warm-start key is set via
+    the ``warm_start_key`` property.
+
+    .. note::
+
+        With warm-starts enabled the result of a minimization depends on the
+        minimizations previously done by the same MultiStartMinimizer
+        instance. Hence, the results of trials are no longer reproducible
+        from their seeds alone, but depend on the order of the trials and on
+        how the trials are distributed to processes or compute nodes. Use the
+        ``clear_warm_starts`` method to reset the stored best fits.
+    """
+
+    def __init__(
+            self,
+            minimizer_impl,
+            n_candidates=16,
+            n_starts=1,
+            sampling='lhs',
+            warm_start=False,
+            **kwargs,
+    ):
+        """Creates a new MultiStartMinimizer instance.
+
+        Parameters
+        ----------
+        minimizer_impl : instance of MinimizerImpl
+            The minimizer implementation for a specific minimizer algorithm.
+        n_candidates : int
+            The number of candidate initials, for which the function is
+            evaluated. For the ``'grid'`` sampling the number of candidates is
+            rounded to the next power of the number of floating parameters.
+            The initials of the parameter set are always an additional
+            candidate.
+        n_starts : int
+            The number of candidates with the smallest function values, from
+            which the minimizer implementation is started.
+        sampling : str
+            The sampling of the candidate initials. Possible values are
+            ``'lhs'`` for a Latin hypercube sampling and ``'grid'`` for a
+            regular grid.
+        warm_start : bool
+            Flag if the best fit of the previous minimization with the same
+            warm-start key should be added to the candidates. Note that this
+            makes the result of a minimization depend on the previous
+            minimizations, e.g. the previous trial executed by the same
+            process, so trial results are not reproducible from their seeds
+            alone.
+        **kwargs
+            Additional keyword arguments are passed to the constructor of the
+            Minimizer class, e.g. ``max_repetitions``.
+        """
+        super().__init__(
+            minimizer_impl=minimizer_impl,
+            **kwargs)
+
+        self.n_candidates = n_candidates
+        self.n_starts = n_starts
+        self.sampling = sampling
+        self.warm_start = warm_start
+        self.warm_start_key = None
+
+        self._warm_start_xmin_dict = dict()
+
+    @property
+    def n_candidates(self):
+        """The number of candidate initials, for which the function is
+        evaluated.
+        """
+        return self._n_candidates
+
+    @n_candidates.setter
+    def n_candidates(self, n):
+        n = int_cast(
+            n,
+            'The n_candidates property must be castable to type int! '
+            f'Its current type is {classname(n)}.')
+        if n < 0:
+            raise ValueError(
+                'The n_candidates property must not be negative!')
+        self._n_candidates = n
+
+    @property
+    def n_starts(self):
+        """The number of candidates with the smallest function values, from
+        which the minimizer implementation is started.
+        """
+        return self._n_starts
+
+    @n_starts.setter
+    def n_starts(self, n):
+        n = int_cast(
+            n,
+            'The n_starts property must be castable to type int! '
+            f'Its current type is {classname(n)}.')
+        if n < 1:
+            raise ValueError(
+                'The n_starts property must be at least 1!')
+        self._n_starts = n
+
+    @property
+    def sampling(self):
+        """The sampling of the candidate initials. Either ``'lhs'`` or
+        ``'grid'``.
+        """
+        return self._sampling
+
+    @sampling.setter
+    def sampling(self, s):
+        if s not in ('lhs', 'grid'):
+            raise ValueError(
+                'The sampling property must be either "lhs" or "grid"! '
+                f'Its current value is "{s}".')
+        self._sampling = s
+
+    @property
+    def warm_start(self):
+        """Flag if the best fit of the previous minimization with the same
+        warm-start key should be added to the candidates. If enabled, the
+        result of a minimization depends on the previous minimizations of this
+        instance.
+        """
+        return self._warm_start
+
+    @warm_start.setter
+    def warm_start(self, flag):
+        if not isinstance(flag, bool):
+            raise TypeError(
+                'The warm_start property must be of type bool! '
+                f'Its current type is {classname(flag)}.')
+        self._warm_start = flag
+
+    @property
+    def warm_start_key(self):
+        """The hashable key under which the best fit of the next minimization
+        is stored, and whose previous best fit is used as warm-start
+        candidate. If set to ``None``, no warm-start is performed.
+        """
+        return self._warm_start_key
+
+    @warm_start_key.setter
+    def warm_start_key(self, key):
+        self._warm_start_key = key
+
+    def clear_warm_starts(self):
+        """Removes all stored best fits for warm-starts.
+        """
+        self._warm_start_xmin_dict = dict()
+
+    def generate_candidates(
+            self,
+            rss,
+            paramset,
+    ):
+        """Generates the candidate initials for the given parameter set.
+        The first candidate are the initials of the parameter set, followed by
+        the best fit of the previous minimization with the same warm-start
+        key, if available.
+
+        Parameters
+        ----------
+        rss : RandomStateService instance
+            The RandomStateService instance to draw random numbers from.
+        paramset : instance of ParameterSet
+            The ParameterSet instances holding the floating parameters.
+
+        Returns
+        -------
+        candidates : (n_candidates, N_fitparams)-shaped numpy ndarray
+            The candidate initials.
+        """
+        bounds = paramset.floating_param_bounds
+
+        candidates = [paramset.floating_param_initials[np.newaxis, :]]
+
+        if self._warm_start and (self._warm_start_key is not None):
+            xmin = self._warm_start_xmin_dict.get(self._warm_start_key, None)
+            if xmin is not None:
+                candidates.append(
+                    np.clip(xmin, bounds[:, 0], bounds[:, 1])[np.newaxis, :])
+
+        if self._n_candidates > 0:
+            if self._sampling == 'lhs':
+                candidates.append(
+                    paramset.generate_latin_hypercube_floating_param_initials(
+                        rss=rss,
+                        n=self._n_candidates))
+            else:
+                n_per_param = max(1, int(np.round(
+                    self._n_candidates**(1/paramset.n_floating_params))))
+                candidates.append(
+                    paramset.generate_grid_floating_param_initials(
+                        n_per_param=n_per_param))
+
+        candidates = np.concatenate(candidates, axis=0)
+
+        return candidates
+
+    def minimize(
+            self,
+            rss,
+            paramset,
+            func,
+            args=None,
+            kwargs=None,
+    ):
+        """Minimizes the the given function ``func`` by starting the minimizer
+        implementation from the best candidate initials.
+
+        Parameters
+        ----------
+        rss : RandomStateService instance
+            The RandomStateService instance to draw random numbers from.
+        paramset : instance of ParameterSet
+            The ParameterSet instances holding the floating parameters of the
+            function ``func``.
+        func : callable ``f(x, *args)``
+            The function to be minimized. It must have the call signature
+
+                ``__call__(x, *args)``
+
+            The return value of ``func`` must be the function value or a tuple
+            with the function value as first element.
+        args : sequence of arguments for ``func`` | None
+            The optional sequence of arguments for ``func``.
+        kwargs : dict | None
+            The optional dictionary with keyword arguments for the minimizer
+            implementation minimize method.
+
+        Returns
+        -------
+        xmin : 1d numpy ndarray
+            The array holding the parameter values for which the function has
+            a minimum.
+        fmin : float
+            The function value at its minimum.
+        status : dict
+            The status dictionary with information about the minimization
+            process. In addition to the minimizer implementation specific
+            information, it contains the number of candidates
+            ``'skyllh_minimizer_n_candidates'`` and the number of started
+            minimizations ``'skyllh_minimizer_n_starts'``.
+        """
+        if not isinstance(paramset, ParameterSet):
+            raise TypeError(
+                'The paramset argument must be an instance of ParameterSet!')
+
+        if args is None:
+            args = tuple()
+        if kwargs is None:
+            kwargs = dict()
+
+        bounds = paramset.floating_param_bounds
+
+        # Evaluate the function once for each candidate. The function is not
+        # vectorized over parameter points, hence one call per candidate.
+        candidates = self.generate_candidates(
+            rss=rss,
+            paramset=paramset)
+        fvals = np.empty((len(candidates),), dtype=np.float64)
+        for (i, x) in enumerate(candidates):
+            f = func(x, *args)
+            fvals[i] = f[0] if isinstance(f, tuple) else f
+        fvals[~np.isfinite(fvals)] = np.inf
+        candidate_idxs = list(np.argsort(fvals, kind='stable'))
+        logger.debug(
+            f'Evaluated function for {len(candidates)} candidates: '
+            f'best initials: {candidates[candidate_idxs[0]]}.')
+
+        best = None
+        n_starts = 0
+        for idx in candidate_idxs[:self._n_starts]:
+            (xmin, fmin, status) = self._minimizer_impl.minimize(
+                candidates[idx], bounds, func, args, **kwargs)
+            n_starts += 1
+            if self._minimizer_impl.has_converged(status) and\
+               ((best is None) or (fmin < best[1])):
+                best = (xmin, fmin, status)
+        if best is not None:
+            (xmin, fmin, status) = best
+
+        # None of the minimizations converged. Repeat the minimization from the
+        # remaining candidates and then from random initials.
+        remaining_idxs = candidate_idxs[self._n_starts:]
+        reps = 0
+        while (not self._minimizer_impl.has_converged(status)) and\
+              (self._minimizer_impl.is_repeatable(status)) and\
+              (reps < self._max_repetitions):
+            if reps < len(remaining_idxs):
+                initials = candidates[remaining_idxs[reps]]
+            else:
+                initials = paramset.generate_random_floating_param_initials(
+                    rss=rss)
+
+            logger.debug(
+                'Previous rep ({}) status={}, new initials={}'.format(
+                    reps, str(status), str(initials)))
+
+            (xmin, fmin, status) = self._minimizer_impl.minimize(
+                initials, bounds, func, args, **kwargs)
+
+            reps += 1
+
+        status['skyllh_minimizer_n_candidates'] = len(candidates)
+        status['skyllh_minimizer_n_starts'] = n_starts + reps
+
+        (xmin, fmin, status) = self._finalize_minimization(
+            xmin=xmin,
+            fmin=fmin,
+            status=status,
+            reps=reps,
+            bounds=bounds,
+            func=func,
+            args=args)
+
+        if self._warm_start and (self._warm_start_key is not None):
+            self._warm_start_xmin_dict[self._warm_start_key] = np.copy(xmin)
+
+        return (xmin, fmin, status)
@@ -3,6 +3,7 @@
 import logging
 import queue
 import time
+import traceback
 
 import multiprocessing as mp
 import numpy as np
@@ -25,6 +26,7 @@ from skyllh.core.random import (
 )
 from skyllh.core.timing import (
     TimeLord,
+    activate_time_lord,
 )
 
 
@@ -67,6 +69,129 @@ def get_ncpu(
     return ncpu
 
 
+def _limit_ncpu_in_daemonic_process(ncpu):
+    """Returns 1 if the current process is a daemonic process, e.g. a worker
+    process of a WorkerPool instance, and ``ncpu`` otherwise. Daemonic
+    processes are not allowed to have child processes, hence nested
+    multi-processing work is done sequentially within them.
+    """
+    if mp.current_process().daemon:
+        return 1
+    return ncpu
+
+
+def limit_ncpu_by_memory(
+        ncpu,
+        task_sizes,
+        max_memory,
+):
+    """Limits the number of CPUs, i.e. the number of concurrently executed
+    tasks, such that the estimated memory of the concurrently executed tasks
+    does not exceed the given maximum memory. The estimate assumes that the
+    largest tasks are executed concurrently.
+
+    Parameters
+    ----------
+    ncpu : int
+        The requested number of CPUs.
+    task_sizes : sequence of int
+        The estimated memory in bytes required by each task.
+    max_memory : int | None
+        The maximum memory in bytes of all concurrently executed tasks. If set
+        to ``None``, the memory is not limited.
+
+    Returns
+    -------
+    ncpu : int
+        The number of CPUs to use. At least one CPU is used and not more CPUs
+        than there are tasks.
+    """
+    ncpu = min(ncpu, max(len(task_sizes), 1))
+
+    if max_memory is None:
+        return ncpu
+
+    sizes = np.sort(task_sizes)[::-1]
+    n = np.count_nonzero(np.cumsum(sizes) <= max_memory)
+
+    return int(max(1, min(ncpu, n)))
+
+
+def _create_process_rss_list(
+        rss,
+        ncpu,
+):
+    """Creates the list of RandomStateService instances, one for each process.
+    The first element is the given ``rss`` instance itself, which is used by
+    the master process. The other instances are seeded with random numbers
+    drawn from ``rss``.
+
+    Parameters
+    ----------
+    rss : instance of RandomStateService | None
+        The RandomStateService instance of the master process.
+    ncpu : int
+        The number of processes, including the master process.
+
+    Returns
+    -------
+    rss_list : list of RandomStateService | list of None
+        The list of length ``ncpu`` holding the RandomStateService instance for
+        each process.
+    """
+    rss_list = [rss]
+    if rss is None:
+        rss_list += [None]*(ncpu-1)
+        return rss_list
+
+    if not isinstance(rss, RandomStateService):
+        raise TypeError(
+            'The rss argument must be an instance of RandomStateService!')
+    rss_list.extend([
+        RandomStateService(seed=rss.random.randint(0, 2**32))
+        for i in range(1, ncpu)
+    ])
+
+    return rss_list
+
+
+def _create_process_tl_list(
+        tl,
+        ncpu,
+):
+    """Creates the list of TimeLord instances, one for each process. The first
+    element is the given ``tl`` instance itself, which is used by the master
+    process.
+
+    Parameters
+    ----------
+    tl : instance of TimeLord | None
+        The TimeLord instance of the master process.
+    ncpu : int
+        The number of processes, including the master process.
+
+    Returns
+    -------
+    tl_list : list of TimeLord | list of None
+        The list of length ``ncpu`` holding the TimeLord instance for each
+        process.
+    """
+    tl_list = [tl]
+    if tl is None:
+        tl_list += [None]*(ncpu-1)
+        return tl_list
+
+    if not isinstance(tl, TimeLord):
+        raise TypeError(
+            'The tl argument must be an instance of TimeLord!')
+    tl_list.extend([
+        tl.empty_copy()
+        for i in range(1, ncpu)
+    ])
+
+    return tl_list
+
+
 def parallelize(  # noqa: C901
         func,
         args_list,
@@ -74,9 +199,21 @@ def parallelize(  # noqa: C901
         rss=None,
         tl=None,
         ppbar=None,
+        chunksize=None,
 ):
     """Parallelizes the execution of the given function for different arguments.
 
+    By default, ``args_list`` is split into ``ncpu`` contiguous blocks, one for
+    each process. If the run time of the individual tasks varies a lot, the
+    slowest process determines the total run time. In such cases dynamic
+    scheduling can be enabled by setting the ``chunksize`` argument. Then the
+    processes pick up chunks of ``chunksize`` consecutive tasks from a shared
+    queue until all tasks are finished, hence faster processes evaluate more
+    tasks. In order to keep the results reproducible, each task gets its own
+    RandomStateService instance, which seed is drawn from ``rss`` based on the
+    task's index within ``args_list``. Hence, the results depend neither on
+    ``ncpu`` nor on the process a task is evaluated on.
+
     Parameters
     ----------
     func : callable
@@ -91,12 +228,19 @@ def parallelize(  # noqa: C901
         is not None, `func` argument `rss` has to be omitted.
     ncpu : int
         The number of CPUs to use, i.e. the number of subprocesses to spawn.
+        Within a daemonic process, e.g. a worker process of a WorkerPool
+        instance, the function is always evaluated sequentially, because
+        daemonic processes are not allowed to have child processes.
     rss : RandomStateService | None
         The RandomStateService instance to use for generating random numbers.
     tl : instance of TimeLord | None
         The instance of TimeLord that should be used to time individual tasks.
     ppbar : instance of ProgressBar | None
         The possible parent ProgressBar instance.
+    chunksize : int | None
+        The number of tasks per chunk for dynamic scheduling. If set to None,
+        the static scheduling with one contiguous block of tasks per process
+        is used.
 
     Returns
     -------
@@ -104,6 +248,18 @@ def parallelize(  # noqa: C901
         The list of the result values of ``func``, where each element of that
         list corresponds to the arguments element in ``args_list``.
     """
+    ncpu = _limit_ncpu_in_daemonic_process(ncpu)
+
+    if chunksize is not None:
+        return _parallelize_chunked(
+            func=func,
+            args_list=args_list,
+            ncpu=ncpu,
+            chunksize=chunksize,
+            rss=rss,
+            tl=tl,
+            ppbar=ppbar)
+
     # Define a wrapper function for the multiprocessing module that evaluates
     # ``func`` for a subset of `args_list` on a worker process.
     def worker_wrapper(
@@ -162,7 +318,8 @@ def parallelize(  # noqa: C901
                 kwargs['rss'] = rss
             if tl is not None:
                 kwargs['tl'] = tl
-            result_list.append(func(*args, **kwargs))
+            with activate_time_lord(tl):
+                result_list.append(func(*args, **kwargs))
 
             if squeue is not None:
                 squeue.put((pid, task_idx))
@@ -224,7 +381,8 @@ def parallelize(  # noqa: C901
                 kwargs['rss'] = rss
             if tl is not None:
                 kwargs['tl'] = tl
-            result_list.append(func(*args, **kwargs))
+            with activate_time_lord(tl):
+                result_list.append(func(*args, **kwargs))
 
             # Skip the rest, if we are not in an interactive session, hence
             # there is not progress bar.
@@ -273,31 +431,11 @@ def parallelize(  # noqa: C901
 
     # Create a list of RandomStateService for each process if rss argument is
     # set.
-    rss_list = [rss]
-    if rss is None:
-        rss_list += [None]*(ncpu-1)
-    else:
-        if not isinstance(rss, RandomStateService):
-            raise TypeError(
-                'The rss argument must be an instance of RandomStateService!')
-        rss_list.extend([
-            RandomStateService(seed=rss.random.randint(0, 2**32))
-            for i in range(1, ncpu)
-        ])
+    rss_list = _create_process_rss_list(rss, ncpu)
 
     # Create a list of TimeLord instances, one for each process if tl argument
     # is set.
-    tl_list = [tl]
-    if tl is None:
-        tl_list += [None]*(ncpu-1)
-    else:
-        if not isinstance(tl, TimeLord):
-            raise TypeError(
-                'The tl argument must be an instance of TimeLord!')
-        tl_list.extend([
-            TimeLord()
-            for i in range(1, ncpu)
-        ])
+    tl_list = _create_process_tl_list(tl, ncpu)
 
     # Replace all existing main process handlers with the `QueueHandler`.
     # This allows storing all the log record generated by worker processes at
@@ -362,7 +500,7 @@ def parallelize(  # noqa: C901
 
         pid_result_list_map[pid] = result_list
         if tl is not None:
-            tl.join(proc_tl)
+            tl.join(proc_tl, worker=f'worker-{pid}')
         logger.debug(
             f'Beginning of worker process (pid={pid}) log records.')
         lqueue_end = False
@@ -389,6 +527,905 @@ def parallelize(  # noqa: C901
     return result_list
 
 
+def create_seed_chunks(
+        n_tasks,
+        chunksize,
+        rss=None,
+):
+    """Splits ``n_tasks`` tasks into chunks of ``chunksize`` consecutive tasks.
+    If a RandomStateService instance is given, an individual seed is drawn for
+    each task, which depends only on the task's index. Hence, the random numbers
+    of a task do not depend on the process or the compute node the task is
+    evaluated on. This is the seeding scheme used by the :func:`parallelize`
+    function and the :class:`WorkerPool` class with a ``chunksize``.
+
+    Parameters
+    ----------
+    n_tasks : int
+        The total number of tasks.
+    chunksize : int
+        The number of tasks per chunk.
+    rss : instance of RandomStateService | None
+        The RandomStateService instance from which the task seeds are drawn.
+
+    Returns
+    -------
+    seed_chunks : list of 2-element tuple
+        The list of chunks. Each chunk is a tuple of the index of the first
+        task of the chunk and the (n_chunk_tasks,)-shaped numpy ndarray holding
+        the seeds of the chunk's tasks, or ``None`` if ``rss`` is ``None``.
+    """
+    if not isinstance(chunksize, int):
+        raise TypeError(
+            'The chunksize argument must be of type int!')
+    if chunksize < 1:
+        raise ValueError(
+            'The chunksize argument must be >= 1!')
+
+    seeds = None
+    if rss is not None:
+        if not isinstance(rss, RandomStateService):
+            raise TypeError(
+                'The rss argument must be an instance of RandomStateService!')
+        seeds = rss.random.randint(0, 2**32, size=n_tasks, dtype=np.int64)
+
+    seed_chunks = [
+        (
+            start_idx,
+            None if seeds is None else seeds[start_idx:start_idx+chunksize]
+        )
+        for start_idx in range(0, n_tasks, chunksize)
+    ]
+
+    return seed_chunks
+
+
+def _create_chunk_list(
+        args_list,
+        chunksize,
+        rss=None,
+):
+    """Splits the given list of arguments into chunks of ``chunksize``
+    consecutive tasks with seeds as created by the :func:`create_seed_chunks`
+    function.
+
+    Parameters
+    ----------
+    args_list : list of 2-element tuple
+        The list of the different arguments for the function.
+    chunksize : int
+        The number of tasks per chunk.
+    rss : instance of RandomStateService | None
+        The RandomStateService instance from which the task seeds are drawn.
+
+    Returns
+    -------
+    chunk_list : list of 4-element tuple
+        The list of chunks. Each chunk is a tuple of the index of the first
+        task of the chunk, the list of arguments of the chunk's tasks,
+        ``None``, and the (n_tasks,)-shaped numpy ndarray holding the seeds of
+        the chunk's tasks, or ``None`` if ``rss`` is ``None``.
+    """
+    chunk_list = [
+        (
+            start_idx,
+            list(args_list[start_idx:start_idx+chunksize]),
+            None,
+            seeds
+        )
+        for (start_idx, seeds) in create_seed_chunks(
+            len(args_list), chunksize, rss=rss)
+    ]
+
+    return chunk_list
+
+
+def _evaluate_chunks(
+        func,
+        chunks,
+        handle_result,
+        handle_status=None,
+        tl=None,
+):
+    """Evaluates ``func`` for all the tasks of the given chunks.
+
+    Parameters
+    ----------
+    func : callable
+        The function that should be called for each task.
+    chunks : iterable of 4-element tuple
+        The iterable of chunks. Each chunk is a tuple of the index of the first
+        task of the chunk, the list of arguments of the chunk's tasks, the
+        RandomStateService instance that should be used for all tasks of the
+        chunk, and the numpy ndarray holding the individual seed of each task
+        of the chunk. The latter two can be ``None``.
+    handle_result : callable
+        The function that is called with the index of the first task of the
+        chunk and the list of results after a chunk has been evaluated.
+    handle_status : callable | None
+        The optional function that is called without arguments after each
+        finished task.
+    tl : instance of TimeLord | None
+        The instance of TimeLord that should be used to time individual tasks.
+
+    Returns
+    -------
+    error : str | None
+        The formatted traceback of the first exception that occurred, or
+        ``None`` if no exception occurred. After an exception occurred, the
+        remaining chunks are consumed but not evaluated.
+    """
+    error = None
+    for (start_idx, sub_args_list, rss, seeds) in chunks:
+        if error is not None:
+            continue
+
+        result_list = []
+        try:
+            for (task_idx, (args, kwargs)) in enumerate(sub_args_list):
+                if seeds is not None:
+                    kwargs['rss'] = RandomStateService(seed=seeds[task_idx])
+                elif rss is not None:
+                    kwargs['rss'] = rss
+                if tl is not None:
+                    kwargs['tl'] = tl
+                with activate_time_lord(tl):
+                    result_list.append(func(*args, **kwargs))
+
+                if handle_status is not None:
+                    handle_status()
+        except Exception:
+            error = traceback.format_exc()
+            continue
+
+        handle_result(start_idx, result_list)
+
+    return error
+
+
+def _setup_worker_logging(
+        lqueue,
+):
+    """Updates the log records queue of the ``QueueHandler``, which has been
+    installed by the master process before starting the worker process.
+    """
+    logger = logging.getLogger('skyllh')
+    queue_handler = list(logger.handlers)[0]
+    queue_handler.queue = lqueue
+
+
+def _start_worker_processes(
+        target,
+        args_list,
+        lqueue,
+        daemon=False,
+):
+    """Starts worker processes for the given target function, while the log
+    handlers of the ``skyllh`` logger are replaced by a ``QueueHandler``.
+    After creating the worker processes the handlers are reverted to their
+    initial state.
+
+    Parameters
+    ----------
+    target : callable
+        The target function of the worker processes.
+    args_list : list of tuple
+        The list of arguments of the target function, one for each worker
+        process.
+    lqueue : multiprocessing.Queue
+        The log records queue for the installed ``QueueHandler``.
+    daemon : bool
+        Flag if the worker processes should be daemonic processes, which are
+        terminated automatically when the master process exits.
+
+    Returns
+    -------
+    processes : list of multiprocessing.Process
+        The list of started worker processes.
+    """
+    logger = logging.getLogger('skyllh')
+    orig_handlers = list(logger.handlers)
+    for orig_handler in orig_handlers:
+        logger.removeHandler(orig_handler)
+    queue_handler = QueueHandler(lqueue)
+    logger.addHandler(queue_handler)
+
+    processes = [
+        mp.Process(target=target, args=args, daemon=daemon)
+        for args in args_list
+    ]
+
+    try:
+        for proc in processes:
+            proc.start()
+    finally:
+        # Revert main process handlers to the initial state.
+        logger.removeHandler(queue_handler)
+        for orig_handler in orig_handlers:
+            logger.addHandler(orig_handler)
+
+    return processes
+
+
+def _handle_worker_log_records(
+        pid,
+        lqueue,
+):
+    """Handles the log records generated by the worker process of the given
+    process ID, until a ``None`` object is received from the log records
+    queue.
+    """
+    logger = logging.getLogger(__name__)
+    logger.debug(
+        f'Beginning of worker process (pid={pid}) log records.')
+    while True:
+        record = lqueue.get()
+        if record is None:
+            break
+        lqueue_logger = logging.getLogger(record.name)
+        lqueue_logger.handle(record)
+    logger.debug('Ending of worker process (pid=%d) log records.', pid)
+
+
+def _update_worker_status(
+        pbar,
+        sarr,
+        squeue,
+):
+    """Updates the status array and the progress bar with the status
+    information received from the worker processes.
+    """
+    if squeue is not None:
+        while not squeue.empty():
+            (pid, worker_task_idx) = squeue.get()
+            sarr[pid]['n_finished_tasks'] = worker_task_idx + 1
+
+    pbar.update(np.sum(sarr['n_finished_tasks']))
+
+
+def _collect_worker_results(
+        rqueue,
+        processes,
+        lqueue_list,
+        start_idx_result_list_map,
+        pbar,
+        sarr,
+        squeue,
+        tl=None,
+):
+    """Collects the chunk results of the worker processes from the result
+    queue until all worker processes have reported to be done. The log records
+    of each worker process are handled and the worker's TimeLord instance is
+    joined with the given TimeLord instance.
+
+    Parameters
+    ----------
+    rqueue : multiprocessing.Queue
+        The result queue.
+    processes : dict of int to multiprocessing.Process
+        The dictionary mapping the process ID to the worker process.
+    lqueue_list : list of multiprocessing.Queue
+        The log records queue of each process, where the process ID is the
+        list index.
+    start_idx_result_list_map : dict
+        The dictionary into which the results of each chunk are inserted. The
+        key is the index of the first task of the chunk.
+    pbar : instance of ProgressBar
+        The progress bar.
+    sarr : numpy record ndarray
+        The status numpy record ndarray for all the processes.
+    squeue : multiprocessing.Queue | None
+        The status queue of the worker processes.
+    tl : instance of TimeLord | None
+        The TimeLord instance of the master process.
+
+    Returns
+    -------
+    error_list : list of 2-element tuple
+        The list of (pid, error) tuples of the worker processes that raised an
+        exception.
+
+    Raises
+    ------
+    RuntimeError
+        If a worker process died unexpectedly.
+    """
+    done_pids = set()
+    error_list = []
+    while len(done_pids) < len(processes):
+        try:
+            (pid, start_idx, result_list, proc_tl, error) = rqueue.get(
+                timeout=0.01)
+        except queue.Empty:
+            # Either the worker processes aren't finished yet, or a worker
+            # process died due to an exception.
+            for (pid, proc) in processes.items():
+                if pid in done_pids:
+                    continue
+                if proc.exitcode is not None:
+                    raise RuntimeError(
+                        f'Worker process {proc.pid} died unexpectedly! '
+                        f'Exit code was {proc.exitcode}.')
+            if pbar.is_shown:
+                _update_worker_status(pbar, sarr, squeue)
+            continue
+
+        if start_idx is not None:
+            start_idx_result_list_map[start_idx] = result_list
+            continue
+
+        # The worker process is done.
+        done_pids.add(pid)
+        if error is not None:
+            error_list.append((pid, error))
+        if proc_tl is not None:
+            tl.join(proc_tl, worker=f'worker-{pid}')
+        _handle_worker_log_records(pid, lqueue_list[pid])
+
+    return error_list
+
+
+def _join_chunk_results(
+        start_idx_result_list_map,
+):
+    """Joins the result lists of the chunks in the order of the tasks.
+    """
+    result_list = []
+    for start_idx in sorted(start_idx_result_list_map.keys()):
+        result_list += start_idx_result_list_map[start_idx]
+    return result_list
+
+
+def _chunk_worker(
+        func,
+        pid,
+        cqueue,
+        rqueue,
+        lqueue,
+        squeue,
+        tl,
+):
+    """Target function of a worker process of the
+    :func:`~skyllh.core.multiproc.parallelize` function with enabled dynamic
+    scheduling. It evaluates chunks from the shared chunk queue until ``None``
+    is received.
+
+    Parameters
+    ----------
+    func : callable
+        The function that should be called for each task.
+    pid : int
+        The process ID that identifies the worker process.
+    cqueue : multiprocessing.Queue
+        The shared queue holding the chunks.
+    rqueue : multiprocessing.Queue
+        The queue into which the results are put.
+    lqueue : multiprocessing.Queue
+        The queue to hold generated log records by ``func``.
+    squeue : multiprocessing.Queue | None
+        The queue into which status information about finished tasks is put.
+        Can be None to skip sending status information.
+    tl : instance of TimeLord | None
+        The empty TimeLord instance that should be used to time the tasks, or
+        None if the tasks should not be timed.
+    """
+    _setup_worker_logging(lqueue)
+
+    n_finished_tasks = 0
+
+    def handle_result(start_idx, result_list):
+        rqueue.put((pid, start_idx, result_list, None, None))
+
+    def handle_status():
+        nonlocal n_finished_tasks
+        squeue.put((pid, n_finished_tasks))
+        n_finished_tasks += 1
+
+    error = _evaluate_chunks(
+        func=func,
+        chunks=iter(cqueue.get, None),
+        handle_result=handle_result,
+        handle_status=None if squeue is None else handle_status,
+        tl=tl)
+
+    rqueue.put((pid, None, None, tl, error))
+
+    # Put None object as the last log records queue item.
+    lqueue.put_nowait(None)
+
+
+def _parallelize_chunked(
+        func,
+        args_list,
+        ncpu,
+        chunksize,
+        rss=None,
+        tl=None,
+        ppbar=None,
+):
+    """Implementation of the :func:`~skyllh.core.multiproc.parallelize`
+    function with dynamic scheduling, where the processes pick up chunks of
+    tasks from a shared queue. See the documentation of the
+    :func:`~skyllh.core.multiproc.parallelize` function for the description of
+    the arguments.
+    """
+    if (tl is not None) and (not isinstance(tl, TimeLord)):
+        raise TypeError(
+            'The tl argument must be an instance of TimeLord!')
+
+    chunk_list = _create_chunk_list(args_list, chunksize, rss=rss)
+
+    pbar = ProgressBar(maxval=len(args_list), parent=ppbar).start()
+    sarr = np.zeros((ncpu,), dtype=[('n_finished_tasks', np.int64)])
+    start_idx_result_list_map = dict()
+
+    def handle_master_result(start_idx, result_list):
+        start_idx_result_list_map[start_idx] = result_list
+
+    def handle_master_status():
+        sarr[0]['n_finished_tasks'] += 1
+        _update_worker_status(pbar, sarr, squeue)
+
+    if ncpu == 1:
+        squeue = None
+        error = _evaluate_chunks(
+            func=func,
+            chunks=chunk_list,
+            handle_result=handle_master_result,
+            handle_status=handle_master_status if pbar.is_shown else None,
+            tl=tl)
+        if error is not None:
+            raise RuntimeError(error)
+
+        pbar.finish()
+
+        return _join_chunk_results(start_idx_result_list_map)
+
+    cqueue = mp.Queue()
+    rqueue = mp.Queue()
+    squeue = None
+    if pbar.is_shown:
+        squeue = mp.Queue()
+    lqueue_list = [None] + [mp.Queue() for i in range(ncpu-1)]
+
+    for chunk in chunk_list:
+        cqueue.put(chunk)
+    # Put one None object for each process, including the master process, as
+    # the last chunk queue items.
+    for pid in range(ncpu):
+        cqueue.put(None)
+
+    worker_processes = _start_worker_processes(
+        target=_chunk_worker,
+        args_list=[
+            (func, pid, cqueue, rqueue, lqueue_list[pid], squeue,
+             None if tl is None else tl.empty_copy())
+            for pid in range(1, ncpu)
+        ],
+        lqueue=lqueue_list[1])
+    processes = dict(zip(range(1, ncpu), worker_processes))
+
+    # Take part in the work as process 0.
+    master_error = _evaluate_chunks(
+        func=func,
+        chunks=iter(cqueue.get, None),
+        handle_result=handle_master_result,
+        handle_status=handle_master_status if pbar.is_shown else None,
+        tl=tl)
+
+    error_list = _collect_worker_results(
+        rqueue=rqueue,
+        processes=processes,
+        lqueue_list=lqueue_list,
+        start_idx_result_list_map=start_idx_result_list_map,
+        pbar=pbar,
+        sarr=sarr,
+        squeue=squeue,
+        tl=tl)
+
+    # Join all the processes.
+    for proc in worker_processes:
+        proc.join()
+
+    if master_error is not None:
+        raise RuntimeError(master_error)
+    if len(error_list) > 0:
+        (pid, error) = error_list[0]
+        raise RuntimeError(
+            f'Worker process (pid={pid}) raised an exception:\n{error}')
+
+    pbar.finish()
+
+    return _join_chunk_results(start_idx_result_list_map)
+
+
+def _worker_pool_loop(
+        func,
+        pid,
+        tqueue,
+        cqueue,
+        rqueue,
+        lqueue,
+        squeue,
+):
+    """The main loop of a worker process of a WorkerPool instance. It waits for
+    task batches on the task queue, evaluates ``func`` for each task of the
+    batch, and puts the results of the batch into the result queue. The loop
+    ends when ``None`` is received from the task queue.
+
+    Parameters
+    ----------
+    func : callable
+        The function that should be called for each task.
+    pid : int
+        The process ID that identifies the worker process within the pool.
+    tqueue : multiprocessing.Queue
+        The queue from which task batches are received.
+    cqueue : multiprocessing.Queue
+        The chunk queue shared by all processes of the pool, from which chunks
+        are taken for batches with dynamic scheduling.
+    rqueue : multiprocessing.Queue
+        The queue into which the results are put.
+    lqueue : multiprocessing.Queue
+        The queue to hold generated log records by ``func``.
+    squeue : multiprocessing.Queue
+        The queue into which status information about finished tasks is put.
+    """
+    _setup_worker_logging(lqueue)
+
+    while True:
+        batch = tqueue.get()
+        if batch is None:
+            break
+
+        # The chunk list is None for batches with dynamic scheduling.
+        (chunk_list, tl, send_status) = batch
+        if chunk_list is None:
+            chunks = iter(cqueue.get, None)
+        else:
+            chunks = chunk_list
+
+        n_finished_tasks = 0
+
+        def handle_result(start_idx, result_list):
+            rqueue.put((pid, start_idx, result_list, None, None))
+
+        def handle_status():
+            nonlocal n_finished_tasks
+            squeue.put((pid, n_finished_tasks))
+            n_finished_tasks += 1
+
+        error = _evaluate_chunks(
+            func=func,
+            chunks=chunks,
+            handle_result=handle_result,
+            handle_status=handle_status if send_status else None,
+            tl=tl)
+
+        rqueue.put((pid, None, None, tl, error))
+
+        # Put None object as the last log records queue item of this batch.
+        lqueue.put_nowait(None)
+
+
+class WorkerPool(
+        object,
+):
+    """The WorkerPool class provides a long-lived pool of worker processes,
+    which evaluate a fixed function for batches of different arguments. In
+    contrast to the :func:`~skyllh.core.multiproc.parallelize` function, the
+    worker processes are created only once, hence the function (e.g. a bound
+    method of an Analysis instance including all its data) is transferred to
+    the worker processes only once, i.e. inherited via fork or pickled once,
+    and can then be used for many batches of tasks via the :meth:`map` method.
+
+    The master process participates as worker with process ID 0. By default,
+    the work of a batch is split into ``ncpu`` contiguous blocks in the same
+    way as done by the :func:`~skyllh.core.multiproc.parallelize` function.
+    Hence, for the same RandomStateService instance, the results are identical
+    to the ones of the :func:`~skyllh.core.multiproc.parallelize` function.
+
+    Because the worker processes hold a copy of the function made at the
+    creation of the pool, later changes to the state of the function, e.g.
+    changing the source of the analysis, are seen only by the master process.
+    A new pool must be created after such changes.
+
+    The pool should be used as context manager, or the :meth:`close` method
+    must be called explicitly in order to terminate the worker processes::
+
+        with WorkerPool(func=ana.do_trial, ncpu=4) as pool:
+            for mean_n_sig in mean_n_sig_list:
+                trials = ana.do_trials(
+                    rss=rss, n=100, mean_n_sig=mean_n_sig, pool=pool)
+    """
+
+    def __init__(
+            self,
+            func,
+            ncpu,
+            **kwargs,
+    ):
+        """Creates a new WorkerPool instance and starts its worker processes.
+
+        Parameters
+        ----------
+        func : callable
+            The function which should be called with different arguments by
+            the worker processes.
+        ncpu : int
+            The number of CPUs to use, i.e. the number of processes including
+            the master process. Hence, ``ncpu-1`` worker processes are started.
+            Within a daemonic process, e.g. a worker process of another pool,
+            no worker processes are started.
+        """
+        super().__init__(**kwargs)
+
+        if not callable(func):
+            raise TypeError(
+                'The func argument must be a callable object!')
+        if not isinstance(ncpu, int):
+            raise TypeError(
+                'The ncpu argument must be of type int!')
+        if ncpu < 1:
+            raise ValueError(
+                'The ncpu argument must be >= 1!')
+
+        self._func = func
+        self._ncpu = _limit_ncpu_in_daemonic_process(ncpu)
+
+        self._processes = dict()
+        self._tqueue_list = []
+        self._lqueue_list = []
+        self._cqueue = None
+        self._rqueue = None
+        self._squeue = None
+        self._is_closed = False
+
+        self._start_processes()
+
+    @property
+    def func(self):
+        """(read-only) The function that is evaluated by the worker processes.
+        """
+        return self._func
+
+    @property
+    def ncpu(self):
+        """(read-only) The number of CPUs used by this pool, including the
+        master process.
+        """
+        return self._ncpu
+
+    @property
+    def is_alive(self):
+        """(read-only) Flag if the worker processes of this pool are running.
+        A pool with ``ncpu=1`` is always alive until it has been closed.
+        """
+        return not self._is_closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        self.terminate()
+
+    def _start_processes(self):
+        """Starts the ``ncpu-1`` worker processes of this pool.
+        """
+        if self._ncpu == 1:
+            return
+
+        self._cqueue = mp.Queue()
+        self._rqueue = mp.Queue()
+        self._squeue = mp.Queue()
+
+        # Create a task queue and a log records queue for each worker
+        # process. Prepend it with None to be able to use `pid` as the list
+        # index.
+        self._tqueue_list = [None] + [mp.Queue() for i in range(self._ncpu-1)]
+        self._lqueue_list = [None] + [mp.Queue() for i in range(self._ncpu-1)]
+
+        # The worker processes are daemonic, so that a pool, which has not
+        # been closed, does not prevent the master process from exiting.
+        # Nested multi-processing work within them is done sequentially.
+        worker_processes = _start_worker_processes(
+            target=_worker_pool_loop,
+            args_list=[
+                (self._func, pid, self._tqueue_list[pid], self._cqueue,
+                 self._rqueue, self._lqueue_list[pid], self._squeue)
+                for pid in range(1, self._ncpu)
+            ],
+            lqueue=self._lqueue_list[1],
+            daemon=True)
+        self._processes = dict(zip(range(1, self._ncpu), worker_processes))
+
+    def _assert_is_alive(self):
+        """Raises a RuntimeError if this pool has been closed already.
+        """
+        if not self.is_alive:
+            raise RuntimeError(
+                f'The {classname(self)} instance has been closed already!')
+
+    def map(  # noqa: C901
+            self,
+            args_list,
+            rss=None,
+            tl=None,
+            ppbar=None,
+            chunksize=None,
+    ):
+        """Evaluates the function of this pool for the given list of
+        arguments using the worker processes of this pool.
+
+        Parameters
+        ----------
+        args_list : list of 2-element tuple
+            The list of the different arguments for the function of this pool.
+            See the documentation of the
+            :func:`~skyllh.core.multiproc.parallelize` function for the format.
+        rss : RandomStateService | None
+            The RandomStateService instance to use for generating random
+            numbers. Each worker process gets its own RandomStateService
+            instance seeded from this instance, or each task gets its own
+            RandomStateService instance if ``chunksize`` is not None.
+        tl : instance of TimeLord | None
+            The instance of TimeLord that should be used to time individual
+            tasks. The TimeLord instances of the worker processes are joined
+            with this instance.
+        ppbar : instance of ProgressBar | None
+            The possible parent ProgressBar instance.
+        chunksize : int | None
+            If set to an integer, dynamic scheduling is used, where the
+            processes pick up chunks of ``chunksize`` tasks from a shared
+            queue. See the documentation of the
+            :func:`~skyllh.core.multiproc.parallelize` function for details.
+
+        Returns
+        -------
+        result_list : list
+            The list of the result values of the function, where each element
+            of that list corresponds to the arguments element in
+            ``args_list``.
+        """
+        self._assert_is_alive()
+
+        if self._ncpu == 1:
+            if chunksize is None:
+                return parallelize(
+                    func=self._func,
+                    args_list=args_list,
+                    ncpu=1,
+                    rss=rss,
+                    tl=tl,
+                    ppbar=ppbar)
+            return _parallelize_chunked(
+                func=self._func,
+                args_list=args_list,
+                ncpu=1,
+                chunksize=chunksize,
+                rss=rss,
+                tl=tl,
+                ppbar=ppbar)
+
+        if (tl is not None) and (not isinstance(tl, TimeLord)):
+            raise TypeError(
+                'The tl argument must be an instance of TimeLord!')
+
+        ncpu = self._ncpu
+
+        pbar = ProgressBar(maxval=len(args_list), parent=ppbar).start()
+        sarr = np.zeros((ncpu,), dtype=[('n_finished_tasks', np.int64)])
+        start_idx_result_list_map = dict()
+
+        def handle_master_result(start_idx, result_list):
+            start_idx_result_list_map[start_idx] = result_list
+
+        def handle_master_status():
+            sarr[0]['n_finished_tasks'] += 1
+            _update_worker_status(pbar, sarr, self._squeue)
+
+        if chunksize is None:
+            # Split the work into ncpu contiguous blocks.
+            rss_list = _create_process_rss_list(rss, ncpu)
+            sub_args_list_list = np.array_split(
+                np.array(args_list, dtype=object), ncpu)
+            start_idx_list = np.cumsum(
+                [0] + [len(sub) for sub in sub_args_list_list[:-1]])
+            process_chunk_list = [
+                [(int(start_idx_list[pid]), list(sub_args_list_list[pid]),
+                  rss_list[pid], None)]
+                for pid in range(ncpu)
+            ]
+            for pid in range(1, ncpu):
+                self._tqueue_list[pid].put((
+                    process_chunk_list[pid],
+                    None if tl is None else tl.empty_copy(),
+                    pbar.is_shown))
+            master_chunks = process_chunk_list[0]
+        else:
+            chunk_list = _create_chunk_list(args_list, chunksize, rss=rss)
+            for chunk in chunk_list:
+                self._cqueue.put(chunk)
+            for pid in range(ncpu):
+                self._cqueue.put(None)
+            for pid in range(1, ncpu):
+                self._tqueue_list[pid].put((
+                    None,
+                    None if tl is None else tl.empty_copy(),
+                    pbar.is_shown))
+            master_chunks = iter(self._cqueue.get, None)
+
+        master_error = _evaluate_chunks(
+            func=self._func,
+            chunks=master_chunks,
+            handle_result=handle_master_result,
+            handle_status=handle_master_status if pbar.is_shown else None,
+            tl=tl)
+
+        try:
+            error_list = _collect_worker_results(
+                rqueue=self._rqueue,
+                processes=self._processes,
+                lqueue_list=self._lqueue_list,
+                start_idx_result_list_map=start_idx_result_list_map,
+                pbar=pbar,
+                sarr=sarr,
+                squeue=self._squeue,
+                tl=tl)
+        except Exception:
+            self.terminate()
+            raise
+
+        if master_error is not None:
+            raise RuntimeError(master_error)
+        if len(error_list) > 0:
+            (pid, error) = error_list[0]
+            raise RuntimeError(
+                f'Worker process (pid={pid}) of the worker pool raised an '
+                f'exception:\n{error}')
+
+        # Drain possible remaining status information.
+        if pbar.is_shown:
+            _update_worker_status(pbar, sarr, self._squeue)
+
+        pbar.finish()
+
+        return _join_chunk_results(start_idx_result_list_map)
+
+    def close(self):
+        """Stops the worker processes of this pool gracefully and waits for
+        them to finish.
+        """
+        if not self.is_alive:
+            return
+
+        for tqueue in self._tqueue_list[1:]:
+            tqueue.put(None)
+        for proc in self._processes.values():
+            proc.join()
+
+        self._processes = dict()
+        self._is_closed = True
+
+    def terminate(self):
+        """Terminates the worker processes of this pool immediately.
+        """
+        if getattr(self, '_is_closed', True):
+            return
+
+        for proc in self._processes.values():
+            if proc.is_alive():
+                proc.terminate()
+        for proc in self._processes.values():
+            proc.join()
+
+        self._processes = dict()
+        self._is_closed = True
+
+
 class IsParallelizable(
         object,
 ):
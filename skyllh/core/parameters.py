@@ -770,6 +770,67 @@ class ParameterSet(
 
         return ri
 
+    def generate_latin_hypercube_floating_param_initials(self, rss, n):
+        """Generates ``n`` sets of initials for all floating parameters, which
+        are distributed as a Latin hypercube within the parameter bounds.
+        The range of each floating parameter is divided into ``n`` equally
+        sized intervals and each interval contains exactly one initial value.
+
+        Parameters
+        ----------
+        rss : RandomStateService instance
+            The RandomStateService instance that should be used for drawing
+            random numbers from.
+        n : int
+            The number of sets of initials.
+
+        Returns
+        -------
+        ri : (n, N_floating_params)-shaped numpy ndarray
+            The numpy 2D ndarray holding the generated initial values.
+        """
+        vb = self.floating_param_bounds
+        n_params = vb.shape[0]
+
+        # Place one random point in each of the n intervals and shuffle the
+        # intervals independently for each parameter.
+        u = (np.arange(n)[:, np.newaxis] +
+             rss.random.uniform(size=(n, n_params))) / n
+        for j in range(n_params):
+            u[:, j] = rss.random.permutation(u[:, j])
+
+        ri = vb[:, 0] + u*(vb[:, 1] - vb[:, 0])
+
+        return ri
+
+    def generate_grid_floating_param_initials(self, n_per_param):
+        """Generates the sets of initials for all floating parameters, which
+        lie on a regular grid within the parameter bounds. The grid points of
+        each parameter are the centers of ``n_per_param`` equally sized
+        intervals of the parameter range.
+
+        Parameters
+        ----------
+        n_per_param : int
+            The number of grid points for each floating parameter.
+
+        Returns
+        -------
+        gi : (n_per_param**N_floating_params, N_floating_params)-shaped numpy
+                ndarray
+            The numpy 2D ndarray holding the initial values of the grid
+            points.
+        """
+        vb = self.floating_param_bounds
+
+        u = (np.arange(n_per_param) + 0.5) / n_per_param
+        grids = np.meshgrid(
+            *[vmin + u*(vmax - vmin) for (vmin, vmax) in vb],
+            indexing='ij')
+        gi = np.stack([g.ravel() for g in grids], axis=-1)
+
+        return gi
+
     def has_fixed_param(self, param_name):
         """Checks if this ParameterSet instance has a fixed parameter named
         ``param_name``.
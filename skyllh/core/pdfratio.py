@@ -7,6 +7,9 @@ import numpy as np
 from skyllh.core.config import (
     HasConfig,
 )
+from skyllh.core.debugging import (
+    get_logger,
+)
 from skyllh.core.interpolate import (
     GridManifoldInterpolationMethod,
     Parabola1DGridManifoldInterpolationMethod,
@@ -25,6 +28,7 @@ from skyllh.core.py import (
     int_cast,
     issequence,
     issequenceof,
+    make_dict_hash,
 )
 from skyllh.core.services import (
     SrcDetSigYieldWeightsService,
@@ -34,6 +38,9 @@ from skyllh.core.timing import (
 )
 
 
+logger = get_logger(__name__)
+
+
 class PDFRatio(
         HasConfig,
         metaclass=abc.ABCMeta,
@@ -131,6 +138,23 @@ class PDFRatio(
                 'instances!')
         self._bkg_param_names = names
 
+    def change_shg_mgr(
+            self,
+            shg_mgr,
+    ):
+        """Changes the instance of SourceHypoGroupManager, e.g. when the source
+        of the analysis has been changed. PDF ratios, which depend on the
+        source hypotheses beyond the source data fields of the trial data,
+        should reimplement this method. The default implementation does
+        nothing.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The new instance of SourceHypoGroupManager.
+        """
+        pass
+
     @abc.abstractmethod
     def initialize_for_new_trial(
             self,
@@ -288,6 +312,23 @@ class PDFRatioProduct(
                 'The pdfratio2 property must be an instance of PDFRatio!')
         self._pdfratio2 = pdfratio
 
+    def change_shg_mgr(
+            self,
+            shg_mgr,
+    ):
+        """Changes the instance of SourceHypoGroupManager of both PDFRatio
+        instances.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The new instance of SourceHypoGroupManager.
+        """
+        self._pdfratio1.change_shg_mgr(
+            shg_mgr=shg_mgr)
+        self._pdfratio2.change_shg_mgr(
+            shg_mgr=shg_mgr)
+
     def initialize_for_new_trial(
             self,
             **kwargs):
@@ -571,9 +612,6 @@ class SourceWeightedPDFRatio(
         (a_jk, a_jk_grads) = self._src_detsigyield_weights_service.get_weights()
         a_k = a_jk[self._dataset_idx]
 
-        n_sources = len(a_k)
-        n_sel_events = tdm.n_selected_events
-
         A = np.sum(a_k)
 
         R_ik = self._pdfratio.get_ratio(
@@ -582,12 +620,7 @@ class SourceWeightedPDFRatio(
             tl=tl)
         # The R_ik ndarray is (N_values,)-shaped.
 
-        R_i = np.zeros((n_sel_events,), dtype=np.double)
-
-        (src_idxs, evt_idxs) = tdm.src_evt_idxs
-        for k in range(n_sources):
-            src_mask = src_idxs == k
-            R_i[evt_idxs[src_mask]] += R_ik[src_mask] * a_k[k]
+        R_i = tdm.src_evt_pairs.sum_per_event(R_ik, src_weights=a_k)
         R_i /= A
 
         self._cache_R_ik = R_ik
@@ -641,9 +674,6 @@ class SourceWeightedPDFRatio(
         a_k = a_jk[self._dataset_idx]
         A = np.sum(a_k)
 
-        n_sources = a_jk.shape[1]
-        n_sel_events = tdm.n_selected_events
-
         if fitparam_id not in a_jk_grads:
             a_k_grad = 0
             dAdp = 0
@@ -663,20 +693,14 @@ class SourceWeightedPDFRatio(
 
         R_i_grad = -self._cache_R_i * dAdp
 
-        src_sum_i = np.zeros((n_sel_events,), dtype=np.double)
+        src_evt_pairs = tdm.src_evt_pairs
+        if isinstance(a_k_grad, np.ndarray):
+            R_i_grad += src_evt_pairs.sum_per_event(
+                self._cache_R_ik, src_weights=a_k_grad)
+        if isinstance(R_ik_grad, np.ndarray):
+            R_i_grad += src_evt_pairs.sum_per_event(
+                R_ik_grad, src_weights=a_k)
 
-        (src_idxs, evt_idxs) = tdm.src_evt_idxs
-        for k in range(n_sources):
-            src_mask = src_idxs == k
-            src_evt_idxs = evt_idxs[src_mask]
-            if isinstance(a_k_grad, np.ndarray):
-                src_sum_i[src_evt_idxs] +=\
-                    a_k_grad[k] * self._cache_R_ik[src_mask]
-            if isinstance(R_ik_grad, np.ndarray):
-                src_sum_i[src_evt_idxs] +=\
-                    a_k[k] * R_ik_grad[src_mask]
-
-        R_i_grad += src_sum_i
         R_i_grad /= A
 
         return R_i_grad
@@ -954,6 +978,8 @@ class SigSetOverBkgPDFRatio(
             sig_pdf_set,
             bkg_pdf,
             interpolmethod_cls=None,
+            precompute_grid_table=False,
+            grid_table_max_nbytes=2**28,
             **kwargs):
         """Constructor called by creating an instance of a class which is
         derived from this PDFRatio class.
@@ -970,6 +996,18 @@ class SigSetOverBkgPDFRatio(
             the PDF ratio manifold grid. If set to ``None`` (default), the
             :class:`skyllh.core.interpolate.Parabola1DGridManifoldInterpolationMethod`
             will be used for 1-dimensional parameter manifolds.
+        precompute_grid_table : bool
+            Switch if the PDF ratio values of all grid points of the signal
+            parameter manifold should be calculated once for each new trial
+            and stored in a (N_grid_points, N_values)-shaped table. The
+            interpolation method then retrieves the grid point values from this
+            table instead of evaluating them for each set of fit parameter
+            values. Default is ``False``.
+        grid_table_max_nbytes : int
+            The maximal size of the grid table in bytes. If the table for a
+            trial would be larger, no table will be created for that trial and
+            the grid point values are evaluated on demand.
+            Default is 256 MiB.
         """
         super().__init__(
             sig_param_names=sig_pdf_set.param_grid_set.params_name_list,
@@ -992,6 +1030,9 @@ class SigSetOverBkgPDFRatio(
                     'dimensions!')
         self.interpolmethod_cls = interpolmethod_cls
 
+        self.precompute_grid_table = precompute_grid_table
+        self.grid_table_max_nbytes = grid_table_max_nbytes
+
     @property
     def bkg_pdf(self):
         """The background PDF instance, derived from IsBackgroundPDF.
@@ -1023,6 +1064,15 @@ class SigSetOverBkgPDFRatio(
                 f'Its current type is {classname(pdfset)}.')
         self._sig_pdf_set = pdfset
 
+        # Create the grid table variables. The grid table is only valid for
+        # the signal PDF set and the trial data state ID it was created for.
+        self._grid_table = None
+        self._grid_table_trial_data_state_id = None
+        self._gridparams_hash_grid_table_row_dict = dict(
+            (make_dict_hash(gridparams), row_idx)
+            for (row_idx, gridparams) in enumerate(pdfset.gridparams_list)
+        )
+
     @property
     def interpolmethod_cls(self):
         """The class derived from GridManifoldInterpolationMethod
@@ -1039,6 +1089,151 @@ class SigSetOverBkgPDFRatio(
                 f'Its current type is {classname(cls)}.')
         self._interpolmethod_cls = cls
 
+    @property
+    def precompute_grid_table(self):
+        """Switch if the PDF ratio values of all parameter grid points should
+        be pre-calculated for each new trial.
+        """
+        return self._precompute_grid_table
+
+    @precompute_grid_table.setter
+    def precompute_grid_table(self, b):
+        if not isinstance(b, bool):
+            raise TypeError(
+                'The precompute_grid_table property must be an instance of '
+                'bool! '
+                f'Its current type is {classname(b)}.')
+        self._precompute_grid_table = b
+
+    @property
+    def grid_table_max_nbytes(self):
+        """The maximal size in bytes of the table holding the pre-calculated
+        PDF ratio values of all parameter grid points.
+        """
+        return self._grid_table_max_nbytes
+
+    @grid_table_max_nbytes.setter
+    def grid_table_max_nbytes(self, n):
+        n = int_cast(
+            n,
+            'The grid_table_max_nbytes property must be castable to type '
+            'int!')
+        if n < 0:
+            raise ValueError(
+                'The grid_table_max_nbytes property must be non-negative! '
+                f'Its current value is {n}.')
+        self._grid_table_max_nbytes = n
+
+    def _create_grid_table(
+            self,
+            tdm,
+            func,
+            eventdata,
+            tl=None):
+        """Creates the (N_grid_points, N_values)-shaped table holding the
+        values of the grid manifold function ``func`` for all parameter grid
+        points of the signal PDF set, when the ``precompute_grid_table``
+        property is set to ``True``. If the table would exceed the
+        ``grid_table_max_nbytes`` limit, no table is created and the grid point
+        values get evaluated on demand.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The instance of TrialDataManager holding the trial data.
+        func : callable
+            The grid manifold function of the interpolation method. See the
+            :class:`~skyllh.core.interpolate.GridManifoldInterpolationMethod`
+            class for its call signature.
+        eventdata : instance of numpy ndarray | None
+            The (V,N_events)-shaped numpy ndarray holding the event data, which
+            should be passed to ``func``.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord for measuring timing information.
+        """
+        self._grid_table = None
+        self._grid_table_trial_data_state_id = None
+
+        if not self._precompute_grid_table:
+            return
+
+        gridparams_list = self._sig_pdf_set.gridparams_list
+        n_values = tdm.get_n_values()
+
+        nbytes = len(gridparams_list) * n_values * np.dtype(np.float64).itemsize
+        if nbytes > self._grid_table_max_nbytes:
+            logger.debug(
+                f'The grid table of {nbytes} bytes exceeds the limit of '
+                f'{self._grid_table_max_nbytes} bytes. The grid point values '
+                'will be evaluated on demand.')
+            return
+
+        gridparams_recarray_dtype = [
+            (pname, np.float64)
+            for pname in self._sig_pdf_set.param_grid_set.params_name_list
+        ]
+
+        grid_table = np.empty(
+            (len(gridparams_list), n_values),
+            dtype=np.float64)
+
+        with TaskTimer(tl, 'Create PDF ratio grid table.'):
+            for (row_idx, gridparams) in enumerate(gridparams_list):
+                gridparams_recarray = np.array(
+                    [tuple(gridparams[pname] for (pname, _) in
+                           gridparams_recarray_dtype)],
+                    dtype=gridparams_recarray_dtype)
+                grid_table[row_idx] = func(
+                    tdm=tdm,
+                    eventdata=eventdata,
+                    gridparams_recarray=gridparams_recarray,
+                    n_values=n_values)
+
+        self._grid_table = grid_table
+        self._grid_table_trial_data_state_id = tdm.trial_data_state_id
+
+    def _get_grid_table_values(
+            self,
+            tdm,
+            gridparams_recarray):
+        """Retrieves the grid manifold values for the given grid points from
+        the grid table.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The instance of TrialDataManager holding the trial data.
+        gridparams_recarray : instance of numpy structured ndarray
+            The numpy structured ndarray of length N_sources or 1 with the
+            parameter names and values of the grid point for each source.
+
+        Returns
+        -------
+        values : instance of numpy ndarray | None
+            The (N_values,)-shaped numpy ndarray holding the grid manifold
+            values for all sources and trial events. ``None``, if no valid grid
+            table is available for the current trial data.
+        """
+        if (self._grid_table is None) or\
+           (self._grid_table_trial_data_state_id != tdm.trial_data_state_id):
+            return None
+
+        pnames = gridparams_recarray.dtype.names
+        row_idxs = np.array([
+            self._gridparams_hash_grid_table_row_dict[
+                make_dict_hash(dict(zip(pnames, param_values)))]
+            for param_values in gridparams_recarray
+        ])
+
+        if len(row_idxs) == 1:
+            return self._grid_table[row_idxs[0]].copy()
+
+        (src_idxs, evt_idxs) = tdm.src_evt_idxs
+        values = self._grid_table[
+            row_idxs[src_idxs], np.arange(self._grid_table.shape[1])]
+
+        return values
+
     def initialize_for_new_trial(
             self,
             tdm,
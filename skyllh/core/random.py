@@ -8,6 +8,78 @@ from skyllh.core.py import (
 )
 
 
+def create_alias_table(
+        p,
+        n_seq=1024,
+):
+    """Creates the alias table of Walker's alias method for the given
+    probabilities using Vose's algorithm. The pairing of under-full and
+    over-full bins is done in vectorized rounds. Each under-full bin gets the
+    over-full bin as alias, in which the start of its cumulative deficit falls.
+    The remaining few bins are paired sequentially.
+
+    Parameters
+    ----------
+    p : instance of numpy.ndarray
+        The (N,)-shaped numpy.ndarray holding the probabilities. They must sum
+        up to one.
+    n_seq : int
+        The number of under-full bins below which the remaining bins are paired
+        sequentially.
+
+    Returns
+    -------
+    prob : instance of numpy.ndarray
+        The (N,)-shaped numpy.ndarray holding the probability to choose the bin
+        itself rather than its alias.
+    alias : instance of numpy.ndarray
+        The (N,)-shaped numpy.ndarray holding the alias index of each bin.
+    """
+    n = len(p)
+    q = np.asarray(p, dtype=np.float64) * n
+    prob = np.ones((n,), dtype=np.float64)
+    alias = np.arange(n, dtype=np.int64)
+
+    small = np.flatnonzero(q < 1)
+    large = np.flatnonzero(q >= 1)
+
+    while (len(small) >= n_seq) and (len(large) > 0):
+        # Assign each small bin to the large bin, in which the start of its
+        # cumulative deficit falls. Each large bin donates at most to one small
+        # bin beyond its surplus, and becomes a small bin itself in that case.
+        deficit = 1 - q[small]
+        deficit_start = np.cumsum(deficit) - deficit
+        surplus_end = np.cumsum(q[large] - 1)
+        large_idxs = np.searchsorted(surplus_end, deficit_start, side='right')
+        large_idxs = np.minimum(large_idxs, len(large)-1)
+
+        prob[small] = q[small]
+        alias[small] = large[large_idxs]
+        q[large] -= np.bincount(
+            large_idxs, weights=deficit, minlength=len(large))
+
+        small = large[q[large] < 1]
+        large = large[q[large] >= 1]
+
+    small = list(small)
+    large = list(large)
+    while small and large:
+        s = small.pop()
+        la = large[-1]
+        prob[s] = q[s]
+        alias[s] = la
+        q[la] -= 1 - q[s]
+        if q[la] < 1:
+            small.append(large.pop())
+
+    # Remaining bins are full up to rounding errors.
+    for i in small + large:
+        prob[i] = 1
+        alias[i] = i
+
+    return (prob, alias)
+
+
 class RandomStateService(
         object):
     """The RandomStateService class provides a container for a
@@ -81,16 +153,22 @@ class RandomChoice(
     """This class provides an efficient numpy.random.choice functionality
     specialized for SkyLLH. The advantage is that it stores the cumulative
     distribution function (CDF), which is assumed to be constant.
+
+    Alternatively, the alias method can be used, which draws each item in
+    constant time, independent of the number of items. The drawn items are
+    distributed identically, but the sequence of drawn items differs from the
+    one of the CDF method for the same random numbers.
     """
 
     def __init__(
             self,
             items,
             probabilities,
+            method='cdf',
             **kwargs,
     ):
         """Creates a new instance of RandomChoice holding the probabilities
-        and their cumulative distribution function (CDF).
+        and their cumulative distribution function (CDF), or their alias table.
 
         Parameters
         ----------
@@ -99,6 +177,16 @@ class RandomChoice(
             choose.
         probabilities : instance of numpy.ndarray
             The (N,)-shaped numpy.ndarray holding the probability for each item.
+        method : str
+            The method to draw the items. Possible values are:
+
+                ``'cdf'``
+                    The items are drawn via a binary search of uniform random
+                    numbers in the CDF. This gives the same items as
+                    ``numpy.random.choice``.
+                ``'alias'``
+                    The items are drawn via Walker's alias method in constant
+                    time per item.
         """
         super().__init__(**kwargs)
 
@@ -108,10 +196,20 @@ class RandomChoice(
         self._assert_probabilities(probabilities, self._items.size)
         self._probabilities = probabilities
 
-        # Create the cumulative distribution function (CDF). We use float64 to
-        # avoid a possible overflow when doing the summation.
-        self._cdf = np.cumsum(self._probabilities, dtype=np.float64)
-        self._cdf /= self._cdf[-1]
+        if method not in ('cdf', 'alias'):
+            raise ValueError(
+                'The method argument must be either "cdf" or "alias"! '
+                f'Its current value is "{method}".')
+        self._method = method
+
+        if method == 'cdf':
+            # Create the cumulative distribution function (CDF). We use float64
+            # to avoid a possible overflow when doing the summation.
+            self._cdf = np.cumsum(self._probabilities, dtype=np.float64)
+            self._cdf /= self._cdf[-1]
+        else:
+            p = np.asarray(self._probabilities, dtype=np.float64)
+            (self._alias_prob, self._alias) = create_alias_table(p / np.sum(p))
 
     @property
     def items(self):
@@ -127,6 +225,13 @@ class RandomChoice(
         """
         return self._probabilities
 
+    @property
+    def method(self):
+        """(read-only) The method to draw the items, i.e. ``'cdf'`` or
+        ``'alias'``.
+        """
+        return self._method
+
     def _assert_items(
             self,
             items,
@@ -217,6 +322,12 @@ class RandomChoice(
             The (size,)-shaped numpy.ndarray holding the randomly selected items
             from ``self.items``.
         """
+        if self._method == 'alias':
+            bin_idxs = rss.random.randint(self._items.size, size=size)
+            keep = rss.random.random(size) < self._alias_prob[bin_idxs]
+            idxs = np.where(keep, bin_idxs, self._alias[bin_idxs])
+            return self._items[idxs]
+
         uniform_values = rss.random.random(size)
 
         # The np.searchsorted function is much faster when the values are
@@ -231,3 +342,37 @@ class RandomChoice(
         random_items = self._items[idxs]
 
         return random_items
+
+    def choose_batch(
+            self,
+            rss,
+            sizes,
+    ):
+        """Chooses random items for several batches, e.g. trials, in one call.
+        The items of all batches are drawn at once and are then split into the
+        individual batches.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The instance of RandomStateService from which random numbers are
+            drawn from.
+        sizes : sequence of int
+            The number of items to draw for each batch.
+
+        Returns
+        -------
+        random_items_list : list of instance of numpy.ndarray
+            The list of (size,)-shaped numpy.ndarray instances holding the
+            randomly selected items from ``self.items`` for each batch.
+        """
+        sizes = np.asarray(sizes, dtype=np.int64)
+        if np.any(sizes < 0):
+            raise ValueError(
+                'The sizes of the batches must not be negative!')
+
+        random_items = self(rss=rss, size=int(np.sum(sizes)))
+
+        random_items_list = np.split(random_items, np.cumsum(sizes)[:-1])
+
+        return random_items_list
@@ -5,6 +5,9 @@ from collections import (
 )
 import numpy as np
 
+from skyllh.core.cache import (
+    get_model_fingerprint,
+)
 from skyllh.core.dataset import (
     Dataset,
     DatasetData,
@@ -25,6 +28,14 @@ class DetSigYieldService(
         object):
     """This class provides a service to build and hold detector signal yield
     instances for multiple datasets and source hypothesis groups.
+
+    The detector signal yield instances depend on the source hypothesis group
+    only through its flux model, because they are functions of the source
+    position. Hence, source hypothesis groups with identical flux models and
+    detector signal yield builders share the same detector signal yield
+    instance, and the instances are reused when the source hypothesis group
+    manager gets changed, e.g. through the ``change_source`` method of an
+    analysis.
     """
 
     def __init__(
@@ -39,6 +50,11 @@ class DetSigYieldService(
         super().__init__(
             **kwargs)
 
+        # The registry of the constructed DetSigYield instances. The key is a
+        # tuple of the dataset index, the builder instance, and the fingerprint
+        # of the flux model.
+        self._detsigyield_registry = dict()
+
         self._set_shg_mgr(shg_mgr)
 
         self.dataset_list = dataset_list
@@ -69,6 +85,7 @@ class DetSigYieldService(
                 'instances! '
                 f'Its current type is {classname(datasets)}!')
         self._dataset_list = list(datasets)
+        self._detsigyield_registry = dict()
 
     @property
     def data_list(self):
@@ -85,6 +102,7 @@ class DetSigYieldService(
                 'instances! '
                 f'Its current type is {classname(datas)}!')
         self._data_list = list(datas)
+        self._detsigyield_registry = dict()
 
     @property
     def arr(self):
@@ -124,7 +142,9 @@ class DetSigYieldService(
             ppbar=None,
     ):
         """Changes the instance of SourceHypoGroupManager of this service. This
-        will also rebuild the detector signal yields.
+        will also rebuild the detector signal yields. Detector signal yields,
+        which have been constructed already for the same flux model and
+        builder, are reused.
         """
         self._set_shg_mgr(shg_mgr)
 
@@ -191,6 +211,10 @@ class DetSigYieldService(
         method is called with different flux models to optimize the construction
         of the detector signal yield functions.
 
+        Only one DetSigYield instance is constructed for source hypothesis
+        groups with identical flux models, which use the same builder. Already
+        constructed instances are taken from the registry of this service.
+
         Parameters
         ----------
         ppbar : instance of ProgressBar | None
@@ -216,51 +240,80 @@ class DetSigYieldService(
 
         shg_list = self.shg_mgr.shg_list
 
+        # Fingerprint each flux model only once.
+        fluxmodel_fingerprints = [
+            get_model_fingerprint(shg.fluxmodel)
+            for shg in shg_list
+        ]
+
+        registry = dict()
+
         for (j, (dataset, data)) in enumerate(zip(self._dataset_list,
                                                   self._data_list)):
 
             builder_to_shgidxs_dict = self.get_builder_to_shgidxs_dict(ds_idx=j)
 
             for (builder, shgidxs) in builder_to_shgidxs_dict.items():
+                # Group the SHGs by the key of their detector signal yield.
+                key_to_shgidxs_dict = defaultdict(list)
+                for g in shgidxs:
+                    key = (j, builder, fluxmodel_fingerprints[g])
+                    key_to_shgidxs_dict[key].append(g)
+
+                # Construct the detector signal yields, which are not in the
+                # registry yet, for one representative SHG of each key.
+                keys = [
+                    key
+                    for key in key_to_shgidxs_dict.keys()
+                    if key not in self._detsigyield_registry
+                ]
+                shgs = [
+                    shg_list[key_to_shgidxs_dict[key][0]]
+                    for key in keys
+                ]
+
                 factory = builder.get_detsigyield_construction_factory()
-                if factory is None:
+                if len(keys) == 0:
+                    detsigyields = []
+                elif factory is None:
                     # The builder does not provide a factory for DetSigYield
                     # instance construction. So we have to construct the
                     # detector signal yields one by one for each SHG.
-                    for g in shgidxs:
-                        shg = shg_list[g]
-
-                        detsigyield = builder.construct_detsigyield(
+                    detsigyields = [
+                        builder.construct_detsigyield(
                             dataset=dataset,
                             data=data,
                             shg=shg,
                             ppbar=pbar)
-
-                        detsigyield_arr[j, g] = detsigyield
-
-                        pbar.increment()
+                        for shg in shgs
+                    ]
                 else:
                     # The builder provides a factory for the construction of
                     # several DetSigYield instances simultaneously, one for each
                     # flux model.
-                    shgs = [
-                        shg_list[g]
-                        for g in shgidxs
-                    ]
-
                     detsigyields = factory(
                         dataset=dataset,
                         data=data,
                         shgs=shgs,
                         ppbar=pbar)
 
-                    for (i, g) in enumerate(shgidxs):
-                        detsigyield_arr[j, g] = detsigyields[i]
+                for (key, detsigyield) in zip(keys, detsigyields):
+                    self._detsigyield_registry[key] = detsigyield
+
+                for (key, gs) in key_to_shgidxs_dict.items():
+                    detsigyield = self._detsigyield_registry[key]
+                    registry[key] = detsigyield
+                    for g in gs:
+                        detsigyield_arr[j, g] = detsigyield
 
-                    pbar.increment(len(detsigyields))
+                pbar.increment(len(shgidxs))
 
         pbar.finish()
 
+        # Keep only the detector signal yields, which are in use, in order to
+        # not accumulate instances for flux models, which are not used anymore.
+        self._detsigyield_registry = registry
+
         return detsigyield_arr
 
 
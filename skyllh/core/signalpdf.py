@@ -12,9 +12,14 @@ from skyllh.core import (
 from skyllh.core.debugging import (
     get_logger,
 )
+from skyllh.core.flux_model import (
+    BoxTimeFluxProfile,
+    GaussianTimeFluxProfile,
+)
 from skyllh.core.interpolate import (
     GridManifoldInterpolationMethod,
     Linear1DGridManifoldInterpolationMethod,
+    group_values_by_grid_point,
 )
 from skyllh.core.pdf import (
     PDF,
@@ -393,6 +398,49 @@ class SignalTimePDF(
 
         self._pd = None
 
+        # Create cache variables for the times and the detector on-time mask
+        # of the trial data values. They depend only on the trial data and
+        # not on the parameters of the time flux profile.
+        self._cache_tdm_trial_data_state_id = None
+        self._cache_values_time = None
+        self._cache_values_on = None
+        self._cache_values_on_time = None
+        self._cache_values_on_src_idxs = None
+
+    def _update_cache(
+            self,
+            tdm,
+    ):
+        """Updates the cached times and detector on-time mask of the trial
+        data values, if the trial data has changed.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The instance of TrialDataManager holding the trial data.
+            The following data fields must exist:
+
+            ``'time'`` : float
+                The time of the event.
+        """
+        if (self._cache_tdm_trial_data_state_id == tdm.trial_data_state_id) and\
+           (self._cache_values_time is not None):
+            return
+
+        src_evt_pairs = tdm.src_evt_pairs
+
+        values_time = tdm.get_data('time')[src_evt_pairs.evt_idxs]
+
+        # Get a mask of the event times which fall inside a detector on-time
+        # interval.
+        values_on = self._livetime.is_on(values_time)
+
+        self._cache_tdm_trial_data_state_id = tdm.trial_data_state_id
+        self._cache_values_time = values_time
+        self._cache_values_on = values_on
+        self._cache_values_on_time = values_time[values_on]
+        self._cache_values_on_src_idxs = src_evt_pairs.src_idxs[values_on]
+
     def _calculate_pd(
             self,
             tdm,
@@ -424,38 +472,77 @@ class SignalTimePDF(
             The (N_values,)-shaped numpy ndarray holding the probability density
             values for each trial data event and source.
         """
-        (src_idxs, evt_idxs) = tdm.src_evt_idxs
-        n_values = len(evt_idxs)
+        src_evt_pairs = tdm.src_evt_pairs
+        n_sources = len(params_recarray)
+
+        self._update_cache(tdm=tdm)
+        values_time = self._cache_values_time
+        values_on = self._cache_values_on
+
+        # The profile values of the box and gaussian time flux profiles can
+        # be calculated for all sources at once. Derived classes might
+        # implement a different profile function.
+        profile = self._time_flux_profile
+        is_vectorizable = type(profile) in (
+            BoxTimeFluxProfile, GaussianTimeFluxProfile)
 
-        pd = np.zeros((n_values,), dtype=np.float64)
+        # Determine the normalization S and, for vectorizable time flux
+        # profiles, the profile parameters of each source.
+        S = np.empty((n_sources,), dtype=np.float64)
+        t_start = np.empty((n_sources,), dtype=np.float64)
+        t_stop = np.empty((n_sources,), dtype=np.float64)
+        sigma_t = np.empty((n_sources,), dtype=np.float64)
+
+        pd = np.zeros((src_evt_pairs.n_values,), dtype=np.float64)
 
-        events_time = tdm.get_data('time')
         for (src_idx, src_params_row) in enumerate(params_recarray):
             params = dict(zip(
                 params_recarray.dtype.fields.keys(),
                 src_params_row))
 
             # Update the time flux profile if its parameter values have changed
-            # and recalculate self._I and self._S if an update was actually
-            # performed.
-            updated = self._time_flux_profile.set_params(params)
+            # and recalculate self._S if an update was actually performed.
+            updated = profile.set_params(params)
             if updated:
                 self._S = self._calculate_sum_of_ontime_time_flux_profile_integrals()
+            S[src_idx] = self._S
 
-            src_m = src_idxs == src_idx
-            idxs = evt_idxs[src_m]
+            if is_vectorizable:
+                t_start[src_idx] = profile.t_start
+                t_stop[src_idx] = profile.t_stop
+                if type(profile) is GaussianTimeFluxProfile:
+                    sigma_t[src_idx] = profile.sigma_t
+                continue
 
-            times = events_time[idxs]
+            # The values of a source are contiguous, hence pd_src is a view
+            # into pd.
+            src_sl = src_evt_pairs.get_values_slice(src_idx)
+            times = values_time[src_sl]
+            on = values_on[src_sl]
 
-            # Get a mask of the event times which fall inside a detector on-time
-            # interval.
-            on = self._livetime.is_on(times)
+            pd_src = pd[src_sl]
+            pd_src[on] = profile(t=times[on]) / S[src_idx]
 
-            pd_src = pd[src_m]
-            pd_src[on] = (
-                self._time_flux_profile(t=times[on]) / self._S
-            )
-            pd[src_m] = pd_src
+        if not is_vectorizable:
+            return pd
+
+        # Evaluate the time flux profile for all sources at once. The
+        # calculation follows the __call__ methods of the time flux profiles.
+        on_src_idxs = self._cache_values_on_src_idxs
+        t = self._cache_values_on_time
+        t_start = t_start[on_src_idxs]
+        t_stop = t_stop[on_src_idxs]
+        if type(profile) is BoxTimeFluxProfile:
+            values = ((t >= t_start) & (t <= t_stop)).astype(np.float64)
+        else:
+            m = (t >= t_start) & (t < t_stop)
+            s = sigma_t[on_src_idxs]
+            twossq = 2*s*s
+            t0 = 0.5*(t_stop + t_start)
+            dt = t - t0
+            values = np.where(m, np.exp(-dt*dt/twossq), 0)
+
+        pd[values_on] = values / S[on_src_idxs]
 
         return pd
 
@@ -660,31 +747,6 @@ class SignalMultiDimGridPDFSet(
                 'GridManifoldInterpolationMethod!')
         self._interpol_method_cls = cls
 
-    def _get_pdf_for_interpol_param_values(
-            self,
-            interpol_param_values,
-    ):
-        """Retrieves the PDF for the given set of interpolation parameter
-        values.
-
-        Parameters
-        ----------
-        interpol_param_values : instance of numpy ndarray
-            The (N_interpol_params,)-shaped numpy ndarray holding the values of
-            the interpolation parameters.
-
-        Returns
-        -------
-        pdf : instance of MultiDimGridPDF
-            The requested PDF instance.
-        """
-        gridparams = dict(
-            zip(self._interpol_param_names, interpol_param_values))
-
-        pdf = self.get_pdf(gridparams)
-
-        return pdf
-
     def _evaluate_pdfs(
             self,
             tdm,
@@ -720,14 +782,20 @@ class SignalMultiDimGridPDFSet(
         """
         logger = get_logger(f'{__name__}.{classname(self)}._evaluate_pdfs')
 
-        # Check for special case when a single set of parameters are provided.
-        if len(gridparams_recarray) == 1:
+        # Group the sources by their grid point, so that each PDF is evaluated
+        # only once for all the sources sharing it.
+        groups = group_values_by_grid_point(
+            tdm=tdm,
+            gridparams_recarray=gridparams_recarray)
+
+        # Check for special case when all sources share the same set of
+        # parameters.
+        if len(groups) == 1:
+            (gridparams, _) = groups[0]
             if self._cfg.is_tracing_enabled:
                 logger.debug(
-                    'Get PDF for '
-                    f'interpol_param_values={gridparams_recarray[0]}.')
-            pdf = self._get_pdf_for_interpol_param_values(
-                interpol_param_values=gridparams_recarray[0])
+                    f'Get PDF for interpol_param_values={gridparams}.')
+            pdf = self.get_pdf(gridparams)
 
             pd = pdf.get_pd_with_eventdata(
                 tdm=tdm,
@@ -739,27 +807,16 @@ class SignalMultiDimGridPDFSet(
 
         pd = np.empty(n_values, dtype=np.float64)
 
-        (src_idxs, evt_idxs) = tdm.src_evt_idxs
-
-        v_start = 0
-        for (sidx, interpol_param_values) in enumerate(gridparams_recarray):
-            pdf = self._get_pdf_for_interpol_param_values(
-                interpol_param_values=interpol_param_values)
-
-            # Determine the events that belong to the current source.
-            evt_mask = src_idxs == sidx
+        for (gridparams, values_mask) in groups:
+            pdf = self.get_pdf(gridparams)
 
-            n = np.count_nonzero(evt_mask)
-            sl = slice(v_start, v_start+n)
-            pd[sl] = pdf.get_pd_with_eventdata(
+            pd[values_mask] = pdf.get_pd_with_eventdata(
                 tdm=tdm,
                 params_recarray=None,
                 eventdata=eventdata,
-                evt_mask=evt_mask,
+                evt_mask=values_mask,
                 tl=tl)
 
-            v_start += n
-
         return pd
 
     def assert_is_valid_for_trial_data(
@@ -1105,8 +1162,7 @@ class SignalSHGMappedMultiDimGridPDFSet(
         """
         pd = np.zeros((tdm.get_n_values(),), dtype=np.float64)
 
-        src_idxs = tdm.src_evt_idxs[0]
-        src_idxs_arr = np.arange(self._shg_mgr.n_sources)
+        src_evt_pairs = tdm.src_evt_pairs
 
         # Loop over the individual PDFs (via their key).
         for shg_idxs in self._shgidxs_list:
@@ -1114,8 +1170,8 @@ class SignalSHGMappedMultiDimGridPDFSet(
             src_mask = np.zeros((self._shg_mgr.n_sources,), dtype=np.bool_)
             for shg_idx in shg_idxs:
                 src_mask |= self._shg_mgr.get_src_mask_of_shg(shg_idx)
-            pdf_src_idxs = src_idxs_arr[src_mask]
-            values_mask = np.isin(src_idxs, pdf_src_idxs)
+            values_mask = src_evt_pairs.get_values_mask_for_source_mask(
+                src_mask)
 
             pdf_key = self.make_key({'shg_idxs': shg_idxs})
             pdf = self.get_pdf(pdf_key)
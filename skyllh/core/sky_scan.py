@@ -0,0 +1,783 @@
+# -*- coding: utf-8 -*-
+
+"""The sky_scan module provides functionality to scan the sky with a single
+source analysis, i.e. to evaluate the test-statistic value and the best-fit
+parameters of the analysis for the source positions of a HEALPix grid.
+"""
+
+import logging
+import os
+import pickle
+
+import numpy as np
+
+from skyllh.core import (
+    tool,
+)
+from skyllh.core.multiproc import (
+    WorkerPool,
+    get_ncpu,
+)
+from skyllh.core.progressbar import (
+    ProgressBar,
+)
+from skyllh.core.py import (
+    classname,
+    float_cast,
+    int_cast,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+from skyllh.core.utils.trials import (
+    AppendableNPYFile,
+    load_trial_data_file,
+)
+
+
+class HEALPixSkyScan(
+        object,
+):
+    """The HEALPixSkyScan class provides a scan of the sky on a HEALPix grid
+    for a single source analysis, e.g. an instance of
+    SingleSourceMultiDatasetLLHRatioAnalysis. For each pixel the source of the
+    analysis is moved to the pixel center via the analysis' ``change_source``
+    method and the experimental data is unblinded.
+
+    The scan starts with all pixels of the grid with resolution ``nside``.
+    If ``nside_max`` is larger than ``nside``, the scan is refined adaptively:
+    The hotspots of a resolution level, and optionally their neighbouring
+    pixels, are divided into their four sub-pixels of the next resolution
+    level, until the resolution ``nside_max`` is reached. All pixel indices
+    refer to the NESTED pixel ordering scheme.
+
+    The pixels of each resolution level are evaluated in the order of their
+    declination. Hence, consecutive pixels evaluated by a process share
+    declination dependent objects of the analysis, like the detector signal
+    yields of the analysis' DetSigYieldService instance.
+
+    If a file is specified, the results are appended block-wise to the file.
+    Next to the results file a configuration file with the extension
+    ``.config`` is written, which holds the seeds and the settings of the scan.
+    A subsequent scan with the same file skips the pixels, which have been
+    evaluated already. Because the random numbers of the minimizer are seeded
+    for each pixel individually, a resumed scan yields the same results as an
+    uninterrupted scan. A scan is resumed only if its seeds and settings match
+    the configuration file.
+    """
+
+    @tool.requires('healpy')
+    def __init__(
+            self,
+            ana,
+            nside,
+            nside_max=None,
+            refine_n_hotspots=10,
+            refine_ts_threshold=None,
+            refine_neighbours=True,
+            dec_range=None,
+            pathfilename=None,
+            **kwargs,
+    ):
+        """Creates a new HEALPixSkyScan instance.
+
+        Parameters
+        ----------
+        ana : instance of SingleSourceMultiDatasetLLHRatioAnalysis
+            The single source analysis instance, which should be used to
+            evaluate the pixels. It must provide the methods ``change_source``
+            and ``unblind``.
+        nside : int
+            The HEALPix resolution parameter of the initial scan grid.
+        nside_max : int | None
+            The HEALPix resolution parameter of the finest scan grid. It must
+            be ``nside`` times a power of two. If set to None, ``nside`` is
+            used, i.e. no refinement is performed.
+        refine_n_hotspots : int | None
+            The number of pixels with the largest test-statistic values of a
+            resolution level, which should be refined.
+        refine_ts_threshold : float | None
+            The test-statistic value above which pixels of a resolution level
+            should be refined in addition to the ``refine_n_hotspots`` pixels.
+        refine_neighbours : bool
+            Flag if the neighbouring pixels of the hotspots should be refined
+            as well.
+        dec_range : 2-element sequence of float | None
+            The optional declination range in radians. Only pixels with their
+            center within this range are evaluated.
+        pathfilename : str | None
+            The optional path and filename of the .npy file to which the scan
+            results should be written. If the file exists already, the scan
+            is resumed, given that the seeds and settings of the scan match the
+            ones of the existing scan.
+        """
+        super().__init__(**kwargs)
+
+        self._hp = tool.get('healpy')
+
+        self.ana = ana
+        self.nside = nside
+        self.nside_max = nside_max
+        self.refine_n_hotspots = refine_n_hotspots
+        self.refine_ts_threshold = refine_ts_threshold
+        self.refine_neighbours = refine_neighbours
+        self.dec_range = dec_range
+        self.pathfilename = pathfilename
+
+    @property
+    def ana(self):
+        """The single source analysis instance, which is used to evaluate the
+        pixels.
+        """
+        return self._ana
+
+    @ana.setter
+    def ana(self, ana):
+        if not (hasattr(ana, 'change_source') and hasattr(ana, 'unblind')):
+            raise TypeError(
+                'The ana property must be a single source analysis instance '
+                'providing the methods change_source and unblind! '
+                f'Its current type is {classname(ana)}!')
+        self._ana = ana
+
+    @property
+    def nside(self):
+        """The HEALPix resolution parameter of the initial scan grid.
+        """
+        return self._nside
+
+    @nside.setter
+    def nside(self, n):
+        n = int_cast(
+            n,
+            'The nside property must be cast-able to type int!')
+        if not self._hp.isnsideok(n, nest=True):
+            raise ValueError(
+                f'The nside property must be a power of two! Its value is {n}!')
+        self._nside = n
+
+    @property
+    def nside_max(self):
+        """The HEALPix resolution parameter of the finest scan grid.
+        """
+        return self._nside_max
+
+    @nside_max.setter
+    def nside_max(self, n):
+        if n is None:
+            n = self._nside
+        n = int_cast(
+            n,
+            'The nside_max property must be None, or cast-able to type int!')
+        if (not self._hp.isnsideok(n, nest=True)) or (n < self._nside):
+            raise ValueError(
+                'The nside_max property must be a power of two and greater or '
+                f'equal than nside ({self._nside})! Its value is {n}!')
+        self._nside_max = n
+
+    @property
+    def nside_list(self):
+        """(read-only) The list of the HEALPix resolution parameters of all
+        resolution levels of the scan.
+        """
+        nside_list = [self._nside]
+        while nside_list[-1] < self._nside_max:
+            nside_list.append(2*nside_list[-1])
+        return nside_list
+
+    @property
+    def refine_n_hotspots(self):
+        """The number of pixels with the largest test-statistic values of a
+        resolution level, which are refined. Can be None.
+        """
+        return self._refine_n_hotspots
+
+    @refine_n_hotspots.setter
+    def refine_n_hotspots(self, n):
+        if n is not None:
+            n = int_cast(
+                n,
+                'The refine_n_hotspots property must be None, or cast-able to '
+                'type int!')
+            if n < 0:
+                raise ValueError(
+                    'The refine_n_hotspots property must be >= 0!')
+        self._refine_n_hotspots = n
+
+    @property
+    def refine_ts_threshold(self):
+        """The test-statistic value above which pixels of a resolution level
+        are refined. Can be None.
+        """
+        return self._refine_ts_threshold
+
+    @refine_ts_threshold.setter
+    def refine_ts_threshold(self, ts):
+        if ts is not None:
+            ts = float_cast(
+                ts,
+                'The refine_ts_threshold property must be None, or cast-able '
+                'to type float!')
+        self._refine_ts_threshold = ts
+
+    @property
+    def refine_neighbours(self):
+        """Flag if the neighbouring pixels of the hotspots are refined as well.
+        """
+        return self._refine_neighbours
+
+    @refine_neighbours.setter
+    def refine_neighbours(self, flag):
+        if not isinstance(flag, bool):
+            raise TypeError(
+                'The refine_neighbours property must be an instance of bool! '
+                f'Its current type is {classname(flag)}!')
+        self._refine_neighbours = flag
+
+    @property
+    def dec_range(self):
+        """The declination range in radians of the pixel centers, which are
+        evaluated.
+        """
+        return self._dec_range
+
+    @dec_range.setter
+    def dec_range(self, r):
+        if r is None:
+            r = (-np.pi/2, np.pi/2)
+        r = float_cast(
+            r,
+            'The dec_range property must be None, or a sequence of values '
+            'cast-able to type float!')
+        if len(r) != 2:
+            raise ValueError(
+                'The dec_range property must be a 2-element sequence! '
+                f'Its current length is {len(r)}!')
+        self._dec_range = tuple(r)
+
+    @property
+    def pathfilename(self):
+        """The path and filename of the .npy file to which the scan results
+        are written. Can be None.
+        """
+        return self._pathfilename
+
+    @pathfilename.setter
+    def pathfilename(self, pathfilename):
+        if pathfilename is not None:
+            if not isinstance(pathfilename, str):
+                raise TypeError(
+                    'The pathfilename property must be None, or an instance '
+                    'of str! '
+                    f'Its current type is {classname(pathfilename)}!')
+            if not pathfilename.endswith('.npy'):
+                pathfilename += '.npy'
+        self._pathfilename = pathfilename
+
+    @property
+    def _empty_results(self):
+        """(read-only) The empty structured numpy ndarray with the data
+        fields of the results, which are independent of the analysis.
+        """
+        return np.empty(
+            (0,),
+            dtype=[
+                ('nside', np.int64),
+                ('ipix', np.int64),
+                ('ra', np.float64),
+                ('dec', np.float64),
+                ('ts', np.float64),
+            ])
+
+    def get_pixel_positions(
+            self,
+            nside,
+            ipix,
+    ):
+        """Calculates the right-ascension and declination of the centers of
+        the given pixels.
+
+        Parameters
+        ----------
+        nside : int
+            The HEALPix resolution parameter.
+        ipix : instance of numpy.ndarray
+            The (n_pixels,)-shaped numpy ndarray holding the NESTED pixel
+            indices.
+
+        Returns
+        -------
+        ra : instance of numpy.ndarray
+            The (n_pixels,)-shaped numpy ndarray holding the right-ascension
+            values in radians.
+        dec : instance of numpy.ndarray
+            The (n_pixels,)-shaped numpy ndarray holding the declination
+            values in radians.
+        """
+        (theta, ra) = self._hp.pix2ang(nside, ipix, nest=True)
+        dec = np.pi/2 - theta
+
+        return (ra, dec)
+
+    def get_hotspot_pixels(
+            self,
+            results,
+    ):
+        """Selects the hotspot pixels of the given results of a resolution
+        level, which should be refined.
+
+        Parameters
+        ----------
+        results : instance of numpy.ndarray
+            The structured numpy ndarray holding the scan results of a single
+            resolution level.
+
+        Returns
+        -------
+        ipix : instance of numpy.ndarray
+            The numpy ndarray holding the sorted unique NESTED pixel indices
+            of the pixels that should be refined, including their neighbours
+            if requested.
+        """
+        if len(results) == 0:
+            return np.empty((0,), dtype=np.int64)
+
+        nside = int(results['nside'][0])
+        ts = results['ts']
+
+        mask = np.zeros((len(results),), dtype=np.bool_)
+        if self._refine_n_hotspots is not None:
+            n = min(self._refine_n_hotspots, len(results))
+            if n > 0:
+                mask[np.argsort(-ts, kind='stable')[:n]] = True
+        if self._refine_ts_threshold is not None:
+            mask |= ts >= self._refine_ts_threshold
+
+        ipix = results['ipix'][mask]
+
+        if self._refine_neighbours and (len(ipix) > 0):
+            neighbours = self._hp.get_all_neighbours(nside, ipix, nest=True)
+            ipix = np.concatenate((ipix, neighbours[neighbours >= 0]))
+
+        return np.unique(ipix).astype(np.int64)
+
+    def _evaluate_pixel(
+            self,
+            nside,
+            ipix,
+            seed,
+            tl=None,
+    ):
+        """Evaluates the analysis for the source position at the center of the
+        given pixel.
+
+        Returns
+        -------
+        recarray : instance of numpy record ndarray
+            The (1,)-shaped numpy record ndarray holding the result of the
+            pixel. See the :meth:`run` method for the list of data fields.
+        """
+        (ra, dec) = self.get_pixel_positions(nside, ipix)
+
+        self._ana.change_source(
+            PointLikeSource(ra=ra, dec=dec))
+
+        (ts, global_params_dict, status) = self._ana.unblind(
+            minimizer_rss=RandomStateService(seed=seed),
+            tl=tl)
+
+        recarray_dtype = [
+            ('nside', np.int64),
+            ('ipix', np.int64),
+            ('ra', np.float64),
+            ('dec', np.float64),
+            ('ts', np.float64),
+        ] + [
+            (param_name, np.float64)
+            for param_name in global_params_dict.keys()
+        ]
+        recarray = np.empty((1,), dtype=recarray_dtype)
+        recarray['nside'] = nside
+        recarray['ipix'] = ipix
+        recarray['ra'] = ra
+        recarray['dec'] = dec
+        recarray['ts'] = ts
+        for (param_name, param_value) in global_params_dict.items():
+            recarray[param_name] = param_value
+
+        return recarray
+
+    def create_worker_pool(
+            self,
+            ncpu=None,
+    ):
+        """Creates a long-lived pool of worker processes for the evaluation of
+        pixels. The pool can be passed to the :meth:`run` method via its
+        ``pool`` argument.
+
+        Parameters
+        ----------
+        ncpu : int | None
+            The number of CPUs to use, i.e. the number of processes including
+            the master process. If set to None, the global setting will be
+            used.
+
+        Returns
+        -------
+        pool : instance of WorkerPool
+            The instance of WorkerPool evaluating the pixels of this scan.
+        """
+        ncpu = get_ncpu(
+            cfg=self._ana.cfg,
+            local_ncpu=ncpu)
+
+        pool = WorkerPool(
+            func=self._evaluate_pixel,
+            ncpu=ncpu)
+
+        return pool
+
+    def load_results(self):
+        """Loads the results of a previous scan from the file of this scan.
+
+        Returns
+        -------
+        results : instance of numpy record ndarray | None
+            The numpy record ndarray holding the results, or None, if no
+            file is set or the file does not exist.
+        """
+        if (self._pathfilename is None) or\
+           (not os.path.exists(self._pathfilename)):
+            return None
+
+        results = np.array(
+            load_trial_data_file(self._pathfilename, mmap_mode=None))
+
+        return results.view(np.recarray)
+
+    def _get_config(
+            self,
+            rss,
+            base_seed,
+    ):
+        """Creates the configuration of the scan, which determines the
+        evaluated pixels and their results.
+        """
+        config = dict(
+            seed=rss.seed,
+            base_seed=base_seed,
+            nside=self._nside,
+            nside_max=self._nside_max,
+            refine_n_hotspots=self._refine_n_hotspots,
+            refine_ts_threshold=self._refine_ts_threshold,
+            refine_neighbours=self._refine_neighbours,
+            dec_range=self._dec_range)
+
+        return config
+
+    def _check_resume_config(
+            self,
+            config,
+    ):
+        """Checks if the existing scan file can be resumed with the given
+        scan configuration.
+
+        Raises
+        ------
+        ValueError
+            If the configuration file of the existing scan does not exist or
+            if the given configuration does not match the configuration of the
+            existing scan.
+        """
+        config_pathfilename = self._pathfilename + '.config'
+        if not os.path.exists(config_pathfilename):
+            raise ValueError(
+                f'The sky scan file "{self._pathfilename}" cannot be resumed, '
+                f'because its configuration file "{config_pathfilename}" does '
+                'not exist!')
+
+        with open(config_pathfilename, 'rb') as fp:
+            file_config = pickle.load(fp)
+
+        mismatched_keys = sorted(
+            k
+            for k in set(config.keys()) | set(file_config.keys())
+            if (k not in config) or
+               (k not in file_config) or
+               (not np.array_equal(config[k], file_config[k]))
+        )
+        if len(mismatched_keys) > 0:
+            raise ValueError(
+                f'The sky scan file "{self._pathfilename}" cannot be resumed, '
+                'because the configuration of this scan does not match the '
+                f'configuration of the existing scan for: {mismatched_keys}!')
+
+    def _write_config_file(
+            self,
+            config,
+    ):
+        """Writes the given scan configuration atomically to the
+        configuration file of the scan.
+        """
+        config_pathfilename = self._pathfilename + '.config'
+        tmp_pathfilename = config_pathfilename + '.tmp'
+        with open(tmp_pathfilename, 'wb') as fp:
+            pickle.dump(config, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_pathfilename, config_pathfilename)
+
+    def _get_level_pixels(
+            self,
+            nside,
+            parent_results,
+    ):
+        """Determines the pixels of the given resolution level, which should
+        be evaluated, sorted by declination and right-ascension.
+        """
+        if parent_results is None:
+            ipix = np.arange(self._hp.nside2npix(nside), dtype=np.int64)
+        else:
+            parents = self.get_hotspot_pixels(parent_results)
+            ipix = (4*parents[:, np.newaxis] + np.arange(4)).ravel()
+
+        (ra, dec) = self.get_pixel_positions(nside, ipix)
+        m = (dec >= self._dec_range[0]) & (dec <= self._dec_range[1])
+        (ipix, ra, dec) = (ipix[m], ra[m], dec[m])
+
+        sidx = np.lexsort((ra, dec))
+
+        return ipix[sidx]
+
+    def run(  # noqa: C901
+            self,
+            rss,
+            ncpu=None,
+            pool=None,
+            chunksize=8,
+            blocksize=None,
+            tl=None,
+            ppbar=None,
+    ):
+        """Runs the scan over all resolution levels.
+
+        Parameters
+        ----------
+        rss : instance of RandomStateService
+            The instance of RandomStateService from which the base seed for
+            the minimizer's random numbers is drawn. Each pixel gets its own
+            RandomStateService instance, which seed depends on the base seed
+            and the pixel.
+        ncpu : int | None
+            The number of CPUs to use. If set to None, the global setting will
+            be used. It is ignored if ``pool`` is given.
+        pool : instance of WorkerPool | None
+            The optional worker pool created by the :meth:`create_worker_pool`
+            method. If set to None and more than one CPU should be used, a
+            worker pool is created for the duration of the scan.
+        chunksize : int
+            The number of consecutive pixels handed to a process at once.
+        blocksize : int | None
+            The number of pixels, which are evaluated before the results are
+            written to the file. If set to None, 32 chunks per process are
+            used.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord to time the evaluation of the
+            pixels.
+        ppbar : instance of ProgressBar | None
+            The optional parent progress bar.
+
+        Raises
+        ------
+        ValueError
+            If the scan file exists already and its configuration, i.e. the
+            seeds and the settings of the scan, does not match the one of
+            this scan.
+
+        Returns
+        -------
+        results : instance of numpy record ndarray
+            The numpy record ndarray holding the results of all evaluated
+            pixels, including the ones of a previous scan. It has the following
+            data fields:
+
+            nside : int
+                The HEALPix resolution parameter of the pixel.
+            ipix : int
+                The NESTED pixel index.
+            ra : float
+                The right-ascension of the pixel center in radians.
+            dec : float
+                The declination of the pixel center in radians.
+            ts : float
+                The test-statistic value.
+            [<global_param_name> : float ]
+                The best-fit values of the parameters of the analysis.
+        """
+        if not isinstance(rss, RandomStateService):
+            raise TypeError(
+                'The rss argument must be an instance of RandomStateService! '
+                f'Its current type is {classname(rss)}!')
+        if pool is not None:
+            if not isinstance(pool, WorkerPool):
+                raise TypeError(
+                    'The pool argument must be None or an instance of '
+                    'WorkerPool! '
+                    f'Its current type is {classname(pool)}!')
+            if pool.func != self._evaluate_pixel:
+                raise ValueError(
+                    'The worker pool given by the pool argument must have '
+                    'been created for this scan instance!')
+
+        logger = logging.getLogger(__name__)
+
+        base_seed = int(rss.random.randint(0, 2**32, dtype=np.int64))
+
+        results_list = []
+        previous_results = self.load_results()
+        if self._pathfilename is not None:
+            config = self._get_config(rss=rss, base_seed=base_seed)
+            if previous_results is not None:
+                self._check_resume_config(config)
+            else:
+                self._write_config_file(config)
+        if previous_results is not None:
+            logger.info(
+                f'Resuming sky scan of file "{self._pathfilename}" with '
+                f'{len(previous_results)} evaluated pixels.')
+            results_list.append(previous_results)
+
+        # Remember the source of the analysis in order to restore it after the
+        # scan.
+        source = self._ana.shg_mgr.shg_list[0].source_list[0]
+
+        own_pool = None
+        if pool is None:
+            own_pool = self.create_worker_pool(ncpu=ncpu)
+            pool = own_pool
+        if blocksize is None:
+            blocksize = 32 * chunksize * pool.ncpu
+
+        writer = None
+        if self._pathfilename is not None:
+            writer = AppendableNPYFile(self._pathfilename, append=True)
+
+        nside_list = self.nside_list
+        pbar = ProgressBar(len(nside_list), parent=ppbar).start()
+        try:
+            level_results = None
+            for nside in nside_list:
+                ipix = self._get_level_pixels(nside, level_results)
+
+                done_list = [
+                    results['ipix'][results['nside'] == nside]
+                    for results in results_list
+                ]
+                if len(done_list) > 0:
+                    ipix = ipix[~np.isin(ipix, np.concatenate(done_list))]
+
+                logger.info(
+                    f'Evaluating {len(ipix)} pixels of the sky scan with '
+                    f'nside={nside}.')
+
+                blocks = [
+                    ipix[i:i+blocksize]
+                    for i in range(0, len(ipix), blocksize)
+                ]
+                for block in blocks:
+                    seeds = [
+                        np.random.SeedSequence(
+                            [base_seed, nside, p]).generate_state(1)[0]
+                        for p in block
+                    ]
+                    args_list = [
+                        ((), dict(nside=nside, ipix=int(p), seed=int(seed)))
+                        for (p, seed) in zip(block, seeds)
+                    ]
+                    result_list = pool.map(
+                        args_list=args_list,
+                        tl=tl,
+                        ppbar=pbar,
+                        chunksize=chunksize)
+                    results = np.concatenate(result_list).view(np.recarray)
+
+                    if writer is not None:
+                        writer.append(results)
+                    results_list.append(results)
+
+                level_results = self._empty_results
+                if len(results_list) > 0:
+                    level_results = np.concatenate([
+                        results[results['nside'] == nside]
+                        for results in results_list
+                    ])
+
+                pbar.increment()
+        finally:
+            if own_pool is not None:
+                own_pool.close()
+            if writer is not None:
+                writer.close()
+            self._ana.change_source(source)
+        pbar.finish()
+
+        if len(results_list) == 0:
+            return self._empty_results.view(np.recarray)
+
+        results = np.concatenate(results_list).view(np.recarray)
+
+        return results
+
+    def create_map(
+            self,
+            results,
+            field='ts',
+            nest=False,
+    ):
+        """Creates a HEALPix map with the resolution ``nside_max`` from the
+        given scan results. Each pixel of the map gets the value of the
+        finest evaluated pixel containing it. Pixels, which have not been
+        evaluated, get the value ``numpy.nan``.
+
+        Parameters
+        ----------
+        results : instance of numpy.ndarray
+            The structured numpy ndarray holding the scan results as returned
+            by the :meth:`run` method.
+        field : str
+            The name of the data field of the results, which should be mapped.
+        nest : bool
+            Flag if the map should be in the NESTED (``True``) or RING
+            (``False``) pixel ordering scheme.
+
+        Returns
+        -------
+        m : instance of numpy.ndarray
+            The (12*nside_max**2,)-shaped numpy ndarray holding the map.
+        """
+        nside_max = self._nside_max
+
+        m = np.full(
+            (self._hp.nside2npix(nside_max),), np.nan, dtype=np.float64)
+
+        for nside in self.nside_list:
+            level_results = results[results['nside'] == nside]
+            if len(level_results) == 0:
+                continue
+
+            # Each pixel of the resolution level covers a contiguous range of
+            # NESTED pixels of the map.
+            n_sub = (nside_max // nside)**2
+            idxs = (
+                level_results['ipix'][:, np.newaxis]*n_sub +
+                np.arange(n_sub)
+            ).ravel()
+            m[idxs] = np.repeat(level_results[field], n_sub)
+
+        if not nest:
+            m = self._hp.reorder(m, n2r=True)
+
+        return m
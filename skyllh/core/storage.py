@@ -12,6 +12,14 @@ from skyllh.core import (
     display as dsp,
     tool,
 )
+from skyllh.core.cache import (
+    DiskCache,
+    make_cache_key,
+)
+from skyllh.core.multiproc import (
+    limit_ncpu_by_memory,
+    parallelize,
+)
 from skyllh.core.py import (
     classname,
     get_byte_size_prefix,
@@ -118,6 +126,7 @@ class FileLoader(
     def __init__(
             self,
             pathfilenames,
+            cache=None,
             **kwargs):
         """Creates a new FileLoader instance.
 
@@ -126,11 +135,16 @@ class FileLoader(
         pathfilenames : str | sequence of str
             The sequence of fully qualified file names of the data files that
             need to be loaded.
+        cache : instance of DiskCache | None
+            The optional on-disk cache for storing the parsed content of the
+            data files in a binary format. It is used by file loaders of
+            formats that are slow to parse, e.g. text files.
         """
         super().__init__(
             **kwargs)
 
         self.pathfilename_list = pathfilenames
+        self.cache = cache
 
     @property
     def pathfilename_list(self):
@@ -148,6 +162,87 @@ class FileLoader(
                 'sequence of type str!')
         self._pathfilename_list = list(pathfilenames)
 
+    @property
+    def cache(self):
+        """The instance of DiskCache for storing the parsed content of the
+        data files in a binary format, or ``None`` if no cache is used.
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache):
+        if cache is not None:
+            if not isinstance(cache, DiskCache):
+                raise TypeError(
+                    'The cache property must be None, or an instance of '
+                    'DiskCache! '
+                    f'Its current type is {classname(cache)}.')
+        self._cache = cache
+
+    def _load_files(
+            self,
+            load_file_func,
+            ncpu=None,
+            max_memory=None,
+            **kwargs):
+        """Loads all the data files by calling the given function for each
+        file. The files can be loaded in parallel by several processes.
+
+        Parameters
+        ----------
+        load_file_func : callable
+            The function with call signature
+            ``__call__(pathfilename, **kwargs)`` loading a single file.
+        ncpu : int | None
+            The number of processes to use for loading the files in parallel.
+            If set to ``None``, the files are loaded sequentially.
+        max_memory : int | None
+            The maximum memory in bytes of the files that are loaded
+            concurrently. The memory of a file is estimated by its size on disk.
+            If set to ``None``, the memory is not limited.
+        **kwargs
+            Additional keyword arguments are passed to ``load_file_func``.
+
+        Returns
+        -------
+        data_list : list
+            The list of the loaded data of each file, in the order of the
+            ``pathfilename_list`` property.
+        """
+        pathfilenames = self._pathfilename_list
+
+        if ncpu is None:
+            ncpu = 1
+        if ncpu > 1:
+            for pathfilename in pathfilenames:
+                assert_file_exists(pathfilename)
+            ncpu = limit_ncpu_by_memory(
+                ncpu=ncpu,
+                task_sizes=[
+                    os.path.getsize(pathfilename)
+                    for pathfilename in pathfilenames
+                ],
+                max_memory=max_memory)
+
+        if ncpu == 1:
+            return [
+                load_file_func(pathfilename, **kwargs)
+                for pathfilename in pathfilenames
+            ]
+
+        # Use dynamic scheduling with one file per task, because the file sizes
+        # can differ a lot.
+        data_list = parallelize(
+            func=load_file_func,
+            args_list=[
+                ((pathfilename,), kwargs)
+                for pathfilename in pathfilenames
+            ],
+            ncpu=ncpu,
+            chunksize=1)
+
+        return data_list
+
     @abc.abstractmethod
     def load_data(self, **kwargs):
         """This method is supposed to load the data from the file.
@@ -278,12 +373,42 @@ class NPYFileLoader(
 
         return data
 
+    def _load_file_mmap(
+            self,
+            pathfilename,
+            keep_fields,
+            dtype_conversions,
+            dtype_conversion_except_fields):
+        """Loads a single file as a copy-on-write memory map. The data fields
+        are column views into the memory mapped file, hence no data is read
+        until it is accessed, and several processes loading the same file share
+        the same read-only memory pages. Only the memory pages of a data field
+        that gets modified in-place are copied into the private memory of the
+        process. The file on disk is never modified.
+
+        Data fields, whose data type gets converted, are copied into memory.
+        """
+        assert_file_exists(pathfilename)
+
+        mmap_ndarray = np.load(pathfilename, mmap_mode='c')
+
+        data = DataFieldRecordArray(
+            mmap_ndarray,
+            keep_fields=keep_fields,
+            dtype_conversions=dtype_conversions,
+            dtype_conversion_except_fields=dtype_conversion_except_fields,
+            copy=False)
+
+        return data
+
     def load_data(  # noqa: C901
             self,
             keep_fields=None,
             dtype_conversions=None,
             dtype_conversion_except_fields=None,
-            efficiency_mode=None):
+            efficiency_mode=None,
+            ncpu=None,
+            max_memory=None):
         """Loads the data from the files specified through their fully qualified
         file names.
 
@@ -311,9 +436,25 @@ class NPYFileLoader(
                     The data will be loaded in a time efficient way. This will
                     require more memory, because each data file gets loaded in
                     memory at once.
+                ``'mmap'``
+                    The data will be memory mapped in copy-on-write mode. The
+                    data fields are column views into the files and memory
+                    pages are shared between processes loading the same file
+                    until a data field is modified. If more than one file is
+                    loaded, the data of the files get concatenated in memory.
 
             The default value is ``'time'``. If set to ``None``, the default
             value will be used.
+        ncpu : int | None
+            The number of processes to use for loading several files in
+            parallel. If set to ``None``, the files are loaded sequentially.
+            In the ``'mmap'`` efficiency mode the files are always loaded
+            sequentially, because the memory maps cannot be shared with the
+            main process.
+        max_memory : int | None
+            The maximum memory in bytes of the files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
 
         Returns
         -------
@@ -350,7 +491,8 @@ class NPYFileLoader(
 
         efficiency_mode2func = {
             'memory': self._load_file_memory_efficiently,
-            'time': self._load_file_time_efficiently
+            'time': self._load_file_time_efficiently,
+            'mmap': self._load_file_mmap,
         }
         if efficiency_mode is None:
             efficiency_mode = 'time'
@@ -363,22 +505,18 @@ class NPYFileLoader(
                 f'{", ".join(efficiency_mode2func.keys())}!')
         load_file_func = efficiency_mode2func[efficiency_mode]
 
-        # Load the first data file.
-        data = load_file_func(
-            self._pathfilename_list[0],
+        if efficiency_mode == 'mmap':
+            ncpu = None
+
+        data_list = self._load_files(
+            load_file_func,
+            ncpu=ncpu,
+            max_memory=max_memory,
             keep_fields=keep_fields,
             dtype_conversions=dtype_conversions,
-            dtype_conversion_except_fields=dtype_conversion_except_fields
-        )
-
-        # Load possible subsequent data files by appending to the first data.
-        for i in range(1, len(self._pathfilename_list)):
-            data.append(load_file_func(
-                self._pathfilename_list[i],
-                keep_fields=keep_fields,
-                dtype_conversions=dtype_conversions,
-                dtype_conversion_except_fields=dtype_conversion_except_fields
-            ))
+            dtype_conversion_except_fields=dtype_conversion_except_fields)
+
+        data = DataFieldRecordArray.concatenate(data_list)
 
         return data
 
@@ -653,37 +791,26 @@ class TextFileLoader(
 
         return names
 
-    def _load_file(
+    def _parse_file(
             self,
             pathfilename,
-            keep_fields,
-            dtype_conversions,
-            dtype_conversion_except_fields):
-        """Loads the given file.
+            keep_fields):
+        """Parses the given text file into a structured numpy ndarray.
 
         Parameters
         ----------
         pathfilename : str
             The fully qualified file name of the data file that
-            need to be loaded.
-        keep_fields : str | sequence of str | None
-            Load the data into memory only for these data fields. If set to
-            ``None``, all in-file-present data fields are loaded into memory.
-        dtype_conversions : dict | None
-            If not None, this dictionary defines how data fields of specific
-            data types get converted into the specified data types.
-            This can be used to use less memory.
-        dtype_conversion_except_fields : str | sequence of str | None
-            The sequence of field names whose data type should not get
-            converted.
+            need to be parsed.
+        keep_fields : sequence of str | None
+            Parse only these data fields. If set to ``None``, all
+            in-file-present data fields are parsed.
 
         Returns
         -------
-        data : DataFieldRecordArray instance
-            The DataFieldRecordArray instance holding the loaded data.
+        data_ndarray : instance of numpy.ndarray
+            The structured numpy ndarray holding the parsed data.
         """
-        assert_file_exists(pathfilename)
-
         with open(pathfilename, 'r') as ifile:
             line = ifile.readline()
             column_names = self._extract_column_names(line)
@@ -712,6 +839,141 @@ class TextFileLoader(
                 comments=self._header_comment,
                 usecols=usecols)
 
+        return data_ndarray
+
+    def get_cache_key(
+            self,
+            pathfilename):
+        """Creates the key of the cache entry for the given text file. The key
+        is built from the file name, size, and modification time of the file,
+        and the header settings of this file loader.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The fully qualified file name of the data file.
+
+        Returns
+        -------
+        key : str
+            The cache key.
+        """
+        st = os.stat(pathfilename)
+
+        key = make_cache_key(
+            classname(self),
+            os.path.abspath(pathfilename),
+            st.st_size,
+            st.st_mtime_ns,
+            self._header_comment,
+            self._header_separator)
+
+        return key
+
+    def _get_cached_ndarray(
+            self,
+            pathfilename):
+        """Retrieves the structured numpy ndarray holding all the data fields
+        of the given text file from the cache. If the file is not in the cache
+        yet, it gets parsed and added to the cache.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The fully qualified file name of the data file.
+
+        Returns
+        -------
+        data_ndarray : instance of numpy.ndarray
+            The structured numpy ndarray holding the data of the file.
+        """
+        key = self.get_cache_key(pathfilename)
+
+        path = self._cache.get(key)
+        if path is not None:
+            try:
+                return np.load(os.path.join(path, 'data.npy'))
+            except (OSError, ValueError):
+                # The cache entry is corrupt. Recreate it.
+                self._cache.remove(key)
+
+        data_ndarray = self._parse_file(pathfilename, keep_fields=None)
+
+        self._cache.put(
+            key,
+            lambda path: np.save(os.path.join(path, 'data.npy'), data_ndarray))
+
+        return data_ndarray
+
+    def build_cache(self):
+        """Parses all the data files of this file loader and stores them in the
+        cache, unless they are cached already.
+
+        Returns
+        -------
+        keys : list of str
+            The list of cache keys of the data files.
+        """
+        if self._cache is None:
+            raise ValueError(
+                f'No cache was specified for the {classname(self)} instance!')
+
+        keys = []
+        for pathfilename in self._pathfilename_list:
+            assert_file_exists(pathfilename)
+            key = self.get_cache_key(pathfilename)
+            if not self._cache.has_entry(key):
+                self._get_cached_ndarray(pathfilename)
+            keys.append(key)
+
+        return keys
+
+    def _load_file(
+            self,
+            pathfilename,
+            keep_fields,
+            dtype_conversions,
+            dtype_conversion_except_fields):
+        """Loads the given file. If a cache is set, the data of the file is
+        taken from the cache.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The fully qualified file name of the data file that
+            need to be loaded.
+        keep_fields : str | sequence of str | None
+            Load the data into memory only for these data fields. If set to
+            ``None``, all in-file-present data fields are loaded into memory.
+        dtype_conversions : dict | None
+            If not None, this dictionary defines how data fields of specific
+            data types get converted into the specified data types.
+            This can be used to use less memory.
+        dtype_conversion_except_fields : str | sequence of str | None
+            The sequence of field names whose data type should not get
+            converted.
+
+        Returns
+        -------
+        data : DataFieldRecordArray instance
+            The DataFieldRecordArray instance holding the loaded data.
+        """
+        assert_file_exists(pathfilename)
+
+        if self._cache is None:
+            data_ndarray = self._parse_file(pathfilename, keep_fields)
+        else:
+            data_ndarray = self._get_cached_ndarray(pathfilename)
+            if keep_fields is not None:
+                keep_fields = [
+                    name
+                    for name in data_ndarray.dtype.names
+                    if name in keep_fields
+                ]
+                if len(keep_fields) == 0:
+                    raise ValueError(
+                        'No data columns were selected to be loaded!')
+
         data = DataFieldRecordArray(
             data_ndarray,
             keep_fields=keep_fields,
@@ -726,6 +988,8 @@ class TextFileLoader(
             keep_fields=None,
             dtype_conversions=None,
             dtype_conversion_except_fields=None,
+            ncpu=None,
+            max_memory=None,
             **kwargs):
         """Loads the data from the data files specified through their fully
         qualified file names.
@@ -742,6 +1006,14 @@ class TextFileLoader(
         dtype_conversion_except_fields : str | sequence of str | None
             The sequence of field names whose data type should not get
             converted.
+        ncpu : int | None
+            The number of processes to use for reading and parsing several
+            files in parallel. If set to ``None``, the files are loaded
+            sequentially.
+        max_memory : int | None
+            The maximum memory in bytes of the files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
 
         Returns
         -------
@@ -779,22 +1051,15 @@ class TextFileLoader(
                 'The dtype_conversion_except_fields argument must be a '
                 'sequence of str instances.')
 
-        # Load the first data file.
-        data = self._load_file(
-            self._pathfilename_list[0],
+        data_list = self._load_files(
+            self._load_file,
+            ncpu=ncpu,
+            max_memory=max_memory,
             keep_fields=keep_fields,
             dtype_conversions=dtype_conversions,
-            dtype_conversion_except_fields=dtype_conversion_except_fields
-        )
-
-        # Load possible subsequent data files by appending to the first data.
-        for i in range(1, len(self._pathfilename_list)):
-            data.append(self._load_file(
-                self._pathfilename_list[i],
-                keep_fields=keep_fields,
-                dtype_conversions=dtype_conversions,
-                dtype_conversion_except_fields=dtype_conversion_except_fields
-            ))
+            dtype_conversion_except_fields=dtype_conversion_except_fields)
+
+        data = DataFieldRecordArray.concatenate(data_list)
 
         return data
 
@@ -1322,6 +1587,42 @@ class DataFieldRecordArray(
             self._indices = np.arange(self._len)
         return self._indices
 
+    @classmethod
+    def concatenate(cls, arrays):
+        """Concatenates the given DataFieldRecordArray instances in the given
+        order. Each data field is copied only once. If only one instance is
+        given, this instance is returned.
+
+        Parameters
+        ----------
+        arrays : sequence of instance of DataFieldRecordArray
+            The non-empty sequence of DataFieldRecordArray instances. All
+            instances must contain the data fields of the first instance.
+            Additional data fields are ignored.
+
+        Returns
+        -------
+        arr : instance of DataFieldRecordArray
+            The instance of DataFieldRecordArray holding the concatenated data.
+        """
+        if not issequenceof(arrays, DataFieldRecordArray):
+            raise TypeError(
+                'The arrays argument must be a sequence of '
+                'DataFieldRecordArray instances!')
+        if len(arrays) == 0:
+            raise ValueError(
+                'The arrays argument must not be empty!')
+
+        if len(arrays) == 1:
+            return arrays[0]
+
+        data = dict([
+            (fname, np.concatenate([arr[fname] for arr in arrays]))
+            for fname in arrays[0].field_name_list
+        ])
+
+        return cls(data, copy=False)
+
     def append(self, arr):
         """Appends the given DataFieldRecordArray to this DataFieldRecordArray
         instance.
@@ -4,10 +4,29 @@
 TimeLord class keeps track of execution times of specific code segments,
 called "tasks". The TaskTimer class can be used within a `with`
 statement to time the execution of the code within the `with` block.
+
+Methods of classes can be instrumented via the :func:`instrument_methods`
+function without changing their code. An instrumented method records its
+executions as tasks into the TimeLord instance, which is active in the current
+thread. A TimeLord instance is activated by using it as context manager::
+
+    instrument_methods(ana)
+    tl = TimeLord()
+    with tl:
+        ana.unblind(rss)
+    tl.save_json('profile.json')
+    tl.save_folded_stacks('profile.folded')
 """
 
-import numpy as np
+import contextlib
+import functools
+import json
+import threading
 import time
+import tracemalloc
+import types
+
+import numpy as np
 
 from skyllh.core import (
     display,
@@ -17,13 +36,20 @@ from skyllh.core.py import (
 )
 
 
+# The name of the worker, which is used for task executions that have not been
+# recorded by a worker process.
+MASTER_WORKER_NAME = 'master'
+
+
 class TaskRecord(
         object):
     def __init__(
             self,
             name,
             start_times,
-            end_times):
+            end_times,
+            mem_deltas=None,
+            workers=None):
         """Creates a new TaskRecord instance.
 
         Parameters
@@ -34,6 +60,16 @@ class TaskRecord(
             The start times of the task in seconds.
         end_times : list of float
             The end times of the task in seconds.
+        mem_deltas : list of float | None
+            The change of the allocated memory in bytes for each execution of
+            the task. The value is ``numpy.nan`` if the memory was not
+            tracked. If set to None, the memory was not tracked for any
+            execution.
+        workers : list of str | None
+            The name of the worker process, which executed the task, for each
+            execution of the task. The value is None for executions of the
+            master process. If set to None, all executions were done by the
+            master process.
         """
         self.name = name
 
@@ -41,8 +77,20 @@ class TaskRecord(
             raise ValueError(
                 'The number of start and end time stamps must be equal!')
 
+        if mem_deltas is None:
+            mem_deltas = [np.nan]*len(start_times)
+        if workers is None:
+            workers = [None]*len(start_times)
+        if (len(mem_deltas) != len(start_times)) or\
+           (len(workers) != len(start_times)):
+            raise ValueError(
+                'The number of memory deltas and workers must be equal to the '
+                'number of time stamps!')
+
         self._start_times = start_times
         self._end_times = end_times
+        self._mem_deltas = mem_deltas
+        self._workers = workers
 
     @property
     def tstart(self):
@@ -56,6 +104,28 @@ class TaskRecord(
         """
         return self._end_times
 
+    @property
+    def mem_deltas(self):
+        """(read-only) The change of the allocated memory in bytes for each
+        execution of this task. The value is ``numpy.nan`` for executions
+        without memory tracking.
+        """
+        return self._mem_deltas
+
+    @property
+    def workers(self):
+        """(read-only) The name of the worker process for each execution of
+        this task. The value is None for executions of the master process.
+        """
+        return self._workers
+
+    @property
+    def durations(self):
+        """(read-only) The numpy ndarray holding the duration of each
+        execution of this task.
+        """
+        return np.asarray(self._end_times) - np.asarray(self._start_times)
+
     @property
     def duration(self):
         """(read-only) The total duration (without time overlap) the task was
@@ -89,6 +159,135 @@ class TaskRecord(
         """
         return len(self._start_times)
 
+    def get_percentiles(
+            self,
+            q):
+        """Calculates the percentiles of the durations of the executions of
+        this task.
+
+        Parameters
+        ----------
+        q : float | sequence of float
+            The percentile(s) in the range [0, 100].
+
+        Returns
+        -------
+        percentiles : float | instance of numpy.ndarray
+            The percentile(s) of the durations in seconds.
+        """
+        return np.percentile(self.durations, q)
+
+    def get_worker_task_records(self):
+        """Splits this task record into task records for the individual worker
+        processes.
+
+        Returns
+        -------
+        worker_task_records : dict of str to TaskRecord
+            The dictionary with the name of the worker as key and the instance
+            of TaskRecord holding the executions of this task by the worker as
+            value. The executions of the master process are stored under the
+            name ``MASTER_WORKER_NAME``.
+        """
+        idxs_dict = dict()
+        for (idx, worker) in enumerate(self._workers):
+            if worker is None:
+                worker = MASTER_WORKER_NAME
+            idxs_dict.setdefault(worker, []).append(idx)
+
+        worker_task_records = dict()
+        for (worker, idxs) in idxs_dict.items():
+            worker_task_records[worker] = TaskRecord(
+                name=self.name,
+                start_times=[self._start_times[idx] for idx in idxs],
+                end_times=[self._end_times[idx] for idx in idxs],
+                mem_deltas=[self._mem_deltas[idx] for idx in idxs],
+                workers=[self._workers[idx] for idx in idxs])
+
+        return worker_task_records
+
+    def relabel_worker(
+            self,
+            worker):
+        """Creates a copy of this task record, where the executions of the
+        master process are attributed to the given worker.
+
+        Parameters
+        ----------
+        worker : str
+            The name of the worker.
+
+        Returns
+        -------
+        task_record : instance of TaskRecord
+            The new TaskRecord instance.
+        """
+        return TaskRecord(
+            name=self.name,
+            start_times=list(self._start_times),
+            end_times=list(self._end_times),
+            mem_deltas=list(self._mem_deltas),
+            workers=[
+                worker if w is None else w
+                for w in self._workers
+            ])
+
+    def to_dict(
+            self,
+            percentiles=(50, 90, 99)):
+        """Creates a dictionary with the statistics of this task, which can be
+        serialized to JSON.
+
+        Parameters
+        ----------
+        percentiles : sequence of float
+            The percentiles of the durations of the executions, which should
+            be included.
+
+        Returns
+        -------
+        d : dict
+            The dictionary holding the statistics of the task. The durations
+            are given in seconds, the memory deltas in bytes. The memory
+            statistics are None if the memory was not tracked.
+        """
+        durations = self.durations
+        mem_deltas = np.asarray(self._mem_deltas, dtype=np.float64)
+        mem_deltas = mem_deltas[np.isfinite(mem_deltas)]
+
+        d = {
+            'name': self.name,
+            'niter': self.niter,
+            'duration': float(self.duration),
+            'total_duration': float(np.sum(durations)),
+            'mean_duration': float(np.mean(durations)),
+            'min_duration': float(np.min(durations)),
+            'max_duration': float(np.max(durations)),
+            'percentiles': {
+                f'p{q:g}': float(v)
+                for (q, v) in zip(
+                    percentiles, np.percentile(durations, percentiles))
+            },
+            'total_mem_delta': (
+                float(np.sum(mem_deltas)) if len(mem_deltas) > 0 else None),
+            'max_mem_delta': (
+                float(np.max(mem_deltas)) if len(mem_deltas) > 0 else None),
+        }
+
+        worker_task_records = self.get_worker_task_records()
+        if (len(worker_task_records) > 1) or\
+           (MASTER_WORKER_NAME not in worker_task_records):
+            d['workers'] = {
+                worker: {
+                    'niter': tr.niter,
+                    'duration': float(tr.duration),
+                    'total_duration': float(np.sum(tr.durations)),
+                }
+                for (worker, tr) in worker_task_records.items()
+            }
+
+        return d
+
     def join(self, tr):
         """Joins this TaskRecord with the given TaskRecord instance.
 
@@ -100,14 +299,103 @@ class TaskRecord(
         """
         self._start_times.extend(tr._start_times)
         self._end_times.extend(tr._end_times)
+        self._mem_deltas.extend(tr._mem_deltas)
+        self._workers.extend(tr._workers)
+
+
+# The thread-local stack of the activated TimeLord instances.
+_ACTIVE_TIME_LORDS = threading.local()
+
+
+def get_active_time_lord():
+    """Returns the TimeLord instance, which is active in the current thread.
+
+    Returns
+    -------
+    tl : instance of TimeLord | None
+        The active TimeLord instance, or None if no TimeLord instance is
+        active.
+    """
+    stack = getattr(_ACTIVE_TIME_LORDS, 'stack', None)
+    if not stack:
+        return None
+    return stack[-1]
+
+
+@contextlib.contextmanager
+def activate_time_lord(tl):
+    """Context manager activating the given TimeLord instance within the
+    current thread, if it is not None.
+
+    Parameters
+    ----------
+    tl : instance of TimeLord | None
+        The TimeLord instance that should be activated.
+    """
+    if tl is None:
+        yield None
+        return
+
+    with tl:
+        yield tl
 
 
 class TimeLord(
         object):
     def __init__(
-            self):
+            self,
+            track_memory=False):
+        """Creates a new TimeLord instance.
+
+        Parameters
+        ----------
+        track_memory : bool
+            Flag if the change of the allocated memory should be recorded for
+            each task execution. The memory is traced via the ``tracemalloc``
+            module, which is started if needed. Memory tracing slows down
+            the execution of the code notably.
+        """
         self._task_records = []
         self._task_records_name_idx_map = {}
+        self._track_memory = track_memory
+
+        # The dictionary holding the sum of the durations of the task
+        # executions for each call stack. The key is a tuple of the name of
+        # the worker (None for the master process) and the task names of the
+        # stack.
+        self._stack_durations = dict()
+
+        # The per-thread stack of the names of the currently executed tasks.
+        self._local = threading.local()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_local']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def __enter__(self):
+        """Activates this TimeLord instance within the current thread. Methods
+        instrumented via the :func:`instrument_methods` function record their
+        executions into the active TimeLord instance.
+        """
+        if not hasattr(_ACTIVE_TIME_LORDS, 'stack'):
+            _ACTIVE_TIME_LORDS.stack = []
+        _ACTIVE_TIME_LORDS.stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _ACTIVE_TIME_LORDS.stack.pop()
+
+    @property
+    def track_memory(self):
+        """(read-only) Flag if the change of the allocated memory is recorded
+        for each task execution.
+        """
+        return self._track_memory
 
     @property
     def task_name_list(self):
@@ -115,6 +403,27 @@ class TimeLord(
         """
         return list(self._task_records_name_idx_map.keys())
 
+    @property
+    def task_stack(self):
+        """(read-only) The list of the names of the tasks, which are currently
+        executed within the current thread, starting with the outermost task.
+        """
+        if not hasattr(self._local, 'task_stack'):
+            self._local.task_stack = []
+        return self._local.task_stack
+
+    def empty_copy(self):
+        """Creates a new empty TimeLord instance with the same settings as this
+        TimeLord instance, e.g. for a worker process or thread, whose TimeLord
+        instance gets joined with this instance later.
+
+        Returns
+        -------
+        tl : instance of TimeLord
+            The new TimeLord instance.
+        """
+        return TimeLord(track_memory=self._track_memory)
+
     def add_task_record(
             self,
             tr):
@@ -131,6 +440,28 @@ class TimeLord(
         self._task_records.append(tr)
         self._task_records_name_idx_map[tr.name] = len(self._task_records)-1
 
+    def add_stack_duration(
+            self,
+            stack,
+            duration,
+            worker=None):
+        """Adds the given duration to the total duration of the given call
+        stack of tasks.
+
+        Parameters
+        ----------
+        stack : tuple of str
+            The names of the tasks of the call stack, starting with the
+            outermost task.
+        duration : float
+            The duration in seconds.
+        worker : str | None
+            The name of the worker process. None for the master process.
+        """
+        key = (worker,) + tuple(stack)
+        self._stack_durations[key] = (
+            self._stack_durations.get(key, 0) + duration)
+
     def get_task_record(
             self,
             name):
@@ -168,7 +499,8 @@ class TimeLord(
 
     def join(
             self,
-            tl):
+            tl,
+            worker=None):
         """Joins a given TimeLord instance with this TimeLord instance. Tasks
         of the same name will be updated and new tasks will be added.
 
@@ -177,9 +509,21 @@ class TimeLord(
         tl : instance of TimeLord
             The instance of TimeLord whos tasks should be joined with the tasks
             of this TimeLord instance.
+        worker : str | None
+            The name of the worker process, which recorded the tasks of the
+            given TimeLord instance. If not None, the task executions of the
+            master process of ``tl`` are attributed to this worker.
         """
+        for (key, duration) in tl._stack_durations.items():
+            (stack_worker, stack) = (key[0], key[1:])
+            if stack_worker is None:
+                stack_worker = worker
+            self.add_stack_duration(stack, duration, worker=stack_worker)
+
         for tname in tl.task_name_list:
             other_tr = tl.get_task_record(tname)
+            if worker is not None:
+                other_tr = other_tr.relabel_worker(worker)
             if self.has_task_record(tname):
                 # Update the task record.
                 tr = self.get_task_record(tname)
@@ -193,6 +537,106 @@ class TimeLord(
         """
         return TaskTimer(self, name)
 
+    def to_dict(
+            self,
+            percentiles=(50, 90, 99)):
+        """Creates a dictionary with the statistics of all tasks, which can be
+        serialized to JSON.
+
+        Parameters
+        ----------
+        percentiles : sequence of float
+            The percentiles of the durations of the task executions, which
+            should be included.
+
+        Returns
+        -------
+        d : dict
+            The dictionary with the key ``'tasks'`` holding the list of the
+            task statistics, sorted by decreasing total duration. See the
+            :meth:`TaskRecord.to_dict` method for the task statistics.
+        """
+        tasks = [
+            tr.to_dict(percentiles=percentiles)
+            for tr in self._task_records
+        ]
+        tasks.sort(key=lambda task: task['total_duration'], reverse=True)
+
+        return {
+            'track_memory': self._track_memory,
+            'tasks': tasks,
+        }
+
+    def save_json(
+            self,
+            pathfilename,
+            percentiles=(50, 90, 99)):
+        """Writes the statistics of all tasks to the given JSON file.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The path and filename of the JSON file.
+        percentiles : sequence of float
+            The percentiles of the durations of the task executions, which
+            should be included.
+        """
+        with open(pathfilename, 'w') as fp:
+            json.dump(self.to_dict(percentiles=percentiles), fp, indent=2)
+
+    def get_folded_stacks(self):
+        """Creates the call stacks of the recorded tasks in the folded stack
+        format, which can be processed by flame graph tools like
+        ``flamegraph.pl`` or speedscope. The first frame of each stack is the
+        name of the worker process. The value of each stack is the self time
+        of its innermost task in microseconds, i.e. without the time spent in
+        recorded sub-tasks.
+
+        Returns
+        -------
+        lines : list of str
+            The list of lines of the form ``"frame1;frame2;frame3 value"``.
+        """
+        children_durations = dict()
+        for (key, duration) in self._stack_durations.items():
+            if len(key) > 2:
+                parent = key[:-1]
+                children_durations[parent] = (
+                    children_durations.get(parent, 0) + duration)
+
+        lines = []
+        for (key, duration) in sorted(
+                self._stack_durations.items(),
+                key=lambda item: tuple(str(k) for k in item[0])):
+            self_time = duration - children_durations.get(key, 0)
+            value = int(round(max(self_time, 0)*1e6))
+            if value == 0:
+                continue
+            worker = MASTER_WORKER_NAME if key[0] is None else key[0]
+            frames = [
+                frame.replace(';', ',')
+                for frame in (worker,) + key[1:]
+            ]
+            lines.append(f'{";".join(frames)} {value}')
+
+        return lines
+
+    def save_folded_stacks(
+            self,
+            pathfilename):
+        """Writes the call stacks of the recorded tasks in the folded stack
+        format to the given file. See the :meth:`get_folded_stacks` method
+        for details.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The path and filename of the output file.
+        """
+        with open(pathfilename, 'w') as fp:
+            for line in self.get_folded_stacks():
+                fp.write(line + '\n')
+
     def __str__(self):
         """Generates a pretty string for this time lord.
         """
@@ -246,6 +690,7 @@ class TaskTimer(
 
         self._start = None
         self._end = None
+        self._mem_start = None
 
     @property
     def time_lord(self):
@@ -285,6 +730,13 @@ class TaskTimer(
     def __enter__(self):
         """This gets executed when entering the `with` block.
         """
+        if self._time_lord is not None:
+            self._time_lord.task_stack.append(self._name)
+            if self._time_lord.track_memory:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                self._mem_start = tracemalloc.get_traced_memory()[0]
+
         self._start = time.process_time()
         return self
 
@@ -296,8 +748,159 @@ class TaskTimer(
         if self._time_lord is None:
             return
 
+        mem_delta = np.nan
+        if self._mem_start is not None:
+            mem_delta = tracemalloc.get_traced_memory()[0] - self._mem_start
+
+        task_stack = self._time_lord.task_stack
+        self._time_lord.add_stack_duration(
+            stack=task_stack,
+            duration=self._end - self._start)
+        task_stack.pop()
+
         self._time_lord.add_task_record(
             TaskRecord(
                 name=self._name,
                 start_times=[self._start],
-                end_times=[self._end]))
+                end_times=[self._end],
+                mem_deltas=[mem_delta]))
+
+
+# The default names of the methods, which are instrumented by the
+# :func:`instrument_methods` function.
+DEFAULT_INSTRUMENTED_METHOD_NAMES = (
+    'evaluate',
+    'get_pd',
+    'get_ratio',
+    'get_gradient',
+    'generate_background_events',
+    'generate_signal_events',
+    'generate_events',
+)
+
+# The set of (class, method name) tuples of the instrumented methods.
+_INSTRUMENTED_METHODS = set()
+
+
+def _create_instrumented_method(
+        func,
+        method_name):
+    """Creates the wrapper function for the given method function, which
+    records the execution of the method into the active TimeLord instance.
+    The task name is ``"<class name>.<method name>"``.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        tl = get_active_time_lord()
+        if tl is None:
+            return func(self, *args, **kwargs)
+        with TaskTimer(tl, f'{classname(self)}.{method_name}'):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _iter_skyllh_objects(
+        obj,
+        max_depth):
+    """Iterates over the given object and all skyllh objects that can be
+    reached from it via instance attributes and containers. Other objects are
+    not traversed.
+    """
+    visited = set()
+    stack = [(obj, 0)]
+    while len(stack) > 0:
+        (o, depth) = stack.pop()
+        if id(o) in visited:
+            continue
+        visited.add(id(o))
+
+        if isinstance(o, (list, tuple, set)):
+            children = o
+        elif isinstance(o, dict):
+            children = o.values()
+        elif isinstance(o, np.ndarray) and (o.dtype == object):
+            children = o.flat
+        elif (o is obj) or any(cls.__module__.startswith('skyllh.')
+                               for cls in type(o).__mro__):
+            yield o
+            children = getattr(o, '__dict__', dict()).values()
+        else:
+            continue
+
+        if depth < max_depth:
+            stack.extend((child, depth+1) for child in children)
+
+
+def instrument_methods(
+        obj,
+        method_names=None,
+        max_depth=10):
+    """Instruments the methods of the classes of the given object and of all
+    skyllh objects reachable from it, e.g. the LLH ratio functions, PDF
+    ratios, PDFs, and event generators of an analysis instance. The
+    executions of an instrumented method are recorded as task named
+    ``"<class name>.<method name>"`` into the TimeLord instance, which is
+    active in the current thread. Without an active TimeLord instance the
+    overhead of an instrumented method is a single function call.
+
+    The methods are instrumented on the class, which defines the method.
+    Hence, the instrumentation applies to all instances of that class within
+    the current process. Worker processes inherit the instrumentation only if
+    they are started via ``fork``, which is the start method set by SkyLLH.
+    Pickling does not carry the instrumentation, because classes are pickled
+    by reference. Hence, in worker processes started via ``spawn`` this
+    function needs to be called again.
+
+    Parameters
+    ----------
+    obj : object
+        The object, e.g. an Analysis instance, whose methods should be
+        instrumented.
+    method_names : sequence of str | None
+        The names of the methods that should be instrumented. If set to None,
+        the methods ``DEFAULT_INSTRUMENTED_METHOD_NAMES`` are instrumented.
+    max_depth : int
+        The maximal depth of attributes and containers, which is searched for
+        skyllh objects.
+
+    Returns
+    -------
+    instrumented_methods : list of 2-element tuple
+        The list of (class, method name) tuples of the methods, which have
+        been instrumented by this call.
+    """
+    if method_names is None:
+        method_names = DEFAULT_INSTRUMENTED_METHOD_NAMES
+
+    instrumented_methods = []
+    for o in _iter_skyllh_objects(obj, max_depth):
+        for method_name in method_names:
+            # Find the class, which defines the method.
+            cls = next(
+                (cls for cls in type(o).__mro__
+                 if method_name in cls.__dict__),
+                None)
+            if cls is None or (cls, method_name) in _INSTRUMENTED_METHODS:
+                continue
+            func = cls.__dict__[method_name]
+            if not isinstance(func, types.FunctionType):
+                continue
+
+            setattr(
+                cls,
+                method_name,
+                _create_instrumented_method(func, method_name))
+            _INSTRUMENTED_METHODS.add((cls, method_name))
+            instrumented_methods.append((cls, method_name))
+
+    return instrumented_methods
+
+
+def uninstrument_methods():
+    """Restores all methods, which have been instrumented by the
+    :func:`instrument_methods` function.
+    """
+    for (cls, method_name) in _INSTRUMENTED_METHODS:
+        setattr(cls, method_name, cls.__dict__[method_name].__wrapped__)
+    _INSTRUMENTED_METHODS.clear()
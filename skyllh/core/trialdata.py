@@ -381,6 +381,331 @@ class DataField(object):
         ]
 
 
+class SourceEventPairs(object):
+    """This class holds the source-event pairs of a trial in a compressed
+    sparse row (CSR) format, i.e. the event indices of all pairs sorted by
+    source, and the offsets of the pairs of each source into the event indices
+    array. The pairs define the layout of the values arrays of length
+    N_values, which are created by PDFs. This class provides segmented-sum,
+    gather and scatter operations on such values arrays, which avoid building
+    masks over all pairs.
+    """
+    def __init__(
+            self,
+            src_offsets,
+            evt_idxs,
+            n_events,
+            **kwargs):
+        """Creates a new instance of SourceEventPairs.
+
+        Parameters
+        ----------
+        src_offsets : instance of numpy ndarray
+            The (N_sources+1,)-shaped numpy ndarray of int holding the offsets
+            of the pairs of each source into the ``evt_idxs`` array.
+        evt_idxs : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray of int holding the event
+            indices of the pairs sorted by source.
+        n_events : int
+            The number of events, i.e. the number of selected events of the
+            trial.
+        """
+        super().__init__(**kwargs)
+
+        src_offsets = np.asarray(src_offsets, dtype=np.int64)
+        evt_idxs = np.asarray(evt_idxs, dtype=np.int64)
+
+        if (src_offsets.ndim != 1) or (len(src_offsets) == 0):
+            raise ValueError(
+                'The src_offsets argument must be a non-empty 1d ndarray!')
+        if (src_offsets[0] != 0) or (src_offsets[-1] != len(evt_idxs)):
+            raise ValueError(
+                'The src_offsets argument must start with 0 and end with the '
+                f'number of values ({len(evt_idxs)})! Its current range is '
+                f'[{src_offsets[0]}, {src_offsets[-1]}].')
+
+        self._src_offsets = src_offsets
+        self._evt_idxs = evt_idxs
+        self._n_events = int_cast(
+            n_events,
+            'The n_events argument must be castable to type int!')
+
+        self._src_idxs = None
+
+    @classmethod
+    def from_src_evt_idxs(
+            cls,
+            src_idxs,
+            evt_idxs,
+            n_sources,
+            n_events):
+        """Creates a new SourceEventPairs instance from the flat source and
+        event index arrays of the pairs, as returned by an event selection
+        method. If the pairs are not sorted by source, they will be sorted by
+        source, keeping the order of the pairs of each source.
+
+        Parameters
+        ----------
+        src_idxs : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray of int holding the source
+            index of each pair.
+        evt_idxs : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray of int holding the event
+            index of each pair.
+        n_sources : int
+            The number of sources.
+        n_events : int
+            The number of events.
+
+        Returns
+        -------
+        pairs : instance of SourceEventPairs
+            The new instance of SourceEventPairs.
+        """
+        src_idxs = np.asarray(src_idxs, dtype=np.int64)
+        evt_idxs = np.asarray(evt_idxs, dtype=np.int64)
+
+        if len(src_idxs) != len(evt_idxs):
+            raise ValueError(
+                f'The lengths of the src_idxs ({len(src_idxs)}) and evt_idxs '
+                f'({len(evt_idxs)}) arguments must be equal!')
+
+        if np.any(np.diff(src_idxs) < 0):
+            sort_idxs = np.argsort(src_idxs, kind='stable')
+            src_idxs = src_idxs[sort_idxs]
+            evt_idxs = evt_idxs[sort_idxs]
+
+        src_offsets = np.zeros((n_sources+1,), dtype=np.int64)
+        np.cumsum(
+            np.bincount(src_idxs, minlength=n_sources),
+            out=src_offsets[1:])
+
+        pairs = cls(
+            src_offsets=src_offsets,
+            evt_idxs=evt_idxs,
+            n_events=n_events)
+        pairs._src_idxs = src_idxs
+
+        return pairs
+
+    @classmethod
+    def from_all_pairs(
+            cls,
+            n_sources,
+            n_events):
+        """Creates a new SourceEventPairs instance where all events are paired
+        with all sources.
+
+        Parameters
+        ----------
+        n_sources : int
+            The number of sources.
+        n_events : int
+            The number of events.
+
+        Returns
+        -------
+        pairs : instance of SourceEventPairs
+            The new instance of SourceEventPairs.
+        """
+        return cls(
+            src_offsets=np.arange(n_sources+1, dtype=np.int64) * n_events,
+            evt_idxs=np.tile(np.arange(n_events, dtype=np.int64), n_sources),
+            n_events=n_events)
+
+    @property
+    def n_sources(self):
+        """(read-only) The number of sources.
+        """
+        return len(self._src_offsets) - 1
+
+    @property
+    def n_events(self):
+        """(read-only) The number of events.
+        """
+        return self._n_events
+
+    @property
+    def n_values(self):
+        """(read-only) The number of source-event pairs, i.e. the length of
+        the values arrays.
+        """
+        return len(self._evt_idxs)
+
+    @property
+    def src_offsets(self):
+        """(read-only) The (N_sources+1,)-shaped numpy ndarray holding the
+        offsets of the pairs of each source into the values arrays.
+        """
+        return self._src_offsets
+
+    @property
+    def n_values_per_source(self):
+        """(read-only) The (N_sources,)-shaped numpy ndarray holding the number
+        of pairs of each source.
+        """
+        return np.diff(self._src_offsets)
+
+    @property
+    def evt_idxs(self):
+        """(read-only) The (N_values,)-shaped numpy ndarray holding the event
+        index of each pair.
+        """
+        return self._evt_idxs
+
+    @property
+    def src_idxs(self):
+        """(read-only) The (N_values,)-shaped numpy ndarray holding the source
+        index of each pair. This array is created on first access.
+        """
+        if self._src_idxs is None:
+            self._src_idxs = np.repeat(
+                np.arange(self.n_sources, dtype=np.int64),
+                self.n_values_per_source)
+        return self._src_idxs
+
+    def get_values_slice(self, src_idx):
+        """Returns the slice of the values arrays, which belongs to the given
+        source.
+
+        Parameters
+        ----------
+        src_idx : int
+            The index of the source.
+
+        Returns
+        -------
+        sl : instance of slice
+            The slice of the values of the given source.
+        """
+        return slice(
+            self._src_offsets[src_idx],
+            self._src_offsets[src_idx+1])
+
+    def get_values_mask_for_source_mask(self, src_mask):
+        """Creates a boolean mask for the values arrays selecting the pairs of
+        the sources given by the source mask.
+
+        Parameters
+        ----------
+        src_mask : instance of numpy ndarray
+            The (N_sources,)-shaped numpy ndarray holding the boolean selection
+            of the sources.
+
+        Returns
+        -------
+        values_mask : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray holding the boolean selection
+            of the values.
+        """
+        return np.repeat(
+            np.asarray(src_mask, dtype=np.bool_),
+            self.n_values_per_source)
+
+    def gather_sources(self, arr):
+        """Gathers the given per-source values for each pair.
+
+        Parameters
+        ----------
+        arr : instance of numpy ndarray
+            The (N_sources,)- or (1,)-shaped numpy ndarray holding values for
+            each source.
+
+        Returns
+        -------
+        out_arr : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray holding the source value of
+            each pair.
+        """
+        if len(arr) == 1:
+            return np.full((self.n_values,), arr[0], dtype=arr.dtype)
+
+        if len(arr) != self.n_sources:
+            raise ValueError(
+                f'The length of arr ({len(arr)}) must be 1 or equal to the '
+                f'number of sources ({self.n_sources})!')
+
+        return np.repeat(arr, self.n_values_per_source)
+
+    def gather_events(self, arr):
+        """Gathers the given per-event values for each pair.
+
+        Parameters
+        ----------
+        arr : instance of numpy ndarray
+            The (N_events,)-shaped numpy ndarray holding values for each event.
+
+        Returns
+        -------
+        out_arr : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray holding the event value of each
+            pair.
+        """
+        return np.take(arr, self._evt_idxs)
+
+    def sum_per_source(self, values):
+        """Calculates the segmented sum of the given values for each source.
+
+        Parameters
+        ----------
+        values : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray holding the value of each pair.
+
+        Returns
+        -------
+        sums : instance of numpy ndarray
+            The (N_sources,)-shaped numpy ndarray holding the sum of the values
+            of each source.
+        """
+        sums = np.zeros((self.n_sources,), dtype=np.float64)
+
+        # np.add.reduceat cannot handle empty segments, hence we sum only over
+        # the non-empty segments, which are contiguous.
+        m = self.n_values_per_source > 0
+        if np.any(m):
+            sums[m] = np.add.reduceat(values, self._src_offsets[:-1][m])
+
+        return sums
+
+    def sum_per_event(self, values, src_weights=None):
+        """Scatters the given values to their events and sums them up, i.e.
+        calculates the (weighted) sum over the sources for each event.
+
+        Parameters
+        ----------
+        values : instance of numpy ndarray
+            The (N_values,)-shaped numpy ndarray holding the value of each pair.
+        src_weights : instance of numpy ndarray | None
+            The optional (N_sources,)-shaped numpy ndarray holding the weight
+            of each source.
+
+        Returns
+        -------
+        sums : instance of numpy ndarray
+            The (N_events,)-shaped numpy ndarray holding the sum of the values
+            of each event.
+        """
+        if src_weights is not None:
+            values = values * self.gather_sources(src_weights)
+
+        return np.bincount(
+            self._evt_idxs,
+            weights=values,
+            minlength=self._n_events)
+
+    def remap_events(self, new_evt_idxs):
+        """Re-assigns the event indices of the pairs after the events have been
+        reordered.
+
+        Parameters
+        ----------
+        new_evt_idxs : instance of numpy ndarray
+            The (N_events,)-shaped numpy ndarray holding the new index of each
+            old event index.
+        """
+        self._evt_idxs = np.take(new_evt_idxs, self._evt_idxs)
+
+
 class TrialDataManager(object):
     """The TrialDataManager class manages the event data for an analysis trial.
     It provides possible additional data fields and their calculation.
@@ -389,6 +714,10 @@ class TrialDataManager(object):
     The data trial manager is provided to the PDF evaluation method.
     Hence, data fields are calculated only once.
     """
+    # The name of the data field holding the trial index of each event, when a
+    # batch of trials is initialized via the initialize_trials method.
+    trial_idx_field_name = 'trial_idx'
+
     def __init__(self, index_field_name=None, **kwargs):
         """Creates a new TrialDataManager instance.
 
@@ -432,9 +761,9 @@ class TrialDataManager(object):
         # data fields get calculated.
         self._events = None
 
-        # Define the member variable that holds the source to event index
-        # mapping.
-        self._src_evt_idxs = None
+        # Define the member variable that holds the source-event pairs, i.e.
+        # the source to event index mapping.
+        self._src_evt_pairs = None
 
         # We store an integer number for the trial data state and increase it
         # whenever the state of the trial data changed. This way other code,
@@ -442,6 +771,13 @@ class TrialDataManager(object):
         # must be flushed.
         self._trial_data_state_id = -1
 
+        # Define the member variables that hold the total number of events of
+        # each trial and the offsets of the selected events of each trial, in
+        # case a batch of trials has been initialized via the
+        # initialize_trials method.
+        self._n_events_per_trial = None
+        self._trial_evt_offsets = None
+
     @property
     def index_field_name(self):
         """The name of the primary index data field. If not None, events will
@@ -519,7 +855,57 @@ class TrialDataManager(object):
         1d ndarray arrays. This can be ``None``, indicating that all trial data
         events should be considered for all sources.
         """
-        return self._src_evt_idxs
+        if self._src_evt_pairs is None:
+            return None
+        return (self._src_evt_pairs.src_idxs, self._src_evt_pairs.evt_idxs)
+
+    @property
+    def src_evt_pairs(self):
+        """(read-only) The instance of SourceEventPairs holding the
+        source-event pairs of the trial in CSR format. This is ``None`` before a
+        trial has been initialized.
+        """
+        return self._src_evt_pairs
+
+    @property
+    def n_trials(self):
+        """(read-only) The number of trials, if a batch of trials has been
+        initialized via the :meth:`initialize_trials` method, ``None``
+        otherwise.
+        """
+        if self._n_events_per_trial is None:
+            return None
+        return len(self._n_events_per_trial)
+
+    @property
+    def n_events_per_trial(self):
+        """(read-only) The (n_trials,)-shaped numpy ndarray holding the total
+        number of events of each trial, if a batch of trials has been
+        initialized via the :meth:`initialize_trials` method, ``None``
+        otherwise.
+        """
+        return self._n_events_per_trial
+
+    @property
+    def n_pure_bkg_events_per_trial(self):
+        """(read-only) The (n_trials,)-shaped numpy ndarray holding the number
+        of pure background events of each trial, if a batch of trials has been
+        initialized via the :meth:`initialize_trials` method, ``None``
+        otherwise.
+        """
+        if self._n_events_per_trial is None:
+            return None
+        return self._n_events_per_trial - np.diff(self._trial_evt_offsets)
+
+    @property
+    def trial_evt_offsets(self):
+        """(read-only) The (n_trials+1,)-shaped numpy ndarray holding the
+        offsets of the selected events of each trial, if a batch of trials has
+        been initialized via the :meth:`initialize_trials` method, ``None``
+        otherwise. The selected events of trial ``k`` are the events
+        ``trial_evt_offsets[k]:trial_evt_offsets[k+1]``.
+        """
+        return self._trial_evt_offsets
 
     @property
     def trial_data_state_id(self):
@@ -644,31 +1030,7 @@ class TrialDataManager(object):
             The (N_values,)-shaped numpy ndarray holding the source values
             broadcasted to each event value.
         """
-        arr_dtype = arr.dtype
-        n_values = self.get_n_values()
-
-        if len(arr) == 1:
-            return np.full((n_values,), arr[0], dtype=arr_dtype)
-
-        if len(arr) != self.n_sources:
-            raise ValueError(
-                f'The length of arr ({len(arr)}) must be 1 or equal to the '
-                f'number of sources ({self.n_sources})!')
-
-        out_arr = np.empty(
-            (n_values,),
-            dtype=arr.dtype)
-
-        src_idxs = self.src_evt_idxs[0]
-        v_start = 0
-        for (src_idx, src_value) in enumerate(arr):
-            n = np.count_nonzero(src_idxs == src_idx)
-            # n = len(evt_idxs[src_idxs == src_idx])
-            out_arr[v_start:v_start+n] = np.full(
-                (n,), src_value, dtype=arr_dtype)
-            v_start += n
-
-        return out_arr
+        return self.src_evt_pairs.gather_sources(arr)
 
     def broadcast_sources_arrays_to_values_arrays(
             self,
@@ -711,9 +1073,8 @@ class TrialDataManager(object):
         out_arrays : list of instance of ndarray
             The list of broadcasted numpy ndarray instances.
         """
-        evt_idxs = self._src_evt_idxs[1]
         out_arrays = [
-            np.take(arr, evt_idxs)
+            self.src_evt_pairs.gather_events(arr)
             for arr in arrays
         ]
 
@@ -774,10 +1135,152 @@ class TrialDataManager(object):
             The optional TimeLord instance that should be used for timing
             measurements.
         """
+        self._n_events_per_trial = None
+        self._trial_evt_offsets = None
+
+        self._initialize_events(
+            shg_mgr=shg_mgr,
+            pmm=pmm,
+            events=events,
+            n_events=n_events,
+            evt_sel_method=evt_sel_method,
+            tl=tl)
+
+    def initialize_trials(
+            self,
+            shg_mgr,
+            pmm,
+            events_list,
+            n_events_list=None,
+            evt_sel_method=None,
+            tl=None):
+        """Initializes the trial data manager for a batch of trials at once.
+        The events of all trials are concatenated and processed like the events
+        of a single trial, i.e. the data fields are calculated and the event
+        selection is performed only once for all trials. The selected events
+        are grouped by trial, where the selected events of trial ``k`` are
+        given by the slice
+        ``trial_evt_offsets[k]:trial_evt_offsets[k+1]``. The index of the trial
+        of each event is stored in the data field with the name given by the
+        ``trial_idx_field_name`` class attribute.
+
+        .. note::
+
+            This requires that the event selection method and the data field
+            functions treat each event independently of the other events.
+
+        Parameters
+        ----------
+        shg_mgr : instance of SourceHypoGroupManager
+            The instance of SourceHypoGroupManager that defines the source
+            hypothesis groups.
+        pmm : instance of ParameterModelMapper
+            The instance of ParameterModelMapper, that defines the global
+            parameters and their mapping to local source parameters.
+        events_list : list of instance of DataFieldRecordArray
+            The list of DataFieldRecordArray instances holding the entire raw
+            events of each trial. All instances must contain the same data
+            fields.
+        n_events_list : list of int | None
+            The total number of events of the data set of each trial.
+            If None, the number of events of each trial is taken from the
+            number of events present in the trial's events array.
+        evt_sel_method : instance of EventSelectionMethod | None
+            The optional event selection method that should be used to select
+            potential signal events.
+        tl : instance of TimeLord | None
+            The optional TimeLord instance that should be used for timing
+            measurements.
+        """
+        if not issequenceof(events_list, DataFieldRecordArray):
+            raise TypeError(
+                'The events_list argument must be a sequence of '
+                'DataFieldRecordArray instances!')
+        n_trials = len(events_list)
+        if n_trials == 0:
+            raise ValueError(
+                'The events_list argument must contain at least one trial!')
+
+        if n_events_list is None:
+            n_events_list = [len(events) for events in events_list]
+        if len(n_events_list) != n_trials:
+            raise ValueError(
+                f'The length of n_events_list ({len(n_events_list)}) must '
+                f'match the number of trials ({n_trials})!')
+
+        data = dict([
+            (fname, np.concatenate([events[fname] for events in events_list]))
+            for fname in events_list[0].field_name_list
+        ])
+        data[self.trial_idx_field_name] = np.repeat(
+            np.arange(n_trials),
+            [len(events) for events in events_list])
+        events = DataFieldRecordArray(data, copy=False)
+
+        self._n_events_per_trial = np.array(n_events_list, dtype=np.int64)
+        self._trial_evt_offsets = None
+
+        self._initialize_events(
+            shg_mgr=shg_mgr,
+            pmm=pmm,
+            events=events,
+            n_events=np.sum(self._n_events_per_trial),
+            evt_sel_method=evt_sel_method,
+            tl=tl)
+
+    def _group_events_by_trial(self):
+        """Sorts the events by their trial index, keeping the order of the
+        events within each trial, and calculates the offsets of the selected
+        events of each trial.
+        """
+        trial_idxs = self._events[self.trial_idx_field_name]
+
+        if np.any(np.diff(trial_idxs) < 0):
+            sorted_idxs = np.argsort(trial_idxs, kind='stable')
+            self.events = self._events.get_selection(sorted_idxs)
+            trial_idxs = self._events[self.trial_idx_field_name]
+            self._remap_src_evt_pairs(sorted_idxs)
+
+        self._trial_evt_offsets = np.zeros(
+            (len(self._n_events_per_trial)+1,), dtype=np.int64)
+        np.cumsum(
+            np.bincount(trial_idxs, minlength=len(self._n_events_per_trial)),
+            out=self._trial_evt_offsets[1:])
+
+    def _remap_src_evt_pairs(self, sorted_idxs):
+        """Re-assigns the event indices of the source-event pairs after the
+        events have been reordered according to the given sorting indices.
+
+        Parameters
+        ----------
+        sorted_idxs : instance of numpy ndarray
+            The (N_selected_events,)-shaped numpy ndarray holding the old event
+            index of each new event position.
+        """
+        if self._src_evt_pairs is None:
+            return
+
+        new_evt_idxs = np.empty_like(sorted_idxs)
+        new_evt_idxs[sorted_idxs] = np.arange(len(sorted_idxs))
+        self._src_evt_pairs.remap_events(new_evt_idxs)
+
+    def _initialize_events(
+            self,
+            shg_mgr,
+            pmm,
+            events,
+            n_events,
+            evt_sel_method,
+            tl):
+        """Sets the events, calculates pre-event-selection data fields,
+        performs a possible event selection and calculates the static data
+        fields for the left-over events. See the documentation of the
+        :meth:`initialize_trial` method for the description of the arguments.
+        """
         # Set the events property, so that the calculation functions of the data
         # fields can access them.
         self.events = events
-        self._src_evt_idxs = None
+        self._src_evt_pairs = None
 
         # Save the number of sources.
         self._n_sources = shg_mgr.n_sources
@@ -803,7 +1306,11 @@ class TrialDataManager(object):
                 f'Selected {len(selected_events)} out of {len(self._events)} '
                 'events.')
             self.events = selected_events
-            self._src_evt_idxs = src_evt_idxs
+            self._src_evt_pairs = SourceEventPairs.from_src_evt_idxs(
+                src_idxs=src_evt_idxs[0],
+                evt_idxs=src_evt_idxs[1],
+                n_sources=self._n_sources,
+                n_events=len(selected_events))
 
         # Sort the events by the index field, if a field was provided.
         if self._index_field_name is not None:
@@ -812,18 +1319,19 @@ class TrialDataManager(object):
             sorted_idxs = self._events.sort_by_field(self._index_field_name)
             # If event indices are stored, we need to re-assign also those event
             # indices according to the new order.
-            if self._src_evt_idxs is not None:
-                self._src_evt_idxs[1] = np.take(
-                    sorted_idxs, self._src_evt_idxs[1])
+            self._remap_src_evt_pairs(sorted_idxs)
+
+        # Group the events by trial, if a batch of trials is initialized.
+        if self._n_events_per_trial is not None:
+            self._group_events_by_trial()
 
-        # Create the src_evt_idxs property data in case it was not provided by
-        # the event selection. In that case all events are selected for all
+        # Create the source-event pairs in case they were not provided by the
+        # event selection. In that case all events are selected for all
         # sources. This simplifies the implementations of the PDFs.
-        if self._src_evt_idxs is None:
-            self._src_evt_idxs = (
-                np.repeat(np.arange(self.n_sources), self.n_selected_events),
-                np.tile(np.arange(self.n_selected_events), self.n_sources)
-            )
+        if self._src_evt_pairs is None:
+            self._src_evt_pairs = SourceEventPairs.from_all_pairs(
+                n_sources=self.n_sources,
+                n_events=self.n_selected_events)
 
         # Now calculate all the static data fields. This will increment the
         # trial data state ID.
@@ -841,7 +1349,7 @@ class TrialDataManager(object):
         n : int
             The length of the expected values array after a PDF evaluation.
         """
-        return len(self._src_evt_idxs[0])
+        return self._src_evt_pairs.n_values
 
     def get_values_mask_for_source_mask(self, src_mask):
         """Creates a boolean mask for the values array where entries belonging
@@ -859,18 +1367,7 @@ class TrialDataManager(object):
             The (N_values,)-shaped numpy ndarray holding the boolean selection
             of the values.
         """
-        tdm_src_idxs = self.src_evt_idxs[0]
-        src_idxs = np.arange(self.n_sources)[src_mask]
-
-        values_mask = np.zeros((self.get_n_values(),), dtype=np.bool_)
-
-        def make_values_mask(src_idx):
-            global values_mask
-            values_mask |= tdm_src_idxs == src_idx
-
-        np.vectorize(make_values_mask)(src_idxs)
-
-        return values_mask
+        return self._src_evt_pairs.get_values_mask_for_source_mask(src_mask)
 
     def add_source_data_field(
             self,
@@ -3,6 +3,7 @@
 import itertools
 import logging
 import numpy as np
+import pickle
 from numpy.lib import (
     recfunctions as np_rfn,
 )
@@ -24,6 +25,9 @@ except Exception:
 else:
     IMINUIT_LOADED = True
 
+from skyllh.core.multiproc import (
+    get_ncpu,
+)
 from skyllh.core.progressbar import (
     ProgressBar,
 )
@@ -45,6 +49,10 @@ from skyllh.core.storage import (
 from skyllh.core.utils.spline import (
     make_spline_1d,
 )
+from skyllh.core.utils.trials import (
+    AppendableNPYFile,
+    load_trial_data_file,
+)
 
 
 """This module contains common utility functions useful for an analysis.
@@ -1236,11 +1244,26 @@ def create_trial_data_file(  # noqa: C901
         pathfilename=None,
         ncpu=None,
         ppbar=None,
-        tl=None):
+        tl=None,
+        pool=None,
+        chunksize=None,
+        append=False,
+        resume=True):
     """Creates and fills a trial data file with `n_trials` generated trials for
     each mean number of injected signal events specified by `mean_n_sig` for a
     given analysis.
 
+    If a trial data file is specified via the ``pathfilename`` argument, the
+    trials of each combination of ``mean_n_sig`` and ``mean_n_sig_null`` are
+    appended to the file as soon as they have been generated. Next to the
+    trial data file a state file with the extension ``.state`` is written,
+    which holds the state of the random number generators after the last
+    completed combination. If the trial generation gets interrupted, a
+    subsequent call of this function with the same arguments resumes the
+    generation after the last completed combination and produces the same
+    trials as an uninterrupted call. The state file is removed after all trials
+    have been generated.
+
     Parameters
     ----------
     ana : instance of Analysis
@@ -1289,6 +1312,8 @@ def create_trial_data_file(  # noqa: C901
     pathfilename : string | None
         Trial data file path including the filename.
         If set to None generated trials won't be saved.
+        If the filename does not end with ``.npy``, this extension is
+        appended.
     ncpu : int | None
         The number of CPUs to use.
     ppbar : instance of ProgressBar | None
@@ -1296,6 +1321,27 @@ def create_trial_data_file(  # noqa: C901
     tl: instance of TimeLord | None
         The instance of TimeLord that should be used to measure individual
         tasks.
+    pool : instance of WorkerPool | None
+        The optional instance of WorkerPool created via the
+        ``create_trial_worker_pool`` method of the analysis, which should be
+        used to generate the trials. If set to None and more than one CPU
+        should be used, a worker pool is created for the duration of this
+        function call, so the worker processes are spawned only once for all
+        the mean numbers of signal events.
+    chunksize : int | None
+        If set to an integer, the trials are distributed dynamically in chunks
+        of ``chunksize`` trials to the processes. See the ``do_trials`` method
+        of the analysis for details.
+    append : bool
+        If set to ``True`` and the trial data file exists already, the
+        generated trials are appended to the existing trials in the file.
+        Otherwise the trial data file is overwritten.
+    resume : bool
+        If set to ``True``, an interrupted trial generation for the same
+        trial data file and the same arguments is resumed. Otherwise the trial
+        generation starts from scratch, and the trials of the interrupted
+        trial generation are removed from the file before new trials are
+        appended.
 
     Returns
     -------
@@ -1308,7 +1354,9 @@ def create_trial_data_file(  # noqa: C901
         The array holding the fixed mean number of signal events for the
         null-hypothesis used to generate the trials.
     trial_data : structured numpy ndarray
-        The generated trial data.
+        The generated trial data. If the trials have been written to a trial
+        data file, this is a memory-mapped view of the trials of this function
+        call within the file.
     """
     n_trials = int_cast(
         n_trials,
@@ -1361,51 +1409,210 @@ def create_trial_data_file(  # noqa: C901
             mean_n_sig_null_min, mean_n_sig_null_max+1, mean_n_sig_null_step,
             dtype=np.float64)
 
-    pbar = ProgressBar(
-        len(mean_n_sig)*len(mean_n_sig_null), parent=ppbar).start()
-    trial_data = None
-    for (mean_n_sig_, mean_n_sig_null_) in itertools.product(
-            mean_n_sig, mean_n_sig_null):
-
-        trials = ana.do_trials(
-            rss=rss,
-            n=n_trials,
+    writer = None
+    state = None
+    n_finished_combinations = 0
+    if pathfilename is not None:
+        if not pathfilename.endswith('.npy'):
+            pathfilename += '.npy'
+        state_pathfilename = pathfilename + '.state'
+
+        config = dict(
+            seed=rss.seed,
+            n_trials=n_trials,
+            mean_n_sig=mean_n_sig,
+            mean_n_sig_null=mean_n_sig_null,
             mean_n_bkg_list=mean_n_bkg_list,
-            mean_n_sig=mean_n_sig_,
-            mean_n_sig_0=mean_n_sig_null_,
-            minimizer_rss=minimizer_rss,
             bkg_kwargs=bkg_kwargs,
             sig_kwargs=sig_kwargs,
-            ncpu=ncpu,
-            tl=tl,
-            ppbar=pbar)
-
-        if trial_data is None:
-            trial_data = trials
+            chunksize=chunksize)
+
+        if (os.path.exists(pathfilename) and
+                os.path.exists(state_pathfilename)):
+            state = _read_trial_data_state_file(state_pathfilename)
+            if (not resume) or\
+               (not _is_equal_trial_data_config(state['config'], config)):
+                # The interrupted trial generation is not resumed. Hence, its
+                # incomplete trials must not remain in the file, when new
+                # trials are appended.
+                if append:
+                    logging.getLogger(__name__).info(
+                        'Removing the trials of the interrupted trial '
+                        f'generation from file "{pathfilename}".')
+                    with AppendableNPYFile(pathfilename, append=True) as f:
+                        f.truncate(min(state['n_records_start'], f.n_records))
+                state = None
+
+        if state is not None:
+            logging.getLogger(__name__).info(
+                f'Resuming trial generation for file "{pathfilename}" after '
+                f'{state["n_finished_combinations"]} completed combinations.')
+            writer = AppendableNPYFile(pathfilename, append=True)
+            writer.truncate(state['n_records'])
+            rss.random.set_state(state['rss_state'])
+            if minimizer_rss is not None:
+                minimizer_rss.random.set_state(state['minimizer_rss_state'])
+            n_finished_combinations = state['n_finished_combinations']
         else:
-            trial_data = np_rfn.stack_arrays(
-                [trial_data, trials],
-                usemask=False,
-                asrecarray=True)
+            writer = AppendableNPYFile(pathfilename, append=append)
+            state = dict(
+                config=config,
+                n_records_start=writer.n_records)
+
+    own_pool = None
+    if (pool is None) and (get_ncpu(ana.cfg, ncpu) > 1):
+        own_pool = ana.create_trial_worker_pool(ncpu=ncpu)
+        pool = own_pool
 
-        pbar.increment()
+    pbar = ProgressBar(
+        len(mean_n_sig)*len(mean_n_sig_null), parent=ppbar).start()
+    trials_list = []
+    try:
+        for (idx, (mean_n_sig_, mean_n_sig_null_)) in enumerate(
+                itertools.product(mean_n_sig, mean_n_sig_null)):
+
+            if idx < n_finished_combinations:
+                pbar.increment()
+                continue
+
+            trials = ana.do_trials(
+                rss=rss,
+                n=n_trials,
+                mean_n_bkg_list=mean_n_bkg_list,
+                mean_n_sig=mean_n_sig_,
+                mean_n_sig_0=mean_n_sig_null_,
+                minimizer_rss=minimizer_rss,
+                bkg_kwargs=bkg_kwargs,
+                sig_kwargs=sig_kwargs,
+                ncpu=ncpu,
+                tl=tl,
+                ppbar=pbar,
+                pool=pool,
+                chunksize=chunksize)
+
+            if writer is None:
+                trials_list.append(trials)
+            else:
+                writer.append(trials)
+                state.update(
+                    n_records=writer.n_records,
+                    n_finished_combinations=idx+1,
+                    rss_state=rss.random.get_state(),
+                    minimizer_rss_state=(
+                        None if minimizer_rss is None else
+                        minimizer_rss.random.get_state()))
+                _write_trial_data_state_file(state_pathfilename, state)
+
+            pbar.increment()
+    finally:
+        if own_pool is not None:
+            own_pool.close()
+        if writer is not None:
+            writer.close()
     pbar.finish()
 
-    if trial_data is None:
+    if writer is None:
+        if len(trials_list) == 0:
+            raise RuntimeError(
+                'No trials have been generated! Check your generation '
+                'boundaries!')
+
+        trial_data = np_rfn.stack_arrays(
+            trials_list,
+            usemask=False,
+            asrecarray=True)
+
+        return (rss.seed, mean_n_sig, mean_n_sig_null, trial_data)
+
+    os.remove(state_pathfilename)
+
+    if writer.n_records == state['n_records_start']:
         raise RuntimeError(
             'No trials have been generated! Check your generation boundaries!')
 
-    if pathfilename is not None:
-        dirname = os.path.dirname(pathfilename)
-        if dirname:
-            # Create the directory if dirname is not empty.
-            makedirs(dirname, exist_ok=True)
-        # Save the trial data to file.
-        np.save(pathfilename, trial_data)
+    trial_data = load_trial_data_file(pathfilename)[state['n_records_start']:]
 
     return (rss.seed, mean_n_sig, mean_n_sig_null, trial_data)
 
 
+def _read_trial_data_state_file(
+        pathfilename):
+    """Reads the state of an interrupted trial generation of the
+    :func:`create_trial_data_file` function.
+    """
+    with open(pathfilename, 'rb') as fp:
+        state = pickle.load(fp)
+    return state
+
+
+def _write_trial_data_state_file(
+        pathfilename,
+        state):
+    """Writes the state of the trial generation of the
+    :func:`create_trial_data_file` function atomically to the given file.
+    """
+    tmp_pathfilename = pathfilename + '.tmp'
+    with open(tmp_pathfilename, 'wb') as fp:
+        pickle.dump(state, fp)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_pathfilename, pathfilename)
+
+
+def _is_equal_trial_data_config(
+        config1,
+        config2):
+    """Checks if the two given trial generation configurations of the
+    :func:`create_trial_data_file` function are equal. Values of type dict,
+    e.g. the keyword arguments for the event generation, are compared
+    recursively.
+    """
+    if isinstance(config1, dict) or isinstance(config2, dict):
+        if not (isinstance(config1, dict) and isinstance(config2, dict)):
+            return False
+        if set(config1.keys()) != set(config2.keys()):
+            return False
+        return all(
+            _is_equal_trial_data_config(v, config2[k])
+            for (k, v) in config1.items()
+        )
+    return np.array_equal(config1, config2)
+
+
+def _is_trial_data_file_extension_of(
+        pathfilename,
+        trial_data):
+    """Checks if the given trial data file holds the given trial data, i.e.
+    if the trial data file can be extended by new trials of the
+    :func:`extend_trial_data_file` function.
+
+    The trial data file holds the given trial data, if its first records are
+    the given trial data and if it holds no further records. Further records
+    are accepted only if the state file of an interrupted trial generation
+    of the :func:`create_trial_data_file` function exists, which started at
+    the end of the given trial data. In that case the interrupted trial
+    generation is resumed.
+    """
+    file_trial_data = load_trial_data_file(pathfilename)
+    n_records = len(trial_data)
+    if ((file_trial_data.dtype != trial_data.dtype) or
+            (len(file_trial_data) < n_records)):
+        return False
+
+    if len(file_trial_data) > n_records:
+        state_pathfilename = pathfilename + '.state'
+        if not os.path.exists(state_pathfilename):
+            return False
+        state = _read_trial_data_state_file(state_pathfilename)
+        if state['n_records_start'] != n_records:
+            return False
+
+    return (
+        np.asarray(file_trial_data[:n_records]).tobytes() ==
+        np.asarray(trial_data).tobytes()
+    )
+
+
 def extend_trial_data_file(
         ana,
         rss,
@@ -1461,6 +1668,10 @@ def extend_trial_data_file(
         `poisson`.
     pathfilename : string | None
         Trial data file path including the filename.
+        If the file holds the given trial data already, the new trials are
+        appended to the file. An interrupted extension of the given trial
+        data is resumed, if its state file exists. Otherwise the file is
+        (re-)written.
 
     Additional keyword arguments
     ----------------------------
@@ -1482,6 +1693,26 @@ def extend_trial_data_file(
             if i != e)
         rss.reseed(seed)
 
+    # Append the new trials directly to the trial data file, if it holds the
+    # given trial data. Otherwise the file is rewritten and a possible state
+    # file of an interrupted trial generation for the previous file content is
+    # removed.
+    if pathfilename is not None:
+        if not pathfilename.endswith('.npy'):
+            pathfilename += '.npy'
+        if os.path.exists(pathfilename):
+            if not _is_trial_data_file_extension_of(pathfilename, trial_data):
+                state_pathfilename = pathfilename + '.state'
+                if os.path.exists(state_pathfilename):
+                    os.remove(state_pathfilename)
+                np.save(pathfilename, trial_data)
+        else:
+            dirname = os.path.dirname(pathfilename)
+            if dirname:
+                # Create the directory if dirname is not empty.
+                makedirs(dirname, exist_ok=True)
+            np.save(pathfilename, trial_data)
+
     (seed, mean_n_sig, mean_n_sig_null, trials) = create_trial_data_file(
         ana=ana,
         rss=rss,
@@ -1491,6 +1722,8 @@ def extend_trial_data_file(
         mean_n_bkg_list=mean_n_bkg_list,
         bkg_kwargs=bkg_kwargs,
         sig_kwargs=sig_kwargs,
+        pathfilename=pathfilename,
+        append=True,
         **kwargs
     )
     trial_data = np_rfn.stack_arrays(
@@ -1498,14 +1731,6 @@ def extend_trial_data_file(
         usemask=False,
         asrecarray=True)
 
-    if pathfilename is not None:
-        dirname = os.path.dirname(pathfilename)
-        if dirname:
-            # Create the directory if dirname is not empty.
-            makedirs(dirname, exist_ok=True)
-        # Save the trial data to file.
-        np.save(pathfilename, trial_data)
-
     return trial_data
 
 
@@ -3,13 +3,305 @@
 """This module contains utility functions related analysis trials.
 """
 
+import numpy as np
+import os
 import pickle
 
+from skyllh.core.py import (
+    classname,
+)
 from skyllh.core.timing import (
     TaskTimer,
 )
 
 
+class AppendableNPYFile(
+        object,
+):
+    """The AppendableNPYFile class provides a writer for a one-dimensional
+    structured numpy array stored in a .npy file, which can be extended by
+    appending new records to the end of the file without rewriting the
+    existing records. After each append operation the file is a valid .npy
+    file, which can be read memory-mapped via
+    ``numpy.load(pathfilename, mmap_mode='r')``.
+
+    The shape stored in the .npy header is updated only after the new records
+    have been written to disk. Hence, if a process dies during an append
+    operation, the file contains all the records of the previously completed
+    append operations. Possible trailing incomplete records are removed when
+    the file is opened again for appending.
+    """
+
+    # The number of digits reserved in the .npy header for the length of the
+    # array. This allows to extend the array without changing the header
+    # length.
+    _SHAPE_MAX_DIGITS = 21
+
+    # The alignment of the array data within the file.
+    _ARRAY_ALIGN = 64
+
+    def __init__(
+            self,
+            pathfilename,
+            append=False,
+            **kwargs,
+    ):
+        """Creates a new AppendableNPYFile instance.
+
+        Parameters
+        ----------
+        pathfilename : str
+            The path and filename of the .npy file.
+        append : bool
+            If set to ``True`` and the file exists already, new records will be
+            appended to the existing records of the file. Otherwise the file
+            will be (re-)created when the first records are appended.
+        """
+        super().__init__(**kwargs)
+
+        self._pathfilename = pathfilename
+        self._fp = None
+        self._dtype = None
+        self._header_size = None
+        self._n_records = 0
+
+        if append and os.path.exists(pathfilename):
+            self._open_existing_file()
+
+    @property
+    def pathfilename(self):
+        """(read-only) The path and filename of the .npy file.
+        """
+        return self._pathfilename
+
+    @property
+    def dtype(self):
+        """(read-only) The numpy dtype of the records. This is None, if no
+        records have been written yet.
+        """
+        return self._dtype
+
+    @property
+    def n_records(self):
+        """(read-only) The number of records stored in the file.
+        """
+        return self._n_records
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _make_header_bytes(
+            self,
+            n_records,
+    ):
+        """Creates the .npy header for the given number of records. If the
+        header size has been determined already, the header is padded to that
+        size.
+        """
+        header = repr({
+            'descr': np.lib.format.dtype_to_descr(self._dtype),
+            'fortran_order': False,
+            'shape': (n_records,),
+        })
+
+        if self._header_size is None:
+            # Determine the header size including space for the growth of the
+            # shape and the terminating newline character.
+            n = len(header) + self._SHAPE_MAX_DIGITS + 1
+            major = 1 if n + 10 <= 65535 else 2
+            prefix_size = 10 if major == 1 else 12
+            self._header_size = (
+                (prefix_size + n + self._ARRAY_ALIGN - 1) //
+                self._ARRAY_ALIGN * self._ARRAY_ALIGN)
+
+        major = 1 if self._header_size <= 65535 else 2
+        prefix_size = 10 if major == 1 else 12
+        n = self._header_size - prefix_size
+        if len(header) + 1 > n:
+            raise ValueError(
+                f'The .npy header of file "{self._pathfilename}" is too small '
+                f'to store {n_records} records!')
+        header = header + ' '*(n - len(header) - 1) + '\n'
+
+        header_bytes = np.lib.format.magic(major, 0)
+        if major == 1:
+            header_bytes += np.uint16(n).tobytes()
+        else:
+            header_bytes += np.uint32(n).tobytes()
+        header_bytes += header.encode('latin1')
+
+        return header_bytes
+
+    def _open_existing_file(self):
+        """Opens the existing .npy file for appending records.
+        """
+        fp = open(self._pathfilename, 'rb+')
+        try:
+            version = np.lib.format.read_magic(fp)
+            if version == (1, 0):
+                header = np.lib.format.read_array_header_1_0(fp)
+            elif version == (2, 0):
+                header = np.lib.format.read_array_header_2_0(fp)
+            else:
+                raise ValueError(
+                    f'The .npy format version {version} of file '
+                    f'"{self._pathfilename}" is not supported!')
+            (shape, fortran_order, dtype) = header
+            header_size = fp.tell()
+        except Exception:
+            fp.close()
+            raise
+
+        if len(shape) != 1 or fortran_order:
+            fp.close()
+            raise ValueError(
+                f'The file "{self._pathfilename}" must contain a '
+                'one-dimensional array in C order!')
+
+        self._fp = fp
+        self._dtype = dtype
+        self._header_size = header_size
+        self._n_records = shape[0]
+
+        # Make sure the header can grow. Otherwise rewrite the file with a
+        # larger header.
+        try:
+            self._make_header_bytes(10**(self._SHAPE_MAX_DIGITS-1))
+        except ValueError:
+            self._rewrite_with_new_header()
+
+        # Remove possible incomplete records from a previously failed append
+        # operation.
+        self.truncate(self._n_records)
+
+    def _rewrite_with_new_header(self):
+        """Rewrites the file with a header of the default size.
+        """
+        self._fp.seek(self._header_size)
+        arr = np.frombuffer(
+            self._fp.read(self._n_records * self._dtype.itemsize),
+            dtype=self._dtype)
+        self._fp.close()
+
+        self._header_size = None
+        tmp_pathfilename = self._pathfilename + '.tmp'
+        with open(tmp_pathfilename, 'wb') as fp:
+            fp.write(self._make_header_bytes(self._n_records))
+            fp.write(arr.tobytes())
+        os.replace(tmp_pathfilename, self._pathfilename)
+
+        self._fp = open(self._pathfilename, 'rb+')
+
+    def _write_header(self):
+        """Writes the header of the file with the current number of records.
+        """
+        self._fp.seek(0)
+        self._fp.write(self._make_header_bytes(self._n_records))
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+    def append(
+            self,
+            arr,
+    ):
+        """Appends the given records to the file.
+
+        Parameters
+        ----------
+        arr : instance of numpy.ndarray
+            The one-dimensional structured numpy ndarray holding the records.
+            Its dtype must match the dtype of the already existing records.
+        """
+        if not isinstance(arr, np.ndarray):
+            raise TypeError(
+                'The arr argument must be an instance of numpy.ndarray! '
+                f'Its current type is {classname(arr)}!')
+        if arr.ndim != 1:
+            raise ValueError(
+                'The arr argument must be a one-dimensional array!')
+
+        if self._fp is None:
+            dirname = os.path.dirname(self._pathfilename)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            self._dtype = np.dtype(arr.dtype.descr)
+            self._header_size = None
+            self._n_records = 0
+            self._fp = open(self._pathfilename, 'wb+')
+            self._write_header()
+
+        if arr.dtype != self._dtype:
+            raise ValueError(
+                f'The dtype {arr.dtype} of the records does not match the '
+                f'dtype {self._dtype} of the file "{self._pathfilename}"!')
+
+        self._fp.seek(self._header_size + self._n_records*self._dtype.itemsize)
+        self._fp.write(np.ascontiguousarray(arr).tobytes())
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+
+        self._n_records += len(arr)
+        self._write_header()
+
+    def truncate(
+            self,
+            n_records,
+    ):
+        """Truncates the file to the given number of records.
+
+        Parameters
+        ----------
+        n_records : int
+            The number of records to keep.
+        """
+        if n_records > self._n_records:
+            raise ValueError(
+                f'Cannot truncate the file "{self._pathfilename}" holding '
+                f'{self._n_records} records to {n_records} records!')
+        if self._fp is None:
+            return
+
+        self._n_records = n_records
+        self._write_header()
+        self._fp.truncate(self._header_size + n_records*self._dtype.itemsize)
+
+    def close(self):
+        """Closes the file.
+        """
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+
+def load_trial_data_file(
+        pathfilename,
+        mmap_mode='r',
+):
+    """Loads the trial data from the given .npy file. By default the file is
+    memory-mapped, hence the trial data is not read into memory at once.
+
+    Parameters
+    ----------
+    pathfilename : str
+        The path and filename of the trial data file.
+    mmap_mode : str | None
+        The mode for memory-mapping the file. See the documentation of the
+        ``numpy.load`` function for possible values. If set to None, the trial
+        data is read into memory.
+
+    Returns
+    -------
+    trial_data : instance of numpy.recarray
+        The numpy record ndarray holding the trial data.
+    """
+    trial_data = np.load(pathfilename, mmap_mode=mmap_mode)
+
+    return trial_data.view(np.recarray)
+
+
 def create_pseudo_data_file(
         ana,
         rss,
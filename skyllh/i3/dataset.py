@@ -20,7 +20,6 @@ from skyllh.core.py import (
 )
 from skyllh.core.storage import (
     DataFieldRecordArray,
-    create_FileLoader,
 )
 from skyllh.core.timing import (
     TaskTimer,
@@ -190,6 +189,67 @@ class I3Dataset(
 
         return file_list
 
+    def get_data_cache_pathfilenames(self):
+        """Returns the list of the fully qualified file names of all data
+        files, whose content defines the prepared data of this dataset. This
+        includes the good-run-list files.
+
+        Returns
+        -------
+        pathfilenames : list of str
+            The list of fully qualified file names.
+        """
+        pathfilenames = (
+            super().get_data_cache_pathfilenames() +
+            self.grl_abs_pathfilename_list
+        )
+
+        return pathfilenames
+
+    def get_data_cache_arrays(self, data):
+        """Returns the data arrays of the given prepared data, which need to be
+        stored in the data cache. In addition to the experimental and
+        monte-carlo data, this includes the good-run-list data.
+
+        Parameters
+        ----------
+        data : instance of I3DatasetData
+            The instance of I3DatasetData holding the prepared data.
+
+        Returns
+        -------
+        arrays : dict of str -> instance of DataFieldRecordArray | None
+            The dictionary holding the data arrays by their name.
+        """
+        arrays = super().get_data_cache_arrays(data)
+        arrays['grl'] = data.grl
+
+        return arrays
+
+    def create_data_from_cache_arrays(self, arrays, livetime):
+        """Creates the I3DatasetData instance from the data arrays loaded from
+        the data cache.
+
+        Parameters
+        ----------
+        arrays : dict of str -> instance of DataFieldRecordArray | None
+            The dictionary holding the data arrays by their name.
+        livetime : float | None
+            The livetime of the data.
+
+        Returns
+        -------
+        data : instance of I3DatasetData
+            The instance of I3DatasetData holding the prepared data.
+        """
+        data = I3DatasetData(
+            data=super().create_data_from_cache_arrays(
+                arrays=arrays,
+                livetime=livetime),
+            data_grl=arrays['grl'])
+
+        return data
+
     def load_grl(
             self,
             efficiency_mode=None,
@@ -223,6 +283,10 @@ class I3Dataset(
                     The data will be loaded in a time efficient way. This will
                     require more memory, because each data file gets loaded in
                     memory at once.
+                - 'mmap'
+                    The data will be memory mapped in copy-on-write mode. This
+                    allows several processes to share the memory of the same
+                    data files. Only modified memory pages get copied.
 
             The default value is ``'time'``. If set to ``None``, the default
             value will be used.
@@ -236,7 +300,7 @@ class I3Dataset(
             information of the dataset.
         """
         with TaskTimer(tl, 'Loading grl data from disk.'):
-            fileloader_grl = create_FileLoader(
+            fileloader_grl = self.create_file_loader(
                 self.grl_abs_pathfilename_list)
             grl_data = fileloader_grl.load_data(
                 efficiency_mode=efficiency_mode)
@@ -255,6 +319,8 @@ class I3Dataset(
             dtc_except_fields=None,
             efficiency_mode=None,
             tl=None,
+            ncpu=None,
+            max_memory=None,
     ):
         """Loads the data, which is described by the dataset. If a good-run-list
         (GRL) is provided for this dataset, only experimental data will be
@@ -290,12 +356,23 @@ class I3Dataset(
                     The data will be loaded in a time efficient way. This will
                     require more memory, because each data file gets loaded in
                     memory at once.
+                - 'mmap'
+                    The data will be memory mapped in copy-on-write mode. This
+                    allows several processes to share the memory of the same
+                    data files. Only modified memory pages get copied.
 
             The default value is ``'time'``. If set to ``None``, the default
             value will be used.
         tl : TimeLord instance | None
             The TimeLord instance that should be used to time the data load
             operation.
+        ncpu : int | None
+            The number of processes to use for loading several data files in
+            parallel. If set to ``None``, the global setting will be used.
+        max_memory : int | None
+            The maximum memory in bytes of the data files that are loaded
+            concurrently, estimated by their size on disk. If set to ``None``,
+            the memory is not limited.
 
         Returns
         -------
@@ -311,7 +388,9 @@ class I3Dataset(
             dtc_dict=dtc_dict,
             dtc_except_fields=dtc_except_fields,
             efficiency_mode=efficiency_mode,
-            tl=tl)
+            tl=tl,
+            ncpu=ncpu,
+            max_memory=max_memory)
 
         # Load the good-run-list (GRL) data if it is provided for this dataset,
         # and calculate the livetime based on the GRL.
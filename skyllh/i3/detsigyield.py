@@ -13,6 +13,11 @@ import scipy.interpolate
 from skyllh.core import (
     multiproc,
 )
+from skyllh.core.cache import (
+    create_DiskCache_from_config,
+    get_model_fingerprint,
+    make_cache_key,
+)
 from skyllh.core.py import (
     classname,
     issequenceof,
@@ -1078,39 +1083,61 @@ class SingleParamFluxPointLikeSourceI3DetSigYieldBuilder(
         param_grid = self._param_grid.copy()
         param_grid.add_extra_lower_and_upper_bin()
 
-        # Construct the arguments for the hist function to be used in the
-        # multiproc.parallelize function.
-        args_list = [
-            (
+        def _create_log_spl():
+            """Creates the 2D spline of the logarithmic detector signal yield
+            in sin(dec) and the parameter.
+            """
+            # Construct the arguments for the hist function to be used in the
+            # multiproc.parallelize function.
+            args_list = [
                 (
-                    data_sin_true_dec,
-                    data_true_energy,
-                    sin_dec_binning,
-                    weights,
-                    shg.fluxmodel.copy({param_grid.name: param_val}),
-                    to_internal_flux_unit_factor,
-                ),
-                {}
-            )
-            for param_val in param_grid.grid
-        ]
-        h = np.vstack(
-            multiproc.parallelize(
-                _create_hist, args_list, self.ncpu, ppbar=ppbar)).T
-
-        # Normalize by solid angle of each bin along the sin(dec) axis.
-        # The solid angle is given by 2*\pi*(\Delta sin(\delta)).
-        h /= (2.*np.pi * np.diff(sin_dec_binning.binedges)).reshape(
-            (sin_dec_binning.nbins, 1))
-
-        # Create the 2D spline.
-        log_spl_sinDec_param = scipy.interpolate.RectBivariateSpline(
-            sin_dec_binning.bincenters,
-            param_grid.grid,
-            np.log(h),
-            kx=self.spline_order_sinDec,
-            ky=self.spline_order_param,
-            s=0)
+                    (
+                        data_sin_true_dec,
+                        data_true_energy,
+                        sin_dec_binning,
+                        weights,
+                        shg.fluxmodel.copy({param_grid.name: param_val}),
+                        to_internal_flux_unit_factor,
+                    ),
+                    {}
+                )
+                for param_val in param_grid.grid
+            ]
+            h = np.vstack(
+                multiproc.parallelize(
+                    _create_hist, args_list, self.ncpu, ppbar=ppbar)).T
+
+            # Normalize by solid angle of each bin along the sin(dec) axis.
+            # The solid angle is given by 2*\pi*(\Delta sin(\delta)).
+            h /= (2.*np.pi * np.diff(sin_dec_binning.binedges)).reshape(
+                (sin_dec_binning.nbins, 1))
+
+            # Create the 2D spline.
+            return scipy.interpolate.RectBivariateSpline(
+                sin_dec_binning.bincenters,
+                param_grid.grid,
+                np.log(h),
+                kx=self.spline_order_sinDec,
+                ky=self.spline_order_param,
+                s=0)
+
+        cache = create_DiskCache_from_config(self._cfg, 'detsigyields')
+        if cache is None:
+            log_spl_sinDec_param = _create_log_spl()
+        else:
+            key = make_cache_key(
+                classname(self),
+                data_sin_true_dec,
+                data_true_energy,
+                weights,
+                sin_dec_binning.binedges,
+                get_model_fingerprint(shg.fluxmodel),
+                to_internal_flux_unit_factor,
+                param_grid.name,
+                param_grid.grid,
+                self.spline_order_sinDec,
+                self.spline_order_param)
+            log_spl_sinDec_param = cache.get_object(key, _create_log_spl)
 
         detsigyield = SingleParamFluxPointLikeSourceI3DetSigYield(
             param_name=self._param_grid.name,
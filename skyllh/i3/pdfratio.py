@@ -8,6 +8,9 @@ from numpy.lib.recfunctions import (
     repack_fields,
 )
 
+from skyllh.core.interpolate import (
+    group_values_by_grid_point,
+)
 from skyllh.core.multiproc import (
     IsParallelizable,
     parallelize,
@@ -263,22 +266,20 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
 
         return True
 
-    def _get_spline_for_param_values(self, interpol_param_values):
-        """Retrieves the spline for a given set of parameter values.
+    def _get_spline_for_gridparams(self, gridparams):
+        """Retrieves the spline for a given set of grid parameter values.
 
         Parameters
         ----------
-        interpol_param_values : instance of numpy ndarray
-            The (N_interpol_params,)-shaped numpy ndarray holding the values of
-            the interpolation parameters.
+        gridparams : dict
+            The dictionary holding the interpolation parameter names and their
+            values on the grid.
 
         Returns
         -------
         spline : instance of scipy.interpolate.RegularGridInterpolator
             The requested spline instance.
         """
-        gridparams = dict(
-            zip(self._interpol_param_names, interpol_param_values))
         gridparams_hash = make_dict_hash(gridparams)
 
         spline = self._gridparams_hash_log_ratio_spline_dict[gridparams_hash]
@@ -291,9 +292,9 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
             eventdata,
             gridparams_recarray,
             n_values):
-        """For each set of parameter values given by ``gridparams_recarray``,
-        the spline is retrieved and evaluated for the events suitable for that
-        source model.
+        """For each distinct set of parameter values given by
+        ``gridparams_recarray``, the spline is retrieved and evaluated for the
+        events of all the sources having this set of parameter values.
 
         Parameters
         ----------
@@ -321,12 +322,25 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
             TrialDataManager. In the worst case it is
             ``N_sources * N_selected_events``.
         """
+        values = self._get_grid_table_values(
+            tdm=tdm,
+            gridparams_recarray=gridparams_recarray)
+        if values is not None:
+            return values
+
         (src_idxs, evt_idxs) = tdm.src_evt_idxs
 
-        # Check for special case when a single set of parameters are provided.
-        if len(gridparams_recarray) == 1:
-            # We got a single parameter set. We will use it for all sources.
-            spline = self._get_spline_for_param_values(gridparams_recarray[0])
+        # Group the sources by their grid point, so that each spline is
+        # evaluated only once for all the sources sharing it.
+        groups = group_values_by_grid_point(
+            tdm=tdm,
+            gridparams_recarray=gridparams_recarray)
+
+        # Check for special case when all sources share the same set of
+        # parameters.
+        if len(groups) == 1:
+            (gridparams, _) = groups[0]
+            spline = self._get_spline_for_gridparams(gridparams)
 
             eventdata = np.take(eventdata, evt_idxs, axis=1)
             values = spline(eventdata.T)
@@ -335,22 +349,35 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
 
         values = np.empty(n_values, dtype=np.float64)
 
-        v_start = 0
-        for (sidx, param_values) in enumerate(gridparams_recarray):
-            spline = self._get_spline_for_param_values(param_values)
-
-            # Select the eventdata that belongs to the current source.
-            m = src_idxs == sidx
-            src_eventdata = np.take(eventdata, evt_idxs[m], axis=1)
+        for (gridparams, values_mask) in groups:
+            spline = self._get_spline_for_gridparams(gridparams)
 
-            n = src_eventdata.shape[1]
-            sl = slice(v_start, v_start+n)
-            values[sl] = spline(src_eventdata.T)
+            # Select the eventdata that belongs to the current group of
+            # sources.
+            group_eventdata = np.take(eventdata, evt_idxs[values_mask], axis=1)
 
-            v_start += n
+            values[values_mask] = spline(group_eventdata.T)
 
         return values
 
+    def _get_eventdata(self, tdm):
+        """Creates a 2D event data array holding only the needed event data
+        fields for the PDF ratio spline evaluation.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The TrialDataManager instance holding the trial data.
+
+        Returns
+        -------
+        eventdata : instance of numpy ndarray
+            The (V,N_events)-shaped numpy ndarray holding the event data.
+        """
+        eventdata = np.vstack([tdm[fn] for fn in self._data_field_names])
+
+        return eventdata
+
     def _create_interpol_params_recarray(self, src_params_recarray):
         """Creates the params_recarray needed for the interpolation. It selects
         The interpolation parameters from the ``params_recarray`` argument.
@@ -400,9 +427,7 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
             names and values for all sources.
             It must contain only the parameters necessary for the interpolation.
         """
-        # Create a 2D event data array holding only the needed event data fields
-        # for the PDF ratio spline evaluation.
-        eventdata = np.vstack([tdm[fn] for fn in self._data_field_names])
+        eventdata = self._get_eventdata(tdm)
 
         (ratio, grads) = self._interpolmethod(
             tdm=tdm,
@@ -423,6 +448,36 @@ class SplinedI3EnergySigSetOverBkgPDFRatio(
             grads=grads
         )
 
+    def initialize_for_new_trial(
+            self,
+            tdm,
+            tl=None,
+            **kwargs):
+        """Initializes the PDF ratio instance for a new trial. If the
+        ``precompute_grid_table`` property is set to ``True``, the log-ratio
+        splines of all parameter grid points are evaluated once for all trial
+        events.
+
+        Parameters
+        ----------
+        tdm : instance of TrialDataManager
+            The instance of TrialDataManager holding the trial data.
+        tl : instance of TimeLord | None
+            The optional instance of TimeLord for measuring timing information.
+        """
+        super().initialize_for_new_trial(
+            tdm=tdm,
+            tl=tl,
+            **kwargs)
+
+        self._create_grid_table(
+            tdm=tdm,
+            func=self._evaluate_splines,
+            eventdata=(
+                self._get_eventdata(tdm) if self.precompute_grid_table
+                else None),
+            tl=tl)
+
     def get_ratio(
             self,
             tdm,
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""Utilities for tests, which run compute nodes of the skyllh.cluster package
+as local processes.
+"""
+
+import multiprocessing as mp
+import os
+import socket
+import sys
+import time
+
+import numpy as np
+
+from skyllh.cluster.compute_node import (
+    ComputeNode,
+)
+
+
+# The failure mode of the analysis on the compute node process.
+_FAILURE_MODE = None
+
+
+class DummyAnalysis(
+        object):
+    def __init__(self, sigma):
+        self.sigma = sigma
+        self.failed = False
+
+    def fail_once(self):
+        if not self.failed:
+            self.failed = True
+            raise ValueError('The trial failed!')
+
+    def do_trial(self, rss, mu=0, **kwargs):
+        if _FAILURE_MODE == 'crash':
+            os._exit(1)
+        if _FAILURE_MODE == 'hang':
+            time.sleep(60)
+        if _FAILURE_MODE == 'slow':
+            time.sleep(0.5)
+        if _FAILURE_MODE == 'fail_once':
+            self.fail_once()
+
+        return np.array(
+            [(rss.random.normal(mu, self.sigma), rss.random.uniform())],
+            dtype=[('ts', np.float64), ('ns', np.float64)])
+
+
+def create_dummy_analysis(sigma):
+    return DummyAnalysis(sigma)
+
+
+def run_compute_node(port, failure_mode):
+    global _FAILURE_MODE
+    _FAILURE_MODE = failure_mode
+
+    sys.stdout = open(os.devnull, 'w')
+
+    cn = ComputeNode(
+        live_time=60,
+        master_addr='127.0.0.1',
+        master_port=port,
+        connect_timeout=10)
+    cn.handle_requests()
+
+
+def get_free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def start_compute_nodes(port, failure_modes):
+    """Starts a compute node process for each of the given failure modes of
+    the DummyAnalysis class. The compute nodes register at the master node
+    listening on the given port on localhost.
+    """
+    ctx = mp.get_context('fork')
+    processes = [
+        ctx.Process(target=run_compute_node, args=(port, failure_mode))
+        for failure_mode in failure_modes
+    ]
+    for p in processes:
+        p.start()
+
+    return processes
+
+
+def stop_compute_nodes(master, processes):
+    """Shuts down the compute nodes registered at the given master node and
+    terminates the compute node processes, which did not stop by themselves.
+    """
+    master.shutdown_compute_nodes()
+    master.clear_cn_registry()
+    for p in processes:
+        p.join(timeout=1)
+        if p.is_alive():
+            p.terminate()
+            p.join()
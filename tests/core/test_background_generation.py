@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from skyllh.core.background_generation import (
+    CompositeMCDataSamplingBkgGenMethod,
+    MCDataSamplingBkgGenMethod,
+)
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.random import (
+    RandomChoice,
+    RandomStateService,
+)
+
+
+def get_event_prob(dataset, data, events):
+    return np.full((len(events),), 1/len(events))
+
+
+class MCDataSamplingBkgGenMethod_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.cfg = Config()
+        self.random_choice = RandomChoice(
+            items=np.arange(600),
+            probabilities=np.full((600,), 1/600))
+
+    def create_bkg_gen_method(self):
+        return MCDataSamplingBkgGenMethod(
+            get_event_prob_func=get_event_prob,
+            draw_batch_size=100,
+            cfg=self.cfg)
+
+    def draw_with_fresh_rss(self, bkg_gen_method, seed):
+        rss = RandomStateService(seed=seed)
+        return bkg_gen_method._draw_mc_event_indices(
+            rss=rss,
+            random_choice=self.random_choice,
+            size=5)
+
+    def test_draw_with_consecutive_fresh_rss(self):
+        # The second RandomStateService instance is created after the first
+        # one has been deleted, hence it might get the same id. The indices
+        # drawn with the first instance must not be used for the second one.
+        bkg_gen_method = self.create_bkg_gen_method()
+        self.draw_with_fresh_rss(bkg_gen_method, seed=1)
+        idxs = self.draw_with_fresh_rss(bkg_gen_method, seed=2)
+
+        ref_idxs = self.draw_with_fresh_rss(
+            self.create_bkg_gen_method(), seed=2)
+
+        np.testing.assert_equal(idxs, ref_idxs)
+
+    def test_draw_with_same_rss_uses_batch(self):
+        bkg_gen_method = self.create_bkg_gen_method()
+        rss = RandomStateService(seed=1)
+        idxs = np.concatenate([
+            bkg_gen_method._draw_mc_event_indices(
+                rss=rss,
+                random_choice=self.random_choice,
+                size=5)
+            for i in range(3)
+        ])
+
+        ref_idxs = self.random_choice(
+            rss=RandomStateService(seed=1),
+            size=100)[:15]
+
+        np.testing.assert_equal(idxs, ref_idxs)
+
+    def test_draw_after_reseed(self):
+        bkg_gen_method = self.create_bkg_gen_method()
+        rss = RandomStateService(seed=1)
+        bkg_gen_method._draw_mc_event_indices(
+            rss=rss,
+            random_choice=self.random_choice,
+            size=5)
+        rss.reseed(2)
+        idxs = bkg_gen_method._draw_mc_event_indices(
+            rss=rss,
+            random_choice=self.random_choice,
+            size=5)
+
+        ref_idxs = self.draw_with_fresh_rss(
+            self.create_bkg_gen_method(), seed=2)
+
+        np.testing.assert_equal(idxs, ref_idxs)
+
+
+class CompositeMCDataSamplingBkgGenMethod_TestCase(
+        unittest.TestCase,
+):
+    def test_draw_batch_size_not_supported(self):
+        with self.assertRaises(ValueError):
+            CompositeMCDataSamplingBkgGenMethod(
+                bkg_component_rate_calc_func_dict=dict(),
+                get_event_prob_func=get_event_prob,
+                draw_batch_size=100,
+                cfg=Config())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import os
+import os.path
+import tempfile
+import unittest
+from unittest.mock import (
+    patch,
+)
+
+import numpy as np
+
+from skyllh.core.cache import (
+    DiskCache,
+    get_callable_fingerprint,
+    get_model_fingerprint,
+    make_cache_key,
+)
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.flux_model import (
+    PowerLawEnergyFluxProfile,
+    SteadyPointlikeFFM,
+)
+
+
+def func1(x, a=1):
+    return x + a
+
+
+def func2(x, a=1):
+    return x - a
+
+
+class Opaque(object):
+    pass
+
+
+class CallableFingerprint_TestCase(unittest.TestCase):
+    def test_function(self):
+        self.assertEqual(
+            get_callable_fingerprint(func1),
+            get_callable_fingerprint(func1))
+        self.assertNotEqual(
+            get_callable_fingerprint(func1),
+            get_callable_fingerprint(func2))
+
+    def test_partial(self):
+        self.assertEqual(
+            get_callable_fingerprint(functools.partial(func1, a=2)),
+            get_callable_fingerprint(functools.partial(func1, a=2)))
+        self.assertNotEqual(
+            get_callable_fingerprint(functools.partial(func1, a=2)),
+            get_callable_fingerprint(functools.partial(func1, a=3)))
+
+    def test_not_callable(self):
+        with self.assertRaises(TypeError):
+            get_callable_fingerprint(1)
+
+    def test_make_cache_key(self):
+        self.assertEqual(
+            make_cache_key('a', [1, 2], {'b': np.arange(3)}),
+            make_cache_key('a', [1, 2], {'b': np.arange(3)}))
+        self.assertNotEqual(
+            make_cache_key('a', [1, 2], {'b': np.arange(3)}),
+            make_cache_key('a', [1, 2], {'b': np.arange(4)}))
+
+    def test_object_without_stable_repr(self):
+        # The default representation of an object contains its memory address,
+        # which must not enter the fingerprint.
+        with self.assertLogs('skyllh.core.cache', level='WARNING'):
+            self.assertEqual(
+                get_callable_fingerprint(functools.partial(func1, a=Opaque())),
+                get_callable_fingerprint(functools.partial(func1, a=Opaque())))
+
+    def test_make_cache_key_version(self):
+        key = make_cache_key('a', 1)
+        with patch('skyllh.__version__', '0.0.0'):
+            self.assertNotEqual(make_cache_key('a', 1), key)
+
+    def test_model_fingerprint(self):
+        def create_fluxmodel(gamma):
+            cfg = Config()
+            return SteadyPointlikeFFM(
+                Phi0=1,
+                energy_profile=PowerLawEnergyFluxProfile(
+                    E0=1000, gamma=gamma, cfg=cfg),
+                cfg=cfg)
+
+        # The name of the model defaults to its memory address, which must not
+        # enter the fingerprint.
+        self.assertEqual(
+            get_model_fingerprint(create_fluxmodel(2)),
+            get_model_fingerprint(create_fluxmodel(2)))
+        self.assertNotEqual(
+            get_model_fingerprint(create_fluxmodel(2)),
+            get_model_fingerprint(create_fluxmodel(3)))
+
+
+class DiskCache_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def _write_file(size):
+        def write_func(path):
+            with open(os.path.join(path, 'data'), 'wb') as f:
+                f.write(b'x' * size)
+        return write_func
+
+    def test_put_get(self):
+        cache = DiskCache(self.tmpdir.name)
+        self.assertIsNone(cache.get('k1'))
+
+        path = cache.put('k1', self._write_file(10))
+        self.assertEqual(cache.get('k1'), path)
+        self.assertTrue(os.path.isfile(os.path.join(path, 'data')))
+        self.assertEqual(cache.get_entry_keys(), ['k1'])
+        self.assertEqual(cache.get_size(), 10)
+
+        cache.remove('k1')
+        self.assertFalse(cache.has_entry('k1'))
+
+    def test_evict(self):
+        cache = DiskCache(self.tmpdir.name, max_size=25)
+        cache.put('k1', self._write_file(10))
+        cache.put('k2', self._write_file(10))
+
+        # Mark k1 as the least recently used entry.
+        os.utime(cache.get_entry_path('k1'), (0, 0))
+
+        cache.put('k3', self._write_file(10))
+        self.assertEqual(sorted(cache.get_entry_keys()), ['k2', 'k3'])
+        self.assertEqual(cache.get_size(), 20)
+
+    def test_get_object(self):
+        cache = DiskCache(self.tmpdir.name)
+        calls = []
+
+        def create_func():
+            calls.append(1)
+            return {'a': np.arange(3)}
+
+        obj1 = cache.get_object('k1', create_func)
+        obj2 = cache.get_object('k1', create_func)
+        self.assertEqual(len(calls), 1)
+        np.testing.assert_array_equal(obj2['a'], obj1['a'])
+
+        # A corrupt entry gets recreated.
+        with open(os.path.join(cache.get_entry_path('k1'), 'object.pkl'),
+                  'wb') as f:
+            f.write(b'x')
+        with self.assertLogs('skyllh.core.cache', level='WARNING'):
+            obj3 = cache.get_object('k1', create_func)
+        self.assertEqual(len(calls), 2)
+        np.testing.assert_array_equal(obj3['a'], obj1['a'])
+
+    def test_get_object_stale_entry(self):
+        cache = DiskCache(self.tmpdir.name)
+        calls = []
+
+        def create_func():
+            calls.append(1)
+            return len(calls)
+
+        # Entries holding pickled objects, whose class was moved or whose
+        # module was removed, get recreated.
+        for (i, pickled) in enumerate([
+                b'cskyllh.core.cache\nNoSuchClass\n.',
+                b'cskyllh_no_such_module\nNoSuchClass\n.']):
+            cache.get_object('k1', create_func)
+            with open(os.path.join(cache.get_entry_path('k1'), 'object.pkl'),
+                      'wb') as f:
+                f.write(pickled)
+            with self.assertLogs('skyllh.core.cache', level='WARNING'):
+                self.assertEqual(
+                    cache.get_object('k1', create_func), i + 2)
+
+    def test_get_file_checksum(self):
+        cache = DiskCache(os.path.join(self.tmpdir.name, 'cache'))
+        pathfilename = os.path.join(self.tmpdir.name, 'file.dat')
+        with open(pathfilename, 'wb') as f:
+            f.write(b'abc')
+
+        self.assertEqual(
+            cache.get_file_checksum(pathfilename),
+            'ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad')
+        # The checksum file must not appear as cache entry.
+        self.assertEqual(cache.get_entry_keys(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import os
+import socket
+import unittest
+
+import numpy as np
+
+from skyllh.cluster.master_node import (
+    MasterNode,
+)
+from skyllh.cluster.srvclt import (
+    Message,
+)
+from skyllh.core.multiproc import (
+    parallelize,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+
+from tests.cluster_utils import (
+    DummyAnalysis,
+    create_dummy_analysis,
+    get_free_port,
+    start_compute_nodes,
+    stop_compute_nodes,
+)
+
+
+class Message_TestCase(
+        unittest.TestCase):
+    def test_send_receive_large_message(self):
+        (sock1, sock2) = socket.socketpair()
+        msg = os.urandom(100000)
+        try:
+            Message(msg).send(sock1)
+            m = Message.receive(sock2, as_bytes=True)
+        finally:
+            sock1.close()
+            sock2.close()
+
+        self.assertEqual(m.msg, msg)
+
+
+class MasterNode_TestCase(
+        unittest.TestCase):
+    def start_compute_nodes(self, failure_modes):
+        port = get_free_port()
+        self.processes = start_compute_nodes(port, failure_modes)
+
+        self.master = MasterNode()
+        self.master.register_compute_nodes(
+            n_cn=len(failure_modes),
+            master_port=port,
+            master_addr='127.0.0.1')
+        self.master.setup_analysis(
+            create_dummy_analysis, kwargs=dict(sigma=2), timeout=10)
+
+    def tearDown(self):
+        stop_compute_nodes(self.master, self.processes)
+
+    def get_local_trials(self, n, chunksize, seed=1):
+        ana = DummyAnalysis(sigma=2)
+        result_list = parallelize(
+            func=ana.do_trial,
+            args_list=[((), dict(mu=1)) for i in range(n)],
+            ncpu=1,
+            rss=RandomStateService(seed=seed),
+            chunksize=chunksize)
+        recarray = np.empty(n, dtype=result_list[0].dtype)
+        recarray[:] = np.array(result_list)[:, 0]
+        return recarray
+
+    def test_do_trials(self):
+        self.start_compute_nodes([None, None])
+
+        recarray = self.master.do_trials(
+            rss=RandomStateService(seed=1), n=20, chunksize=3, mu=1)
+
+        np.testing.assert_array_equal(
+            recarray, self.get_local_trials(n=20, chunksize=3))
+
+    def test_do_trials_dead_node(self):
+        self.start_compute_nodes([None, 'crash'])
+
+        with self.assertLogs('skyllh.cluster.master_node', level='WARNING'):
+            recarray = self.master.do_trials(
+                rss=RandomStateService(seed=1), n=20, chunksize=3, mu=1)
+
+        self.assertEqual(len(self.master.cn_registry), 1)
+        np.testing.assert_array_equal(
+            recarray, self.get_local_trials(n=20, chunksize=3))
+
+    def test_do_trials_timed_out_node(self):
+        self.start_compute_nodes([None, 'hang'])
+
+        with self.assertLogs('skyllh.cluster.master_node', level='WARNING'):
+            recarray = self.master.do_trials(
+                rss=RandomStateService(seed=1), n=20, chunksize=3,
+                task_timeout=1, mu=1)
+
+        self.assertEqual(len(self.master.cn_registry), 1)
+        np.testing.assert_array_equal(
+            recarray, self.get_local_trials(n=20, chunksize=3))
+
+    def test_do_trials_failed_trial(self):
+        self.start_compute_nodes(['fail_once', 'slow'])
+
+        with self.assertRaises(RuntimeError):
+            self.master.do_trials(
+                rss=RandomStateService(seed=1), n=20, chunksize=3, mu=1)
+
+        # The result of the slow compute node for the aborted trials must not
+        # be taken as result for the next trials.
+        self.assertEqual(len(self.master.cn_registry), 2)
+        recarray = self.master.do_trials(
+            rss=RandomStateService(seed=2), n=20, chunksize=3, mu=1)
+
+        np.testing.assert_array_equal(
+            recarray, self.get_local_trials(n=20, chunksize=3, seed=2))
+
+    def test_do_trials_no_nodes_left(self):
+        self.start_compute_nodes(['crash'])
+
+        with self.assertLogs('skyllh.cluster.master_node', level='WARNING'):
+            with self.assertRaises(RuntimeError):
+                self.master.do_trials(
+                    rss=RandomStateService(seed=1), n=5, chunksize=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
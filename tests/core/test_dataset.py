@@ -1,8 +1,13 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+import os
 import os.path
+import tempfile
 import unittest
+from unittest.mock import (
+    patch,
+)
 
 from skyllh.core.config import (
     Config,
@@ -22,6 +27,9 @@ from skyllh.core.livetime import (
 from skyllh.core.storage import (
     DataFieldRecordArray,
 )
+from skyllh.i3.dataset import (
+    I3Dataset,
+)
 
 from skyllh.datasets.i3 import (
     TestData,
@@ -30,6 +38,25 @@ from skyllh.datasets.i3.PublicData_10y_ps import (
     create_dataset_collection,
 )
 
+from tests.core.testdata.testdata_generator import (
+    generate_testdata,
+)
+
+
+# The number of calls of the data preparation functions of the
+# TestDatasetDataCache test case.
+_N_DATA_PREP_CALLS = [0]
+
+
+def _shift_ra(data):
+    _N_DATA_PREP_CALLS[0] += 1
+    data.exp['ra'] = data.exp['ra'] + 0.1
+
+
+def _shift_dec(data):
+    _N_DATA_PREP_CALLS[0] += 1
+    data.exp['dec'] = data.exp['dec'] + 0.1
+
 
 class TestRSYNCDatasetTransfer(
     unittest.TestCase,
@@ -218,5 +245,150 @@ class TestDatasetCollection(
         self.assertEqual(ds_list[1].name, 'IC40')
 
 
+class TestDatasetDataCache(
+    unittest.TestCase,
+):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        data_path = os.path.join(self.tmpdir.name, 'data', 'testdata')
+        os.makedirs(data_path)
+
+        testdata = generate_testdata()
+        self.exp = testdata['exp_testdata']
+        np.save(os.path.join(data_path, 'exp.npy'), self.exp)
+        np.save(os.path.join(data_path, 'mc.npy'), testdata['mc_testdata'])
+        grl = np.array(
+            [(1, 58000., 59000., 1000.)],
+            dtype=[
+                ('run', np.int64),
+                ('start', np.float64),
+                ('stop', np.float64),
+                ('livetime', np.float64)])
+        np.save(os.path.join(data_path, 'grl.npy'), grl)
+
+        self.cfg = Config()
+        self.cfg['datafields'].pop('run')
+        self.cfg['caching']['dataset_data']['directory'] = os.path.join(
+            self.tmpdir.name, 'cache')
+
+        self.ds = I3Dataset(
+            cfg=self.cfg,
+            name='TestData',
+            exp_pathfilenames='exp.npy',
+            mc_pathfilenames='mc.npy',
+            grl_pathfilenames='grl.npy',
+            livetime=None,
+            version=1,
+            base_path=os.path.join(self.tmpdir.name, 'data'),
+            default_sub_path_fmt='testdata')
+        self.ds.add_data_preparation(_shift_ra)
+
+        _N_DATA_PREP_CALLS[0] = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_and_prepare_data(self):
+        data1 = self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 1)
+
+        data2 = self.ds.load_and_prepare_data(efficiency_mode='mmap')
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 1)
+
+        self.assertEqual(data2.livetime, 1000.)
+        self.assertEqual(data2.livetime, data1.livetime)
+        self.assertEqual(data2.exp.field_name_list, data1.exp.field_name_list)
+        self.assertEqual(data2.mc.field_name_list, data1.mc.field_name_list)
+        np.testing.assert_allclose(data2.exp['ra'], self.exp['ra'] + 0.1)
+        np.testing.assert_array_equal(data2.mc['mcweight'], data1.mc['mcweight'])
+        np.testing.assert_array_equal(data2.grl['run'], [1])
+        self.assertIsInstance(data2.exp['ra'], np.memmap)
+
+    def test_load_and_prepare_data_changed_key(self):
+        self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 1)
+
+        # Changing the data preparation chain must invalidate the cache.
+        self.ds.add_data_preparation(_shift_dec)
+        data = self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 3)
+        np.testing.assert_allclose(data.exp['dec'], self.exp['dec'] + 0.1)
+
+        # Changing the keep_fields must invalidate the cache.
+        data = self.ds.load_and_prepare_data(keep_fields=['sin_dec'])
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 5)
+        self.assertIn('sin_dec', data.exp)
+
+        self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 5)
+
+    def test_load_and_prepare_data_changed_version(self):
+        self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 1)
+
+        # Data prepared by a different version of SkyLLH must not be used.
+        with patch('skyllh.__version__', '0.0.0'):
+            self.ds.load_and_prepare_data()
+        self.assertEqual(_N_DATA_PREP_CALLS[0], 2)
+
+    def test_load_data_ignores_global_ncpu(self):
+        # The data files are loaded in parallel only if the number of CPUs is
+        # passed explicitly.
+        self.cfg['multiproc']['ncpu'] = 4
+        self.ds.exp_pathfilename_list = ['exp.npy', 'exp.npy']
+        with patch(
+                'skyllh.core.storage.parallelize',
+                side_effect=AssertionError('The data was loaded in parallel!')):
+            data = self.ds.load_data()
+        np.testing.assert_array_equal(
+            data.exp['ra'], np.concatenate((self.exp['ra'], self.exp['ra'])))
+
+
+class TestDatasetTextFileCache(
+    unittest.TestCase,
+):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        data_path = os.path.join(self.tmpdir.name, 'data', 'testdata')
+        os.makedirs(data_path)
+
+        testdata = generate_testdata()
+        np.save(os.path.join(data_path, 'exp.npy'), testdata['exp_testdata'])
+        with open(os.path.join(data_path, 'aeff.csv'), 'w') as f:
+            f.write('# x y\n1.0 2.0\n3.0 4.0\n')
+
+        self.cfg = Config()
+        self.cfg['caching']['text_files']['directory'] = os.path.join(
+            self.tmpdir.name, 'cache')
+
+        self.ds = Dataset(
+            cfg=self.cfg,
+            name='TestData',
+            exp_pathfilenames='exp.npy',
+            mc_pathfilenames=None,
+            livetime=None,
+            version=1,
+            base_path=os.path.join(self.tmpdir.name, 'data'),
+            default_sub_path_fmt='testdata')
+        self.ds.add_aux_data_definition('aeff', 'aeff.csv')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_build_text_file_cache(self):
+        keys = self.ds.build_text_file_cache()
+        # Only the text data file gets cached.
+        self.assertEqual(len(keys), 1)
+        self.assertTrue(self.ds.get_text_file_cache().has_entry(keys[0]))
+
+        data = self.ds.load_aux_data('aeff')
+        np.testing.assert_array_equal(data['y'], [2., 4.])
+
+    def test_build_text_file_cache_not_configured(self):
+        self.cfg['caching']['text_files']['directory'] = None
+        with self.assertRaises(ValueError):
+            self.ds.build_text_file_cache()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -14,6 +14,7 @@ import numpy as np
 from skyllh.core.event_selection import (
     AllEventSelectionMethod,
     DecBandEventSectionMethod,
+    IndexedSpatialBoxEventSelectionMethod,
     RABandEventSectionMethod,
     SpatialBoxEventSelectionMethod,
     AngErrOfPsiEventSelectionMethod,
@@ -532,6 +533,57 @@ class SpatialBoxEventSelectionMethod_TestCase(unittest.TestCase):
             np.unique(evt_idxs), np.arange(len(events)))
 
 
+class IndexedSpatialBoxEventSelectionMethod_TestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n_events = 5000
+        self.test_events = DataFieldRecordArray(
+            {
+                'ra': rng.uniform(0, 2*np.pi, size=n_events),
+                'dec': np.arcsin(rng.uniform(-1, 1, size=n_events)),
+            })
+
+    def _assert_equal_selection(self, n_sources, delta_angle, **kwargs):
+        shg_mgr = shgm_setup(n_sources=n_sources)
+        box_method = SpatialBoxEventSelectionMethod(
+            shg_mgr, delta_angle)
+        indexed_method = IndexedSpatialBoxEventSelectionMethod(
+            shg_mgr, delta_angle, **kwargs)
+
+        (box_events, (box_src_idxs, box_evt_idxs), box_orig_idxs) =\
+            box_method.select_events(
+                events=self.test_events,
+                ret_original_evt_idxs=True)
+        (events, (src_idxs, evt_idxs), orig_idxs) =\
+            indexed_method.select_events(
+                events=self.test_events,
+                ret_original_evt_idxs=True)
+
+        self.assertGreater(len(src_idxs), 0)
+        np.testing.assert_array_equal(orig_idxs, box_orig_idxs)
+        np.testing.assert_array_equal(src_idxs, box_src_idxs)
+        np.testing.assert_array_equal(evt_idxs, box_evt_idxs)
+        np.testing.assert_array_equal(events['ra'], box_events['ra'])
+        np.testing.assert_array_equal(events['dec'], box_events['dec'])
+
+    def test_select_events_single_source(self):
+        self._assert_equal_selection(
+            n_sources=1, delta_angle=np.deg2rad(15))
+
+    def test_select_events_multiple_sources(self):
+        self._assert_equal_selection(
+            n_sources=300, delta_angle=np.deg2rad(5))
+
+    def test_select_events_large_delta_angle(self):
+        self._assert_equal_selection(
+            n_sources=20, delta_angle=np.deg2rad(80))
+
+    def test_select_events_dec_bin_width(self):
+        self._assert_equal_selection(
+            n_sources=50, delta_angle=np.deg2rad(5),
+            dec_bin_width=np.deg2rad(1))
+
+
 class AngErrOfPsiAndSpatialBoxEventSelectionMethod_TestCase(
         unittest.TestCase):
 
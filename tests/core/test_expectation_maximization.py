@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+from scipy.stats import norm
+
+from skyllh.core.expectation_maximization import (
+    em_expectation_step,
+    em_fit,
+    em_fit_batch,
+)
+
+
+class em_expectation_step_TestCase(
+        unittest.TestCase):
+    def test_em_expectation_step(self):
+        t = np.linspace(0, 100, 11)
+        sob = np.linspace(1, 2, 11)
+        ns = np.array([2., 3.])
+        mu = np.array([30., 60.])
+        sigma = np.array([5., 10.])
+
+        (expectations, llh) = em_expectation_step(
+            ns=ns, mu=mu, sigma=sigma, t=t, sob=sob)
+
+        e_sig = np.array([
+            ns[i] * sob * norm(loc=mu[i], scale=sigma[i]).pdf(t)
+            for i in range(2)
+        ])
+        b_term = (1 - np.cos(10 / 180 * np.pi)) / 2
+        e_bkg = (len(t) - np.sum(ns)) / 100 / b_term
+        denom = np.sum(e_sig, axis=0) + e_bkg
+
+        np.testing.assert_allclose(expectations, e_sig / denom)
+        self.assertAlmostEqual(llh, np.sum(np.log(denom)))
+
+
+class em_fit_batch_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        # Create background events uniformly distributed in time and signal
+        # events of a gaussian flare with larger signal-over-background ratios.
+        rss = np.random.RandomState(1)
+        t = np.concatenate((
+            rss.uniform(0, 1000, size=500),
+            rss.normal(400, 10, size=30)))
+        sob = np.concatenate((np.ones(500), np.full(30, 20.)))
+        sorted_idxs = np.argsort(t)
+        self.t = t[sorted_idxs]
+        self.weights = np.array([
+            sob[sorted_idxs] * rss.lognormal(0, 1, size=len(t)) * (1 + i)
+            for i in range(4)
+        ])
+
+    def test_flare_recovery(self):
+        (mu, sigma, ns) = em_fit(self.t, self.weights[1])
+        self.assertAlmostEqual(mu[0], 400, delta=5)
+
+    def test_batch_equals_single_fits(self):
+        (mu, sigma, ns) = em_fit_batch(
+            self.t, self.weights, iter_max=200, remove_x=self.t[10])
+        self.assertEqual(mu.shape, (4, 1))
+
+        for (i, weights) in enumerate(self.weights):
+            (mu_i, sigma_i, ns_i) = em_fit(
+                self.t, weights, iter_max=200, remove_x=self.t[10])
+            np.testing.assert_allclose(mu[i], mu_i)
+            np.testing.assert_allclose(sigma[i], sigma_i)
+            np.testing.assert_allclose(ns[i], ns_i)
+
+    def test_padded_data_sets(self):
+        # The second data set has fewer events and is padded with NaN values.
+        n = len(self.t) - 50
+        x = np.vstack((self.t, self.t))
+        x[1, n:] = np.nan
+
+        (mu, sigma, ns) = em_fit_batch(x, self.weights[:2], iter_max=200)
+
+        (mu_1, sigma_1, ns_1) = em_fit(
+            self.t[:n], self.weights[1, :n], iter_max=200)
+        np.testing.assert_allclose(mu[1], mu_1, rtol=1e-6)
+        np.testing.assert_allclose(sigma[1], sigma_1, rtol=1e-6)
+        np.testing.assert_allclose(ns[1], ns_1, rtol=1e-6)
+
+    def test_weight_thresh(self):
+        (mu, sigma, ns) = em_fit_batch(
+            self.t, self.weights[:1], iter_max=200, weight_thresh=1)
+
+        m = self.weights[0] > 1
+        (mu_0, sigma_0, ns_0) = em_fit(
+            self.t[m], self.weights[0][m], iter_max=200)
+        np.testing.assert_allclose(mu[0], mu_0, rtol=1e-6)
+        np.testing.assert_allclose(ns[0], ns_0, rtol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+import scipy.optimize
+
+from skyllh.core.flare_scan import (
+    box_flare_scan,
+)
+from skyllh.core.livetime import (
+    Livetime,
+)
+
+
+def brute_force_box_scan(t, sob, livetime, n_events, min_livetime):
+    """Maximizes the log-likelihood ratio function in ns for every box between
+    two events with a signal-over-background ratio greater than one.
+    """
+    N = n_events
+    best = (0, np.nan, np.nan)
+    for (i, t_start) in enumerate(t):
+        for (j, t_stop) in enumerate(t):
+            if (j < i) or (sob[i] <= 1) or (sob[j] <= 1):
+                continue
+            L_w = (
+                livetime.get_livetime_upto(t_stop) -
+                livetime.get_livetime_upto(t_start)
+            )
+            if L_w < min_livetime:
+                continue
+            m = (t >= t_start) & (t <= t_stop)
+            R = np.where(m, sob * livetime.livetime / L_w, 0)
+
+            res = scipy.optimize.minimize_scalar(
+                lambda ns: -np.sum(np.log1p(ns/N * (R - 1))) -
+                (N - len(R)) * np.log1p(-ns/N),
+                bounds=(0, len(R) - 1e-6),
+                method='bounded')
+            if -res.fun > best[0]:
+                best = (-res.fun, t_start, t_stop)
+
+    return (2*best[0], best[1], best[2])
+
+
+class Livetime_get_livetime_upto_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.livetime = Livetime(np.array([[0., 10.], [20., 30.]]))
+
+    def test_get_livetime_upto(self):
+        np.testing.assert_allclose(
+            self.livetime.get_livetime_upto(
+                np.array([-1., 5., 15., 25., 40.])),
+            [0., 5., 10., 15., 20.])
+
+    def test_get_livetime_upto_scalar(self):
+        livetime = self.livetime.get_livetime_upto(25.)
+        self.assertIsInstance(livetime, float)
+        self.assertAlmostEqual(livetime, 15.)
+
+
+class box_flare_scan_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        # Create background events uniformly distributed in time and signal
+        # events of a box-shaped flare with larger signal-over-background
+        # ratios. The detector is off between the times 600 and 700.
+        rss = np.random.RandomState(1)
+        self.livetime = Livetime(np.array([[0., 600.], [700., 1000.]]))
+        t_bkg = rss.uniform(0, 1000, size=150)
+        t_bkg = t_bkg[self.livetime.is_on(t_bkg)]
+        self.t = np.concatenate((t_bkg, rss.uniform(400, 410, size=10)))
+        self.sob = np.concatenate((
+            rss.lognormal(-0.5, 1, size=len(t_bkg)),
+            rss.lognormal(2, 0.5, size=10)))
+        self.n_events = 1000
+
+    def test_box_flare_scan(self):
+        (ts, ns, start, stop) = box_flare_scan(
+            t=self.t,
+            sob=self.sob,
+            livetime=self.livetime,
+            n_events=self.n_events,
+            min_livetime=1)
+
+        (ts_bf, start_bf, stop_bf) = brute_force_box_scan(
+            t=self.t,
+            sob=self.sob,
+            livetime=self.livetime,
+            n_events=self.n_events,
+            min_livetime=1)
+
+        self.assertAlmostEqual(ts, ts_bf, places=5)
+        self.assertEqual(start, start_bf)
+        self.assertEqual(stop, stop_bf)
+        self.assertGreaterEqual(start, 400)
+        self.assertLessEqual(stop, 410)
+        self.assertGreater(ns, 0)
+
+    def test_box_flare_scan_unsorted_events(self):
+        rss = np.random.RandomState(2)
+        idxs = rss.permutation(len(self.t))
+
+        self.assertEqual(
+            box_flare_scan(
+                self.t, self.sob, self.livetime, self.n_events),
+            box_flare_scan(
+                self.t[idxs], self.sob[idxs], self.livetime, self.n_events))
+
+    def test_box_flare_scan_no_box(self):
+        (ts, ns, start, stop) = box_flare_scan(
+            t=self.t,
+            sob=np.full_like(self.t, 0.5),
+            livetime=self.livetime,
+            n_events=self.n_events)
+
+        self.assertEqual(ts, 0)
+        self.assertEqual(ns, 0)
+        self.assertTrue(np.isnan(start))
+        self.assertTrue(np.isnan(stop))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,12 +13,14 @@ from skyllh.core.interpolate import (
     Linear1DGridManifoldInterpolationMethod,
     NullGridManifoldInterpolationMethod,
     Parabola1DGridManifoldInterpolationMethod,
+    group_values_by_grid_point,
 )
 from skyllh.core.parameters import (
     ParameterGrid,
     ParameterGridSet,
 )
 from skyllh.core.trialdata import (
+    SourceEventPairs,
     TrialDataManager,
 )
 
@@ -87,6 +89,7 @@ def create_tdm(n_sources, n_selected_events):
         'trial_data_state_id',
         'get_n_values',
         'src_evt_idxs',
+        'src_evt_pairs',
         'n_sources',
         'n_selected_events',
         'broadcast_params_recarray_to_values_array',
@@ -118,6 +121,9 @@ def create_tdm(n_sources, n_selected_events):
         np.repeat(np.arange(n_sources), n_selected_events),
         np.tile(np.arange(n_selected_events), n_sources)
     )
+    tdm.src_evt_pairs = SourceEventPairs.from_all_pairs(
+        n_sources=n_sources,
+        n_events=n_selected_events)
     tdm.n_sources = n_sources
     tdm.n_selected_events = n_selected_events
     tdm.broadcast_params_recarray_to_values_array =\
@@ -132,6 +138,50 @@ def create_tdm(n_sources, n_selected_events):
     return tdm
 
 
+class group_values_by_grid_point_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tdm = create_tdm(n_sources=3, n_selected_events=2)
+
+    def test_different_source_values(self):
+        gridparams_recarray = np.array(
+            [(1.5,), (1.0,), (1.5,)],
+            dtype=[('p', np.float64)])
+
+        groups = group_values_by_grid_point(
+            tdm=self.tdm,
+            gridparams_recarray=gridparams_recarray)
+
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(groups[0][0], {'p': 1.0})
+        np.testing.assert_array_equal(
+            groups[0][1], [False, False, True, True, False, False])
+        self.assertEqual(groups[1][0], {'p': 1.5})
+        np.testing.assert_array_equal(
+            groups[1][1], [True, True, False, False, True, True])
+
+    def test_same_source_values(self):
+        gridparams_recarray = np.array(
+            [(1.5, 2.), (1.5, 2.), (1.5, 2.)],
+            dtype=[('p1', np.float64), ('p2', np.float64)])
+
+        groups = group_values_by_grid_point(
+            tdm=self.tdm,
+            gridparams_recarray=gridparams_recarray)
+
+        self.assertEqual(groups, [({'p1': 1.5, 'p2': 2.}, None)])
+
+    def test_single_value(self):
+        gridparams_recarray = np.array(
+            [(1.5,)],
+            dtype=[('p', np.float64)])
+
+        groups = group_values_by_grid_point(
+            tdm=self.tdm,
+            gridparams_recarray=gridparams_recarray)
+
+        self.assertEqual(groups, [({'p': 1.5}, None)])
+
+
 class NullGridManifoldInterpolationMethod_TestCase(unittest.TestCase):
     def setUp(self):
         param1_grid = ParameterGrid.from_range('p1', -3, 3, 0.1)
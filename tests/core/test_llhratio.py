@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+import scipy.optimize
+
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.detsigyield import (
+    DetSigYieldBuilder,
+)
+from skyllh.core.flux_model import (
+    SteadyPointlikeFFM,
+)
+from skyllh.core.minimizer import (
+    LBFGSMinimizerImpl,
+    Minimizer,
+)
+from skyllh.core.model import (
+    DetectorModel,
+)
+from skyllh.core.parameters import (
+    Parameter,
+    ParameterModelMapper,
+)
+from skyllh.core.pdfratio import (
+    PDFRatio,
+)
+from skyllh.core.llhratio import (
+    MultiDatasetTCLLHRatio,
+    ZeroSigH0SingleDatasetTCLLHRatio,
+)
+from skyllh.core.services import (
+    DatasetSignalWeightFactorsService,
+    SrcDetSigYieldWeightsService,
+)
+from skyllh.core.source_hypo_grouping import (
+    SourceHypoGroup,
+    SourceHypoGroupManager,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+from skyllh.core.storage import (
+    DataFieldRecordArray,
+)
+from skyllh.core.timing import (
+    TimeLord,
+)
+from skyllh.core.trialdata import (
+    TrialDataManager,
+)
+
+
+# Define placeholder class to satisfy type checks.
+class NoDetSigYieldBuilder(
+        DetSigYieldBuilder):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+    def construct_detsigyield(self, **kwargs):
+        pass
+
+
+class LinearPDFRatio(
+        PDFRatio,
+):
+    """Simple PDF ratio, which is a linear function of the event data field
+    ``x`` and the local source parameter ``gamma``, i.e. x*gamma.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(sig_param_names=['gamma'], **kwargs)
+
+    def initialize_for_new_trial(self, tdm, tl=None, **kwargs):
+        pass
+
+    def get_ratio(self, tdm, src_params_recarray, tl=None):
+        return tdm['x'] * src_params_recarray['gamma'][0]
+
+    def get_gradient(self, tdm, src_params_recarray, fitparam_id, tl=None):
+        return tdm['x']
+
+
+class FixedSrcDetSigYieldWeightsService(
+        SrcDetSigYieldWeightsService,
+):
+    """Source detector signal yield weights service with fixed weights, which
+    depend linearly on the global fit parameter gamma.
+    """
+    def __init__(self, a_jk):
+        self._a_jk = a_jk
+
+    @property
+    def n_datasets(self):
+        return self._a_jk.shape[0]
+
+    def calculate(self, src_params_recarray):
+        pass
+
+    def get_weights(self):
+        return (self._a_jk, {1: 0.1*self._a_jk})
+
+
+def maximize_ns(llhratio, fitparam_values, ns_max):
+    """Maximizes the given LLH ratio function w.r.t. ns for the currently
+    initialized trial via a bounded scalar minimization.
+    """
+    fitparam_values = np.array(fitparam_values, dtype=np.float64)
+
+    def func(ns):
+        fitparam_values[0] = ns
+        return -llhratio.evaluate(fitparam_values)[0]
+
+    res = scipy.optimize.minimize_scalar(
+        func, bounds=(0, ns_max), method='bounded',
+        options=dict(xatol=1e-9))
+    # The maximum might be at the lower boundary.
+    if func(0) <= res.fun:
+        return (0, -func(0))
+    return (res.x, -res.fun)
+
+
+class ZeroSigH0SingleDatasetTCLLHRatio_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.cfg = Config()
+
+        source = PointLikeSource(ra=0, dec=0)
+        detector_model = DetectorModel('IceCube')
+
+        self.shg_mgr = SourceHypoGroupManager(
+            SourceHypoGroup(
+                sources=source,
+                fluxmodel=SteadyPointlikeFFM(
+                    Phi0=1, energy_profile=None, cfg=self.cfg),
+                detsigyield_builders=NoDetSigYieldBuilder(cfg=self.cfg)))
+
+        self.pmm = ParameterModelMapper(
+            models=[detector_model, source])
+        self.pmm.map_param(
+            Parameter(name='ns', initial=1, valmin=0, valmax=100),
+            models=detector_model)
+        self.pmm.map_param(
+            Parameter(name='gamma', initial=2, valmin=1, valmax=4),
+            models=source)
+
+        self.tdm = TrialDataManager()
+
+        self.llhratio = ZeroSigH0SingleDatasetTCLLHRatio(
+            pmm=self.pmm,
+            minimizer=Minimizer(LBFGSMinimizerImpl(cfg=self.cfg)),
+            shg_mgr=self.shg_mgr,
+            tdm=self.tdm,
+            pdfratio=LinearPDFRatio(cfg=self.cfg),
+            cfg=self.cfg)
+
+        rss = np.random.RandomState(1)
+        self.events_list = [
+            DataFieldRecordArray(dict(x=rss.exponential(size=n)))
+            for n in (10, 0, 25, 3)
+        ]
+        self.n_events_list = [100, 50, 200, 30]
+        # Include a very small ns value and a small x value, which leads to
+        # a numerical unstable event.
+        self.events_list[3]['x'][0] = 1e-8
+        self.fitparam_values = np.array([
+            [1.5, 2.5],
+            [2.0, 2.5],
+            [0.1, 2.5],
+            [29.99, 2.5],
+        ])
+
+    def test_evaluate_trials(self):
+        self.tdm.initialize_trials(
+            shg_mgr=self.shg_mgr,
+            pmm=self.pmm,
+            events_list=self.events_list,
+            n_events_list=self.n_events_list)
+
+        np.testing.assert_equal(self.tdm.trial_evt_offsets, [0, 10, 10, 35, 38])
+        np.testing.assert_equal(
+            self.tdm.n_pure_bkg_events_per_trial, [90, 50, 175, 27])
+
+        (log_lambda, grads) = self.llhratio.evaluate_trials(
+            self.fitparam_values)
+
+        for (k, events) in enumerate(self.events_list):
+            self.tdm.initialize_trial(
+                shg_mgr=self.shg_mgr,
+                pmm=self.pmm,
+                events=events,
+                n_events=self.n_events_list[k])
+            (log_lambda_k, grads_k) = self.llhratio.evaluate(
+                self.fitparam_values[k])
+            np.testing.assert_allclose(log_lambda[k], log_lambda_k)
+            np.testing.assert_allclose(grads[k], grads_k)
+
+    def test_evaluate_trials_different_params(self):
+        self.tdm.initialize_trials(
+            shg_mgr=self.shg_mgr,
+            pmm=self.pmm,
+            events_list=self.events_list,
+            n_events_list=self.n_events_list)
+
+        fitparam_values = self.fitparam_values.copy()
+        fitparam_values[0, 1] = 3
+        with self.assertRaises(ValueError):
+            self.llhratio.evaluate_trials(fitparam_values)
+
+    def test_maximize_ns_for_trials(self):
+        self.tdm.initialize_trials(
+            shg_mgr=self.shg_mgr,
+            pmm=self.pmm,
+            events_list=self.events_list,
+            n_events_list=self.n_events_list)
+
+        (log_lambda, fitparam_values) = self.llhratio.maximize_ns_for_trials(
+            n_trials=len(self.events_list),
+            fitparam_values=np.array([1, 2.5]))
+
+        np.testing.assert_equal(fitparam_values[:, 1], 2.5)
+        # The trial without any selected events has its maximum at ns=0.
+        self.assertEqual(fitparam_values[1, 0], 0)
+
+        for (k, events) in enumerate(self.events_list):
+            self.tdm.initialize_trial(
+                shg_mgr=self.shg_mgr,
+                pmm=self.pmm,
+                events=events,
+                n_events=self.n_events_list[k])
+            # ns must be smaller than the number of events of the trial.
+            (ns_k, log_lambda_k) = maximize_ns(
+                self.llhratio, fitparam_values[k],
+                ns_max=min(100, self.n_events_list[k]-1e-9))
+            np.testing.assert_allclose(
+                fitparam_values[k, 0], ns_k, atol=1e-5)
+            np.testing.assert_allclose(log_lambda[k], log_lambda_k, atol=1e-9)
+
+
+class MultiDatasetTCLLHRatio_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.cfg = Config()
+
+        source = PointLikeSource(ra=0, dec=0)
+        detector_model = DetectorModel('IceCube')
+
+        self.shg_mgr = SourceHypoGroupManager(
+            SourceHypoGroup(
+                sources=source,
+                fluxmodel=SteadyPointlikeFFM(
+                    Phi0=1, energy_profile=None, cfg=self.cfg),
+                detsigyield_builders=NoDetSigYieldBuilder(cfg=self.cfg)))
+
+        self.pmm = ParameterModelMapper(
+            models=[detector_model, source])
+        self.pmm.map_param(
+            Parameter(name='ns', initial=1, valmin=0, valmax=100),
+            models=detector_model)
+        self.pmm.map_param(
+            Parameter(name='gamma', initial=2, valmin=1, valmax=4),
+            models=source)
+
+        rss = np.random.RandomState(1)
+        self.events_list = [
+            DataFieldRecordArray(dict(x=rss.exponential(size=n)))
+            for n in (100, 20, 300)
+        ]
+        self.n_events_list = [1000, 500, 2000]
+
+        self.tdm_list = [
+            TrialDataManager()
+            for _ in self.events_list
+        ]
+        llhratio_list = [
+            ZeroSigH0SingleDatasetTCLLHRatio(
+                pmm=self.pmm,
+                minimizer=Minimizer(LBFGSMinimizerImpl(cfg=self.cfg)),
+                shg_mgr=self.shg_mgr,
+                tdm=tdm,
+                pdfratio=LinearPDFRatio(cfg=self.cfg),
+                cfg=self.cfg)
+            for tdm in self.tdm_list
+        ]
+
+        src_detsigyield_weights_service = FixedSrcDetSigYieldWeightsService(
+            a_jk=np.array([[1.], [0.5], [2.]]))
+
+        self.llhratio = MultiDatasetTCLLHRatio(
+            pmm=self.pmm,
+            minimizer=Minimizer(LBFGSMinimizerImpl(cfg=self.cfg)),
+            src_detsigyield_weights_service=src_detsigyield_weights_service,
+            ds_sig_weight_factors_service=DatasetSignalWeightFactorsService(
+                src_detsigyield_weights_service),
+            llhratio_list=llhratio_list,
+            cfg=self.cfg)
+
+        self.fitparam_values = np.array([4.2, 2.5])
+
+    def initialize_trial(self):
+        for (tdm, events, n_events) in zip(
+                self.tdm_list, self.events_list, self.n_events_list):
+            tdm.initialize_trial(
+                shg_mgr=self.shg_mgr,
+                pmm=self.pmm,
+                events=events,
+                n_events=n_events)
+
+    def test_n_threads(self):
+        self.assertIsNone(self.llhratio.n_threads)
+        self.llhratio.n_threads = 2
+        self.assertEqual(self.llhratio.n_threads, 2)
+        with self.assertRaises(ValueError):
+            self.llhratio.n_threads = 0
+
+    def test_evaluate_threaded(self):
+        self.initialize_trial()
+
+        self.llhratio.n_threads = 1
+        (log_lambda, grads) = self.llhratio.evaluate(self.fitparam_values)
+
+        self.llhratio.n_threads = 3
+        tl = TimeLord()
+        self.llhratio.initialize_for_new_trial(tl=tl)
+        (log_lambda_t, grads_t) = self.llhratio.evaluate(
+            self.fitparam_values, tl=tl)
+
+        # The results must be identical, because the per-dataset results are
+        # combined in the order of the datasets.
+        self.assertEqual(log_lambda_t, log_lambda)
+        np.testing.assert_array_equal(grads_t, grads)
+
+        self.assertGreater(len(tl.task_name_list), 0)
+
+    def test_evaluate_threaded_from_config(self):
+        self.initialize_trial()
+
+        (log_lambda, grads) = self.llhratio.evaluate(self.fitparam_values)
+
+        self.cfg['multiproc']['llhratio_n_threads'] = 2
+        (log_lambda_t, grads_t) = self.llhratio.evaluate(self.fitparam_values)
+
+        self.assertEqual(log_lambda_t, log_lambda)
+        np.testing.assert_array_equal(grads_t, grads)
+
+    def test_close_thread_pool(self):
+        self.initialize_trial()
+
+        self.llhratio.n_threads = 3
+        (log_lambda, grads) = self.llhratio.evaluate(self.fitparam_values)
+        thread_pool = self.llhratio._thread_pool
+
+        # The thread pool is shut down, when it gets replaced.
+        self.llhratio.n_threads = 2
+        self.llhratio.evaluate(self.fitparam_values)
+        with self.assertRaises(RuntimeError):
+            thread_pool.submit(abs, -1)
+
+        thread_pool = self.llhratio._thread_pool
+        self.llhratio.close()
+        with self.assertRaises(RuntimeError):
+            thread_pool.submit(abs, -1)
+
+        # The thread pool is re-created when needed.
+        (log_lambda_c, grads_c) = self.llhratio.evaluate(self.fitparam_values)
+        self.assertEqual(log_lambda_c, log_lambda)
+        np.testing.assert_array_equal(grads_c, grads)
+
+    def test_evaluate_trials_threaded(self):
+        for (tdm, events, n_events) in zip(
+                self.tdm_list, self.events_list, self.n_events_list):
+            tdm.initialize_trials(
+                shg_mgr=self.shg_mgr,
+                pmm=self.pmm,
+                events_list=[events[np.arange(k, len(events), 2)]
+                             for k in range(2)],
+                n_events_list=[n_events//2, n_events//2])
+
+        fitparam_values = np.array([[1.5, 2.5], [3., 2.5]])
+
+        self.llhratio.n_threads = 1
+        (log_lambda, grads) = self.llhratio.evaluate_trials(fitparam_values)
+
+        self.llhratio.n_threads = 3
+        (log_lambda_t, grads_t) = self.llhratio.evaluate_trials(
+            fitparam_values)
+
+        np.testing.assert_array_equal(log_lambda_t, log_lambda)
+        np.testing.assert_array_equal(grads_t, grads)
+
+    def test_maximize_ns_for_trials(self):
+        trial_events_list = [
+            [events[np.arange(k, len(events), 2)] for k in range(2)]
+            for events in self.events_list
+        ]
+        # Use only a few pure background events, so that the maximum of each
+        # trial is at a positive value of ns.
+        trial_n_events_list = [
+            [len(events)+10 for events in events_list]
+            for events_list in trial_events_list
+        ]
+        for (tdm, events_list, n_events_list) in zip(
+                self.tdm_list, trial_events_list, trial_n_events_list):
+            tdm.initialize_trials(
+                shg_mgr=self.shg_mgr,
+                pmm=self.pmm,
+                events_list=events_list,
+                n_events_list=n_events_list)
+
+        (log_lambda, fitparam_values) = self.llhratio.maximize_ns_for_trials(
+            n_trials=2,
+            fitparam_values=self.fitparam_values)
+
+        for k in range(2):
+            for (tdm, events_list, n_events_list) in zip(
+                    self.tdm_list, trial_events_list, trial_n_events_list):
+                tdm.initialize_trial(
+                    shg_mgr=self.shg_mgr,
+                    pmm=self.pmm,
+                    events=events_list[k],
+                    n_events=n_events_list[k])
+            (ns_k, log_lambda_k) = maximize_ns(
+                self.llhratio, fitparam_values[k], ns_max=100)
+            self.assertGreater(ns_k, 0)
+            np.testing.assert_allclose(
+                fitparam_values[k, 0], ns_k, atol=1e-5)
+            np.testing.assert_allclose(log_lambda[k], log_lambda_k, atol=1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
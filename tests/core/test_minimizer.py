@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.minimizer import (
+    LBFGSMinimizerImpl,
+    Minimizer,
+    MultiStartMinimizer,
+)
+from skyllh.core.parameters import (
+    Parameter,
+    ParameterSet,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+
+
+def double_well_func(x):
+    """Double-well function with a local minimum at x~0.96 and the global
+    minimum at x~-1.04.
+    """
+    f = (x[0]**2 - 1)**2 + 0.3*x[0]
+    grads = np.array([4*x[0]*(x[0]**2 - 1) + 0.3])
+    return (f, grads)
+
+
+class FailingLBFGSMinimizerImpl(
+        LBFGSMinimizerImpl):
+    """L-BFGS minimizer implementation, whose first ``n_failures``
+    minimizations do not converge.
+    """
+    def __init__(self, n_failures, **kwargs):
+        super().__init__(**kwargs)
+
+        self.n_failures = n_failures
+        self.initials_list = []
+
+    def minimize(self, initials, bounds, func, func_args=None, **kwargs):
+        self.initials_list.append(np.copy(initials))
+        (xmin, fmin, status) = super().minimize(
+            initials, bounds, func, func_args, **kwargs)
+        if len(self.initials_list) <= self.n_failures:
+            status['warnflag'] = 2
+            status['task'] = 'CONVERGENCE: REL_REDUCTION_OF_F_<=_FACTR*EPSMCH'
+        return (xmin, fmin, status)
+
+
+class MultiStartMinimizer_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.cfg = Config()
+        self.paramset = ParameterSet(
+            Parameter('x', 0.9, valmin=-2, valmax=2))
+        self.minimize_kwargs = dict(func_provides_grads=True)
+
+    def test_global_minimum(self):
+        minimizer = Minimizer(LBFGSMinimizerImpl(cfg=self.cfg))
+        (xmin, fmin, status) = minimizer.minimize(
+            rss=RandomStateService(seed=1),
+            paramset=self.paramset,
+            func=double_well_func,
+            kwargs=self.minimize_kwargs)
+        self.assertAlmostEqual(xmin[0], 0.96, places=2)
+
+        minimizer = MultiStartMinimizer(
+            LBFGSMinimizerImpl(cfg=self.cfg),
+            n_candidates=8)
+        (xmin, fmin, status) = minimizer.minimize(
+            rss=RandomStateService(seed=1),
+            paramset=self.paramset,
+            func=double_well_func,
+            kwargs=self.minimize_kwargs)
+        self.assertAlmostEqual(xmin[0], -1.04, places=2)
+        self.assertEqual(status['skyllh_minimizer_n_candidates'], 9)
+        self.assertEqual(status['skyllh_minimizer_n_starts'], 1)
+        self.assertEqual(status['skyllh_minimizer_n_reps'], 0)
+
+    def test_grid_sampling(self):
+        minimizer = MultiStartMinimizer(
+            LBFGSMinimizerImpl(cfg=self.cfg),
+            n_candidates=4,
+            n_starts=2,
+            sampling='grid')
+        (xmin, fmin, status) = minimizer.minimize(
+            rss=RandomStateService(seed=1),
+            paramset=self.paramset,
+            func=double_well_func,
+            kwargs=self.minimize_kwargs)
+        self.assertAlmostEqual(xmin[0], -1.04, places=2)
+        self.assertEqual(status['skyllh_minimizer_n_candidates'], 5)
+        self.assertEqual(status['skyllh_minimizer_n_starts'], 2)
+
+    def test_repetitions(self):
+        impl = FailingLBFGSMinimizerImpl(n_failures=2, cfg=self.cfg)
+        minimizer = MultiStartMinimizer(impl, n_candidates=3)
+        (xmin, fmin, status) = minimizer.minimize(
+            rss=RandomStateService(seed=1),
+            paramset=self.paramset,
+            func=double_well_func,
+            kwargs=self.minimize_kwargs)
+        self.assertEqual(status['skyllh_minimizer_n_reps'], 2)
+        self.assertEqual(status['skyllh_minimizer_n_starts'], 3)
+
+        # The repetitions start from the candidates in the order of their
+        # function values.
+        candidates = minimizer.generate_candidates(
+            RandomStateService(seed=1), self.paramset)
+        fvals = [double_well_func(x)[0] for x in candidates]
+        np.testing.assert_array_equal(
+            impl.initials_list, candidates[np.argsort(fvals)][:3])
+
+    def test_not_converged(self):
+        impl = FailingLBFGSMinimizerImpl(n_failures=10, cfg=self.cfg)
+        minimizer = MultiStartMinimizer(
+            impl, n_candidates=2, max_repetitions=5)
+        with self.assertRaises(ValueError):
+            minimizer.minimize(
+                rss=RandomStateService(seed=1),
+                paramset=self.paramset,
+                func=double_well_func,
+                kwargs=self.minimize_kwargs)
+        self.assertEqual(len(impl.initials_list), 6)
+
+    def test_warm_start(self):
+        minimizer = MultiStartMinimizer(
+            LBFGSMinimizerImpl(cfg=self.cfg),
+            n_candidates=0,
+            warm_start=True)
+        rss = RandomStateService(seed=1)
+
+        minimizer.warm_start_key = 1
+        (xmin, fmin, status) = minimizer.minimize(
+            rss=rss,
+            paramset=self.paramset,
+            func=double_well_func,
+            kwargs=self.minimize_kwargs)
+        self.assertEqual(status['skyllh_minimizer_n_candidates'], 1)
+
+        candidates = minimizer.generate_candidates(rss, self.paramset)
+        np.testing.assert_array_equal(candidates, [[0.9], xmin])
+
+        # Other keys have no warm-start candidate.
+        minimizer.warm_start_key = 2
+        self.assertEqual(
+            len(minimizer.generate_candidates(rss, self.paramset)), 1)
+        minimizer.warm_start_key = None
+        self.assertEqual(
+            len(minimizer.generate_candidates(rss, self.paramset)), 1)
+
+        minimizer.warm_start_key = 1
+        minimizer.clear_warm_starts()
+        self.assertEqual(
+            len(minimizer.generate_candidates(rss, self.paramset)), 1)
+
+    def test_invalid_settings(self):
+        impl = LBFGSMinimizerImpl(cfg=self.cfg)
+        with self.assertRaises(ValueError):
+            MultiStartMinimizer(impl, sampling='random')
+        with self.assertRaises(ValueError):
+            MultiStartMinimizer(impl, n_starts=0)
+        with self.assertRaises(TypeError):
+            MultiStartMinimizer(impl, warm_start=1)
+        with self.assertRaises(TypeError):
+            MultiStartMinimizer(impl, n_candidates='many')
+
+    def test_int_castable_settings(self):
+        impl = LBFGSMinimizerImpl(cfg=self.cfg)
+        minimizer = MultiStartMinimizer(
+            impl, n_candidates=np.int64(8), n_starts=np.int32(2))
+        self.assertEqual(minimizer.n_candidates, 8)
+        self.assertIsInstance(minimizer.n_candidates, int)
+        self.assertEqual(minimizer.n_starts, 2)
+        self.assertIsInstance(minimizer.n_starts, int)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from skyllh.core.multiproc import (
+    WorkerPool,
+    create_seed_chunks,
+    limit_ncpu_by_memory,
+    parallelize,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.timing import (
+    TimeLord,
+    TaskTimer,
+)
+
+
+def draw_random_number(x, rss, tl=None):
+    with TaskTimer(tl, 'draw'):
+        return x + rss.random.uniform()
+
+
+def sum_random_numbers(x, rss):
+    # Uses nested multi-processing, which is done sequentially within the
+    # daemonic worker processes of a WorkerPool instance. The chunked
+    # scheduling makes the result independent of the number of processes.
+    return sum(parallelize(
+        func=draw_random_number,
+        args_list=[((x,), {}) for i in range(4)],
+        ncpu=2,
+        rss=rss,
+        chunksize=1))
+
+
+def raise_error_for_odd(x, rss):
+    if x % 2 == 1:
+        raise ValueError('error')
+    return x
+
+
+class parallelize_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.args_list = [((x,), {}) for x in range(23)]
+
+    def test_chunked_independent_of_ncpu(self):
+        ref_list = parallelize(
+            func=draw_random_number,
+            args_list=self.args_list,
+            ncpu=1,
+            rss=RandomStateService(seed=1),
+            chunksize=4)
+        self.assertEqual(len(ref_list), len(self.args_list))
+
+        for ncpu in (2, 3):
+            result_list = parallelize(
+                func=draw_random_number,
+                args_list=self.args_list,
+                ncpu=ncpu,
+                rss=RandomStateService(seed=1),
+                chunksize=4)
+            np.testing.assert_equal(result_list, ref_list)
+
+    def test_chunked_keeps_order(self):
+        np.testing.assert_equal(
+            np.floor(parallelize(
+                func=draw_random_number,
+                args_list=self.args_list,
+                ncpu=3,
+                rss=RandomStateService(seed=1),
+                chunksize=2)),
+            np.arange(len(self.args_list)))
+
+    def test_chunked_timelord(self):
+        tl = TimeLord()
+        parallelize(
+            func=draw_random_number,
+            args_list=self.args_list,
+            ncpu=3,
+            rss=RandomStateService(seed=1),
+            tl=tl,
+            chunksize=5)
+        self.assertEqual(
+            tl.get_task_record('draw').niter, len(self.args_list))
+
+    def test_invalid_chunksize(self):
+        with self.assertRaises(ValueError):
+            parallelize(
+                func=draw_random_number,
+                args_list=self.args_list,
+                ncpu=1,
+                rss=RandomStateService(seed=1),
+                chunksize=0)
+
+
+class create_seed_chunks_TestCase(
+        unittest.TestCase,
+):
+    def test_seeds_equal_parallelize(self):
+        args_list = [((x,), {}) for x in range(23)]
+        ref_list = parallelize(
+            func=draw_random_number,
+            args_list=args_list,
+            ncpu=1,
+            rss=RandomStateService(seed=1),
+            chunksize=4)
+
+        seed_chunks = create_seed_chunks(
+            len(args_list), 4, rss=RandomStateService(seed=1))
+        self.assertEqual(
+            [start_idx for (start_idx, _) in seed_chunks],
+            list(range(0, len(args_list), 4)))
+
+        result_list = [
+            start_idx + i + draw_random_number(
+                0, RandomStateService(seed=seed))
+            for (start_idx, seeds) in seed_chunks
+            for (i, seed) in enumerate(seeds)
+        ]
+        np.testing.assert_equal(result_list, ref_list)
+
+    def test_no_rss(self):
+        self.assertEqual(
+            create_seed_chunks(5, 2),
+            [(0, None), (2, None), (4, None)])
+
+
+class limit_ncpu_by_memory_TestCase(
+        unittest.TestCase,
+):
+    def test_no_memory_limit(self):
+        self.assertEqual(limit_ncpu_by_memory(4, [1, 2, 3], None), 3)
+        self.assertEqual(limit_ncpu_by_memory(2, [1, 2, 3], None), 2)
+
+    def test_memory_limit(self):
+        # The three largest tasks must fit into the memory at once.
+        self.assertEqual(limit_ncpu_by_memory(4, [1, 5, 3, 4], 12), 3)
+        self.assertEqual(limit_ncpu_by_memory(4, [1, 5, 3, 4], 13), 4)
+
+    def test_at_least_one_cpu(self):
+        self.assertEqual(limit_ncpu_by_memory(4, [10, 20], 5), 1)
+        self.assertEqual(limit_ncpu_by_memory(4, [], 5), 1)
+
+
+class WorkerPool_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.args_list = [((x,), {}) for x in range(10)]
+
+    def test_map_equals_parallelize(self):
+        ref_list = parallelize(
+            func=draw_random_number,
+            args_list=self.args_list,
+            ncpu=3,
+            rss=RandomStateService(seed=1))
+
+        rss = RandomStateService(seed=1)
+        with WorkerPool(func=draw_random_number, ncpu=3) as pool:
+            result_list = pool.map(
+                args_list=self.args_list,
+                rss=rss)
+        np.testing.assert_equal(result_list, ref_list)
+
+    def test_map_multiple_batches(self):
+        tl = TimeLord()
+        with WorkerPool(func=draw_random_number, ncpu=2) as pool:
+            for i in range(3):
+                result_list = pool.map(
+                    args_list=self.args_list,
+                    rss=RandomStateService(seed=i),
+                    tl=tl)
+                self.assertEqual(len(result_list), len(self.args_list))
+            self.assertTrue(pool.is_alive)
+        self.assertFalse(pool.is_alive)
+        self.assertEqual(tl.get_task_record('draw').niter, 30)
+
+    def test_map_chunked_equals_parallelize(self):
+        ref_list = parallelize(
+            func=draw_random_number,
+            args_list=self.args_list,
+            ncpu=1,
+            rss=RandomStateService(seed=1),
+            chunksize=3)
+
+        with WorkerPool(func=draw_random_number, ncpu=3) as pool:
+            for i in range(2):
+                result_list = pool.map(
+                    args_list=self.args_list,
+                    rss=RandomStateService(seed=1),
+                    chunksize=3)
+                np.testing.assert_equal(result_list, ref_list)
+
+    def test_map_single_cpu(self):
+        with WorkerPool(func=draw_random_number, ncpu=1) as pool:
+            result_list = pool.map(
+                args_list=self.args_list,
+                rss=RandomStateService(seed=1))
+        self.assertEqual(len(result_list), len(self.args_list))
+
+    def test_worker_exception(self):
+        # The exception is raised by the worker process, because the master
+        # process evaluates only the first task.
+        args_list = [((0,), {}), ((1,), {})]
+        with WorkerPool(func=raise_error_for_odd, ncpu=2) as pool:
+            with self.assertRaises(RuntimeError):
+                pool.map(
+                    args_list=args_list,
+                    rss=RandomStateService(seed=1))
+
+    def test_map_nested_parallelize(self):
+        ref_list = parallelize(
+            func=sum_random_numbers,
+            args_list=self.args_list,
+            ncpu=1,
+            rss=RandomStateService(seed=1),
+            chunksize=2)
+
+        with WorkerPool(func=sum_random_numbers, ncpu=3) as pool:
+            result_list = pool.map(
+                args_list=self.args_list,
+                rss=RandomStateService(seed=1),
+                chunksize=2)
+        np.testing.assert_allclose(result_list, ref_list)
+
+    def test_unclosed_pool_does_not_block_exit(self):
+        # A script that creates a pool without closing it must exit.
+        script = (
+            'from skyllh.core.multiproc import WorkerPool\n'
+            'pool = WorkerPool(func=abs, ncpu=3)\n'
+            'print(pool.map(args_list=[((-1,), {}), ((-2,), {})]))\n'
+        )
+        proc = subprocess.run(
+            [sys.executable, '-c', script],
+            capture_output=True,
+            timeout=60)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertEqual(proc.stdout.strip(), b'[1, 2]')
+
+
+if __name__ == '__main__':
+    unittest.main()
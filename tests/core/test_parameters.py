@@ -20,6 +20,9 @@ from skyllh.core.parameters import (
     ParameterModelMapper,
     ParameterSet,
 )
+from skyllh.core.random import (
+    RandomStateService,
+)
 
 
 GAMMA_GRID = [
@@ -280,6 +283,29 @@ class ParameterSet_TestCase(unittest.TestCase):
         bounds = self.paramset.floating_param_bounds
         np.testing.assert_almost_equal(bounds[0], [0.5, 1.6])
 
+    def test_generate_latin_hypercube_floating_param_initials(self):
+        p2 = Parameter('p2', 3.2, valmin=2.3, valmax=4.7)
+        paramset = ParameterSet((self.fixed_param, self.floating_param, p2))
+        initials = paramset.generate_latin_hypercube_floating_param_initials(
+            rss=RandomStateService(seed=1), n=10)
+        self.assertEqual(initials.shape, (10, 2))
+
+        # Each of the 10 intervals of each parameter contains one initial.
+        bounds = paramset.floating_param_bounds
+        u = (initials - bounds[:, 0]) / (bounds[:, 1] - bounds[:, 0])
+        for j in range(2):
+            np.testing.assert_array_equal(
+                np.sort(np.floor(u[:, j]*10)), np.arange(10))
+
+    def test_generate_grid_floating_param_initials(self):
+        p2 = Parameter('p2', 3.2, valmin=2.3, valmax=4.7)
+        paramset = ParameterSet((self.fixed_param, self.floating_param, p2))
+        initials = paramset.generate_grid_floating_param_initials(
+            n_per_param=2)
+        np.testing.assert_almost_equal(
+            initials,
+            [[0.775, 2.9], [0.775, 4.1], [1.325, 2.9], [1.325, 4.1]])
+
     def test_len(self):
         self.assertEqual(len(self.paramset), 2)
 
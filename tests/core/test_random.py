@@ -7,6 +7,7 @@ import numpy as np
 from skyllh.core.random import (
     RandomChoice,
     RandomStateService,
+    create_alias_table,
 )
 
 
@@ -37,6 +38,51 @@ class RandomChoice_TestCase(
 
         np.testing.assert_equal(np_items, rc_items)
 
+    def test_alias_table(self):
+        probs = np.concatenate((self.probs, np.zeros(10), [1.]))
+        probs /= np.sum(probs)
+        for n_seq in (1, 1024):
+            (prob, alias) = create_alias_table(probs, n_seq=n_seq)
+            self.assertTrue(np.all((prob >= 0) & (prob <= 1)))
+
+            # Reconstruct the probabilities from the alias table.
+            p = np.copy(prob)
+            np.add.at(p, alias, 1 - prob)
+            np.testing.assert_allclose(p / len(probs), probs, atol=1e-12)
+
+    def test_choice_alias(self):
+        random_choice = RandomChoice(
+            items=self.items,
+            probabilities=self.probs,
+            method='alias')
+        rc_items = random_choice(
+            rss=RandomStateService(seed=1),
+            size=200000)
+
+        freqs = np.bincount(rc_items, minlength=self.size) / len(rc_items)
+        np.testing.assert_allclose(freqs, self.probs, atol=5e-3)
+
+    def test_choice_invalid_method(self):
+        with self.assertRaises(ValueError):
+            RandomChoice(
+                items=self.items,
+                probabilities=self.probs,
+                method='invalid')
+
+    def test_choose_batch(self):
+        random_choice = RandomChoice(
+            items=self.items,
+            probabilities=self.probs)
+        rc_items = random_choice(
+            rss=RandomStateService(seed=1),
+            size=9)
+        rc_items_list = random_choice.choose_batch(
+            rss=RandomStateService(seed=1),
+            sizes=[2, 0, 7])
+
+        self.assertEqual([len(items) for items in rc_items_list], [2, 0, 7])
+        np.testing.assert_equal(np.concatenate(rc_items_list), rc_items)
+
 
 if __name__ == '__main__':
     unittest.main()
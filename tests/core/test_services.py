@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.dataset import (
+    Dataset,
+    DatasetData,
+)
+from skyllh.core.detsigyield import (
+    DetSigYieldBuilder,
+)
+from skyllh.core.flux_model import (
+    SteadyPointlikeFFM,
+)
+from skyllh.core.services import (
+    DetSigYieldService,
+)
+from skyllh.core.source_hypo_grouping import (
+    SourceHypoGroup,
+    SourceHypoGroupManager,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+
+
+class CountingDetSigYieldBuilder(
+        DetSigYieldBuilder):
+    """Detector signal yield builder, which counts the number of constructed
+    detector signal yields.
+    """
+    def __init__(self, use_factory=False, **kwargs):
+        super().__init__(**kwargs)
+
+        self.use_factory = use_factory
+        self.n_constructed = 0
+
+    def get_detsigyield_construction_factory(self):
+        if not self.use_factory:
+            return None
+        return self.construct_detsigyields
+
+    def construct_detsigyield(self, dataset, data, shg, ppbar=None):
+        self.n_constructed += 1
+        return object()
+
+    def construct_detsigyields(self, dataset, data, shgs, ppbar=None):
+        return [
+            self.construct_detsigyield(dataset, data, shg)
+            for shg in shgs
+        ]
+
+
+class DetSigYieldService_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.cfg = Config()
+
+        self.dataset_list = [
+            Dataset(
+                cfg=self.cfg,
+                name=f'TestData{i}',
+                exp_pathfilenames=None,
+                mc_pathfilenames=None,
+                livetime=None,
+                version=1,
+                default_sub_path_fmt='testdata')
+            for i in range(2)
+        ]
+        self.data_list = [
+            DatasetData(data_exp=None, data_mc=None, livetime=1)
+            for _ in self.dataset_list
+        ]
+
+    def create_shg_mgr(self, builder, decs, phi0s):
+        return SourceHypoGroupManager([
+            SourceHypoGroup(
+                sources=PointLikeSource(ra=0, dec=dec),
+                fluxmodel=SteadyPointlikeFFM(
+                    Phi0=phi0, energy_profile=None, cfg=self.cfg),
+                detsigyield_builders=builder)
+            for (dec, phi0) in zip(decs, phi0s)
+        ])
+
+    def _test_shared_detsigyields(self, use_factory):
+        builder = CountingDetSigYieldBuilder(
+            use_factory=use_factory, cfg=self.cfg)
+
+        shg_mgr = self.create_shg_mgr(
+            builder, decs=[0, 0.1, 0.2], phi0s=[1, 1, 2])
+        service = DetSigYieldService(
+            shg_mgr=shg_mgr,
+            dataset_list=self.dataset_list,
+            data_list=self.data_list)
+
+        # Two distinct flux models for two datasets.
+        self.assertEqual(builder.n_constructed, 4)
+        arr = service.arr
+        self.assertEqual(arr.shape, (2, 3))
+        self.assertIs(arr[0, 0], arr[0, 1])
+        self.assertIsNot(arr[0, 0], arr[0, 2])
+        self.assertIsNot(arr[0, 0], arr[1, 0])
+
+        # Changing the sources with the same flux models must not construct
+        # new detector signal yields.
+        service.change_shg_mgr(
+            self.create_shg_mgr(
+                builder, decs=[0.5, -0.5], phi0s=[1, 2]))
+        self.assertEqual(builder.n_constructed, 4)
+        self.assertIs(service.arr[0, 0], arr[0, 0])
+        self.assertIs(service.arr[1, 1], arr[1, 2])
+
+        # A new flux model requires new detector signal yields.
+        service.change_shg_mgr(
+            self.create_shg_mgr(
+                builder, decs=[0.5], phi0s=[3]))
+        self.assertEqual(builder.n_constructed, 6)
+
+    def test_shared_detsigyields(self):
+        self._test_shared_detsigyields(use_factory=False)
+
+    def test_shared_detsigyields_with_factory(self):
+        self._test_shared_detsigyields(use_factory=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
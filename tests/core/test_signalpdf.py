@@ -17,6 +17,7 @@ from skyllh.core.config import (
 )
 from skyllh.core.flux_model import (
     BoxTimeFluxProfile,
+    GaussianTimeFluxProfile,
 )
 from skyllh.core.livetime import (
     Livetime,
@@ -31,6 +32,7 @@ from skyllh.core.source_model import (
     SourceModel,
 )
 from skyllh.core.trialdata import (
+    SourceEventPairs,
     TrialDataManager,
 )
 
@@ -44,6 +46,7 @@ def create_tdm(n_sources, n_selected_events):
         'trial_data_state_id',
         'get_n_values',
         'src_evt_idxs',
+        'src_evt_pairs',
         'n_sources',
         'n_selected_events',
         'get_data'])
@@ -61,6 +64,9 @@ def create_tdm(n_sources, n_selected_events):
         np.repeat(np.arange(n_sources), n_selected_events),
         np.tile(np.arange(n_selected_events), n_sources)
     )
+    tdm.src_evt_pairs = SourceEventPairs.from_all_pairs(
+        n_sources=n_sources,
+        n_events=n_selected_events)
     tdm.n_sources = n_sources
     tdm.n_selected_events = n_selected_events
     tdm.get_data = tdm_get_data
@@ -126,6 +132,96 @@ class SignalTimePDFTestCase(
 
         self.assertEqual(grads, {})
 
+    def _get_single_source_pd(self, time_flux_profile):
+        """Calculates the probability density values of a single source
+        using a separate SignalTimePDF instance for the given time flux profile.
+        """
+        tdm = create_tdm(n_sources=1, n_selected_events=3)
+        sig_time_pdf = SignalTimePDF(
+            livetime=self.livetime,
+            time_flux_profile=time_flux_profile,
+            cfg=self.cfg)
+        (pd, grads) = sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=np.empty((1,), dtype=[]))
+        return pd
+
+    def test_get_pd_multiple_sources_gaussian(self):
+        tdm = create_tdm(n_sources=2, n_selected_events=3)
+        params_recarray = np.array(
+            [(3., 1.), (8., 1.)],
+            dtype=[('t0', np.float64), ('sigma_t', np.float64)])
+
+        sig_time_pdf = SignalTimePDF(
+            livetime=self.livetime,
+            time_flux_profile=GaussianTimeFluxProfile(
+                t0=5, sigma_t=1, cfg=self.cfg),
+            cfg=self.cfg)
+        (pd, grads) = sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=params_recarray)
+
+        for (src_idx, (t0, sigma_t)) in enumerate(params_recarray):
+            pd_src = self._get_single_source_pd(
+                GaussianTimeFluxProfile(
+                    t0=t0, sigma_t=sigma_t, cfg=self.cfg))
+            np.testing.assert_allclose(
+                pd[src_idx*3:(src_idx+1)*3], pd_src, rtol=1e-15)
+
+    def test_get_pd_multiple_sources_box(self):
+        tdm = create_tdm(n_sources=2, n_selected_events=3)
+        params_recarray = np.array(
+            [(2., 4.), (8., 4.)],
+            dtype=[('t0', np.float64), ('tw', np.float64)])
+
+        (pd, grads) = self.sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=params_recarray)
+
+        for (src_idx, (t0, tw)) in enumerate(params_recarray):
+            pd_src = self._get_single_source_pd(
+                BoxTimeFluxProfile(t0=t0, tw=tw, cfg=self.cfg))
+            np.testing.assert_allclose(
+                pd[src_idx*3:(src_idx+1)*3], pd_src, rtol=1e-15)
+
+    def test_get_pd_new_trial_data(self):
+        tdm = create_tdm(n_sources=2, n_selected_events=3)
+        params_recarray = np.empty((2,), dtype=[])
+
+        (pd, grads) = self.sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=params_recarray)
+
+        # Move the second event into a detector off-time interval. The PDF
+        # values must be recalculated for the new trial data state.
+        tdm.get_data = lambda key: np.array([0, 6, 9.7])
+        tdm.trial_data_state_id += 1
+
+        (pd, grads) = self.sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=params_recarray)
+
+        np.testing.assert_almost_equal(
+            pd,
+            np.array([
+                1/self.S,
+                0.,
+                1/self.S,
+                1/self.S,
+                0.,
+                1/self.S,
+            ]))
+
+        # Move the second event into a detector on-time interval.
+        tdm.get_data = lambda key: np.array([0, 4, 9.7])
+        tdm.trial_data_state_id += 1
+
+        (pd, grads) = self.sig_time_pdf.get_pd(
+            tdm=tdm,
+            params_recarray=params_recarray)
+
+        np.testing.assert_almost_equal(pd, np.full((6,), 1/self.S))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from skyllh.core import (
+    tool,
+)
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.detsigyield import (
+    NullDetSigYieldBuilder,
+)
+from skyllh.core.flux_model import (
+    SteadyPointlikeFFM,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.source_hypo_grouping import (
+    SourceHypoGroup,
+    SourceHypoGroupManager,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+from skyllh.core.utils.coords import (
+    angular_separation,
+)
+from skyllh.core.utils.trials import (
+    AppendableNPYFile,
+)
+
+HEALPY_AVAILABLE = tool.is_available('healpy')
+if HEALPY_AVAILABLE:
+    from skyllh.core.sky_scan import (
+        HEALPixSkyScan,
+    )
+
+
+class GaussianHotspotAnalysis(
+        object):
+    """Fake single source analysis, which test-statistic value is a Gaussian
+    function of the angular distance of the source to a hotspot.
+    """
+    def __init__(self, ra, dec, sigma=0.1):
+        self.cfg = Config()
+        self.shg_mgr = SourceHypoGroupManager(
+            SourceHypoGroup(
+                sources=PointLikeSource(ra=0, dec=0),
+                fluxmodel=SteadyPointlikeFFM(
+                    Phi0=1, energy_profile=None, cfg=self.cfg),
+                detsigyield_builders=NullDetSigYieldBuilder(cfg=self.cfg)))
+
+        self.hotspot_ra = ra
+        self.hotspot_dec = dec
+        self.sigma = sigma
+
+    @property
+    def source(self):
+        return self.shg_mgr.shg_list[0].source_list[0]
+
+    def change_source(self, source):
+        self.shg_mgr.shg_list[0].source_list[0] = source
+
+    def unblind(self, minimizer_rss, tl=None):
+        psi = angular_separation(
+            np.array([self.source.ra]), np.array([self.source.dec]),
+            self.hotspot_ra, self.hotspot_dec)[0]
+        ts = 100*np.exp(-0.5*(psi/self.sigma)**2)
+        params = dict(
+            ns=ts/10,
+            gamma=minimizer_rss.random.uniform(1, 4))
+        return (ts, params, dict())
+
+
+@unittest.skipIf(not HEALPY_AVAILABLE, 'healpy not available!')
+class HEALPixSkyScan_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.hp = tool.get('healpy')
+        self.ana = GaussianHotspotAnalysis(ra=1.2, dec=0.4)
+
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathfilename = os.path.join(self.tmpdir.name, 'scan.npy')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def create_scan(self, **kwargs):
+        return HEALPixSkyScan(
+            ana=self.ana,
+            nside=2,
+            nside_max=8,
+            refine_n_hotspots=1,
+            **kwargs)
+
+    def test_nside_max(self):
+        with self.assertRaises(ValueError):
+            HEALPixSkyScan(ana=self.ana, nside=4, nside_max=2)
+        with self.assertRaises(ValueError):
+            HEALPixSkyScan(ana=self.ana, nside=3)
+
+        scan = HEALPixSkyScan(ana=self.ana, nside=2, nside_max=16)
+        self.assertEqual(scan.nside_list, [2, 4, 8, 16])
+
+    def test_run(self):
+        source = self.ana.source
+        scan = self.create_scan()
+        results = scan.run(rss=RandomStateService(seed=1), ncpu=1)
+
+        # The initial level covers the entire sky.
+        self.assertEqual(
+            np.count_nonzero(results['nside'] == 2),
+            self.hp.nside2npix(2))
+        # The refined levels contain the sub-pixels of the hotspot and its
+        # neighbours.
+        for nside in (4, 8):
+            r = results[results['nside'] == nside//2]
+            ipix = r['ipix'][np.argmax(r['ts'])]
+            neighbours = self.hp.get_all_neighbours(nside//2, ipix, nest=True)
+            n_parents = 1 + np.count_nonzero(neighbours >= 0)
+            self.assertEqual(
+                np.count_nonzero(results['nside'] == nside), 4*n_parents)
+
+        # The pixel with the largest TS value of the finest level contains
+        # the hotspot.
+        r = results[results['nside'] == 8]
+        self.assertEqual(
+            r['ipix'][np.argmax(r['ts'])],
+            self.hp.ang2pix(8, np.pi/2 - 0.4, 1.2, nest=True))
+
+        np.testing.assert_allclose(results['ns'], results['ts']/10)
+
+        # The source of the analysis is restored.
+        self.assertIs(self.ana.source, source)
+
+    def test_run_dec_range(self):
+        scan = self.create_scan(dec_range=(0, np.pi/2))
+        results = scan.run(rss=RandomStateService(seed=1), ncpu=1)
+
+        self.assertTrue(np.all(results['dec'] >= 0))
+        (theta, phi) = self.hp.pix2ang(2, np.arange(self.hp.nside2npix(2)))
+        self.assertEqual(
+            np.count_nonzero(results['nside'] == 2),
+            np.count_nonzero(theta <= np.pi/2))
+
+    def test_run_parallel(self):
+        results1 = self.create_scan().run(
+            rss=RandomStateService(seed=1), ncpu=1)
+        results2 = self.create_scan().run(
+            rss=RandomStateService(seed=1), ncpu=2, chunksize=3)
+
+        np.testing.assert_array_equal(results1, results2)
+
+    def test_run_resume(self):
+        results = self.create_scan().run(
+            rss=RandomStateService(seed=1), ncpu=1)
+
+        scan = self.create_scan(pathfilename=self.pathfilename)
+        scan.run(rss=RandomStateService(seed=1), ncpu=1, blocksize=10)
+
+        # Simulate an interruption of the scan within the second level.
+        with AppendableNPYFile(self.pathfilename, append=True) as writer:
+            writer.truncate(60)
+
+        resumed_results = scan.run(
+            rss=RandomStateService(seed=1), ncpu=1, blocksize=10)
+
+        self.assertEqual(len(np.load(self.pathfilename)), len(results))
+
+        sidx = np.lexsort((results['ipix'], results['nside']))
+        resumed_sidx = np.lexsort(
+            (resumed_results['ipix'], resumed_results['nside']))
+        np.testing.assert_array_equal(
+            resumed_results[resumed_sidx], results[sidx])
+
+    def test_run_resume_config_mismatch(self):
+        scan = self.create_scan(pathfilename=self.pathfilename)
+        scan.run(rss=RandomStateService(seed=1), ncpu=1)
+        n_results = len(np.load(self.pathfilename))
+
+        # A different seed of the random state service.
+        with self.assertRaises(ValueError):
+            scan.run(rss=RandomStateService(seed=2), ncpu=1)
+
+        # Different settings of the scan.
+        with self.assertRaises(ValueError):
+            self.create_scan(
+                pathfilename=self.pathfilename,
+                dec_range=(0, np.pi/2)).run(
+                    rss=RandomStateService(seed=1), ncpu=1)
+        with self.assertRaises(ValueError):
+            HEALPixSkyScan(
+                ana=self.ana,
+                nside=2,
+                nside_max=4,
+                pathfilename=self.pathfilename).run(
+                    rss=RandomStateService(seed=1), ncpu=1)
+
+        # The existing scan file is left untouched.
+        self.assertEqual(len(np.load(self.pathfilename)), n_results)
+
+        # A scan file without configuration file is not resumed.
+        os.remove(self.pathfilename + '.config')
+        with self.assertRaises(ValueError):
+            scan.run(rss=RandomStateService(seed=1), ncpu=1)
+
+    def test_create_map(self):
+        scan = self.create_scan()
+        results = scan.run(rss=RandomStateService(seed=1), ncpu=1)
+
+        m = scan.create_map(results, nest=True)
+        self.assertEqual(len(m), self.hp.nside2npix(8))
+        self.assertFalse(np.any(np.isnan(m)))
+
+        r = results[results['nside'] == 8]
+        np.testing.assert_array_equal(m[r['ipix']], r['ts'])
+
+        r = results[results['nside'] == 2]
+        self.assertEqual(m[16*r['ipix'][0]], r['ts'][0])
+
+        m_ring = scan.create_map(results)
+        np.testing.assert_array_equal(
+            m_ring, self.hp.reorder(m, n2r=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
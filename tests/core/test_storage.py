@@ -1,10 +1,23 @@
 # -*- coding: utf-8 -*-
 
+import os
+import os.path
+import tempfile
 import unittest
+from unittest.mock import (
+    patch,
+)
 import numpy as np
 from numpy.testing import assert_array_almost_equal
 
-from skyllh.core.storage import DataFieldRecordArray
+from skyllh.core.cache import (
+    DiskCache,
+)
+from skyllh.core.storage import (
+    DataFieldRecordArray,
+    NPYFileLoader,
+    TextFileLoader,
+)
 
 
 class DataFieldRecordArray_TestCase(unittest.TestCase):
@@ -152,6 +165,23 @@ class DataFieldRecordArray_TestCase(unittest.TestCase):
             self.arr['field3'],
             np.array([3.5, 3.4, 3.1, 3.3, 3.2], dtype=np.float64))
 
+    def test_concatenate(self):
+        arr2 = DataFieldRecordArray(dict(
+            field1=np.array([4.1, 4.2]),
+            field2=np.array([5.1, 5.2]),
+            field3=np.array([6.1, 6.2])))
+        arr = DataFieldRecordArray.concatenate([self.arr, arr2])
+        self.assertEqual(len(arr), self.arr_len + 2)
+        self.assertEqual(arr.field_name_list, self.arr.field_name_list)
+        assert_array_almost_equal(
+            arr['field2'],
+            np.concatenate((self.field2, arr2['field2'])))
+
+        self.assertIs(DataFieldRecordArray.concatenate([self.arr]), self.arr)
+
+        with self.assertRaises(ValueError):
+            DataFieldRecordArray.concatenate([])
+
     def test_tidy_up(self):
         self.arr.tidy_up('field2')
         self.assertEqual(len(self.arr.field_name_list), 1)
@@ -172,5 +202,134 @@ class DataFieldRecordArray_TestCase(unittest.TestCase):
         self.assertTrue('field3' in self.arr)
 
 
+class NPYFileLoader_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathfilename = os.path.join(self.tmpdir.name, 'data.npy')
+        self.arr = np.zeros(
+            (5,),
+            dtype=[('ra', np.float64), ('dec', np.float64), ('n', np.int64)])
+        self.arr['ra'] = np.linspace(0, 1, 5)
+        self.arr['dec'] = np.linspace(-1, 0, 5)
+        self.arr['n'] = np.arange(5)
+        np.save(self.pathfilename, self.arr)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_data_mmap(self):
+        loader = NPYFileLoader(self.pathfilename)
+        data = loader.load_data(
+            keep_fields=['ra', 'n'],
+            dtype_conversions={np.dtype(np.int64): np.dtype(np.int32)},
+            efficiency_mode='mmap')
+
+        self.assertEqual(data.field_name_list, ['ra', 'n'])
+        np.testing.assert_array_equal(data['ra'], self.arr['ra'])
+        np.testing.assert_array_equal(data['n'], self.arr['n'])
+
+        # The not converted field is a view into the memory mapped file,
+        # whereas the converted field is a copy.
+        self.assertIsInstance(data['ra'], np.memmap)
+        self.assertNotIsInstance(data['n'], np.memmap)
+        self.assertEqual(data.get_field_dtype('n'), np.dtype(np.int32))
+
+        # In-place modifications must not alter the file.
+        data['ra'][0] = 42.
+        self.assertEqual(data['ra'][0], 42.)
+        np.testing.assert_array_equal(
+            np.load(self.pathfilename)['ra'], self.arr['ra'])
+
+    def test_load_data_mmap_multiple_files(self):
+        loader = NPYFileLoader([self.pathfilename, self.pathfilename])
+        data = loader.load_data(efficiency_mode='mmap')
+
+        self.assertEqual(len(data), 10)
+        np.testing.assert_array_equal(
+            data['dec'], np.concatenate((self.arr['dec'], self.arr['dec'])))
+
+    def test_load_data_parallel(self):
+        pathfilenames = []
+        for i in range(3):
+            pathfilename = os.path.join(self.tmpdir.name, f'data{i}.npy')
+            arr = self.arr.copy()
+            arr['n'] += 10*i
+            np.save(pathfilename, arr)
+            pathfilenames.append(pathfilename)
+
+        ref_data = NPYFileLoader(pathfilenames).load_data()
+        data = NPYFileLoader(pathfilenames).load_data(ncpu=2)
+        self.assertEqual(data.field_name_list, ref_data.field_name_list)
+        for fname in ref_data.field_name_list:
+            np.testing.assert_array_equal(data[fname], ref_data[fname])
+
+        # A memory limit smaller than two files must give the same result.
+        data = NPYFileLoader(pathfilenames).load_data(
+            ncpu=2,
+            max_memory=os.path.getsize(pathfilenames[0]))
+        np.testing.assert_array_equal(data['n'], ref_data['n'])
+
+    def test_load_data_unknown_argument(self):
+        with self.assertRaises(TypeError):
+            NPYFileLoader(self.pathfilename).load_data(n_cpu=2)
+
+
+class TextFileLoader_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathfilename = os.path.join(self.tmpdir.name, 'data.csv')
+        with open(self.pathfilename, 'w') as f:
+            f.write('# a b c\n')
+            f.write('1.0 2.0 3.0\n')
+            f.write('4.0 5.0 6.0\n')
+        self.cache = DiskCache(os.path.join(self.tmpdir.name, 'cache'))
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_load_data_cache(self):
+        ref_data = TextFileLoader(self.pathfilename).load_data(
+            keep_fields=['a', 'c'])
+
+        loader = TextFileLoader(self.pathfilename, cache=self.cache)
+        data = loader.load_data(keep_fields=['a', 'c'])
+        self.assertEqual(len(self.cache.get_entry_keys()), 1)
+        self.assertEqual(data.field_name_list, ref_data.field_name_list)
+
+        # The second load must not parse the text file.
+        with patch.object(
+                TextFileLoader, '_parse_file',
+                side_effect=AssertionError('The file was parsed!')):
+            data = loader.load_data(keep_fields=['a', 'c'])
+            all_data = loader.load_data()
+        self.assertEqual(data.field_name_list, ['a', 'c'])
+        np.testing.assert_array_equal(data['a'], ref_data['a'])
+        np.testing.assert_array_equal(data['c'], ref_data['c'])
+        self.assertEqual(all_data.field_name_list, ['a', 'b', 'c'])
+
+        with self.assertRaises(ValueError):
+            loader.load_data(keep_fields=['d'])
+
+    def test_cache_invalidation(self):
+        loader = TextFileLoader(self.pathfilename, cache=self.cache)
+        key1 = loader.build_cache()[0]
+
+        # Modifying the file must change the cache key.
+        with open(self.pathfilename, 'a') as f:
+            f.write('7.0 8.0 9.0\n')
+        st = os.stat(self.pathfilename)
+        os.utime(
+            self.pathfilename,
+            ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        key2 = loader.build_cache()[0]
+        self.assertNotEqual(key1, key2)
+        np.testing.assert_array_equal(loader.load_data()['b'], [2., 5., 8.])
+
+    def test_build_cache_without_cache(self):
+        with self.assertRaises(ValueError):
+            TextFileLoader(self.pathfilename).build_cache()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+import numpy as np
+
+from skyllh.core.multiproc import (
+    parallelize,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.timing import (
+    MASTER_WORKER_NAME,
+    TaskRecord,
+    TaskTimer,
+    TimeLord,
+    get_active_time_lord,
+    instrument_methods,
+    uninstrument_methods,
+)
+
+
+class DummyPDF(
+        object):
+    def __init__(self):
+        self.rss = RandomStateService(seed=1)
+
+    def get_pd(self, x):
+        return self.rss.random.uniform(size=x)
+
+
+def busy_wait(duration):
+    t0 = time.process_time()
+    while time.process_time() - t0 < duration:
+        pass
+
+
+def evaluate_pdf(pdf, x, tl=None):
+    return pdf.get_pd(x)
+
+
+class TaskRecord_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.tr = TaskRecord(
+            name='task',
+            start_times=[0., 1., 2., 3.],
+            end_times=[1., 3., 5., 7.],
+            workers=[None, 'worker-1', 'worker-1', None])
+
+    def test_durations(self):
+        np.testing.assert_array_equal(self.tr.durations, [1, 2, 3, 4])
+        self.assertEqual(self.tr.duration, 7)
+        self.assertEqual(self.tr.get_percentiles(50), 2.5)
+
+    def test_get_worker_task_records(self):
+        worker_trs = self.tr.get_worker_task_records()
+        self.assertEqual(
+            set(worker_trs.keys()), {MASTER_WORKER_NAME, 'worker-1'})
+        self.assertEqual(worker_trs[MASTER_WORKER_NAME].niter, 2)
+        self.assertEqual(worker_trs['worker-1'].tstart, [1., 2.])
+
+    def test_to_dict(self):
+        d = self.tr.to_dict(percentiles=(50, 100))
+        self.assertEqual(d['niter'], 4)
+        self.assertEqual(d['total_duration'], 10)
+        self.assertEqual(d['percentiles'], {'p50': 2.5, 'p100': 4})
+        self.assertIsNone(d['total_mem_delta'])
+        self.assertEqual(d['workers']['worker-1']['niter'], 2)
+
+    def test_invalid_workers(self):
+        with self.assertRaises(ValueError):
+            TaskRecord('task', [0.], [1.], workers=[None, None])
+
+
+class TimeLord_TestCase(
+        unittest.TestCase):
+    def test_folded_stacks(self):
+        tl = TimeLord()
+        with TaskTimer(tl, 'outer'):
+            busy_wait(0.02)
+            with TaskTimer(tl, 'inner'):
+                busy_wait(0.02)
+
+        self.assertEqual(tl.task_stack, [])
+
+        lines = tl.get_folded_stacks()
+        self.assertEqual(len(lines), 2)
+        stacks = dict(line.rsplit(' ', 1) for line in lines)
+        self.assertEqual(
+            set(stacks.keys()),
+            {f'{MASTER_WORKER_NAME};outer',
+             f'{MASTER_WORKER_NAME};outer;inner'})
+
+        # The value of the outer task is its self time.
+        inner = tl.get_task_record('inner').duration
+        outer = tl.get_task_record('outer').duration
+        self.assertAlmostEqual(
+            int(stacks[f'{MASTER_WORKER_NAME};outer'])*1e-6,
+            outer - inner,
+            places=5)
+
+    def test_join_worker(self):
+        tl = TimeLord()
+        with TaskTimer(tl, 'task'):
+            pass
+
+        worker_tl = tl.empty_copy()
+        with TaskTimer(worker_tl, 'task'):
+            pass
+        tl.join(worker_tl, worker='worker-1')
+
+        self.assertEqual(
+            tl.get_task_record('task').workers, [None, 'worker-1'])
+        # The records of the joined TimeLord instance are not modified.
+        self.assertEqual(worker_tl.get_task_record('task').workers, [None])
+
+        tl = TimeLord()
+        tl.add_stack_duration(('task',), 1)
+        tl.join(worker_tl, worker='worker-1')
+        self.assertEqual(
+            tl.get_folded_stacks()[0], f'{MASTER_WORKER_NAME};task 1000000')
+
+    def test_track_memory(self):
+        if not tracemalloc.is_tracing():
+            self.addCleanup(tracemalloc.stop)
+
+        tl = TimeLord(track_memory=True)
+        with TaskTimer(tl, 'alloc'):
+            arr = np.ones(1000000)
+
+        mem_delta = tl.get_task_record('alloc').mem_deltas[0]
+        self.assertGreaterEqual(mem_delta, arr.nbytes)
+
+        with TaskTimer(TimeLord(), 'no_tracking') as tt:
+            pass
+        self.assertIsNone(tt._mem_start)
+
+    def test_save_json(self):
+        tl = TimeLord()
+        with TaskTimer(tl, 'task1'):
+            busy_wait(0.01)
+        with TaskTimer(tl, 'task2'):
+            pass
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pathfilename = os.path.join(tmpdir, 'profile.json')
+            tl.save_json(pathfilename)
+            with open(pathfilename) as fp:
+                d = json.load(fp)
+
+        self.assertEqual(
+            [task['name'] for task in d['tasks']], ['task1', 'task2'])
+        self.assertEqual(d['tasks'][0]['niter'], 1)
+
+    def test_activation(self):
+        self.assertIsNone(get_active_time_lord())
+        tl1 = TimeLord()
+        tl2 = TimeLord()
+        with tl1:
+            with tl2:
+                self.assertIs(get_active_time_lord(), tl2)
+            self.assertIs(get_active_time_lord(), tl1)
+        self.assertIsNone(get_active_time_lord())
+
+
+class instrument_methods_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.pdf = DummyPDF()
+        self.instrumented_methods = instrument_methods(
+            self.pdf, method_names=['get_pd', 'reseed'])
+
+    def tearDown(self):
+        uninstrument_methods()
+
+    def test_instrument_methods(self):
+        self.assertEqual(
+            set(self.instrumented_methods),
+            {(DummyPDF, 'get_pd'), (RandomStateService, 'reseed')})
+
+        # Instrumenting again does not wrap the methods twice.
+        self.assertEqual(
+            instrument_methods(self.pdf, method_names=['get_pd']), [])
+
+        # Without active TimeLord instance nothing is recorded.
+        tl = TimeLord()
+        self.pdf.get_pd(3)
+        self.assertEqual(tl.task_name_list, [])
+
+        with tl:
+            self.pdf.get_pd(3)
+            self.pdf.get_pd(3)
+            self.pdf.rss.reseed(1)
+        self.assertEqual(tl.get_task_record('DummyPDF.get_pd').niter, 2)
+        self.assertEqual(
+            tl.get_task_record('RandomStateService.reseed').niter, 1)
+
+    def test_uninstrument_methods(self):
+        uninstrument_methods()
+
+        self.assertEqual(DummyPDF.get_pd.__name__, 'get_pd')
+        self.assertFalse(hasattr(DummyPDF.get_pd, '__wrapped__'))
+
+    def test_parallelize(self):
+        tl = TimeLord()
+        parallelize(
+            func=evaluate_pdf,
+            args_list=[((self.pdf, 2), {}) for _ in range(6)],
+            ncpu=2,
+            tl=tl,
+            chunksize=1)
+
+        tr = tl.get_task_record('DummyPDF.get_pd')
+        self.assertEqual(tr.niter, 6)
+        self.assertTrue(set(tr.workers) <= {None, 'worker-1'})
+
+        for line in tl.get_folded_stacks():
+            self.assertTrue(
+                line.startswith(f'{MASTER_WORKER_NAME};') or
+                line.startswith('worker-1;'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+
+import numpy as np
+
+from skyllh.core.trialdata import (
+    SourceEventPairs,
+)
+
+
+class SourceEventPairs_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        # Source 1 has no events. The pairs are not sorted by source.
+        self.src_idxs = np.array([2, 0, 2, 0, 3])
+        self.evt_idxs = np.array([1, 0, 3, 2, 1])
+        self.pairs = SourceEventPairs.from_src_evt_idxs(
+            src_idxs=self.src_idxs,
+            evt_idxs=self.evt_idxs,
+            n_sources=4,
+            n_events=4)
+
+    def test_from_src_evt_idxs(self):
+        pairs = self.pairs
+        self.assertEqual(pairs.n_sources, 4)
+        self.assertEqual(pairs.n_events, 4)
+        self.assertEqual(pairs.n_values, 5)
+        np.testing.assert_array_equal(pairs.src_offsets, [0, 2, 2, 4, 5])
+        np.testing.assert_array_equal(pairs.src_idxs, [0, 0, 2, 2, 3])
+        np.testing.assert_array_equal(pairs.evt_idxs, [0, 2, 1, 3, 1])
+
+    def test_from_all_pairs(self):
+        pairs = SourceEventPairs.from_all_pairs(n_sources=2, n_events=3)
+        np.testing.assert_array_equal(pairs.src_idxs, [0, 0, 0, 1, 1, 1])
+        np.testing.assert_array_equal(pairs.evt_idxs, [0, 1, 2, 0, 1, 2])
+
+    def test_get_values_slice(self):
+        self.assertEqual(self.pairs.get_values_slice(2), slice(2, 4))
+        self.assertEqual(self.pairs.get_values_slice(1), slice(2, 2))
+
+    def test_get_values_mask_for_source_mask(self):
+        mask = self.pairs.get_values_mask_for_source_mask(
+            np.array([True, True, False, True]))
+        np.testing.assert_array_equal(
+            mask, [True, True, False, False, True])
+
+    def test_gather(self):
+        np.testing.assert_array_equal(
+            self.pairs.gather_sources(np.array([1., 2., 3., 4.])),
+            [1, 1, 3, 3, 4])
+        np.testing.assert_array_equal(
+            self.pairs.gather_sources(np.array([5.])),
+            [5, 5, 5, 5, 5])
+        np.testing.assert_array_equal(
+            self.pairs.gather_events(np.array([10., 11., 12., 13.])),
+            [10, 12, 11, 13, 11])
+        with self.assertRaises(ValueError):
+            self.pairs.gather_sources(np.array([1., 2.]))
+
+    def test_sum_per_source(self):
+        np.testing.assert_array_equal(
+            self.pairs.sum_per_source(np.array([1., 2., 3., 4., 5.])),
+            [3, 0, 7, 5])
+
+    def test_sum_per_event(self):
+        values = np.array([1., 2., 3., 4., 5.])
+        np.testing.assert_array_equal(
+            self.pairs.sum_per_event(values),
+            [1, 8, 2, 4])
+        np.testing.assert_array_equal(
+            self.pairs.sum_per_event(
+                values, src_weights=np.array([1., 0., 2., 3.])),
+            [1, 21, 2, 8])
+
+    def test_remap_events(self):
+        self.pairs.remap_events(np.array([3, 2, 1, 0]))
+        np.testing.assert_array_equal(self.pairs.evt_idxs, [3, 1, 2, 0, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.utils.analysis import (
+    create_trial_data_file,
+    extend_trial_data_file,
+)
+from skyllh.core.utils.trials import (
+    AppendableNPYFile,
+    load_trial_data_file,
+)
+
+
+class FakeAnalysis(
+        object,
+):
+    """Fake analysis class generating trials with random TS values.
+    """
+    def __init__(self, fail_after=None):
+        self.cfg = Config()
+        self.fail_after = fail_after
+        self.n_calls = 0
+
+    def do_trials(self, rss, n, mean_n_sig=0, mean_n_sig_0=0, **kwargs):
+        if (self.fail_after is not None) and (self.n_calls == self.fail_after):
+            raise KeyboardInterrupt()
+        self.n_calls += 1
+
+        trials = np.empty(
+            (n,),
+            dtype=[
+                ('seed', np.int64),
+                ('mean_n_sig', np.float64),
+                ('mean_n_sig_0', np.float64),
+                ('ts', np.float64)
+            ]).view(np.recarray)
+        trials['seed'] = rss.seed
+        trials['mean_n_sig'] = mean_n_sig
+        trials['mean_n_sig_0'] = mean_n_sig_0
+        trials['ts'] = rss.random.uniform(size=n)
+
+        return trials
+
+
+class AppendableNPYFile_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathfilename = os.path.join(self.tmpdir.name, 'data.npy')
+        self.dtype = np.dtype([('a', np.float64), ('b', np.int32)])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_append(self):
+        arr1 = np.ones((3,), dtype=self.dtype)
+        arr2 = np.zeros((2,), dtype=self.dtype)
+        with AppendableNPYFile(self.pathfilename) as f:
+            f.append(arr1)
+            np.testing.assert_equal(np.load(self.pathfilename), arr1)
+            f.append(arr2)
+            self.assertEqual(f.n_records, 5)
+
+        data = load_trial_data_file(self.pathfilename)
+        np.testing.assert_equal(data['a'], [1, 1, 1, 0, 0])
+
+    def test_append_to_numpy_file(self):
+        np.save(self.pathfilename, np.ones((2,), dtype=self.dtype))
+        with AppendableNPYFile(self.pathfilename, append=True) as f:
+            self.assertEqual(f.n_records, 2)
+            f.append(np.zeros((1,), dtype=self.dtype))
+        np.testing.assert_equal(np.load(self.pathfilename)['a'], [1, 1, 0])
+
+    def test_incomplete_records_are_removed(self):
+        with AppendableNPYFile(self.pathfilename) as f:
+            f.append(np.ones((2,), dtype=self.dtype))
+        with open(self.pathfilename, 'ab') as fp:
+            fp.write(b'incomplete')
+        with AppendableNPYFile(self.pathfilename, append=True) as f:
+            f.append(np.zeros((1,), dtype=self.dtype))
+        np.testing.assert_equal(np.load(self.pathfilename)['a'], [1, 1, 0])
+
+    def test_wrong_dtype(self):
+        with AppendableNPYFile(self.pathfilename) as f:
+            f.append(np.ones((2,), dtype=self.dtype))
+            with self.assertRaises(ValueError):
+                f.append(np.ones((2,), dtype=np.float64))
+
+
+class create_trial_data_file_TestCase(
+        unittest.TestCase,
+):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pathfilename = os.path.join(self.tmpdir.name, 'trials.npy')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_streaming_equals_in_memory(self):
+        (_, _, _, ref) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            mean_n_sig=(0, 3))
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            mean_n_sig=(0, 3),
+            pathfilename=self.pathfilename)
+
+        np.testing.assert_equal(trial_data, ref)
+        np.testing.assert_equal(np.load(self.pathfilename), ref)
+        self.assertFalse(os.path.exists(self.pathfilename+'.state'))
+
+    def test_resume(self):
+        (_, _, _, ref) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            mean_n_sig=(0, 3))
+
+        with self.assertRaises(KeyboardInterrupt):
+            create_trial_data_file(
+                ana=FakeAnalysis(fail_after=2),
+                rss=RandomStateService(seed=1),
+                n_trials=4,
+                mean_n_sig=(0, 3),
+                pathfilename=self.pathfilename)
+        self.assertEqual(len(np.load(self.pathfilename)), 8)
+
+        ana = FakeAnalysis()
+        create_trial_data_file(
+            ana=ana,
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            mean_n_sig=(0, 3),
+            pathfilename=self.pathfilename)
+        self.assertEqual(ana.n_calls, 2)
+        np.testing.assert_equal(np.load(self.pathfilename), ref)
+
+    def test_extend(self):
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            pathfilename=self.pathfilename)
+        trial_data = extend_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=3,
+            trial_data=np.load(self.pathfilename).view(np.recarray),
+            pathfilename=self.pathfilename)
+
+        self.assertEqual(len(trial_data), 7)
+        np.testing.assert_equal(np.load(self.pathfilename), trial_data)
+
+    def test_resume_with_different_arguments(self):
+        with self.assertRaises(KeyboardInterrupt):
+            create_trial_data_file(
+                ana=FakeAnalysis(fail_after=2),
+                rss=RandomStateService(seed=1),
+                n_trials=4,
+                mean_n_sig=(0, 3),
+                bkg_kwargs={'poisson': True},
+                pathfilename=self.pathfilename)
+
+        ana = FakeAnalysis()
+        create_trial_data_file(
+            ana=ana,
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            mean_n_sig=(0, 3),
+            bkg_kwargs={'poisson': False},
+            pathfilename=self.pathfilename)
+        self.assertEqual(ana.n_calls, 4)
+        self.assertEqual(len(np.load(self.pathfilename)), 16)
+
+    def test_append_after_interrupt_with_different_arguments(self):
+        with self.assertRaises(KeyboardInterrupt):
+            create_trial_data_file(
+                ana=FakeAnalysis(fail_after=2),
+                rss=RandomStateService(seed=1),
+                n_trials=4,
+                mean_n_sig=(0, 3),
+                pathfilename=self.pathfilename)
+
+        # The trials of the interrupted generation are removed before the new
+        # trials are appended.
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=6,
+            mean_n_sig=(0, 3),
+            pathfilename=self.pathfilename,
+            append=True)
+
+        self.assertEqual(len(trial_data), 24)
+        np.testing.assert_equal(np.load(self.pathfilename), trial_data)
+        self.assertFalse(os.path.exists(self.pathfilename+'.state'))
+
+    def create_extend_trial_data(self, pathfilename, trial_data, **kwargs):
+        return extend_trial_data_file(
+            rss=RandomStateService(seed=1),
+            n_trials=3,
+            trial_data=trial_data,
+            mean_n_sig=(0, 3),
+            pathfilename=pathfilename,
+            **kwargs)
+
+    def test_extend_resume(self):
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            pathfilename=self.pathfilename)
+        trial_data = np.array(trial_data).view(np.recarray)
+
+        ref_pathfilename = os.path.join(self.tmpdir.name, 'ref.npy')
+        np.save(ref_pathfilename, trial_data)
+        ref = self.create_extend_trial_data(
+            ref_pathfilename, trial_data, ana=FakeAnalysis())
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.create_extend_trial_data(
+                self.pathfilename, trial_data, ana=FakeAnalysis(fail_after=2))
+        self.assertEqual(len(np.load(self.pathfilename)), 10)
+
+        # The interrupted extension is resumed instead of rewriting the file.
+        ana = FakeAnalysis()
+        extended_trial_data = self.create_extend_trial_data(
+            self.pathfilename, trial_data, ana=ana)
+        self.assertEqual(ana.n_calls, 2)
+        np.testing.assert_equal(extended_trial_data, ref)
+        np.testing.assert_equal(np.load(self.pathfilename), ref)
+
+    def test_extend_resume_with_different_arguments(self):
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4,
+            pathfilename=self.pathfilename)
+        trial_data = np.array(trial_data).view(np.recarray)
+
+        with self.assertRaises(KeyboardInterrupt):
+            self.create_extend_trial_data(
+                self.pathfilename, trial_data, ana=FakeAnalysis(fail_after=2))
+
+        extended_trial_data = extend_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=2,
+            trial_data=trial_data,
+            mean_n_sig=(0, 3),
+            pathfilename=self.pathfilename)
+
+        self.assertEqual(len(extended_trial_data), 12)
+        np.testing.assert_equal(
+            np.load(self.pathfilename), extended_trial_data)
+        np.testing.assert_equal(extended_trial_data[:4], trial_data)
+
+    def test_extend_rewrites_different_file(self):
+        (_, _, _, trial_data) = create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=1),
+            n_trials=4)
+        # The file holds different trials with the same length and data type.
+        create_trial_data_file(
+            ana=FakeAnalysis(),
+            rss=RandomStateService(seed=2),
+            n_trials=4,
+            pathfilename=self.pathfilename)
+
+        extended_trial_data = self.create_extend_trial_data(
+            self.pathfilename, trial_data, ana=FakeAnalysis())
+
+        self.assertEqual(len(extended_trial_data), 16)
+        np.testing.assert_equal(
+            np.load(self.pathfilename)[:4], trial_data)
+        np.testing.assert_equal(
+            np.load(self.pathfilename), extended_trial_data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,605 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import scipy.stats
+
+from skyllh.analyses.i3.publicdata_ps import (
+    mcbkg_ps,
+    time_integrated_ps,
+)
+from skyllh.analyses.i3.publicdata_ps.pdfratio import (
+    PDSigSetOverBkgPDFRatio,
+)
+from skyllh.analyses.i3.publicdata_ps.signalpdf import (
+    PDSignalEnergyPDFSetRegistry,
+)
+from skyllh.analyses.i3.publicdata_ps.smearing_matrix import (
+    PDSmearingMatrix,
+    _create_cdf_table,
+    _sample_from_cdf_table,
+)
+from skyllh.cluster.master_node import (
+    MasterNode,
+)
+from skyllh.core import (
+    tool,
+)
+from skyllh.core.config import (
+    Config,
+)
+from skyllh.core.flux_model import (
+    PowerLawEnergyFluxProfile,
+    SteadyPointlikeFFM,
+)
+from skyllh.core.parameters import (
+    Parameter,
+    ParameterGrid,
+    ParameterModelMapper,
+)
+from skyllh.core.pdfratio import (
+    PDFRatioProduct,
+)
+from skyllh.core.random import (
+    RandomStateService,
+)
+from skyllh.core.source_hypo_grouping import (
+    SourceHypoGroup,
+    SourceHypoGroupManager,
+)
+from skyllh.core.source_model import (
+    PointLikeSource,
+)
+from tests.i3.testdata.synthetic_data import (
+    SMEARING_COLUMNS,
+    create_synthetic_data_files,
+    create_synthetic_dataset,
+    generate_smearing_data,
+)
+from tests.cluster_utils import (
+    get_free_port,
+    start_compute_nodes,
+    stop_compute_nodes,
+)
+
+HEALPY_AVAILABLE = tool.is_available('healpy')
+if HEALPY_AVAILABLE:
+    from skyllh.core.sky_scan import (
+        HEALPixSkyScan,
+    )
+
+
+def setUpModule():
+    global TMPDIR
+    TMPDIR = tempfile.TemporaryDirectory()
+    create_synthetic_data_files(
+        path=os.path.join(TMPDIR.name, 'testdata'),
+        rss=RandomStateService(seed=1),
+        n_events=2000,
+        n_days=30)
+
+
+def tearDownModule():
+    TMPDIR.cleanup()
+
+
+def get_energy_pdfratio(ana):
+    """Returns the instance of PDSigSetOverBkgPDFRatio of the first dataset of
+    the given analysis.
+    """
+    pdfratios = [ana.llhratio.llhratio_list[0].pdfratio]
+    while len(pdfratios) > 0:
+        pdfratio = pdfratios.pop()
+        if isinstance(pdfratio, PDSigSetOverBkgPDFRatio):
+            return pdfratio
+        if isinstance(pdfratio, PDFRatioProduct):
+            pdfratios.extend((pdfratio.pdfratio1, pdfratio.pdfratio2))
+
+    raise LookupError('No PDSigSetOverBkgPDFRatio instance found!')
+
+
+def assert_sampled_bins_follow_pdf(idxs, pdf, bin_widths, min_pvalue=1e-3):
+    """Asserts that the given sampled bin indices follow the binned
+    probabilities given by the PDF and bin widths from the ``get_*_pdf``
+    methods of the PDSmearingMatrix class via a chi-square test.
+    """
+    p = pdf * bin_widths
+    counts = np.bincount(idxs, minlength=len(p))
+    np.testing.assert_equal(len(counts), len(p))
+
+    m = p > 0
+    np.testing.assert_equal(counts[~m], 0)
+    if np.count_nonzero(m) < 2:
+        return
+    (_, pvalue) = scipy.stats.chisquare(
+        counts[m], len(idxs)*p[m]/np.sum(p[m]))
+    assert pvalue > min_pvalue, f'p-value {pvalue} of chi-square test!'
+
+
+class PDSignalEnergyPDFSetRegistry_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.cfg = Config()
+        self.ds = create_synthetic_dataset(
+            cfg=self.cfg,
+            base_path=TMPDIR.name)
+        self.fluxmodel = SteadyPointlikeFFM(
+            Phi0=1,
+            energy_profile=PowerLawEnergyFluxProfile(
+                E0=1e3, gamma=2, cfg=self.cfg),
+            cfg=self.cfg)
+        self.gamma_grid = ParameterGrid.from_range('gamma', 1.5, 2.5, 0.5)
+        self.registry = PDSignalEnergyPDFSetRegistry()
+
+    def get_pdf_set(self, dec_deg):
+        return self.registry.get_pdf_set(
+            cfg=self.cfg,
+            ds=self.ds,
+            src_dec=np.deg2rad(dec_deg),
+            fluxmodel=self.fluxmodel,
+            param_grid_set=self.gamma_grid)
+
+    def test_same_dec_bins(self):
+        # The declinations 33 and 35 degrees lie within the same smearing
+        # matrix and effective area declination bins.
+        pdf_set = self.get_pdf_set(33)
+        self.assertIs(self.get_pdf_set(35), pdf_set)
+        self.assertEqual(self.registry.n_pdf_sets, 1)
+
+    def test_different_aeff_dec_bins(self):
+        # The declination 45 degrees lies within the same smearing matrix
+        # declination bin as 33 degrees, but within a different effective area
+        # declination bin.
+        pdf_set = self.get_pdf_set(33)
+        self.assertIsNot(self.get_pdf_set(45), pdf_set)
+        self.assertEqual(self.registry.n_pdf_sets, 2)
+
+    def test_different_sm_dec_bins(self):
+        # The declinations 5 and 15 degrees lie within different smearing
+        # matrix declination bins.
+        pdf_set = self.get_pdf_set(5)
+        self.assertIsNot(self.get_pdf_set(15), pdf_set)
+        self.assertEqual(self.registry.n_pdf_sets, 2)
+
+    def test_different_param_grid(self):
+        pdf_set = self.get_pdf_set(33)
+        self.gamma_grid = ParameterGrid.from_range('gamma', 1.5, 3, 0.5)
+        self.assertIsNot(self.get_pdf_set(33), pdf_set)
+
+    def test_clear(self):
+        pdf_set = self.get_pdf_set(33)
+        self.registry.clear()
+        self.assertEqual(self.registry.n_pdf_sets, 0)
+        self.assertIsNot(self.get_pdf_set(33), pdf_set)
+
+    def test_mcbkg_ps_create_analysis(self):
+        anas = [
+            mcbkg_ps.create_analysis(
+                cfg=self.cfg,
+                datasets=[self.ds],
+                source=PointLikeSource(ra=1, dec=np.deg2rad(dec_deg)),
+                energy_pdf_set_registry=self.registry)
+            for dec_deg in (33, 35, 45)
+        ]
+        sig_pdf_sets = [
+            get_energy_pdfratio(ana).sig_pdf_set
+            for ana in anas
+        ]
+
+        self.assertIs(sig_pdf_sets[1], sig_pdf_sets[0])
+        self.assertIsNot(sig_pdf_sets[2], sig_pdf_sets[0])
+        self.assertEqual(self.registry.n_pdf_sets, 2)
+
+
+class sample_from_cdf_table_TestCase(
+        unittest.TestCase):
+    def test_sample_from_cdf_table(self):
+        p = np.array([
+            [0.2, 0.8, 0],
+            [0, 0, 0],
+            [2, 1, 1],
+        ])
+        (cdf, valid) = _create_cdf_table(p)
+        np.testing.assert_equal(valid, [True, False, True])
+
+        n = 20000
+        rss = RandomStateService(seed=1)
+        row_idxs = np.repeat(np.array([0, 1, 2, -1]), n)
+        col_idxs = _sample_from_cdf_table(
+            rss=rss,
+            cdf=cdf,
+            valid=valid,
+            n_cols=3,
+            row_idxs=row_idxs)
+
+        # Rows without probability and negative row indices yield -1.
+        np.testing.assert_equal(col_idxs[n:2*n], -1)
+        np.testing.assert_equal(col_idxs[3*n:], -1)
+
+        for row_idx in (0, 2):
+            assert_sampled_bins_follow_pdf(
+                col_idxs[row_idx*n:(row_idx+1)*n], p[row_idx], 1)
+
+
+class PDSmearingMatrixSampler_TestCase(
+        unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create a small smearing matrix with the axes
+        # (true_e, true_dec, reco_e, psi, ang_err).
+        data = generate_smearing_data(n_reco_e=3, n_psi=2, n_ang_err=3)
+        shape = (14, 3, 3, 2, 3)
+        counts = data[:, 10].reshape(shape)
+        ang_err_min = data[:, 8].reshape(shape)
+        ang_err_max = data[:, 9].reshape(shape)
+
+        # A true energy bin without any counts.
+        counts[0] = 0
+        # A (true_e, reco_e) bin without any counts.
+        counts[1, 0, 0] = 0
+        # A (true_e, reco_e, psi) bin without any counts.
+        counts[1, 0, 1, 0] = 0
+        # An undefined angular error bin with zero width.
+        ang_err_max[2, 0, 0, 0, 1] = ang_err_min[2, 0, 0, 0, 1]
+
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        pathfilename = os.path.join(cls.tmpdir.name, 'smearing.csv')
+        np.savetxt(
+            pathfilename,
+            data,
+            header=' '.join(SMEARING_COLUMNS),
+            comments='# ')
+        cls.sm = PDSmearingMatrix(pathfilenames=pathfilename)
+        cls.sampler = cls.sm.get_sampler(0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.rss = RandomStateService(seed=1)
+        self.n = 20000
+
+    def test_sample_log_e(self):
+        for log_true_e_idx in (1, 2, 7):
+            (log_e_idx, log_e) = self.sampler.sample_log_e(
+                self.rss, np.full((self.n,), log_true_e_idx))
+
+            (pdf, lower_edges, upper_edges, bin_widths) =\
+                self.sm.get_log_e_pdf(log_true_e_idx, 0)
+            assert_sampled_bins_follow_pdf(log_e_idx, pdf, bin_widths)
+            self.assertTrue(np.all(log_e >= lower_edges[log_e_idx]))
+            self.assertTrue(np.all(log_e <= upper_edges[log_e_idx]))
+
+    def test_sample_log_e_invalid(self):
+        self.assertIsNone(self.sm.get_log_e_pdf(0, 0)[0])
+
+        (log_e_idx, log_e) = self.sampler.sample_log_e(
+            self.rss, np.array([0, -1, 1]))
+        np.testing.assert_equal(log_e_idx[:2], -1)
+        self.assertTrue(np.all(np.isnan(log_e[:2])))
+        self.assertGreaterEqual(log_e_idx[2], 0)
+        self.assertFalse(np.isnan(log_e[2]))
+
+    def test_sample_psi(self):
+        for (log_true_e_idx, log_e_idx) in ((1, 1), (2, 0), (7, 2)):
+            (psi_idx, psi) = self.sampler.sample_psi(
+                self.rss,
+                np.full((self.n,), log_true_e_idx),
+                np.full((self.n,), log_e_idx))
+
+            (pdf, lower_edges, upper_edges, bin_widths) =\
+                self.sm.get_psi_pdf(log_true_e_idx, 0, log_e_idx)
+            assert_sampled_bins_follow_pdf(psi_idx, pdf, bin_widths)
+            self.assertTrue(np.all(psi >= lower_edges[psi_idx]))
+            self.assertTrue(np.all(psi <= upper_edges[psi_idx]))
+
+    def test_sample_psi_invalid(self):
+        self.assertIsNone(self.sm.get_psi_pdf(1, 0, 0)[0])
+
+        (psi_idx, psi) = self.sampler.sample_psi(
+            self.rss, np.array([1, 0, -1, 1, 1]), np.array([0, 1, 1, -1, 1]))
+        np.testing.assert_equal(psi_idx[:4], -1)
+        self.assertTrue(np.all(np.isnan(psi[:4])))
+        self.assertGreaterEqual(psi_idx[4], 0)
+        self.assertFalse(np.isnan(psi[4]))
+
+    def test_sample_ang_err(self):
+        for (log_true_e_idx, log_e_idx, psi_idx) in (
+                (1, 1, 1), (2, 0, 0), (7, 2, 1)):
+            (ang_err_idx, ang_err) = self.sampler.sample_ang_err(
+                self.rss,
+                np.full((self.n,), log_true_e_idx),
+                np.full((self.n,), log_e_idx),
+                np.full((self.n,), psi_idx))
+
+            # The bin indices count only the defined angular error bins.
+            (pdf, lower_edges, upper_edges, bin_widths) =\
+                self.sm.get_ang_err_pdf(log_true_e_idx, 0, log_e_idx, psi_idx)
+            assert_sampled_bins_follow_pdf(ang_err_idx, pdf, bin_widths)
+            self.assertTrue(np.all(ang_err >= lower_edges[ang_err_idx]))
+            self.assertTrue(np.all(ang_err <= upper_edges[ang_err_idx]))
+
+        # The undefined angular error bin is never sampled.
+        self.assertEqual(len(self.sm.get_ang_err_pdf(2, 0, 0, 0)[0]), 2)
+
+    def test_sample_ang_err_invalid(self):
+        self.assertIsNone(self.sm.get_ang_err_pdf(1, 0, 1, 0)[0])
+
+        (ang_err_idx, ang_err) = self.sampler.sample_ang_err(
+            self.rss,
+            np.array([1, 0, 1, -1, 1]),
+            np.array([1, 0, 0, 1, 1]),
+            np.array([0, 0, 0, 1, 1]))
+        np.testing.assert_equal(ang_err_idx[:4], -1)
+        self.assertTrue(np.all(np.isnan(ang_err[:4])))
+        self.assertGreaterEqual(ang_err_idx[4], 0)
+        self.assertFalse(np.isnan(ang_err[4]))
+
+
+class PDSigSetOverBkgPDFRatio_grid_table_TestCase(
+        unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cfg = Config()
+        ds = create_synthetic_dataset(
+            cfg=cls.cfg,
+            base_path=TMPDIR.name)
+        cls.ana = time_integrated_ps.create_analysis(
+            cfg=cls.cfg,
+            datasets=[ds],
+            source=PointLikeSource(ra=1, dec=0.3))
+        cls.energy_pdfratio = get_energy_pdfratio(cls.ana)
+
+    def setUp(self):
+        self.tdm = self.ana.tdm_list[0]
+        self.events = self.ana.data_list[0].exp
+
+        # Create a source hypothesis group with two sources, which have an
+        # individual gamma parameter each.
+        shg = self.ana.shg_mgr.shg_list[0]
+        sources = [
+            PointLikeSource(ra=1, dec=0.3),
+            PointLikeSource(ra=2, dec=0.35),
+        ]
+        self.shg_mgr = SourceHypoGroupManager(
+            SourceHypoGroup(
+                sources=sources,
+                fluxmodel=shg.fluxmodel,
+                detsigyield_builders=shg.detsigyield_builder_list))
+        self.pmm = ParameterModelMapper(models=sources)
+        for (src_idx, source) in enumerate(sources):
+            self.pmm.map_param(
+                Parameter(f'gamma{src_idx}', 2, valmin=1, valmax=5),
+                models=[source],
+                model_param_names='gamma')
+
+    def initialize_trial(self, shg_mgr, pmm, events):
+        self.tdm.change_shg_mgr(shg_mgr=shg_mgr, pmm=pmm)
+        self.tdm.initialize_trial(shg_mgr=shg_mgr, pmm=pmm, events=events)
+
+    def create_pdfratio(self, **kwargs):
+        pdfratio = PDSigSetOverBkgPDFRatio(
+            cfg=self.cfg,
+            sig_pdf_set=self.energy_pdfratio.sig_pdf_set,
+            bkg_pdf=self.energy_pdfratio.bkg_pdf,
+            **kwargs)
+        pdfratio.initialize_for_new_trial(tdm=self.tdm)
+        return pdfratio
+
+    def assert_equal_ratio_and_grads(self, pdfratio1, pdfratio2, pmm, gflp):
+        src_params_recarray = pmm.create_src_params_recarray(np.array(gflp))
+        np.testing.assert_array_equal(
+            pdfratio1.get_ratio(self.tdm, src_params_recarray),
+            pdfratio2.get_ratio(self.tdm, src_params_recarray))
+        for fitparam_id in range(pmm.n_global_floating_params):
+            np.testing.assert_array_equal(
+                pdfratio1.get_gradient(
+                    self.tdm, src_params_recarray, fitparam_id),
+                pdfratio2.get_gradient(
+                    self.tdm, src_params_recarray, fitparam_id))
+
+    def test_single_source(self):
+        self.initialize_trial(self.ana.shg_mgr, self.ana.pmm, self.events)
+        pdfratio = self.create_pdfratio()
+        pdfratio_table = self.create_pdfratio(precompute_grid_table=True)
+        self.assertIsNotNone(pdfratio_table._grid_table)
+
+        for gamma in (1.57, 2, 2.13, 3.04):
+            self.assert_equal_ratio_and_grads(
+                pdfratio, pdfratio_table, self.ana.pmm, [10, gamma])
+
+    def test_multiple_sources(self):
+        self.initialize_trial(self.shg_mgr, self.pmm, self.events)
+        pdfratio = self.create_pdfratio()
+        pdfratio_table = self.create_pdfratio(precompute_grid_table=True)
+        self.assertIsNotNone(pdfratio_table._grid_table)
+
+        for gflp in ([2.13, 2.71], [1.57, 3.04], [2.2, 2.2]):
+            self.assert_equal_ratio_and_grads(
+                pdfratio, pdfratio_table, self.pmm, gflp)
+
+    def test_grid_table_max_nbytes(self):
+        self.initialize_trial(self.shg_mgr, self.pmm, self.events)
+        pdfratio = self.create_pdfratio()
+        pdfratio_table = self.create_pdfratio(
+            precompute_grid_table=True,
+            grid_table_max_nbytes=self.tdm.get_n_values()*8)
+
+        # The grid table exceeds the limit, so the grid point values are
+        # evaluated on demand.
+        self.assertIsNone(pdfratio_table._grid_table)
+        self.assert_equal_ratio_and_grads(
+            pdfratio, pdfratio_table, self.pmm, [2.13, 2.71])
+
+    def test_trial_data_state_id(self):
+        self.initialize_trial(self.shg_mgr, self.pmm, self.events)
+        pdfratio_table = self.create_pdfratio(precompute_grid_table=True)
+        gridparams_recarray = np.array(
+            [(2.,), (3.,)], dtype=[('gamma', np.float64)])
+        self.assertIsNotNone(pdfratio_table._get_grid_table_values(
+            self.tdm, gridparams_recarray))
+
+        # A new trial invalidates the grid table of the previous trial, even
+        # if the PDF ratio is not initialized for the new trial.
+        self.initialize_trial(
+            self.shg_mgr,
+            self.pmm,
+            self.events[np.arange(0, len(self.events), 2)])
+        self.assertIsNone(pdfratio_table._get_grid_table_values(
+            self.tdm, gridparams_recarray))
+
+        pdfratio = self.create_pdfratio()
+        self.assert_equal_ratio_and_grads(
+            pdfratio, pdfratio_table, self.pmm, [2.13, 2.71])
+
+        # The grid table is recreated for the new trial.
+        pdfratio_table.initialize_for_new_trial(tdm=self.tdm)
+        self.assertEqual(
+            pdfratio_table._grid_table.shape[1], self.tdm.get_n_values())
+        self.assert_equal_ratio_and_grads(
+            pdfratio, pdfratio_table, self.pmm, [1.57, 3.04])
+
+
+def create_time_integrated_ps_analysis(base_path, ra=1, dec=0.3):
+    cfg = Config()
+    ds = create_synthetic_dataset(
+        cfg=cfg,
+        base_path=base_path)
+    return time_integrated_ps.create_analysis(
+        cfg=cfg,
+        datasets=[ds],
+        source=PointLikeSource(ra=ra, dec=dec))
+
+
+class time_integrated_ps_MasterNode_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        port = get_free_port()
+        self.processes = start_compute_nodes(port, [None, None])
+
+        self.master = MasterNode()
+        self.master.register_compute_nodes(
+            n_cn=len(self.processes),
+            master_port=port,
+            master_addr='127.0.0.1')
+        self.master.setup_analysis(
+            create_time_integrated_ps_analysis,
+            kwargs=dict(base_path=TMPDIR.name),
+            timeout=60)
+
+    def tearDown(self):
+        stop_compute_nodes(self.master, self.processes)
+
+    def test_do_trials(self):
+        ana = create_time_integrated_ps_analysis(base_path=TMPDIR.name)
+        ref = ana.do_trials(
+            rss=RandomStateService(seed=1),
+            n=6,
+            ncpu=1,
+            chunksize=2,
+            mean_n_sig=3)
+
+        recarray = self.master.do_trials(
+            rss=RandomStateService(seed=1),
+            n=6,
+            chunksize=2,
+            mean_n_sig=3)
+
+        self.assertEqual(len(self.master.cn_registry), 2)
+        np.testing.assert_array_equal(recarray, ref)
+
+
+class time_integrated_ps_do_trials_batched_TestCase(
+        unittest.TestCase):
+    def setUp(self):
+        self.ana = create_time_integrated_ps_analysis(base_path=TMPDIR.name)
+
+    def test_do_trials_batched(self):
+        self.ana.pmm.global_paramset.make_params_fixed({'gamma': 2.5})
+
+        ref = self.ana.do_trials(
+            rss=RandomStateService(seed=1),
+            n=10,
+            ncpu=1,
+            mean_n_sig=3)
+
+        recarray = self.ana.do_trials_batched(
+            rss=RandomStateService(seed=1),
+            n=10,
+            mean_n_sig=3)
+
+        self.assertEqual(recarray.dtype, ref.dtype)
+        for name in ('seed', 'mean_n_sig', 'n_sig', 'mean_n_sig_0', 'gamma'):
+            np.testing.assert_array_equal(recarray[name], ref[name])
+        self.assertTrue(np.all(recarray['ns'] > 0))
+        np.testing.assert_allclose(recarray['ns'], ref['ns'], atol=1e-2)
+        np.testing.assert_allclose(recarray['ts'], ref['ts'], rtol=1e-6)
+
+    def test_do_trials_batched_floating_gamma(self):
+        with self.assertRaises(ValueError):
+            self.ana.do_trials_batched(
+                rss=RandomStateService(seed=1),
+                n=2)
+
+
+@unittest.skipIf(not HEALPY_AVAILABLE, 'healpy not available!')
+class time_integrated_ps_HEALPixSkyScan_TestCase(
+        unittest.TestCase):
+    def create_analysis(self, ra, dec):
+        return create_time_integrated_ps_analysis(
+            base_path=TMPDIR.name, ra=ra, dec=dec)
+
+    def test_run(self):
+        # The scanned pixels lie within other smearing matrix and effective
+        # area declination bins than the initial source of the analysis. Hence,
+        # the signal energy PDF set must be swapped for each pixel.
+        ana = self.create_analysis(ra=0, dec=0)
+        scan = HEALPixSkyScan(
+            ana=ana,
+            nside=1,
+            nside_max=1,
+            dec_range=(-np.pi/2, -0.5))
+        results = scan.run(rss=RandomStateService(seed=1), ncpu=1)
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(np.any(results['ts'] > 0))
+
+        for result in results:
+            (ts, params, status) = self.create_analysis(
+                ra=result['ra'],
+                dec=result['dec']).unblind(
+                    minimizer_rss=RandomStateService(seed=1))
+
+            self.assertAlmostEqual(result['ts'], ts)
+            self.assertAlmostEqual(result['ns'], params['ns'])
+            self.assertAlmostEqual(result['gamma'], params['gamma'])
+
+    def test_run_parallel(self):
+        # The signal energy PDF sets for the scanned pixels are created within
+        # the worker processes of the scan, which must not spawn processes
+        # themselves, even though the configuration allows multiple CPUs.
+        results = HEALPixSkyScan(
+            ana=self.create_analysis(ra=0, dec=0),
+            nside=1,
+            nside_max=1,
+            dec_range=(-np.pi/2, -0.5)).run(
+                rss=RandomStateService(seed=1), ncpu=1)
+
+        ana = self.create_analysis(ra=0, dec=0)
+        ana.cfg['multiproc']['ncpu'] = 2
+        parallel_results = HEALPixSkyScan(
+            ana=ana,
+            nside=1,
+            nside_max=1,
+            dec_range=(-np.pi/2, -0.5)).run(
+                rss=RandomStateService(seed=1), chunksize=1)
+
+        np.testing.assert_array_equal(parallel_results, results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+
+"""Generates synthetic data files for tests and benchmarks. The experimental
+and good-run-list data files have the same structure as the files of the
+``TestData`` dataset, see ``skyllh.datasets.i3.TestData``. In addition the
+auxiliary data files, i.e. effective area, smearing matrix, and monte-carlo
+background energy PDF, are generated in the format of the public 10-year
+point-source data release, so that the analyses of
+``skyllh.analyses.i3.publicdata_ps`` can be created without the real data.
+"""
+
+import os
+import pickle
+
+import numpy as np
+
+from skyllh.core.binning import (
+    BinningDefinition,
+)
+from skyllh.datasets.i3 import (
+    TestData,
+)
+
+EXP_DTYPE = np.dtype([
+    ('time', '<f8'),
+    ('ra', '<f8'),
+    ('dec', '<f8'),
+    ('azi', '<f8'),
+    ('zen', '<f8'),
+    ('ang_err', '<f8'),
+    ('log_energy', '<f8'),
+    ('sin_dec', '<f8'),
+])
+
+GRL_DTYPE = np.dtype([
+    ('run', '<i8'),
+    ('start', '<f8'),
+    ('stop', '<f8'),
+    ('livetime', '<f8'),
+    ('events', '<i8'),
+])
+
+EFF_AREA_COLUMNS = [
+    'log10(E_nu/GeV)_min',
+    'log10(E_nu/GeV)_max',
+    'Dec_nu_min[deg]',
+    'Dec_nu_max[deg]',
+    'A_Eff[cm^2]',
+]
+
+SMEARING_COLUMNS = [
+    'log10(E_nu/GeV)_min',
+    'log10(E_nu/GeV)_max',
+    'Dec_nu_min[deg]',
+    'Dec_nu_max[deg]',
+    'log10(E/GeV)_min',
+    'log10(E/GeV)_max',
+    'PSF_min[deg]',
+    'PSF_max[deg]',
+    'AngErr_min[deg]',
+    'AngErr_max[deg]',
+    'Fractional_Counts',
+]
+
+SIN_DEC_BINEDGES = np.unique(np.concatenate([
+    np.linspace(-1., -0.25, 10 + 1),
+    np.linspace(-0.25, 0.0, 10 + 1),
+    np.linspace(0.0, 1., 10 + 1),
+]))
+LOG_ENERGY_BINEDGES = np.arange(1., 9.5 + 0.01, 0.125)
+
+# The start time of the synthetic data taking in MJD.
+MJD_START = 55694.
+# The duration of a synthetic detector run in days.
+RUN_DURATION = 1/3
+
+
+def generate_grl_data(
+        n_days):
+    """Generates a good-run-list with consecutive runs covering ``n_days``
+    days.
+
+    Parameters
+    ----------
+    n_days : float
+        The number of days covered by the good-run-list.
+
+    Returns
+    -------
+    grl : instance of numpy structured ndarray
+        The good-run-list data. The ``events`` field is set to zero.
+    """
+    n_runs = int(np.ceil(n_days / RUN_DURATION))
+
+    grl = np.zeros((n_runs,), dtype=GRL_DTYPE)
+    grl['run'] = 120000 + np.arange(n_runs)
+    grl['start'] = MJD_START + np.arange(n_runs) * RUN_DURATION
+    grl['stop'] = grl['start'] + RUN_DURATION
+    grl['livetime'] = grl['stop'] - grl['start']
+
+    return grl
+
+
+def generate_exp_data(
+        rss,
+        n_events,
+        grl):
+    """Generates a sample of background-like experimental data events, i.e.
+    events distributed uniformly on the sky with a steeply falling energy
+    spectrum.
+
+    Parameters
+    ----------
+    rss : instance of RandomStateService
+        The random state service to draw the random numbers from.
+    n_events : int
+        The number of events to generate.
+    grl : instance of numpy structured ndarray
+        The good-run-list data. The ``events`` field is updated with the
+        number of generated events of each run.
+
+    Returns
+    -------
+    exp : instance of numpy structured ndarray
+        The experimental data events sorted by time.
+    """
+    exp = np.empty((n_events,), dtype=EXP_DTYPE)
+
+    run_idxs = rss.random.randint(0, len(grl), size=n_events)
+    exp['time'] = rss.random.uniform(
+        grl['start'][run_idxs], grl['stop'][run_idxs])
+    grl['events'] = np.bincount(run_idxs, minlength=len(grl))
+
+    exp['ra'] = rss.random.uniform(0, 2*np.pi, size=n_events)
+    exp['sin_dec'] = rss.random.uniform(-0.99, 0.99, size=n_events)
+    exp['dec'] = np.arcsin(exp['sin_dec'])
+    exp['azi'] = rss.random.uniform(0, 2*np.pi, size=n_events)
+    exp['zen'] = exp['dec'] + np.pi/2
+
+    exp['log_energy'] = np.clip(
+        2 + rss.random.exponential(0.6, size=n_events), None, 9)
+    exp['ang_err'] = np.deg2rad(np.clip(
+        rss.random.lognormal(np.log(0.7), 0.5, size=n_events), 0.2, 15))
+
+    exp.sort(order='time')
+
+    return exp
+
+
+def generate_eff_area_data():
+    """Generates a smooth effective area table as function of the true
+    neutrino energy and declination.
+
+    Returns
+    -------
+    data : (n_rows, 5)-shaped numpy ndarray
+        The effective area table with the columns ``EFF_AREA_COLUMNS``.
+    """
+    log10_enu_edges = np.linspace(2, 9, 35 + 1)
+    decnu_edges = np.rad2deg(np.arcsin(np.linspace(-1, 1, 20 + 1)))
+
+    (log10_enu_lower, decnu_lower) = np.meshgrid(
+        log10_enu_edges[:-1], decnu_edges[:-1], indexing='ij')
+    (log10_enu_upper, decnu_upper) = np.meshgrid(
+        log10_enu_edges[1:], decnu_edges[1:], indexing='ij')
+
+    log10_enu = 0.5*(log10_enu_lower + log10_enu_upper)
+    sin_decnu = np.sin(np.deg2rad(0.5*(decnu_lower + decnu_upper)))
+    # The effective area rises with energy and gets absorbed by the Earth at
+    # high energies for up-going neutrinos.
+    aeff = 10**(1.5*(log10_enu - 2)) * np.exp(
+        -np.clip(-sin_decnu, 0, None) * 10**(log10_enu - 6))
+
+    data = np.column_stack([
+        log10_enu_lower.ravel(),
+        log10_enu_upper.ravel(),
+        decnu_lower.ravel(),
+        decnu_upper.ravel(),
+        aeff.ravel(),
+    ])
+
+    return data
+
+
+def generate_smearing_data(
+        n_reco_e=10,
+        n_psi=5,
+        n_ang_err=5):
+    """Generates a smearing matrix table mapping the true neutrino energy and
+    declination onto the reconstructed energy, the point-spread function, and
+    the angular error.
+
+    Parameters
+    ----------
+    n_reco_e : int
+        The number of reconstructed energy bins for each true energy bin.
+    n_psi : int
+        The number of point-spread function bins.
+    n_ang_err : int
+        The number of angular error bins.
+
+    Returns
+    -------
+    data : (n_rows, 11)-shaped numpy ndarray
+        The smearing matrix table with the columns ``SMEARING_COLUMNS``.
+    """
+    true_e_edges = np.linspace(2, 9, 14 + 1)
+    true_dec_edges = np.array([-90., -10., 10., 90.])
+    ang_err_edges = np.linspace(0.2, 5, n_ang_err + 1)
+
+    rows = []
+    for (true_e_min, true_e_max) in zip(true_e_edges[:-1], true_e_edges[1:]):
+        true_e = 0.5*(true_e_min + true_e_max)
+        # The reconstructed energy bins must be the same for all
+        # declinations in order to be able to determine the number of bins
+        # from the table.
+        reco_e_edges = np.linspace(
+            max(1., true_e - 2.), min(9.5, true_e + 0.5), n_reco_e + 1)
+        psi_sigma = 0.2 + 3 * 10**(-0.5*(true_e - 2))
+        psi_edges = np.linspace(0, 4*psi_sigma, n_psi + 1)
+
+        reco_e = 0.5*(reco_e_edges[:-1] + reco_e_edges[1:])
+        psi = 0.5*(psi_edges[:-1] + psi_edges[1:])
+        ang_err = 0.5*(ang_err_edges[:-1] + ang_err_edges[1:])
+
+        p = (
+            np.exp(-0.5*((reco_e - true_e + 0.8)/0.5)**2)[:, None, None] *
+            (psi/psi_sigma**2 * np.exp(-0.5*(psi/psi_sigma)**2))[
+                None, :, None] *
+            np.exp(-0.5*((ang_err - psi_sigma)/psi_sigma)**2)[None, None, :]
+        )
+        p /= np.sum(p)
+
+        for (true_dec_min, true_dec_max) in zip(
+                true_dec_edges[:-1], true_dec_edges[1:]):
+            for i in range(n_reco_e):
+                for j in range(n_psi):
+                    for k in range(n_ang_err):
+                        rows.append((
+                            true_e_min, true_e_max,
+                            true_dec_min, true_dec_max,
+                            reco_e_edges[i], reco_e_edges[i+1],
+                            psi_edges[j], psi_edges[j+1],
+                            ang_err_edges[k], ang_err_edges[k+1],
+                            p[i, j, k],
+                        ))
+
+    return np.array(rows)
+
+
+def generate_mc_bkg_pdf_data(
+        exp):
+    """Generates the monte-carlo background energy PDF from the given
+    experimental data in the format created by the ``mceq_atm_bkg.py``
+    script.
+
+    Parameters
+    ----------
+    exp : instance of numpy structured ndarray
+        The experimental data events.
+
+    Returns
+    -------
+    bkg_pdf_data : dict
+        The dictionary with the keys ``'pdf'``, ``'log10emu_binning'``, and
+        ``'sindecmu_binning'``.
+    """
+    log10emu_binning = BinningDefinition('log_energy', LOG_ENERGY_BINEDGES)
+    sindecmu_binning = BinningDefinition('sin_dec', SIN_DEC_BINEDGES)
+
+    (h, _, _) = np.histogram2d(
+        exp['log_energy'],
+        exp['sin_dec'],
+        bins=(log10emu_binning.binedges, sindecmu_binning.binedges))
+    # Avoid empty bins and normalize each sin(dec) slice in log10(E).
+    h += 1e-3
+    h /= np.sum(h, axis=0, keepdims=True) * log10emu_binning.binwidths[
+        :, np.newaxis]
+
+    bkg_pdf_data = {
+        'pdf': h,
+        'log10emu_binning': log10emu_binning,
+        'sindecmu_binning': sindecmu_binning,
+    }
+
+    return bkg_pdf_data
+
+
+def _save_table(pathfilename, data, columns):
+    """Saves the given table as text file with a header line holding the
+    column names, as it is expected by the ``TextFileLoader`` class.
+    """
+    np.savetxt(pathfilename, data, header=' '.join(columns), comments='# ')
+
+
+def create_synthetic_data_files(
+        path,
+        rss,
+        n_events,
+        n_days=365):
+    """Creates the data files of the synthetic dataset in the given directory.
+
+    Parameters
+    ----------
+    path : str
+        The directory in which the data files should be created.
+    rss : instance of RandomStateService
+        The random state service to draw the random numbers from.
+    n_events : int
+        The number of experimental data events.
+    n_days : float
+        The number of days covered by the good-run-list.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    grl = generate_grl_data(n_days=n_days)
+    exp = generate_exp_data(rss=rss, n_events=n_events, grl=grl)
+
+    np.save(os.path.join(path, 'exp.npy'), exp)
+    np.save(os.path.join(path, 'grl.npy'), grl)
+
+    _save_table(
+        os.path.join(path, 'effectiveArea.csv'),
+        generate_eff_area_data(),
+        EFF_AREA_COLUMNS)
+    _save_table(
+        os.path.join(path, 'smearing.csv'),
+        generate_smearing_data(),
+        SMEARING_COLUMNS)
+
+    with open(os.path.join(path, 'mc_bkg_pdf.pkl'), 'wb') as fp:
+        pickle.dump(generate_mc_bkg_pdf_data(exp), fp)
+
+
+def create_synthetic_dataset(
+        cfg,
+        base_path):
+    """Creates the ``TestData`` dataset for the synthetic data files, which
+    have been created via the ``create_synthetic_data_files`` function in the
+    ``testdata`` sub directory of the given base path.
+
+    Parameters
+    ----------
+    cfg : instance of Config
+        The instance of Config holding the local configuration.
+    base_path : str
+        The base path of the data files.
+
+    Returns
+    -------
+    ds : instance of I3Dataset
+        The dataset of the synthetic data.
+    """
+    dsc = TestData.create_dataset_collection(cfg=cfg, base_path=base_path)
+    ds = dsc['TestData']
+
+    # The public data analyses do not use monte-carlo data.
+    ds.mc_pathfilename_list = None
+
+    ds.add_aux_data_definition('eff_area_datafile', 'effectiveArea.csv')
+    ds.add_aux_data_definition('smearing_datafile', 'smearing.csv')
+    ds.add_aux_data_definition('pdf_bkg_datafile', 'mc_bkg_pdf.pkl')
+
+    ds.define_binning('sin_dec', SIN_DEC_BINEDGES)
+    ds.define_binning('log_energy', LOG_ENERGY_BINEDGES)
+
+    return ds